@@ -1,6 +1,7 @@
 """This file contains the code for "Download nodal data." in the "Example Usage" section of the documentation located
 at https://plantpredict-python.readthedocs.io."""
 
+import os
 import plantpredict
 
 # authenticate using API credentials
@@ -49,3 +50,20 @@ nodal_data_dc_field = prediction.get_nodal_data(params={
 
 # for System-level nodal data, call method with no inputs
 nodal_data_system = prediction.get_nodal_data()
+
+# alternatively, retrieve the nodal data of every array and DC field exported by the export options of the run
+# concurrently, writing each to a .csv file as it arrives. nodes already written are listed in the checkpoint file and
+# skipped if the download is run again
+os.makedirs("nodal_data", exist_ok=True)
+
+
+def write_nodal_data(node, nodal_data):
+    nodal_data.to_csv(os.path.join("nodal_data", node.replace("/", "_") + ".csv"))
+
+
+prediction.get_all_nodal_data(
+    levels=["array", "dc_field"],
+    sink=write_nodal_data,
+    checkpoint=os.path.join("nodal_data", "completed_nodes.txt"),
+    export_options=export_options
+)
@@ -1,2 +1,3 @@
 from plantpredict.api import Api
-from plantpredict.error_handlers import APIError
+from plantpredict.async_api import AsyncApi
+from plantpredict.error_handlers import APIError, PredictionError, PredictionTimeoutError, RetryPolicy
@@ -1,6 +1,9 @@
-import requests
 import json
+import time
+import threading
 
+from plantpredict.session import Session
+from plantpredict.error_handlers import RetryPolicy
 from plantpredict.project import Project
 from plantpredict.prediction import Prediction
 from plantpredict.powerplant import PowerPlant
@@ -9,14 +12,30 @@ from plantpredict.inverter import Inverter
 from plantpredict.module import Module
 from plantpredict.weather import Weather
 from plantpredict.ashrae import ASHRAE
+from plantpredict.batch import PredictionBatch
 
 
 class Api(object):
 
+    def _set_tokens(self, response):
+        # set authentication token as global variable
+        try:
+            content = json.loads(response.content)
+            self._access_token = content['access_token']
+            self.refresh_token = content['refresh_token']
+        except (KeyError, ValueError):
+            return False
+
+        # tracks the lifetime of the token (in seconds) if the authorization server reports it
+        expires_in = content.get('expires_in')
+        self.access_token_expires_at = time.time() + expires_in if expires_in is not None else None
+
+        return True
+
     def __get_access_token(self):
         """
         """
-        response = requests.post(
+        response = self.session.post(
             url=self.__okta_auth_url,
             headers={"content-type": "application/x-www-form-urlencoded"},
             params={
@@ -28,40 +47,80 @@ class Api(object):
                 "client_secret": self.client_secret
             }
         )
-
-        # set authentication token as global variable
-        try:
-            self.access_token = json.loads(response.content)['access_token']
-            self.refresh_token = json.loads(response.content)['refresh_token']
-        except KeyError:
-            pass
+        self._set_tokens(response)
 
         return response
 
-    def refresh_access_token(self):
-        response = requests.post(
-            url=self.__okta_auth_url,
-            headers={"content-type": "application/x-www-form-urlencoded"},
-            params={
-                "refresh_token": self.refresh_token,
-                "grant_type": "refresh_token",
-                "scope": "offline_access",
-                "client_id": self.client_id,
-                "client_secret": self.client_secret
-            }
-        )
+    @property
+    def access_token(self):
+        """
+        Current access token. If it expires within :py:attr:`token_refresh_margin` seconds, it is refreshed before it is
+        returned.
 
-        # set authentication token as global variable
-        try:
-            self.access_token = json.loads(response.content)['access_token']
-            self.refresh_token = json.loads(response.content)['refresh_token']
-        except KeyError:
-            pass
+        :rtype: str
+        """
+        expires_at = self.access_token_expires_at
+        if expires_at is not None and time.time() >= expires_at - self.token_refresh_margin:
+            self.refresh_access_token(stale_token=self._access_token)
 
-        return response
+        return self._access_token
+
+    @access_token.setter
+    def access_token(self, access_token):
+        self._access_token = access_token
+        self.access_token_expires_at = None
+
+    @property
+    def retry_policy(self):
+        """
+        Retries of refused connections and transient server errors, applied to every single request sent through
+        :py:attr:`session`.
+
+        :rtype: plantpredict.error_handlers.RetryPolicy
+        """
+        return self.session.retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, retry_policy):
+        self.session.retry_policy = retry_policy
+
+    def refresh_access_token(self, stale_token=None):
+        """
+        Obtains a new access token with the refresh token (or with the username and password, if the refresh token is
+        no longer valid). Refreshes are single-flight: concurrent callers that found the same :py:data:`stale_token`
+        invalid wait for one refresh instead of each sending their own.
+
+        :param str stale_token: The access token found to be expired or invalid. If the current access token differs
+                                from it, another caller has already refreshed it and no request is sent.
+        :return: The response of the authorization server, or :py:data:`None` if no refresh was necessary.
+        """
+        with self._token_lock:
+            if stale_token is not None and stale_token != self._access_token:
+                return None
+
+            response = self.session.post(
+                url=self.__okta_auth_url,
+                headers={"content-type": "application/x-www-form-urlencoded"},
+                params={
+                    "refresh_token": self.refresh_token,
+                    "grant_type": "refresh_token",
+                    "scope": "offline_access",
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret
+                }
+            )
+
+            # if the refresh token has expired as well, authenticate again
+            if not self._set_tokens(response):
+                response = self.__get_access_token()
+
+            return response
 
     def __init__(self, username, password, client_id, client_secret, base_url="https://api.plantpredict.com",
-                 okta_auth_url="https://afse.okta.com/oauth2/aus3jzhulkrINTdnc356/v1/token"):
+                 okta_auth_url="https://afse.okta.com/oauth2/aus3jzhulkrINTdnc356/v1/token", pool_connections=10,
+                 pool_maxsize=10, pool_block=False, keep_alive=True, token_refresh_margin=60.0, retry_policy=None,
+                 rate_limits=None, request_compression=None, compression_threshold=16384, disk_cache=None,
+                 geo_cache=None, ashrae_index=None):
         self.base_url = base_url
         self.__okta_auth_url = okta_auth_url
 
@@ -70,8 +129,33 @@ class Api(object):
         self.client_id = client_id
         self.client_secret = client_secret
 
-        self.access_token = None
+        self._access_token = None
         self.refresh_token = None
+        self.access_token_expires_at = None
+        self.token_refresh_margin = token_refresh_margin
+        self._token_lock = threading.Lock()
+
+        # every entity created from this instance sends its requests through this pooled, keep-alive session, which
+        # retries each request after refused connections and transient server errors
+        self.session = Session(
+            retry_policy=retry_policy if retry_policy is not None else RetryPolicy(),
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+            rate_limits=rate_limits,
+            request_compression=request_compression,
+            compression_threshold=compression_threshold
+        )
+
+        # optional persistent cache (plantpredict.cache.DiskCache) of modules, inverters and weather
+        self.disk_cache = disk_cache
+
+        # optional cache (plantpredict.cache.GeoCache) of location attributes by latitude/longitude grid cell
+        self.geo_cache = geo_cache
+
+        # optional offline index (plantpredict.ashrae.ASHRAEStationIndex) answering ASHRAE station lookups locally
+        self.ashrae_index = ashrae_index
 
         self.__get_access_token()
 
@@ -100,3 +184,14 @@ class Api(object):
 
     def ashrae(self, **kwargs):
         return ASHRAE(self, **kwargs)
+
+    def run_predictions(self, predictions, **kwargs):
+        """
+        Runs many predictions concurrently. Iterate over the returned batch to receive each run as it finishes; see
+        :py:class:`~plantpredict.batch.PredictionBatch` for the available keyword arguments.
+
+        :param list predictions: Predictions to run.
+        :return: The (not yet started) batch of prediction runs.
+        :rtype: plantpredict.batch.PredictionBatch
+        """
+        return PredictionBatch(self, predictions, **kwargs)
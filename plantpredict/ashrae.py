@@ -1,10 +1,248 @@
 import json
-import requests
+import math
+import numpy
+import pandas
+
 from plantpredict.utilities import convert_json, camel_to_snake, decorate_all_methods
-from plantpredict.error_handlers import handle_refused_connection, handle_error_response
+from plantpredict.error_handlers import handle_error_response, decode_response
+
+# mean radius of the earth - units [km]
+EARTH_RADIUS = 6371.0
+
+
+def _to_unit_vectors(latitudes, longitudes):
+    """Converts latitudes and longitudes (in decimal degrees) to points on the unit sphere."""
+    latitudes = numpy.radians(numpy.asarray(latitudes, dtype=float))
+    longitudes = numpy.radians(numpy.asarray(longitudes, dtype=float))
+    cos_latitudes = numpy.cos(latitudes)
+
+    return numpy.stack([cos_latitudes * numpy.cos(longitudes), cos_latitudes * numpy.sin(longitudes),
+                        numpy.sin(latitudes)], axis=-1)
+
+
+def _chord_to_distance(chord):
+    """Converts the straight-line distance between two points on the unit sphere to a great-circle distance in km."""
+    return 2.0 * EARTH_RADIUS * numpy.arcsin(numpy.minimum(chord / 2.0, 1.0))
+
+
+class _KDTree(object):
+    """
+    Minimal KD-tree of 3D points. Nearest neighbours by straight-line distance between points on the unit sphere are
+    also nearest by great-circle distance, so stations are indexed by their unit vectors.
+    """
+    def _build(self, start, end):
+        node = len(self._split_dims)
+        self._split_dims.append(-1)
+        self._split_values.append(0.0)
+        self._children.append((start, end))
+        if end - start <= self.leaf_size:
+            return node
+
+        # splits the widest dimension of the node's points at the median
+        segment = self._order[start:end]
+        points = self.points[segment]
+        dim = int(numpy.argmax(points.max(axis=0) - points.min(axis=0)))
+        self._order[start:end] = segment[numpy.argsort(points[:, dim], kind="stable")]
+        middle = (start + end) // 2
+
+        self._split_dims[node] = dim
+        self._split_values[node] = float(self.points[self._order[middle], dim])
+        self._children[node] = (self._build(start, middle), self._build(middle, end))
+
+        return node
+
+    def query(self, point):
+        """
+        :param numpy.ndarray point: Query point.
+        :return: Index of the nearest point and its straight-line distance.
+        :rtype: tuple
+        """
+        best_index, best_distance2 = -1, numpy.inf
+        stack = [(0, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if bound >= best_distance2:
+                continue
+
+            dim = self._split_dims[node]
+            if dim < 0:
+                start, end = self._children[node]
+                distances2 = ((self._sorted_points[start:end] - point) ** 2).sum(axis=1)
+                i = int(numpy.argmin(distances2))
+                if distances2[i] < best_distance2:
+                    best_index, best_distance2 = int(self._order[start + i]), float(distances2[i])
+                continue
+
+            # visits the side of the split containing the point first
+            difference = point[dim] - self._split_values[node]
+            left, right = self._children[node]
+            near, far = (left, right) if difference < 0 else (right, left)
+            stack.append((far, max(bound, difference * difference)))
+            stack.append((near, bound))
+
+        return best_index, math.sqrt(best_distance2)
+
+    def __init__(self, points, leaf_size=16):
+        self.points = points
+        self.leaf_size = leaf_size
+
+        self._order = numpy.arange(len(points))
+        self._split_dims = []
+        self._split_values = []
+        self._children = []
+        self._build(0, len(points))
+
+        # points of each leaf are contiguous in this array
+        self._sorted_points = points[self._order]
+
+
+class ASHRAEStationIndex(object):
+    """
+    Offline index of ASHRAE stations, loaded from a dump of station records (as returned by
+    :py:meth:`ASHRAE.get_station`), which answers nearest-station queries locally with a KD-tree. Passed as the
+    :py:data:`ashrae_index` argument of :py:class:`~plantpredict.api.Api`, it is used by :py:class:`ASHRAE` (and so by
+    predictions created with :py:data:`use_closest_ashrae_station` and inverters added with
+    :py:data:`use_cooling_temp`) instead of the API:
+
+    .. code-block:: python
+
+        from plantpredict.ashrae import ASHRAEStationIndex
+
+        ashrae_index = ASHRAEStationIndex.from_file("ashrae_stations.csv")
+        api = plantpredict.Api(..., ashrae_index=ashrae_index)
+
+        # or queried directly, also for many sites at once
+        stations = ashrae_index.get_closest_stations(latitudes, longitudes)
+
+    Stations are returned as dictionaries with the fields of the station records (e.g. :py:data:`station_name`,
+    :py:data:`cool_996`, :py:data:`max_50_year`, :py:data:`min_50_year`) and the great-circle :py:data:`distance` from
+    the queried location - units :py:data:`[km]`.
+
+    :param list stations: Station records (dictionaries), each with at least :py:data:`station_name`,
+                          :py:data:`latitude` and :py:data:`longitude`. Keys in camel case are converted to snake case.
+    """
+    @classmethod
+    def from_file(cls, path):
+        """
+        Loads the index from a station dump saved with :py:meth:`save` (JSON), or from a CSV file with one station per
+        row.
+
+        :param str path: Path of the JSON or CSV file.
+        :rtype: ASHRAEStationIndex
+        """
+        if path.lower().endswith(".csv"):
+            return cls(pandas.read_csv(path).to_dict("records"))
+
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def save(self, path):
+        """
+        Saves the station records to a JSON file that can be loaded with :py:meth:`from_file`.
+
+        :param str path: Path of the JSON file.
+        """
+        with open(path, "w") as f:
+            json.dump(self.stations, f)
+
+    def _make_station(self, index, distance):
+        station = dict(self.stations[index])
+        station["distance"] = float(distance)
+        return station
+
+    def query(self, latitudes, longitudes):
+        """
+        Finds the closest station of every location.
+
+        :param latitudes: North-South GPS coordinates - units :py:data:`[decimal degrees]`.
+        :type latitudes: float or list or numpy.ndarray
+        :param longitudes: East-West GPS coordinates - units :py:data:`[decimal degrees]`.
+        :type longitudes: float or list or numpy.ndarray
+        :return: Indices of the closest stations in :py:attr:`stations`, and their distances - units :py:data:`[km]`.
+        :rtype: tuple
+        """
+        points = _to_unit_vectors(numpy.atleast_1d(latitudes), numpy.atleast_1d(longitudes))
+        indices = numpy.empty(len(points), dtype=int)
+        chords = numpy.empty(len(points))
+        for i, point in enumerate(points):
+            indices[i], chords[i] = self._tree.query(point)
+
+        return indices, _chord_to_distance(chords)
+
+    def get_closest_station(self, latitude, longitude):
+        """
+        Same as :py:meth:`ASHRAE.get_closest_station`, without a request.
+
+        :param float latitude: North-South GPS coordinate - units :py:data:`[decimal degrees]`.
+        :param float longitude: East-West GPS coordinate - units :py:data:`[decimal degrees]`.
+        :return: The closest station.
+        :rtype: dict
+        """
+        index, chord = self._tree.query(_to_unit_vectors(latitude, longitude))
+        return self._make_station(index, _chord_to_distance(chord))
+
+    def get_closest_stations(self, latitudes, longitudes):
+        """
+        Batched :py:meth:`get_closest_station`.
+
+        :param list latitudes: North-South GPS coordinates - units :py:data:`[decimal degrees]`.
+        :param list longitudes: East-West GPS coordinates - units :py:data:`[decimal degrees]`.
+        :return: The closest station of every location.
+        :rtype: list
+        """
+        indices, distances = self.query(latitudes, longitudes)
+        return [self._make_station(index, distance) for index, distance in zip(indices, distances)]
+
+    def get_station(self, latitude, longitude, station_name=None):
+        """
+        Same as :py:meth:`ASHRAE.get_station`, without a request: the station named :py:data:`station_name` (the
+        closest one if several share the name), or the closest station if no name is given or no station has it.
+
+        :param float latitude: North-South GPS coordinate - units :py:data:`[decimal degrees]`.
+        :param float longitude: East-West GPS coordinate - units :py:data:`[decimal degrees]`.
+        :param str station_name: Valid name of ASHRAE weather station.
+        :rtype: dict
+        """
+        indices = self._indices_by_name.get(station_name) if station_name else None
+        if not indices:
+            return self.get_closest_station(latitude, longitude)
+
+        chords = numpy.linalg.norm(self._points[indices] - _to_unit_vectors(latitude, longitude), axis=1)
+        i = int(numpy.argmin(chords))
+        return self._make_station(indices[i], _chord_to_distance(chords[i]))
+
+    def __len__(self):
+        return len(self.stations)
+
+    def __init__(self, stations):
+        # the distance to a queried location is computed for every query, not stored with the station
+        self.stations = []
+        for station in stations:
+            station = convert_json(station, camel_to_snake)
+            station.pop("distance", None)
+            self.stations.append(station)
+        if not self.stations:
+            raise ValueError("An ASHRAE station index needs at least one station.")
+
+        self._points = _to_unit_vectors([s["latitude"] for s in self.stations], [s["longitude"] for s in self.stations])
+        self._tree = _KDTree(self._points)
+        self._indices_by_name = {}
+        for i, station in enumerate(self.stations):
+            self._indices_by_name.setdefault(station["station_name"], []).append(i)
+
+
+def _get_ashrae_index(api):
+    ashrae_index = getattr(api, "ashrae_index", None)
+    return ashrae_index if isinstance(ashrae_index, ASHRAEStationIndex) else None
+
+
+def _assign_station(ashrae, station):
+    for key in station:
+        setattr(ashrae, key, station[key])
+
+    return station
 
 
-@decorate_all_methods(handle_refused_connection)
 @decorate_all_methods(handle_error_response)
 class ASHRAE(object):
     """
@@ -21,14 +259,23 @@ class ASHRAE(object):
         :return: # TODO once new http response is implemented
         """
         self.station_name = station_name if station_name else self.station_name
-        response = requests.get(
+
+        # answered locally if the api has an offline station index
+        ashrae_index = _get_ashrae_index(self.api)
+        if ashrae_index is not None:
+            return _assign_station(self, ashrae_index.get_station(self.latitude, self.longitude, self.station_name))
+
+        response = self.api.session.get(
             url=self.api.base_url + "/ASHRAE/GetStation",
             headers={"Authorization": "Bearer " + self.api.access_token},
             params={"latitude": self.latitude, "longitude": self.longitude, "stationName": self.station_name}
         )
-        attr = convert_json(json.loads(response.content), camel_to_snake)
-        for key in attr:
-            setattr(self, key, attr[key])
+
+        # an error response is left to the error handler
+        if 200 <= response.status_code < 300:
+            attr = decode_response(response)
+            for key in attr:
+                setattr(self, key, attr[key])
 
         return response
 
@@ -39,14 +286,21 @@ class ASHRAE(object):
 
         :return: # TODO once new http response is implemented
         """
-        response = requests.get(
+        ashrae_index = _get_ashrae_index(self.api)
+        if ashrae_index is not None:
+            return _assign_station(self, ashrae_index.get_closest_station(self.latitude, self.longitude))
+
+        response = self.api.session.get(
             url=self.api.base_url + "/ASHRAE",
             headers={"Authorization": "Bearer " + self.api.access_token},
             params={"latitude": self.latitude, "longitude": self.longitude}
         )
-        attr = convert_json(json.loads(response.content), camel_to_snake)
-        for key in attr:
-            setattr(self, key, attr[key])
+
+        # an error response is left to the error handler
+        if 200 <= response.status_code < 300:
+            attr = decode_response(response)
+            for key in attr:
+                setattr(self, key, attr[key])
 
         return response
 
@@ -0,0 +1,748 @@
+import json
+import time
+import asyncio
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from plantpredict.utilities import convert_json, parse_json, camel_to_snake, snake_to_camel
+from plantpredict.error_handlers import APIError, PredictionTimeoutError, RetryPolicy, parse_retry_after
+from plantpredict.enumerations import EntityTypeEnum
+from plantpredict.plant_predict_entity import PlantPredictEntity
+from plantpredict.project import Project
+from plantpredict.prediction import Prediction, PollingPolicy, nodal_data_to_frame
+from plantpredict.powerplant import PowerPlant
+from plantpredict.geo import Geo
+from plantpredict.inverter import Inverter
+from plantpredict.module import Module
+from plantpredict.weather import Weather
+from plantpredict.ashrae import ASHRAE, _get_ashrae_index, _assign_station
+
+
+class AsyncPlantPredictEntity(PlantPredictEntity):
+    """
+    Awaitable counterpart of :py:class:`~plantpredict.plant_predict_entity.PlantPredictEntity`. The generic
+    create/get/update/delete requests are coroutines sent through the connection pool of an
+    :py:class:`~plantpredict.async_api.AsyncApi`. Each async entity class inherits from both its synchronous
+    counterpart and this class, so the URL suffixes and payload preparation of the synchronous methods are reused as-is.
+    """
+    async def create(self, *args):
+        """Generic POST request."""
+        response = await self.api.request(
+            "POST", self.create_url_suffix, json=convert_json(self.__dict__, snake_to_camel)
+        )
+
+        # power plant is the exception that doesn't have its own id. has a project and prediction id
+        if isinstance(response, dict) and "id" in response:
+            self.id = response["id"]
+
+        return response
+
+    async def delete(self):
+        """Generic DELETE request."""
+        return await self.api.request("DELETE", self.delete_url_suffix)
+
+    async def get(self):
+        """Generic GET request."""
+        response = await self.api.request("GET", self.get_url_suffix)
+        for key in response:
+            setattr(self, key, response[key])
+
+        return response
+
+    async def update(self):
+        """Generic PUT request."""
+        return await self.api.request("PUT", self.update_url_suffix, json=convert_json(self.__dict__, snake_to_camel))
+
+
+class AsyncProject(Project, AsyncPlantPredictEntity):
+    """
+    Awaitable counterpart of :py:class:`~plantpredict.project.Project`.
+    """
+    async def get_all_predictions(self):
+        """HTTP Request: GET /Project/{ProjectId}/Prediction"""
+        return await self.api.request("GET", "/Project/{}/Prediction".format(self.id))
+
+    async def search(self, latitude, longitude, search_radius=1.0):
+        """HTTP Request: GET /Project/Search"""
+        return await self.api.request(
+            "GET", "/Project/Search",
+            params={'latitude': latitude, 'longitude': longitude, 'searchRadius': search_radius}
+        )
+
+    async def assign_location_attributes(self):
+        """
+        Same as :py:meth:`plantpredict.project.Project.assign_location_attributes`, but the location info, elevation
+        and time zone are requested concurrently.
+        """
+        geo = self.api.geo(latitude=self.latitude, longitude=self.longitude)
+        await geo.get_location_attributes()
+
+        self.locality = geo.locality
+        self.state_province_code = geo.state_province_code
+        self.state_province = geo.state_province
+        self.country_code = geo.country_code
+        self.country = geo.country
+        self.region = geo.region
+        self.elevation = geo.elevation
+        self.standard_offset_from_utc = geo.time_zone
+
+
+class AsyncPrediction(Prediction, AsyncPlantPredictEntity):
+    """
+    Awaitable counterpart of :py:class:`~plantpredict.prediction.Prediction`.
+    """
+    async def create(self, use_closest_ashrae_station=True, **kwargs):
+        """**POST** */Project/ :py:attr:`project_id` /Prediction*"""
+        if use_closest_ashrae_station:
+            await self._assign_plant_design_temperature_with_closest_ashrae_station()
+
+        return await super(AsyncPrediction, self).create(use_closest_ashrae_station=False, **kwargs)
+
+    async def _assign_plant_design_temperature_with_closest_ashrae_station(self):
+        project = self.api.project(id=self.project_id)
+        await project.get()
+        ashrae = self.api.ashrae(latitude=project.latitude, longitude=project.longitude)
+        await ashrae.get_closest_station()
+
+        # set relevant attributes from ASHRAE to Prediction
+        self.ashrae_station = ashrae.station_name
+        self.cool_996 = ashrae.cool_996
+        self.max_50_year = ashrae.max_50_year
+        self.min_50_year = ashrae.min_50_year
+
+    async def _get_processing_status(self):
+        data = await self.api.request(
+            "GET", "/Project/{}/Prediction/{}".format(self.project_id, self.id), convert_keys=False
+        )
+        return data.get("processingStatus")
+
+    async def _wait_for_prediction(self, polling_policy=None):
+        polling_policy = polling_policy if polling_policy is not None else PollingPolicy()
+        start = time.monotonic()
+
+        for interval in polling_policy.intervals():
+            processing_status = await self._get_processing_status()
+            if self._is_prediction_complete(processing_status, polling_policy):
+                break
+
+            if polling_policy.timeout is not None and time.monotonic() - start + interval > polling_policy.timeout:
+                raise PredictionTimeoutError(self.id, processing_status, polling_policy.timeout)
+            await asyncio.sleep(interval)
+
+        # assigns the attributes of the completed prediction to the local instance
+        await self.get()
+
+    async def run(self, export_options=None, polling_policy=None):
+        """POST /Project/{ProjectId}/Prediction/{PredictionId}/Run"""
+        response = await self.api.request(
+            "POST", "/Project/{}/Prediction/{}/Run".format(self.project_id, self.id),
+            json=convert_json(export_options, snake_to_camel) if export_options else None
+        )
+
+        # observes task queue to wait for prediction run to complete
+        await self._wait_for_prediction(polling_policy)
+
+        return response
+
+    async def get_results_summary(self):
+        """GET /Project/{ProjectId}/Prediction/{Id}/ResultSummary"""
+        return await self.api.request("GET", "/Project/{}/Prediction/{}/ResultSummary".format(self.project_id, self.id))
+
+    async def get_results_details(self):
+        """GET /Project/{ProjectId}/Prediction/{Id}/ResultDetails"""
+        return await self.api.request("GET", "/Project/{}/Prediction/{}/ResultDetails".format(self.project_id, self.id))
+
+    async def get_nodal_data(self, params=None):
+        """GET /Project/{ProjectId}/Prediction/{Id}/NodalJson"""
+        return await self.api.request(
+            "GET", "/Project/{}/Prediction/{}/NodalJson".format(self.project_id, self.id),
+            params=convert_json(params, snake_to_camel) if params else {}
+        )
+
+    async def get_nodal_frame(self, params=None, index="timestamp"):
+        """Same as :py:meth:`plantpredict.prediction.Prediction.get_nodal_frame`."""
+        nodal_data = await self.api.request(
+            "GET", "/Project/{}/Prediction/{}/NodalJson".format(self.project_id, self.id),
+            params=convert_json(params, snake_to_camel) if params else {}, convert_keys=False
+        )
+        return nodal_data_to_frame(nodal_data, index=index)
+
+    async def clone(self, new_prediction_name):
+        """Same as :py:meth:`plantpredict.prediction.Prediction.clone`."""
+        new_prediction = self.api.prediction()
+        await self.get()
+        original_prediction_id = self.id
+
+        new_prediction.__dict__ = self.__dict__
+        self._initialize_cloned_prediction(new_prediction)
+
+        new_prediction.name = new_prediction_name
+        await new_prediction.create()
+        new_prediction_id = new_prediction.id
+
+        # clone powerplant and attach to new prediction
+        new_powerplant = self.api.powerplant()
+        powerplant = self.api.powerplant(project_id=self.project_id, prediction_id=original_prediction_id)
+        await powerplant.get()
+        new_powerplant.__dict__ = powerplant.__dict__
+        new_powerplant.prediction_id = new_prediction_id
+        self._initialize_cloned_powerplant(new_powerplant)
+
+        await new_powerplant.create()
+
+        self.id = original_prediction_id
+        await self.get()
+
+        return new_prediction_id
+
+    async def change_status(self, new_status, note=""):
+        """POST /Project/{ProjectId}/Prediction/Status"""
+        return await self.api.request(
+            "POST", "/Project/{}/Prediction/Status".format(self.project_id),
+            json=[{
+                "name": self.name,
+                "id": self.id,
+                "type": EntityTypeEnum.PREDICTION,
+                "status": new_status,
+                "note": note
+            }]
+        )
+
+
+class AsyncPowerPlant(PowerPlant, AsyncPlantPredictEntity):
+    """
+    Awaitable counterpart of :py:class:`~plantpredict.powerplant.PowerPlant`. Building the power plant structure is
+    done locally, as with the synchronous class; :py:meth:`add_inverter`, :py:meth:`add_dc_field` and
+    :py:meth:`calculate_post_to_post_spacing_from_gcr` are coroutines because they first retrieve the module, inverter,
+    project and ASHRAE station they depend on. These are stored in the same cache as in the synchronous class, so
+    :py:attr:`cache_ttl` and :py:meth:`~plantpredict.powerplant.PowerPlant.invalidate_cache` apply, and the synchronous
+    builder methods then find everything they need in it.
+    """
+    async def clone_block(self, block_id_to_clone):
+        """Same as :py:meth:`plantpredict.powerplant.PowerPlant.clone_block`."""
+        block_name = self._append_block_copy(block_id_to_clone)
+        try:
+            await self.update()
+        except Exception:
+            self._remove_last_block()
+            raise
+
+        return block_name
+
+    async def _resolve(self, key, fetch):
+        value = self._entity_cache.get_cached(key)
+        if value is None:
+            value = await fetch()
+            self._entity_cache.set(key, value)
+
+        return value
+
+    async def _resolve_entity(self, key, entity, get=None):
+        async def fetch():
+            await (get if get is not None else entity.get)()
+            return entity
+
+        return await self._resolve(key, fetch)
+
+    async def _resolve_project(self):
+        return await self._resolve_entity(("project", self.project_id), self.api.project(id=self.project_id))
+
+    async def _resolve_prediction(self):
+        return await self._resolve_entity(
+            ("prediction", self.prediction_id), self.api.prediction(id=self.prediction_id, project_id=self.project_id)
+        )
+
+    async def _resolve_module(self, module_id):
+        return await self._resolve_entity(("module", module_id), self.api.module(id=module_id))
+
+    async def _resolve_inverter(self, inverter_id):
+        inverter = await self._resolve_entity(("inverter", inverter_id), self.api.inverter(id=inverter_id))
+        if not self.use_cooling_temp:
+            return
+
+        # retrieve ASHRAE station based on latitude and longitude of project associated with power plant
+        project, prediction = await asyncio.gather(self._resolve_project(), self._resolve_prediction())
+        ashrae = self.api.ashrae(
+            latitude=project.latitude, longitude=project.longitude, station_name=prediction.ashrae_station
+        )
+        ashrae = await self._resolve_entity(
+            ("ashrae", prediction.ashrae_station, project.latitude, project.longitude), ashrae, ashrae.get_station
+        )
+        if self._local_kva and self._interpolate_inverter_kva(inverter, project.elevation, ashrae.cool_996) is not None:
+            return
+
+        async def fetch():
+            return await self.api.inverter(id=inverter_id).get_kva(
+                elevation=project.elevation,
+                temperature=ashrae.cool_996,
+                use_cooling_temp=self.use_cooling_temp
+            )
+
+        await self._resolve(self._get_inverter_kva_key(inverter_id, project, ashrae), fetch)
+
+    async def add_inverter(self, block_name, array_name, inverter_id, *args, **kwargs):
+        """Same as :py:meth:`plantpredict.powerplant.PowerPlant.add_inverter`."""
+        self._validate_array_name(block_name, array_name)
+        await self._resolve_inverter(inverter_id)
+
+        return super(AsyncPowerPlant, self).add_inverter(block_name, array_name, inverter_id, *args, **kwargs)
+
+    async def calculate_post_to_post_spacing_from_gcr(self, ground_coverage_ratio, module_id, *args, **kwargs):
+        """Same as :py:meth:`plantpredict.powerplant.PowerPlant.calculate_post_to_post_spacing_from_gcr`."""
+        await self._resolve_module(module_id)
+
+        return super(AsyncPowerPlant, self).calculate_post_to_post_spacing_from_gcr(
+            ground_coverage_ratio, module_id, *args, **kwargs
+        )
+
+    async def add_dc_field(self, block_name, array_name, inverter_name, module_id, *args, **kwargs):
+        """Same as :py:meth:`plantpredict.powerplant.PowerPlant.add_dc_field`."""
+        self._validate_inverter_name(block_name=block_name, array_name=array_name, inverter_name=inverter_name)
+        await asyncio.gather(self._resolve_module(module_id), self._resolve_project())
+
+        return super(AsyncPowerPlant, self).add_dc_field(
+            block_name, array_name, inverter_name, module_id, *args, **kwargs
+        )
+
+
+class AsyncWeather(Weather, AsyncPlantPredictEntity):
+    """
+    Awaitable counterpart of :py:class:`~plantpredict.weather.Weather`.
+    """
+    async def get_details(self):
+        """GET /Weather/{Id}/Detail"""
+        return await self.api.request("GET", "/Weather/{}/Detail".format(self.id))
+
+    async def search(self, latitude, longitude, search_radius=1):
+        """GET /Weather/Search"""
+        return await self.api.request(
+            "GET", "/Weather/Search",
+            params=convert_json({
+                'latitude': latitude,
+                'longitude': longitude,
+                'search_radius': search_radius
+            }, snake_to_camel)
+        )
+
+    async def download(self, latitude, longitude, provider=0):
+        """POST /Weather/Download/{Provider}"""
+        response = await self.api.request(
+            "POST", "/Weather/Download/{}".format(provider),
+            params={'latitude': latitude, 'longitude': longitude}
+        )
+        self.id = response['id']
+
+        return response
+
+
+class AsyncModule(Module, AsyncPlantPredictEntity):
+    """
+    Awaitable counterpart of :py:class:`~plantpredict.module.Module`.
+    """
+    async def _generate(self, url_suffix):
+        response = await self.api.request("POST", url_suffix, json=convert_json(self.__dict__, snake_to_camel))
+        self.__dict__.update(response)
+
+        return response
+
+    async def generate_single_diode_parameters_default(self):
+        """POST /Module/Generator/GenerateSingleDiodeParametersDefault"""
+        return await self._generate("/Module/Generator/GenerateSingleDiodeParametersDefault")
+
+    async def generate_single_diode_parameters_advanced(self):
+        """POST /Module/Generator/GenerateSingleDiodeParametersAdvanced"""
+        return await self._generate("/Module/Generator/GenerateSingleDiodeParametersAdvanced")
+
+    async def optimize_series_resistance(self):
+        """POST /Module/Generator/OptimizeSeriesResistance"""
+        return await self._generate("/Module/Generator/OptimizeSeriesResistance")
+
+    async def calculate_effective_irradiance_response(self):
+        """POST /Module/Generator/CalculateEffectiveIrradianceResponse"""
+        return await self.api.request(
+            "POST", "/Module/Generator/CalculateEffectiveIrradianceResponse",
+            json=convert_json(self.__dict__, snake_to_camel)
+        )
+
+    async def process_key_iv_points(self, file_path=None, key_iv_points_data=None):
+        """POST /Module/Generator/ProcessKeyIVPoints"""
+        key_iv_points_data = self._prepare_key_iv_points_data(file_path, key_iv_points_data)
+        response = await self.api.request(
+            "POST", "/Module/Generator/ProcessKeyIVPoints",
+            json=[convert_json(d, snake_to_camel) for d in key_iv_points_data]
+        )
+        self.__dict__.update(response)
+
+        return response
+
+    async def process_iv_curves(self, file_path=None, iv_curve_data=None):
+        """POST /Module/Generator/ProcessIVCurves"""
+        iv_curve_data = self._prepare_iv_curve_data(file_path, iv_curve_data)
+
+        return await self.api.request(
+            "POST", "/Module/Generator/ProcessIVCurves",
+            json=[convert_json(d, snake_to_camel) for d in iv_curve_data]
+        )
+
+    async def generate_iv_curve(self, num_iv_points=100):
+        """POST /Module/Generator/GenerateIVCurve"""
+        self.num_iv_points = num_iv_points
+
+        return await self.api.request(
+            "POST", "/Module/Generator/GenerateIVCurve",
+            json=convert_json(self.__dict__, snake_to_camel)
+        )
+
+    async def calculate_basic_data_at_conditions(self, temperature, irradiance):
+        """Same as :py:meth:`plantpredict.module.Module.calculate_basic_data_at_conditions`."""
+        return await self.process_iv_curves(iv_curve_data=[{
+            "temperature": temperature,
+            "irradiance": irradiance,
+            "data_points": await self.generate_iv_curve()
+        }])
+
+
+class AsyncInverter(Inverter, AsyncPlantPredictEntity):
+    """
+    Awaitable counterpart of :py:class:`~plantpredict.inverter.Inverter`.
+    """
+    async def change_status(self, new_status, note=""):
+        """POST /Inverter/Status"""
+        return await self.api.request(
+            "POST", "/Inverter/Status",
+            json=[{
+                "name": self.name,
+                "id": self.id,
+                "type": EntityTypeEnum.INVERTER,
+                "status": new_status,
+                "note": note
+            }]
+        )
+
+    async def get_kva(self, elevation, temperature, use_cooling_temp):
+        """GET /Inverter/{Id}/kVa"""
+        return await self.api.request(
+            "GET", "/Inverter/{}/kVa".format(self.id),
+            params={"elevation": elevation, "temperature": temperature, "useCoolingTemp": use_cooling_temp}
+        )
+
+
+class AsyncGeo(Geo):
+    """
+    Awaitable counterpart of :py:class:`~plantpredict.geo.Geo`.
+    """
+    async def _get(self, resource):
+        response = await self.api.request("GET", "/Geo/{}/{}/{}".format(self.latitude, self.longitude, resource))
+        for key in response:
+            setattr(self, key, response[key])
+
+        return response
+
+    async def get_location_info(self):
+        """**GET** */Geo/* :py:attr:`latitude` */* :py:attr:`longitude` */Location*"""
+        return await self._get("Location")
+
+    async def get_elevation(self):
+        """**GET** */Geo/* :py:attr:`latitude` */* :py:attr:`longitude` */Elevation*"""
+        return await self._get("Elevation")
+
+    async def get_time_zone(self):
+        """**GET** */Geo/* :py:attr:`latitude` */* :py:attr:`longitude` */TimeZone*"""
+        return await self._get("TimeZone")
+
+    async def get_location_attributes(self):
+        """Same as :py:meth:`plantpredict.geo.Geo.get_location_attributes`, without the geo cache."""
+        attr = {}
+        for response in await asyncio.gather(self.get_location_info(), self.get_elevation(), self.get_time_zone()):
+            attr.update(response)
+
+        return attr
+
+
+class AsyncASHRAE(ASHRAE):
+    """
+    Awaitable counterpart of :py:class:`~plantpredict.ashrae.ASHRAE`.
+    """
+    async def _get(self, url_suffix, params):
+        response = await self.api.request("GET", url_suffix, params=params)
+        for key in response:
+            setattr(self, key, response[key])
+
+        return response
+
+    async def get_station(self, station_name=None):
+        """GET /ASHRAE/GetStation"""
+        self.station_name = station_name if station_name else self.station_name
+        ashrae_index = _get_ashrae_index(self.api)
+        if ashrae_index is not None:
+            return _assign_station(self, ashrae_index.get_station(self.latitude, self.longitude, self.station_name))
+
+        return await self._get(
+            "/ASHRAE/GetStation",
+            params={"latitude": self.latitude, "longitude": self.longitude, "stationName": self.station_name}
+        )
+
+    async def get_closest_station(self):
+        """GET /ASHRAE"""
+        ashrae_index = _get_ashrae_index(self.api)
+        if ashrae_index is not None:
+            return _assign_station(self, ashrae_index.get_closest_station(self.latitude, self.longitude))
+
+        return await self._get("/ASHRAE", params={"latitude": self.latitude, "longitude": self.longitude})
+
+
+class AsyncApi(object):
+    """
+    Asynchronous counterpart of :py:class:`~plantpredict.api.Api`. Its factory methods return awaitable entities that
+    share one event loop and one connection pool, so hundreds of requests can be kept in flight from a single thread.
+    Requires the optional dependency :py:mod:`aiohttp` (:code:`pip install plantpredict[async]`).
+
+    The connection is opened (and the access token obtained) when entering the context manager:
+
+    .. code-block:: python
+
+        async def get_summaries(prediction_ids):
+            async with plantpredict.AsyncApi(username, password, client_id, client_secret) as api:
+                predictions = [api.prediction(id=i, project_id=project_id) for i in prediction_ids]
+                return await asyncio.gather(*[p.get_results_summary() for p in predictions])
+
+        summaries = asyncio.run(get_summaries([1001, 1002, 1003]))
+    """
+    async def _send(self, method, url, headers=None, params=None, json=None):
+        # aiohttp only accepts str/int/float query values, so mirror how requests encodes booleans and None
+        if params:
+            params = {k: str(v) if isinstance(v, bool) else v for k, v in params.items() if v is not None}
+
+        async with self.session.request(method, url, headers=headers, params=params, json=json) as response:
+            return response.status, await response.read(), response.headers
+
+    def _set_tokens(self, content):
+        # set authentication token as global variable
+        try:
+            content = json.loads(content)
+            self.access_token = content['access_token']
+            self.refresh_token = content['refresh_token']
+        except (KeyError, ValueError):
+            return False
+
+        # tracks the lifetime of the token (in seconds) if the authorization server reports it
+        expires_in = content.get('expires_in')
+        self.access_token_expires_at = time.time() + expires_in if expires_in is not None else None
+
+        return True
+
+    async def __get_access_token(self):
+        status, content, _ = await self._send(
+            "POST", self.__okta_auth_url,
+            headers={"content-type": "application/x-www-form-urlencoded"},
+            params={
+                "grant_type": "password",
+                "scope": "openid offline_access",
+                "username": self.username,
+                "password": self.password,
+                "client_id": self.client_id,
+                "client_secret": self.client_secret
+            }
+        )
+        self._set_tokens(content)
+
+    async def refresh_access_token(self, stale_token=None):
+        """
+        Same as :py:meth:`plantpredict.api.Api.refresh_access_token`: concurrent tasks that found the same
+        :py:data:`stale_token` invalid share a single refresh.
+        """
+        async with self._token_lock:
+            if stale_token is not None and stale_token != self.access_token:
+                return
+
+            status, content, _ = await self._send(
+                "POST", self.__okta_auth_url,
+                headers={"content-type": "application/x-www-form-urlencoded"},
+                params={
+                    "refresh_token": self.refresh_token,
+                    "grant_type": "refresh_token",
+                    "scope": "offline_access",
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret
+                }
+            )
+
+            # if the refresh token has expired as well, authenticate again
+            if not self._set_tokens(content):
+                await self.__get_access_token()
+
+    async def _get_access_token(self):
+        # refreshes the access token proactively if it expires within token_refresh_margin seconds
+        expires_at = self.access_token_expires_at
+        if expires_at is not None and time.time() >= expires_at - self.token_refresh_margin:
+            await self.refresh_access_token(stale_token=self.access_token)
+
+        return self.access_token
+
+    @staticmethod
+    def _handle_response(url_suffix, status, content, convert_keys=True):
+        # same handling of the response as plantpredict.error_handlers.handle_error_response
+        if not 200 <= status < 300:
+            raise APIError(status, content)
+
+        # if the response does not contain content, return a generic success message
+        if not content:
+            return {'is_successful': True}
+
+        # the keys are converted while the content is decoded, so it is only walked once
+        return parse_json(content, camel_to_snake if convert_keys and "Queue" not in url_suffix else None)
+
+    async def request(self, method, url_suffix, params=None, json=None, convert_keys=True):
+        """
+        Sends an authorized request to the PlantPredict API and returns the response content with its keys converted to
+        snake case. If the access token has expired, it is refreshed and the request is sent once more. Refused
+        connections and transient server errors are retried according to :py:attr:`retry_policy`.
+
+        :param str method: HTTP method, e.g. :py:data:`"GET"`.
+        :param str url_suffix: Endpoint path appended to :py:attr:`base_url`.
+        :param dict params: Query string parameters.
+        :param json: JSON-serializable request body.
+        :param bool convert_keys: If :py:data:`False`, the decoded response content is returned with its keys as sent
+                                  by the server (camel case), skipping the conversion of the whole response.
+        :return: The response content, or :py:data:`{"is_successful": True}` if there is none.
+        :rtype: dict or list
+        """
+        start = time.monotonic()
+        attempt = 0
+        is_replayed = False
+        while True:
+            attempt += 1
+            access_token = await self._get_access_token()
+            try:
+                status, content, headers = await self._send(
+                    method, self.base_url + url_suffix,
+                    headers={"Authorization": "Bearer " + access_token},
+                    params=params,
+                    json=json
+                )
+            except aiohttp.ClientConnectionError as e:
+                if not self.retry_policy.is_retryable(
+                        method, connection_refused=isinstance(e, aiohttp.ClientConnectorError)):
+                    raise
+                error = e
+            else:
+                # if the authorization is invalid, refresh the API access token and try again
+                if status == 401 and not is_replayed:
+                    is_replayed = True
+                    await self.refresh_access_token(stale_token=access_token)
+                    continue
+
+                if not self.retry_policy.is_retryable(method, status):
+                    break
+                error = APIError(status, content, retry_after=parse_retry_after(headers.get("Retry-After")))
+
+            # retries refused connections and transient server errors as configured by the retry policy
+            delay = self.retry_policy.get_delay(attempt, getattr(error, "retry_after", None))
+            if not self.retry_policy.allows_retry(attempt, time.monotonic() - start + delay):
+                self.retry_policy.report("give_up", method + " " + url_suffix, attempt, error=error)
+                raise error
+
+            self.retry_policy.report("retry", method + " " + url_suffix, attempt, delay, error)
+            await asyncio.sleep(delay)
+
+        if attempt > 1:
+            self.retry_policy.report("recovered", method + " " + url_suffix, attempt)
+
+        return self._handle_response(url_suffix, status, content, convert_keys)
+
+    async def open(self):
+        """
+        Opens the connection pool and obtains an access token. Called automatically when entering
+        :code:`async with AsyncApi(...)`.
+        """
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+        if self.session is None:
+            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                force_close=not self.keep_alive
+            ))
+        await self.__get_access_token()
+
+        return self
+
+    async def close(self):
+        """Closes the connection pool."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def __init__(self, username, password, client_id, client_secret, base_url="https://api.plantpredict.com",
+                 okta_auth_url="https://afse.okta.com/oauth2/aus3jzhulkrINTdnc356/v1/token", limit=100,
+                 limit_per_host=0, keep_alive=True, token_refresh_margin=60.0, retry_policy=None, ashrae_index=None):
+        """
+        :param int limit: Maximum number of simultaneous connections in the pool.
+        :param int limit_per_host: Maximum number of simultaneous connections to a single host (:py:data:`0` for no
+                                   limit other than :py:attr:`limit`).
+        :param bool keep_alive: If :py:data:`False`, every connection is closed after its response is read.
+        :param float token_refresh_margin: The access token is refreshed when it expires within this many seconds.
+        :param plantpredict.error_handlers.RetryPolicy retry_policy: Retries of refused connections and transient
+                                                                     server errors. Defaults to :py:class:`RetryPolicy`
+                                                                     with default arguments.
+        :param plantpredict.ashrae.ASHRAEStationIndex ashrae_index: Offline index answering ASHRAE station lookups
+                                                                    without requests.
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncApi requires aiohttp. Install it with 'pip install plantpredict[async]'.")
+
+        self.base_url = base_url
+        self.__okta_auth_url = okta_auth_url
+
+        self.username = username
+        self.password = password
+        self.client_id = client_id
+        self.client_secret = client_secret
+
+        self.access_token = None
+        self.refresh_token = None
+        self.access_token_expires_at = None
+        self.token_refresh_margin = token_refresh_margin
+        self._token_lock = None
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.ashrae_index = ashrae_index
+
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keep_alive = keep_alive
+        self.session = None
+
+        super(AsyncApi, self).__init__()
+
+    def project(self, **kwargs):
+        return AsyncProject(self, **kwargs)
+
+    def prediction(self, **kwargs):
+        return AsyncPrediction(self, **kwargs)
+
+    def powerplant(self, **kwargs):
+        return AsyncPowerPlant(self, **kwargs)
+
+    def geo(self, **kwargs):
+        return AsyncGeo(self, **kwargs)
+
+    def inverter(self, **kwargs):
+        return AsyncInverter(self, **kwargs)
+
+    def module(self, **kwargs):
+        return AsyncModule(self, **kwargs)
+
+    def weather(self, **kwargs):
+        return AsyncWeather(self, **kwargs)
+
+    def ashrae(self, **kwargs):
+        return AsyncASHRAE(self, **kwargs)
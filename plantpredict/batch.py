@@ -0,0 +1,211 @@
+import time
+from collections import deque
+
+from plantpredict.enumerations import ProcessingStatusEnum
+from plantpredict.prediction import PollingPolicy
+from plantpredict.error_handlers import APIError, PredictionError, PredictionTimeoutError, RetryPolicy
+
+
+class PredictionJob(object):
+    """
+    Tracks a single prediction run of a :py:class:`PredictionBatch`. Jobs are yielded by the batch as soon as they
+    finish, whether successfully or not.
+
+    :ivar plantpredict.prediction.Prediction prediction: The prediction being run.
+    :ivar int attempts: Number of times the run was submitted.
+    :ivar float submitted_at: Time (in seconds since the epoch) the last attempt was submitted.
+    :ivar float completed_at: Time (in seconds since the epoch) the job finished.
+    :ivar dict results_summary: Result of :py:meth:`~plantpredict.prediction.Prediction.get_results_summary` once the
+                                run has succeeded.
+    :ivar Exception error: The exception that made the job fail, or :py:data:`None`.
+    """
+    @property
+    def is_successful(self):
+        return self.completed_at is not None and self.error is None
+
+    @property
+    def elapsed(self):
+        """
+        Seconds between the submission of the last attempt and completion (or now, if the job is still running).
+
+        :rtype: float
+        """
+        if self.submitted_at is None:
+            return None
+        return (self.completed_at if self.completed_at is not None else time.time()) - self.submitted_at
+
+    def __init__(self, prediction):
+        self.prediction = prediction
+        self.attempts = 0
+        self.submitted_at = None
+        self.completed_at = None
+        self.results_summary = None
+        self.error = None
+
+        # monotonic clock reading of the submission, and earliest time a failed submission may be retried
+        self._started = None
+        self._not_before = 0.0
+
+    def __repr__(self):
+        return "PredictionJob(prediction_id={}, attempts={}, error={!r})".format(
+            getattr(self.prediction, "id", None), self.attempts, self.error
+        )
+
+
+class PredictionBatch(object):
+    """
+    Runs many predictions concurrently from a single scheduler loop. At most :py:attr:`max_in_flight` runs are
+    submitted at a time; the processing status of every outstanding run is polled in each cycle, and every finished
+    run is yielded (with its results summary) as soon as it completes, so that results can be processed while the rest
+    of the batch is still running.
+
+    .. code-block:: python
+
+        predictions = [api.prediction(id=prediction_id, project_id=project_id) for prediction_id in prediction_ids]
+
+        for job in api.run_predictions(predictions, max_in_flight=10):
+            if job.is_successful:
+                print(job.prediction.id, job.elapsed, job.results_summary)
+            else:
+                print(job.prediction.id, job.error)
+
+    Every request is retried on its own according to the :py:class:`~plantpredict.error_handlers.RetryPolicy` of the
+    API session. A submission that fails with a status in
+    :py:attr:`~plantpredict.error_handlers.RetryPolicy.retry_statuses` which the session does not retry itself for a
+    (non-idempotent) run, e.g. :code:`503`, is resubmitted up to :py:attr:`max_retries` times after a delay, without
+    blocking the other runs. Any other error, e.g. a connection error or an unexpected response, fails only its own
+    job. A run whose processing status becomes :py:attr:`~plantpredict.enumerations.ProcessingStatusEnum.ERROR` or
+    that exceeds the timeout of the polling policy fails with :py:class:`~plantpredict.error_handlers.PredictionError`
+    or :py:class:`~plantpredict.error_handlers.PredictionTimeoutError` respectively.
+
+    :param plantpredict.api.Api api: Authenticated API instance.
+    :param list predictions: Predictions (with :py:attr:`id` and :py:attr:`project_id`) to run.
+    :param int max_in_flight: Maximum number of runs submitted and not yet finished, e.g. to respect a server quota.
+    :param plantpredict.prediction.PollingPolicy polling_policy: Intervals between polling cycles, timeout of each run
+                                                                  (measured from its submission) and handling of failed
+                                                                  runs. Defaults to :py:class:`PollingPolicy` with
+                                                                  default arguments.
+    :param int max_retries: Maximum number of resubmissions of a run after a transient failure.
+    :param dict export_options: Export options passed to every run.
+    :param bool get_results_summary: If :py:data:`False`, the results summary of completed runs is not retrieved.
+    """
+    def _is_transient(self, error):
+        return isinstance(error, APIError) and error.status in self._retry_policy.retry_statuses
+
+    def _is_resubmittable(self, error):
+        # a submission the session has already retried as far as its policy allows is not resubmitted
+        session_retry_policy = self.api.session.retry_policy
+        return self._is_transient(error) and (
+            session_retry_policy is None or not session_retry_policy.is_retryable("POST", error.status)
+        )
+
+    def _fail(self, job, error):
+        job.error = error
+        job.completed_at = time.time()
+        return job
+
+    def _submit(self, job):
+        job.attempts += 1
+        job.submitted_at = time.time()
+        job._started = time.monotonic()
+        try:
+            job.prediction._submit_run(self.export_options)
+        except APIError as e:
+            if self._is_resubmittable(e) and job.attempts <= self.max_retries:
+                # backs off before resubmitting, a little longer after every failed attempt
+                job._not_before = time.monotonic() + self.polling_policy.initial_interval * job.attempts
+                self._pending.append(job)
+                return None
+            return self._fail(job, e)
+        except Exception as e:
+            # any other error (e.g. a connection error or an unexpected response) only fails this job
+            return self._fail(job, e)
+
+        self._in_flight.append(job)
+        return None
+
+    def _poll(self, job):
+        processing_status = None
+        try:
+            processing_status = job.prediction._get_processing_status()
+            if job.prediction._is_prediction_complete(processing_status, self.polling_policy):
+                # a failed run is never a completed job, even if the polling policy does not raise on errors
+                if processing_status == ProcessingStatusEnum.ERROR:
+                    return self._fail(job, PredictionError(job.prediction.id, processing_status))
+                if self.get_results_summary:
+                    job.results_summary = job.prediction.get_results_summary()
+                job.completed_at = time.time()
+                return job
+        except PredictionError as e:
+            return self._fail(job, e)
+        except APIError as e:
+            # a transient error while polling is ignored, and the status is polled again in the next cycle
+            if not self._is_transient(e):
+                return self._fail(job, e)
+        except Exception as e:
+            return self._fail(job, e)
+
+        if self.polling_policy.timeout is not None and time.monotonic() - job._started > self.polling_policy.timeout:
+            return self._fail(job, PredictionTimeoutError(job.prediction.id, processing_status,
+                                                          self.polling_policy.timeout))
+
+        return None
+
+    def __iter__(self):
+        intervals = self.polling_policy.intervals()
+        while self._pending or self._in_flight:
+            is_active = False
+
+            # submits pending runs (whose retry delay has elapsed) until the in-flight cap is reached
+            for _ in range(len(self._pending)):
+                if len(self._in_flight) >= self.max_in_flight:
+                    break
+                job = self._pending.popleft()
+                if job._not_before > time.monotonic():
+                    self._pending.append(job)
+                    continue
+                is_active = True
+                failed_job = self._submit(job)
+                if failed_job is not None:
+                    yield failed_job
+
+            # polls every outstanding run once per cycle
+            for job in list(self._in_flight):
+                finished_job = self._poll(job)
+                if finished_job is not None:
+                    is_active = True
+                    self._in_flight.remove(job)
+                    yield finished_job
+
+            if not (self._pending or self._in_flight):
+                break
+
+            # polls quickly again after any change to the set of runs, and backs off while nothing happens
+            if is_active:
+                intervals = self.polling_policy.intervals()
+            time.sleep(next(intervals))
+
+    def run(self):
+        """
+        Runs the whole batch and waits for all runs to finish.
+
+        :return: All jobs, in the order they finished.
+        :rtype: list
+        """
+        return list(self)
+
+    def __init__(self, api, predictions, max_in_flight=5, polling_policy=None, max_retries=2, export_options=None,
+                 get_results_summary=True):
+        self.api = api
+        self.max_in_flight = max_in_flight
+        self.polling_policy = polling_policy if polling_policy is not None else PollingPolicy()
+        self.max_retries = max_retries
+        self.export_options = export_options
+        self.get_results_summary = get_results_summary
+
+        # statuses of failed requests that are worth retrying, as configured for the session of the API
+        self._retry_policy = api.session.retry_policy or RetryPolicy()
+
+        self.jobs = [PredictionJob(prediction) for prediction in predictions]
+        self._pending = deque(self.jobs)
+        self._in_flight = []
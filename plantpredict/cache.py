@@ -0,0 +1,405 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+import sqlite3
+import threading
+
+import requests
+
+# marks a missing entry, as None is a valid cached value
+_MISSING = object()
+
+
+class EntityCache(object):
+    """
+    In-memory cache of entities (or any values) retrieved from PlantPredict, keyed by tuples such as
+    :code:`("module", 456)`. Used by :py:class:`~plantpredict.powerplant.PowerPlant` so that the same module, inverter,
+    project, prediction and ASHRAE station are only retrieved once while building a power plant.
+
+    :param float ttl: Number of seconds a cached value stays valid, or :py:data:`None` to keep it until it is
+                      invalidated explicitly.
+    """
+    def get(self, key, fetch):
+        """
+        Returns the cached value for :py:data:`key`, calling :py:data:`fetch` to retrieve (and cache) it if it is
+        missing or expired.
+
+        :param tuple key: Cache key, starting with the kind of the cached value.
+        :param fetch: Function without arguments that retrieves the value.
+        :return: The cached or retrieved value.
+        """
+        value = self.get_cached(key, _MISSING)
+        if value is _MISSING:
+            value = fetch()
+            self.set(key, value)
+
+        return value
+
+    def get_cached(self, key, default=None):
+        """
+        Returns the cached value for :py:data:`key` without retrieving it, e.g. for callers that retrieve values
+        asynchronously and store them with :py:meth:`set`.
+
+        :param tuple key: Cache key, starting with the kind of the cached value.
+        :param default: Value returned if the key is missing or expired.
+        :return: The cached value, or :py:data:`default`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or time.monotonic() - entry[0] < self.ttl):
+                self.hits += 1
+                return entry[1]
+
+        return default
+
+    def set(self, key, value):
+        """
+        Caches :py:data:`value` for :py:data:`key`.
+
+        :param tuple key: Cache key, starting with the kind of the cached value.
+        :param value: Value retrieved from PlantPredict.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self.misses += 1
+
+    def invalidate(self, *key_prefix):
+        """
+        Removes cached values whose key starts with :py:data:`key_prefix`, e.g. :code:`invalidate("module", 456)` for
+        one module, :code:`invalidate("module")` for all modules, or :code:`invalidate()` for everything.
+        """
+        with self._lock:
+            for key in [k for k in self._entries if k[:len(key_prefix)] == key_prefix]:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = {}
+        self._lock = threading.Lock()
+
+
+class DiskCache(object):
+    """
+    Persistent cache of GET responses for library entities (:py:class:`~plantpredict.module.Module`,
+    :py:class:`~plantpredict.inverter.Inverter` and :py:class:`~plantpredict.weather.Weather`), stored in a SQLite
+    database so that it is shared by every process and run using the same file. Enabled by passing an instance as the
+    :py:data:`disk_cache` argument of :py:class:`~plantpredict.api.Api`:
+
+    .. code-block:: python
+
+        from plantpredict.cache import DiskCache
+
+        api = plantpredict.Api(..., disk_cache=DiskCache("~/.plantpredict/entities.sqlite", max_size=200 * 2 ** 20))
+
+    Entities are keyed by their URL (and so by the base URL and their id) and by the account they were retrieved for,
+    so that one account is never served an entity cached for another one sharing the file. Entities younger than
+    :py:attr:`max_age` are returned without any request at all. An older entity is revalidated with a conditional
+    request (:code:`If-None-Match`/:code:`If-Modified-Since`) using the :code:`ETag`/:code:`Last-Modified` headers of
+    the response it came from, so that an unchanged entity is not downloaded again if the server supports it; if the
+    server does not send these headers, it is downloaded again. Entities are evicted in least-recently-used order once
+    the total (compressed) size exceeds :py:attr:`max_size`, and are invalidated when updated or deleted through the
+    same :py:class:`~plantpredict.api.Api`.
+
+    :param str path: Path of the SQLite database file, created if it does not exist.
+    :param int max_size: Maximum total size of the cached responses in bytes (after compression).
+    :param float max_age: Number of seconds a cached entity is used without revalidating it. Defaults to one hour, so
+                          that changes to an entity made elsewhere are picked up within that time. If
+                          :py:data:`None`, every :py:meth:`get` sends a (conditional) request.
+    """
+    def _connect(self):
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        connection = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False, isolation_level=None)
+
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses (account TEXT NOT NULL, url TEXT NOT NULL, etag TEXT, "
+            "last_modified TEXT, content BLOB NOT NULL, size INTEGER NOT NULL, stored_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL, PRIMARY KEY (account, url))"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        return connection
+
+    def _load(self, account, url):
+        with self._lock:
+            return self._connection.execute(
+                "SELECT etag, last_modified, content, stored_at FROM responses WHERE account = ? AND url = ?",
+                (account, url)
+            ).fetchone()
+
+    def _touch(self, account, url, revalidated=False):
+        now = time.time()
+        with self._lock:
+            if revalidated:
+                self._connection.execute(
+                    "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE account = ? AND url = ?",
+                    (now, now, account, url)
+                )
+            else:
+                self._connection.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE account = ? AND url = ?", (now, account, url)
+                )
+
+    def _store(self, account, url, etag, last_modified, content):
+        compressed = zlib.compress(content)
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (account, url, etag, last_modified, sqlite3.Binary(compressed), len(compressed), now, now)
+            )
+            self._evict()
+
+    def _evict(self):
+        # removes the least recently used entities until the total size is back under the limit
+        total_size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total_size <= self.max_size:
+            return
+
+        rows = self._connection.execute("SELECT account, url, size FROM responses ORDER BY accessed_at").fetchall()
+        evicted = []
+        for account, url, size in rows:
+            if total_size <= self.max_size:
+                break
+            evicted.append((account, url))
+            total_size -= size
+
+        self._connection.executemany("DELETE FROM responses WHERE account = ? AND url = ?", evicted)
+        self.evictions += len(evicted)
+
+    @staticmethod
+    def _make_response(url, content):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = content
+        return response
+
+    def get(self, session, url, headers, account=""):
+        """
+        Sends the GET request for an entity unless a cached copy can be used, and caches successful responses.
+
+        :param requests.Session session: Session used to send the request.
+        :param str url: URL of the entity.
+        :param dict headers: Request headers.
+        :param str account: Identity of the account (user and client) the request is sent for, see
+                            :py:meth:`get_account`.
+        :return: The response from the server, or a response with status code 200 and the cached content.
+        :rtype: requests.Response
+        """
+        entry = self._load(account, url)
+        if entry is not None:
+            etag, last_modified, content, stored_at = entry
+            if self.max_age is not None and time.time() - stored_at < self.max_age:
+                self._touch(account, url)
+                self.hits += 1
+                return self._make_response(url, zlib.decompress(content))
+
+            headers = dict(headers)
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        response = session.get(url=url, headers=headers)
+        if entry is not None and response.status_code == 304:
+            self._touch(account, url, revalidated=True)
+            self.revalidations += 1
+            return self._make_response(url, zlib.decompress(entry[2]))
+
+        self.misses += 1
+        if 200 <= response.status_code < 300 and response.content:
+            response_headers = getattr(response, "headers", None) or {}
+            self._store(
+                account, url, response_headers.get("ETag"), response_headers.get("Last-Modified"), response.content
+            )
+
+        return response
+
+    def invalidate(self, url=None):
+        """
+        Removes the cached entity with the given URL (for every account), or every cached entity if :py:data:`url` is
+        :py:data:`None`.
+
+        :param str url: URL of the entity.
+        """
+        with self._lock:
+            if url is None:
+                self._connection.execute("DELETE FROM responses")
+            else:
+                self._connection.execute("DELETE FROM responses WHERE url = ?", (url, ))
+
+    @staticmethod
+    def get_account(api):
+        """
+        :param plantpredict.api.Api api: API instance the requests are sent with.
+        :return: Identity of the user and client of :py:data:`api`, hashed so that no credentials are stored in the
+                 cache file.
+        :rtype: str
+        """
+        identity = "{}\n{}".format(getattr(api, "client_id", ""), getattr(api, "username", ""))
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    def size(self):
+        """
+        :return: Total size of the cached responses in bytes (after compression).
+        :rtype: int
+        """
+        with self._lock:
+            return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def __init__(self, path, max_size=100 * 2 ** 20, max_age=3600.0):
+        self.path = os.path.expanduser(path)
+        self.max_size = max_size
+        self.max_age = max_age
+
+        # counters, e.g. to check how many downloads the cache saved
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._connection = self._connect()
+
+
+class GeoCache(object):
+    """
+    Cache of the location attributes (location info, elevation and time zone) retrieved by
+    :py:meth:`~plantpredict.geo.Geo.get_location_attributes`, keyed by the cell of a latitude/longitude grid so that
+    sites a few metres apart share one lookup. Enabled by passing an instance as the :py:data:`geo_cache` argument of
+    :py:class:`~plantpredict.api.Api`, and optionally persisted to a JSON file that is read again in later runs:
+
+    .. code-block:: python
+
+        from plantpredict.cache import GeoCache
+
+        geo_cache = GeoCache(resolution=0.01, path="geo_cache.json")
+        api = plantpredict.Api(..., geo_cache=geo_cache)
+        ...
+        geo_cache.close()
+
+    The cached attributes of a cell are those of the first site looked up in it. New cells are saved to the file in
+    batches of :py:attr:`save_every`, and the remaining ones by :py:meth:`save` or :py:meth:`close`.
+
+    :param float resolution: Size of the grid cells in decimal degrees.
+    :param str path: Path of the JSON file the cache is loaded from (if it exists) and saved to, or :py:data:`None` to
+                     keep the cache in memory only.
+    :param int save_every: Number of new cells after which the cache is saved to :py:attr:`path`.
+    """
+    def get_cell(self, latitude, longitude):
+        """
+        :param float latitude: North-South GPS coordinate - units :py:data:`[decimal degrees]`.
+        :param float longitude: East-West GPS coordinate - units :py:data:`[decimal degrees]`.
+        :return: Indices of the grid cell containing the coordinates.
+        :rtype: tuple
+        """
+        return int(round(latitude / self.resolution)), int(round(longitude / self.resolution))
+
+    def get(self, latitude, longitude, fetch):
+        """
+        Returns the cached location attributes of the grid cell containing the coordinates, calling :py:data:`fetch`
+        to retrieve (and cache) them if the cell has not been looked up yet. Concurrent callers in the same cell wait
+        for a single lookup.
+
+        :param float latitude: North-South GPS coordinate - units :py:data:`[decimal degrees]`.
+        :param float longitude: East-West GPS coordinate - units :py:data:`[decimal degrees]`.
+        :param fetch: Function without arguments that retrieves the location attributes as a dictionary.
+        :return: Location attributes.
+        :rtype: dict
+        """
+        cell = self.get_cell(latitude, longitude)
+        with self._lock:
+            cell_lock = self._cell_locks.setdefault(cell, threading.Lock())
+
+        with cell_lock:
+            with self._lock:
+                if cell in self._cells:
+                    self.hits += 1
+                    return dict(self._cells[cell])
+
+            attributes = fetch()
+            with self._lock:
+                self._cells[cell] = dict(attributes)
+                self.misses += 1
+                self._num_unsaved += 1
+                if self.path is not None and self._num_unsaved >= self.save_every:
+                    self._save()
+
+        return attributes
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                content = json.load(f)
+        except (IOError, OSError, ValueError):
+            return
+
+        # cells of a file saved with another resolution are on a different grid
+        if content.get("resolution") != self.resolution:
+            return
+
+        for key, attributes in content.get("cells", {}).items():
+            latitude_index, longitude_index = key.split(",")
+            self._cells[(int(latitude_index), int(longitude_index))] = attributes
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        # writes to a temporary file first so that an interrupted run does not leave a truncated cache behind
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w") as f:
+            json.dump({
+                "resolution": self.resolution,
+                "cells": {"{},{}".format(*cell): attributes for cell, attributes in self._cells.items()}
+            }, f)
+        os.replace(temporary_path, self.path)
+        self._num_unsaved = 0
+
+    def save(self):
+        """Saves the cache to :py:attr:`path`."""
+        with self._lock:
+            self._save()
+
+    def close(self):
+        """Saves the cells added since the cache was last saved, if it has a :py:attr:`path`."""
+        with self._lock:
+            if self.path is not None and self._num_unsaved:
+                self._save()
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __init__(self, resolution=0.001, path=None, save_every=100):
+        self.resolution = resolution
+        self.path = os.path.expanduser(path) if path is not None else None
+        self.save_every = save_every
+        self.hits = 0
+        self.misses = 0
+
+        self._cells = {}
+        self._num_unsaved = 0
+        self._cell_locks = {}
+        self._lock = threading.Lock()
+
+        if self.path is not None:
+            self._load()
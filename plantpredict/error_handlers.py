@@ -1,52 +1,274 @@
-from __future__ import print_function
 import time
+import random
+import logging
 import requests
-import json
+import urllib3
+from email.utils import parsedate_to_datetime
 
-from plantpredict.utilities import convert_json, camel_to_snake
+from plantpredict.utilities import parse_json, iter_json_items, camel_to_snake
+
+logger = logging.getLogger(__name__)
+
+
+class RetryPolicy(object):
+    """
+    Controls how requests are retried after a refused connection or a transient server error. The delay before retry
+    number :code:`n` is :code:`min(initial_backoff * backoff_factor**(n - 1), max_backoff)`, randomly shrunk by up to
+    :py:attr:`jitter` (as a fraction) so that many clients failing together do not retry in lockstep. If the server
+    sends a :code:`Retry-After` header, that delay is used instead. Retrying stops after :py:attr:`max_attempts`
+    attempts, or once the next retry would exceed :py:attr:`budget` seconds since the first attempt.
+
+    Retries are applied to single HTTP requests (by :py:class:`~plantpredict.session.Session` and
+    :py:class:`~plantpredict.async_api.AsyncApi`), never to methods that send several requests or change local state.
+    Requests with a method in :py:attr:`retry_methods` (idempotent by default) are retried after any connection error
+    or a response with a status in :py:attr:`retry_statuses`. Other requests (e.g. :code:`POST` creating an entity or
+    starting a prediction run) are only retried if the server cannot have processed them: if the connection was
+    refused, or the response has status 429 (Too Many Requests).
+
+    Every retry, recovery and final failure is logged to the :code:`plantpredict.error_handlers` logger and, if
+    provided, passed to :py:data:`on_event` as a dictionary, e.g. to feed metrics:
+
+    .. code-block:: python
+
+        {
+            "outcome": "retry",         # "retry", "recovered" or "give_up"
+            "function": "get",          # name of the method sending the request
+            "attempt": 2,               # number of attempts made so far
+            "delay": 3.6,               # seconds until the next attempt (None if there is none)
+            "error": APIError(...)      # exception of the failed attempt (None if recovered)
+        }
+
+    :param int max_attempts: Maximum number of attempts (including the first), or :py:data:`None` for no limit.
+    :param float initial_backoff: Delay in seconds before the first retry.
+    :param float backoff_factor: Factor applied to the delay after every retry.
+    :param float max_backoff: Upper bound of the delay in seconds.
+    :param float jitter: Maximum relative random reduction of each delay, between 0 and 1.
+    :param float budget: Maximum total time in seconds spent on one request including retries, or :py:data:`None`
+                         for no limit.
+    :param tuple retry_statuses: HTTP status codes of responses that are retried.
+    :param on_event: Function called with a dictionary describing each retry outcome.
+    :param tuple retry_methods: HTTP methods of the requests that are retried after any transient failure.
+    """
+    def is_retryable(self, method, status=None, connection_refused=False):
+        """
+        :param str method: HTTP method of the request, e.g. :py:data:`"GET"`.
+        :param int status: HTTP status code of the response, or :py:data:`None` if the request failed without one.
+        :param bool connection_refused: :py:data:`True` if the request failed because the connection was refused, so
+                                        that it was never sent.
+        :return: :py:data:`True` if the failed request may be sent again.
+        :rtype: bool
+        """
+        if status is not None and status not in self.retry_statuses:
+            return False
+        if method.upper() in self.retry_methods:
+            return True
+
+        # a non-idempotent request is only sent again if the server cannot have processed it
+        return connection_refused if status is None else status == 429
+
+    def get_delay(self, attempt, retry_after=None):
+        """
+        :param int attempt: Number of attempts made so far.
+        :param float retry_after: Delay in seconds requested by the server, if any.
+        :return: Delay in seconds before the next attempt.
+        :rtype: float
+        """
+        if retry_after is not None:
+            return max(retry_after, 0.0)
+
+        delay = min(self.initial_backoff * self.backoff_factor ** (attempt - 1), self.max_backoff)
+        return delay * (1 - random.uniform(0, self.jitter))
+
+    def allows_retry(self, attempt, elapsed):
+        """
+        :param int attempt: Number of attempts made so far.
+        :param float elapsed: Seconds since the first attempt, including the delay before the next attempt.
+        :return: :py:data:`True` if another attempt may be made.
+        :rtype: bool
+        """
+        if self.max_attempts is not None and attempt >= self.max_attempts:
+            return False
+        if self.budget is not None and elapsed > self.budget:
+            return False
+
+        return True
+
+    def call(self, function_name, attempt):
+        """
+        Makes attempts until one succeeds or the policy gives up. Each call of :py:data:`attempt` returns a tuple
+        :code:`(result, error)`, where :code:`error` is :py:data:`None` on success or the exception of a failure that
+        may be retried (other failures are raised by :py:data:`attempt` itself). A result of a failed attempt (e.g. an
+        error response) is closed before the next attempt, or returned if the policy gives up; without one, the error
+        of the last attempt is raised.
+
+        :param str function_name: Name of the request or method, as reported.
+        :param attempt: Function without arguments making a single attempt.
+        :return: The result of the last attempt.
+        """
+        start = time.monotonic()
+        num_attempts = 0
+        while True:
+            num_attempts += 1
+            result, error = attempt()
+            if error is None:
+                break
+
+            delay = self.get_delay(num_attempts, getattr(error, "retry_after", None))
+            if not self.allows_retry(num_attempts, time.monotonic() - start + delay):
+                self.report("give_up", function_name, num_attempts, error=error)
+                if result is None:
+                    raise error
+                return result
+
+            self.report("retry", function_name, num_attempts, delay, error)
+            if result is not None:
+                result.close()
+            time.sleep(delay)
+
+        if num_attempts > 1:
+            self.report("recovered", function_name, num_attempts)
+
+        return result
+
+    def report(self, outcome, function_name, attempt, delay=None, error=None):
+        if outcome == "retry":
+            logger.warning(
+                "%s failed on attempt %s (%s), retrying in %.1f seconds", function_name, attempt, error, delay
+            )
+        elif outcome == "recovered":
+            logger.info("%s succeeded on attempt %s", function_name, attempt)
+        else:
+            logger.error("%s failed on attempt %s (%s), giving up", function_name, attempt, error)
+
+        if self.on_event is not None:
+            self.on_event({
+                "outcome": outcome,
+                "function": function_name,
+                "attempt": attempt,
+                "delay": delay,
+                "error": error
+            })
+
+    def __init__(self, max_attempts=5, initial_backoff=1.0, backoff_factor=2.0, max_backoff=60.0, jitter=0.5,
+                 budget=300.0, retry_statuses=(429, 502, 503, 504), on_event=None,
+                 retry_methods=("GET", "HEAD", "OPTIONS", "PUT", "DELETE")):
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.budget = budget
+        self.retry_statuses = retry_statuses
+        self.on_event = on_event
+        self.retry_methods = tuple(method.upper() for method in retry_methods)
+
+
+def parse_retry_after(value):
+    """
+    Parses the value of a :code:`Retry-After` header, given either in seconds or as an HTTP date.
+
+    :param str value: Header value.
+    :return: Delay in seconds, or :py:data:`None` if the value is missing or invalid.
+    :rtype: float
+    """
+    if value is None:
+        return None
+
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    try:
+        return parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def is_connection_refused(error):
+    """
+    :param requests.exceptions.ConnectionError error: Connection error raised by :py:mod:`requests`.
+    :return: :py:data:`True` if the connection could not be established, so that the request was never sent.
+    :rtype: bool
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, (urllib3.exceptions.NewConnectionError, urllib3.exceptions.ConnectTimeoutError))
 
 
 def handle_refused_connection(function):
+    """
+    Retries a function that sends a single request according to the :py:class:`RetryPolicy` of its entity's
+    :py:class:`~plantpredict.api.Api`. Requests sent through :py:class:`~plantpredict.session.Session` are already
+    retried individually, so this must not wrap methods that send several requests or change local state.
+    """
     def function_wrapper(*args, **kwargs):
-        connection_error = True
-        while connection_error:
+        # the policy of the Api that the entity (first positional argument of the decorated method) belongs to
+        retry_policy = getattr(getattr(args[0], "api", None), "retry_policy", None) if args else None
+        if not isinstance(retry_policy, RetryPolicy):
+            retry_policy = RetryPolicy()
+
+        def attempt():
             try:
-                connection_error = False
-                return function(*args, **kwargs)
-            except requests.exceptions.ConnectionError:
-                print("Connection refused, trying again...")
-                time.sleep(7)
+                return function(*args, **kwargs), None
+            except (requests.exceptions.ConnectionError, APIError) as e:
+                # only refused connections and transient server errors are worth another attempt
+                if isinstance(e, APIError) and e.status not in retry_policy.retry_statuses:
+                    raise
+                return None, e
+
+        return retry_policy.call(function.__name__, attempt)
+
     function_wrapper.__name__ = function.__name__
     function_wrapper.__doc__ = function.__doc__
     return function_wrapper
 
 
+def decode_response(response, convert_function=camel_to_snake):
+    """
+    Decodes the JSON content of a successful response, converting its keys while it is decoded. The decoded content is
+    kept on the response, so that an entity method assigning it as attributes and :py:func:`handle_error_response`
+    returning it decode the response only once.
+
+    :param requests.Response response: Successful response with JSON content.
+    :param convert_function: :py:func:`~plantpredict.utilities.camel_to_snake`, or :py:data:`None` to keep the keys.
+    :return: The decoded content.
+    :rtype: dict or list
+    """
+    decoded = vars(response).get("_decoded_content")
+    if decoded is None or decoded[0] is not convert_function:
+        decoded = (convert_function, parse_json(response.content, convert_function))
+        response._decoded_content = decoded
+
+    return decoded[1]
+
+
 def handle_error_response(function):
     def function_wrapper(*args, **kwargs):
+        api = args[0].api
+        stale_token = api.access_token
         response = function(*args, **kwargs)
         try:
-            # if the authorization is invalid, refresh the API access token
+            # if the authorization is invalid, refresh the API access token and send the request once more
             if response.status_code == 401:
-                args[0].api.refresh_access_token()
+                api.refresh_access_token(stale_token=stale_token)
+                response = function(*args, **kwargs)
 
             # if there is a sever side error, return the error message
-            elif not 200 <= response.status_code < 300:
-                raise APIError(response.status_code, response.content)
+            if not 200 <= response.status_code < 300:
+                raise APIError(
+                    response.status_code, response.content,
+                    retry_after=parse_retry_after(getattr(response, "headers", {}).get("Retry-After"))
+                )
 
             # if the HTTP request receives a successful response
             else:
 
-                # if the response contains content, return it
+                # if the response contains content, return it (decoded once, converting the keys as it is decoded)
                 if response.content:
-                    if "Queue" in response.url:
-                        return json.loads(response.content)
-
-                    else:
-                        # if it is a list, use convert_json method in list comprehension
-                        if isinstance(json.loads(response.content), list):
-                            return [convert_json(i, camel_to_snake) for i in json.loads(response.content)]
-                        else:
-                            return convert_json(json.loads(response.content), camel_to_snake)
+                    return decode_response(response, None if "Queue" in response.url else camel_to_snake)
 
                 # if the response does not contain content, return a generic success message
                 else:
@@ -60,14 +282,81 @@ def handle_error_response(function):
     return function_wrapper
 
 
+def stream_json_response(entity, send, key=None, chunk_size=65536, convert_keys=True):
+    """
+    Sends a request with :py:data:`send` and yields the elements of the (long) array in its JSON response one at a
+    time as they are received, with their keys converted to snake case (see
+    :py:func:`~plantpredict.utilities.iter_json_items`). Errors are handled as by :py:func:`handle_error_response`:
+    the access token is refreshed and the request sent once more if it is rejected, and :py:class:`APIError` is raised
+    for any other unsuccessful response. The request is only sent once iteration starts.
+
+    :param entity: Entity sending the request, whose :py:attr:`api` holds the access token.
+    :param send: Function without arguments that sends the request with :code:`stream=True` and returns the response.
+    :param str key: Name of the member holding the array if the response is an object (in snake case, unless
+                    :py:data:`convert_keys` is :py:data:`False`).
+    :param int chunk_size: Number of bytes read from the response at a time.
+    :param bool convert_keys: If :py:data:`False`, the elements are yielded with their keys as sent by the server
+                              (camel case).
+    :return: Generator of the elements of the array.
+    """
+    api = entity.api
+    stale_token = api.access_token
+    response = send()
+    if response.status_code == 401:
+        response.close()
+        api.refresh_access_token(stale_token=stale_token)
+        response = send()
+
+    try:
+        if not 200 <= response.status_code < 300:
+            raise APIError(
+                response.status_code, response.content,
+                retry_after=parse_retry_after(getattr(response, "headers", {}).get("Retry-After"))
+            )
+
+        convert_function = camel_to_snake if convert_keys else None
+        for item in iter_json_items(response.iter_content(chunk_size), key=key, convert_function=convert_function):
+            yield item
+    finally:
+        response.close()
+
+
 class APIError(Exception):
 
-    def __init__(self, status, errors):
+    def __init__(self, status, errors, retry_after=None):
         self.status = status
         self.errors = errors
+        self.retry_after = retry_after
 
     def __str__(self):
         return "HTTP Status Code {}: {}".format(
             self.status,
             self.errors
         )
+
+
+class PredictionError(Exception):
+
+    def __init__(self, prediction_id, processing_status):
+        self.prediction_id = prediction_id
+        self.processing_status = processing_status
+
+    def __str__(self):
+        return "Prediction {} failed with processing status {}".format(
+            self.prediction_id,
+            self.processing_status
+        )
+
+
+class PredictionTimeoutError(PredictionError):
+
+    def __init__(self, prediction_id, processing_status, timeout):
+        super(PredictionTimeoutError, self).__init__(prediction_id, processing_status)
+        self.timeout = timeout
+
+    def __str__(self):
+        return "Prediction {} did not complete within {} seconds (processing status {})".format(
+            self.prediction_id,
+            self.timeout,
+            self.processing_status
+        )
@@ -0,0 +1,424 @@
+import os
+import json
+import uuid
+import threading
+import importlib.util
+from urllib.parse import quote, unquote
+
+import pandas
+
+try:
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# file formats of the exported tables, with their file extension and default compression
+EXPORT_FORMATS = {
+    "parquet": (".parquet", "snappy"),
+    "feather": (".arrow", "zstd"),
+    "csv": (".csv.gz", "gzip")
+}
+
+# columns stored in the directory names of the partitions rather than in the files, from the outermost level in
+PARTITION_COLUMNS = ("project_id", "prediction_id", "node")
+
+SCHEMA_FILE_NAME = "_schema.json"
+
+
+def _to_frame(data):
+    """Converts a DataFrame, a list of records or a single record into a flat DataFrame with a default index."""
+    if isinstance(data, pandas.DataFrame):
+        # a named index (e.g. the time stamps of nodal data) is kept as a column
+        if any(name is not None for name in data.index.names):
+            return data.reset_index()
+        return data.reset_index(drop=True)
+
+    frame = pandas.json_normalize(data if isinstance(data, list) else [data], sep="_")
+
+    # nested lists are stored as JSON so that every column has a single scalar type
+    for column in frame.columns:
+        if frame[column].dtype == object:
+            frame[column] = frame[column].map(lambda v: json.dumps(v) if isinstance(v, (list, dict)) else v)
+
+    return frame
+
+
+def _split_records(data):
+    """
+    Splits a record holding lists of records (e.g. the block summaries of a results summary) into the record without
+    them and one :code:`(member, records)` tuple per list, each of which is exported to its own table.
+    """
+    if not isinstance(data, dict):
+        return data, []
+
+    members = [k for k, v in data.items() if isinstance(v, list) and v and all(isinstance(r, dict) for r in v)]
+    return {k: v for k, v in data.items() if k not in members}, [(k, data[k]) for k in members]
+
+
+def _normalize_dtypes(frame):
+    # integer and float columns are all stored as floats, so that a column does not change type between predictions
+    # depending on whether it happens to hold whole numbers or missing values
+    for column in frame.columns:
+        dtype = frame[column].dtype
+        if pandas.api.types.is_bool_dtype(dtype):
+            frame[column] = frame[column].astype("boolean")
+        elif pandas.api.types.is_numeric_dtype(dtype):
+            frame[column] = frame[column].astype("float64")
+
+    return frame
+
+
+def _parse_partition_value(value):
+    value = unquote(value)
+    return int(value) if value.lstrip("-").isdigit() else value
+
+
+class ResultsExporter(object):
+    """
+    Exports prediction results (results summaries, results details and nodal data) to compressed columnar files,
+    partitioned by project, prediction and node in the directory layout read natively by Arrow datasets, Spark, DuckDB
+    and :py:func:`pandas.read_parquet`:
+
+    .. code-block:: none
+
+        results/
+            nodal_data/
+                _schema.json
+                project_id=7/prediction_id=77/node=block%3D1%2Farray%3D1/part-00000-1f0c2a9b.parquet
+                ...
+            results_summary/
+            results_summary.block_result_summaries/
+
+    Every write adds a new part file to its partition, so results can be exported incrementally as they are produced,
+    e.g. by a :py:class:`~plantpredict.batch.PredictionBatch`:
+
+    .. code-block:: python
+
+        from plantpredict.batch import PredictionBatch
+        from plantpredict.export import ResultsExporter
+
+        exporter = ResultsExporter("results")
+        exporter.export_batch(PredictionBatch(api, predictions), nodal_levels=["array"])
+
+        nodal_data = exporter.read("nodal_data", prediction_id=77)
+
+    The columns of each table, and their types, are recorded in its :code:`_schema.json` when they are first written.
+    Later writes are conformed to that schema, so that every file of a table has the same columns in the same order:
+    missing columns are filled with missing values, new columns are appended to the schema, and integer columns are
+    stored as floats. Records holding lists of records, such as results summaries, are split into one table for the
+    record and one per list (e.g. :code:`results_summary.block_result_summaries`), and any other nested list is stored
+    as JSON.
+
+    Parquet and Arrow (Feather) files require :code:`pyarrow` (or :code:`fastparquet` for Parquet). Gzip compressed
+    CSV files can be written without either, but do not preserve column types.
+
+    :param str path: Root directory of the exported tables, created if it does not exist.
+    :param str file_format: :py:data:`"parquet"`, :py:data:`"feather"` or :py:data:`"csv"`.
+    :param str compression: Compression codec, defaulting to :py:data:`"snappy"`, :py:data:`"zstd"` and
+                            :py:data:`"gzip"` respectively.
+    :raises ValueError: Raised if :py:data:`file_format` is not supported.
+    :raises ImportError: Raised if the library required by :py:data:`file_format` is not installed.
+    """
+    def get_partition(self, table, project_id, prediction_id, node=None):
+        """
+        :param str table: Name of the table, e.g. :py:data:`"nodal_data"`.
+        :param int project_id: Unique identifier of the project.
+        :param int prediction_id: Unique identifier of the prediction.
+        :param str node: Name of the node of the power plant (see
+                         :py:func:`~plantpredict.prediction.get_nodal_data_nodes`), if any.
+        :return: Path of the directory holding the files of the partition.
+        :rtype: str
+        """
+        parts = [self.path, table, "project_id={}".format(project_id), "prediction_id={}".format(prediction_id)]
+        if node is not None:
+            parts.append("node=" + quote(str(node), safe=""))
+
+        return os.path.join(*parts)
+
+    def get_schema(self, table):
+        """
+        :param str table: Name of the table.
+        :return: Type of each column of the table, in the order in which they are written.
+        :rtype: dict
+        """
+        with self._lock:
+            return dict(self._load_schema(table))
+
+    def _load_schema(self, table):
+        if table not in self._schemas:
+            schema_path = os.path.join(self.path, table, SCHEMA_FILE_NAME)
+            if os.path.exists(schema_path):
+                with open(schema_path) as f:
+                    self._schemas[table] = dict(json.load(f)["columns"])
+            else:
+                self._schemas[table] = {}
+
+        return self._schemas[table]
+
+    def _save_schema(self, table, schema):
+        directory = os.path.join(self.path, table)
+        os.makedirs(directory, exist_ok=True)
+
+        # writes to a temporary file first so that an interrupted run does not leave a truncated schema behind
+        schema_path = os.path.join(directory, SCHEMA_FILE_NAME)
+        with open(schema_path + ".tmp", "w") as f:
+            json.dump({"columns": list(schema.items())}, f, indent=4)
+        os.replace(schema_path + ".tmp", schema_path)
+
+    def _conform(self, table, frame, extend=True):
+        """Adds the missing columns of the table schema to the frame, and casts and orders its columns as in it."""
+        with self._lock:
+            schema = self._load_schema(table)
+            new_columns = [(column, str(frame[column].dtype)) for column in frame.columns if column not in schema]
+            if new_columns and extend:
+                schema.update(new_columns)
+                self._save_schema(table, schema)
+            schema = dict(schema)
+
+        columns = {}
+        for column, dtype in schema.items():
+            values = frame[column] if column in frame.columns else pandas.Series(None, index=frame.index, dtype=object)
+            try:
+                columns[column] = values if str(values.dtype) == dtype else values.astype(dtype)
+            except (ValueError, TypeError):
+                raise ValueError("Column '{}' cannot be converted to the type {} of table '{}'.".format(
+                    column, dtype, table
+                ))
+
+        return pandas.DataFrame(columns, index=frame.index)
+
+    def _write_file(self, frame, file_path):
+        if self.file_format == "parquet":
+            frame.to_parquet(file_path, compression=self.compression, index=False)
+        elif self.file_format == "feather":
+            frame.to_feather(file_path, compression=self.compression)
+        else:
+            frame.to_csv(file_path, index=False, compression=self.compression)
+
+    def _read_file(self, file_path):
+        if self.file_format == "parquet":
+            return pandas.read_parquet(file_path)
+        elif self.file_format == "feather":
+            return pandas.read_feather(file_path)
+
+        return pandas.read_csv(file_path, compression=self.compression)
+
+    def write(self, table, data, project_id, prediction_id, node=None):
+        """
+        Appends data to a partition of a table, as a new file.
+
+        :param str table: Name of the table, e.g. :py:data:`"nodal_data"`.
+        :param data: Data to be written. If it is a record holding lists of records, each list is written to the table
+                     :code:`"{table}.{member}"`.
+        :type data: pandas.DataFrame, list of dict or dict
+        :param int project_id: Unique identifier of the project.
+        :param int prediction_id: Unique identifier of the prediction.
+        :param str node: Name of the node of the power plant, if any.
+        :return: Paths of the files written.
+        :rtype: list of str
+        """
+        data, members = _split_records(data)
+        file_paths = []
+        for table_name, table_data in [(table, data)] + [(table + "." + k, v) for k, v in members]:
+            frame = _normalize_dtypes(_to_frame(table_data))
+            if frame.empty:
+                continue
+
+            frame = self._conform(table_name, frame)
+            directory = self.get_partition(table_name, project_id, prediction_id, node)
+            with self._lock:
+                # part numbers keep the files of a partition in the order written, and the random suffix keeps
+                # processes writing to the same partition from overwriting each other's files
+                if directory not in self._num_parts:
+                    os.makedirs(directory, exist_ok=True)
+                    self._num_parts[directory] = sum(1 for name in os.listdir(directory) if name.startswith("part-"))
+                part = self._num_parts[directory]
+                self._num_parts[directory] += 1
+
+            file_name = "part-{:05d}-{}{}".format(part, uuid.uuid4().hex[:8], self.extension)
+            file_path = os.path.join(directory, file_name)
+
+            # writes to a hidden temporary file first, so that readers never see a partially written file
+            temporary_path = os.path.join(directory, "." + file_name + ".tmp")
+            try:
+                self._write_file(frame, temporary_path)
+                os.replace(temporary_path, file_path)
+            except BaseException:
+                if os.path.exists(temporary_path):
+                    os.remove(temporary_path)
+                raise
+
+            file_paths.append(file_path)
+
+        return file_paths
+
+    def write_results_summary(self, prediction, results_summary=None):
+        """
+        Exports the results summary of a prediction to the :code:`results_summary` tables.
+
+        :param plantpredict.prediction.Prediction prediction: The prediction.
+        :param dict results_summary: Results summary, retrieved with
+                                     :py:meth:`~plantpredict.prediction.Prediction.get_results_summary` if not given.
+        :return: Paths of the files written.
+        :rtype: list of str
+        """
+        if results_summary is None:
+            results_summary = prediction.get_results_summary()
+
+        return self.write("results_summary", results_summary, prediction.project_id, prediction.id)
+
+    def write_results_details(self, prediction, results_details=None):
+        """
+        Exports the results details of a prediction to the :code:`results_details` tables.
+
+        :param plantpredict.prediction.Prediction prediction: The prediction.
+        :param dict results_details: Results details, retrieved with
+                                     :py:meth:`~plantpredict.prediction.Prediction.get_results_details` if not given.
+        :return: Paths of the files written.
+        :rtype: list of str
+        """
+        if results_details is None:
+            results_details = prediction.get_results_details()
+
+        return self.write("results_details", results_details, prediction.project_id, prediction.id)
+
+    def write_nodal_data(self, prediction, node, nodal_data):
+        """
+        Exports the nodal data of a node of a prediction to the :code:`nodal_data` table.
+
+        :param plantpredict.prediction.Prediction prediction: The prediction.
+        :param str node: Name of the node (see :py:func:`~plantpredict.prediction.get_nodal_data_nodes`).
+        :param nodal_data: Nodal data, e.g. as returned by
+                           :py:meth:`~plantpredict.prediction.Prediction.get_nodal_frame`.
+        :type nodal_data: pandas.DataFrame or list of dict
+        :return: Paths of the files written.
+        :rtype: list of str
+        """
+        return self.write("nodal_data", nodal_data, prediction.project_id, prediction.id, node=node)
+
+    def nodal_data_sink(self, prediction):
+        """
+        :param plantpredict.prediction.Prediction prediction: The prediction.
+        :return: Function exporting the nodal data of each node, to be passed as the :py:data:`sink` of
+                 :py:meth:`~plantpredict.prediction.Prediction.get_all_nodal_data`.
+        """
+        def sink(node, nodal_data):
+            self.write_nodal_data(prediction, node, nodal_data)
+
+        return sink
+
+    def export_prediction(self, prediction, results_summary=None, results_details=True, nodal_levels=None,
+                          max_workers=4):
+        """
+        Exports the results summary, and optionally the results details and nodal data, of a prediction that has been
+        run. Progress is recorded in a checkpoint file under :code:`_checkpoints`, so that exporting the prediction
+        again (e.g. after an interruption) only exports what is missing.
+
+        :param plantpredict.prediction.Prediction prediction: The prediction.
+        :param dict results_summary: Results summary, retrieved if not given.
+        :param bool results_details: If :py:data:`True`, the results details are exported.
+        :param list nodal_levels: Levels of the power plant hierarchy whose nodal data is exported (see
+                                  :py:meth:`~plantpredict.prediction.Prediction.get_all_nodal_data`), if any.
+        :param int max_workers: Maximum number of nodes retrieved concurrently.
+        """
+        checkpoint = os.path.join(
+            self.path, "_checkpoints", "project_id={}_prediction_id={}.txt".format(prediction.project_id, prediction.id)
+        )
+        os.makedirs(os.path.dirname(checkpoint), exist_ok=True)
+
+        completed = set()
+        if os.path.exists(checkpoint):
+            with open(checkpoint) as f:
+                completed = {line.strip() for line in f}
+
+        for table, is_exported, write in [
+            ("results_summary", True, lambda: self.write_results_summary(prediction, results_summary)),
+            ("results_details", results_details, lambda: self.write_results_details(prediction))
+        ]:
+            if is_exported and table not in completed:
+                write()
+                with open(checkpoint, "a") as f:
+                    f.write(table + "\n")
+
+        if nodal_levels:
+            prediction.get_all_nodal_data(
+                levels=nodal_levels, sink=self.nodal_data_sink(prediction), checkpoint=checkpoint,
+                max_workers=max_workers
+            )
+
+    def export_batch(self, batch, results_details=True, nodal_levels=None, max_workers=4):
+        """
+        Runs a batch of predictions and exports the results of each successful one as soon as it completes (see
+        :py:meth:`export_prediction`), while the rest of the batch keeps running.
+
+        :param plantpredict.batch.PredictionBatch batch: The batch of predictions.
+        :param bool results_details: If :py:data:`True`, the results details are exported.
+        :param list nodal_levels: Levels of the power plant hierarchy whose nodal data is exported, if any.
+        :param int max_workers: Maximum number of nodes retrieved concurrently.
+        :return: Jobs in order of completion.
+        :rtype: list of plantpredict.batch.PredictionJob
+        """
+        jobs = []
+        for job in batch:
+            if job.is_successful:
+                self.export_prediction(
+                    job.prediction, results_summary=job.results_summary, results_details=results_details,
+                    nodal_levels=nodal_levels, max_workers=max_workers
+                )
+            jobs.append(job)
+
+        return jobs
+
+    def read(self, table, project_id=None, prediction_id=None, node=None):
+        """
+        Reads the exported files of a table, optionally only those of a project, prediction or node, conformed to the
+        schema of the table. The partition columns (:py:data:`PARTITION_COLUMNS`) are added from the directory names.
+
+        :param str table: Name of the table.
+        :param int project_id: Unique identifier of the project.
+        :param int prediction_id: Unique identifier of the prediction.
+        :param str node: Name of the node of the power plant.
+        :return: The exported data.
+        :rtype: pandas.DataFrame
+        """
+        filters = {"project_id": project_id, "prediction_id": prediction_id, "node": node}
+        frames = []
+        for directory, directory_names, file_names in os.walk(os.path.join(self.path, table)):
+            directory_names.sort()
+            partition = {}
+            for part in os.path.relpath(directory, os.path.join(self.path, table)).split(os.sep):
+                if "=" in part:
+                    column, value = part.split("=", 1)
+                    partition[column] = _parse_partition_value(value)
+
+            if any(value is not None and partition.get(column) != value for column, value in filters.items()):
+                continue
+
+            for file_name in sorted(file_names):
+                if file_name.startswith("part-") and file_name.endswith(self.extension):
+                    frame = self._conform(table, self._read_file(os.path.join(directory, file_name)), extend=False)
+                    for column, value in partition.items():
+                        frame[column] = value
+                    frames.append(frame)
+
+        if not frames:
+            return pandas.DataFrame(columns=list(self.get_schema(table)))
+
+        return pandas.concat(frames, ignore_index=True)
+
+    def __init__(self, path, file_format="parquet", compression=None):
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError("file_format must be one of {}.".format(", ".join(EXPORT_FORMATS)))
+        if file_format == "feather" and pyarrow is None:
+            raise ImportError("Exporting Arrow files requires pyarrow.")
+        if file_format == "parquet" and pyarrow is None and importlib.util.find_spec("fastparquet") is None:
+            raise ImportError("Exporting Parquet files requires pyarrow or fastparquet.")
+
+        self.path = os.path.expanduser(path)
+        self.file_format = file_format
+        self.extension, default_compression = EXPORT_FORMATS[file_format]
+        self.compression = compression if compression is not None else default_compression
+
+        self._schemas = {}
+        self._num_parts = {}
+        self._lock = threading.Lock()
@@ -1,10 +1,21 @@
-import json
-import requests
-from plantpredict.utilities import convert_json, camel_to_snake, decorate_all_methods
-from plantpredict.error_handlers import handle_refused_connection, handle_error_response
+from concurrent.futures import ThreadPoolExecutor
+
+from plantpredict.utilities import decorate_all_methods
+from plantpredict.error_handlers import handle_error_response, decode_response
+from plantpredict.cache import GeoCache
+
+
+def _lookup_location_attributes(geo):
+    """Sends the location info, elevation and time zone requests of a :py:mod:`Geo` concurrently."""
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(method) for method in (geo.get_location_info, geo.get_elevation, geo.get_time_zone)]
+        for future in futures:
+            future.result()
+
+    # each method assigns the contents of its response to the instance
+    return {key: value for key, value in geo.__dict__.items() if key not in ("api", "latitude", "longitude")}
 
 
-@decorate_all_methods(handle_refused_connection)
 @decorate_all_methods(handle_error_response)
 class Geo(object):
     """
@@ -82,13 +93,16 @@ class Geo(object):
         :return: A dictionary with location information as shown in "Example Response".
         :rtype: dict
         """
-        response = requests.get(
+        response = self.api.session.get(
             url=self.api.base_url + "/Geo/{}/{}/Location".format(self.latitude, self.longitude),
             headers={"Authorization": "Bearer " + self.api.access_token}
         )
-        attr = convert_json(json.loads(response.content), camel_to_snake)
-        for key in attr:
-            setattr(self, key, attr[key])
+
+        # an error response is left to the error handler
+        if 200 <= response.status_code < 300:
+            attr = decode_response(response)
+            for key in attr:
+                setattr(self, key, attr[key])
 
         return response
 
@@ -152,13 +166,16 @@ class Geo(object):
         :return: A dictionary with location information as shown in "Example Response".
         :rtype: dict
         """
-        response = requests.get(
+        response = self.api.session.get(
             url=self.api.base_url + "/Geo/{}/{}/Elevation".format(self.latitude, self.longitude),
             headers={"Authorization": "Bearer " + self.api.access_token}
         )
-        attr = convert_json(json.loads(response.content), camel_to_snake)
-        for key in attr:
-            setattr(self, key, attr[key])
+
+        # an error response is left to the error handler
+        if 200 <= response.status_code < 300:
+            attr = decode_response(response)
+            for key in attr:
+                setattr(self, key, attr[key])
 
         return response
 
@@ -222,15 +239,46 @@ class Geo(object):
         :return: A dictionary with location information as shown in "Example Response".
         :rtype: dict
         """
-        response = requests.get(
+        response = self.api.session.get(
             url=self.api.base_url + "/Geo/{}/{}/TimeZone".format(self.latitude, self.longitude),
             headers={"Authorization": "Bearer " + self.api.access_token}
         )
-        attr = convert_json(json.loads(response.content), camel_to_snake)
+
+        # an error response is left to the error handler
+        if 200 <= response.status_code < 300:
+            attr = decode_response(response)
+            for key in attr:
+                setattr(self, key, attr[key])
+
+        return response
+
+    def get_location_attributes(self):
+        """
+        Retrieves the location info, elevation and time zone for a given latitude and longitude (see
+        :py:meth:`get_location_info`, :py:meth:`get_elevation` and :py:meth:`get_time_zone`) with the three requests
+        sent concurrently, and assigns their contents to the instance of :py:mod:`Geo` as attributes.
+
+        If the :py:class:`~plantpredict.api.Api` has a :py:class:`~plantpredict.cache.GeoCache`, the attributes are
+        taken from it when a site in the same grid cell has been looked up before, and no request is sent.
+
+        .. code-block:: python
+
+            geo = api.geo(latitude=35.1, longitude=-106.7)
+            geo.get_location_attributes()
+
+        :return: A dictionary with the combined contents of the "Example Response" of the three methods.
+        :rtype: dict
+        """
+        geo_cache = getattr(self.api, "geo_cache", None)
+        if isinstance(geo_cache, GeoCache):
+            attr = geo_cache.get(self.latitude, self.longitude, lambda: _lookup_location_attributes(self))
+        else:
+            attr = _lookup_location_attributes(self)
+
         for key in attr:
             setattr(self, key, attr[key])
 
-        return response
+        return attr
 
     def __init__(self, api, latitude=None, longitude=None):
         """
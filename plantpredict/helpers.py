@@ -1,5 +1,203 @@
+import os
+import csv
+import itertools
+
+import openpyxl
 import pandas as pd
 
+# extensions of the workbooks that are streamed with openpyxl (other Excel formats are read with pandas)
+OPENPYXL_EXTENSIONS = (".xlsx", ".xlsm")
+
+
+def _make_header(values):
+    # names blank header cells like pandas does
+    return [str(v) if v is not None else "Unnamed: {}".format(i) for i, v in enumerate(values)]
+
+
+def _get_column_indices(header, columns):
+    if columns is None:
+        return list(range(len(header)))
+
+    missing = [column for column in columns if column not in header]
+    if missing:
+        raise ValueError("Column(s) {} not found in the header.".format(", ".join(repr(c) for c in missing)))
+
+    return [header.index(column) for column in columns]
+
+
+def _iter_excel_rows(file_path, sheet_name=None):
+    """Yields the header and then the values of each non-blank row of a sheet, read in read-only mode."""
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        for values in worksheet.iter_rows(values_only=True):
+            if any(v is not None for v in values):
+                yield values
+    finally:
+        workbook.close()
+
+
+def _infer_csv_converters(rows, num_columns):
+    """Returns the narrowest of int, float and str that converts every non-empty value of each column."""
+    converters = [int] * num_columns
+    widened = {int: float, float: str}
+    for row in rows:
+        for i, value in enumerate(row[:num_columns]):
+            while value and converters[i] is not str:
+                try:
+                    converters[i](value)
+                    break
+                except ValueError:
+                    converters[i] = widened[converters[i]]
+
+    return converters
+
+
+def _iter_csv_rows(file_path):
+    """
+    Yields the header and then the values of each non-blank row of a .csv file. The type of each column is inferred
+    from all of its values in a first pass over the file, so that every value of a column has the same type.
+    """
+    with open(file_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        converters = _infer_csv_converters(reader, len(header))
+
+        f.seek(0)
+        reader = csv.reader(f)
+        yield next(reader)
+        for row in reader:
+            if any(row):
+                yield [converters[i](value) if value else None for i, value in enumerate(row[:len(converters)])]
+
+
+def _iter_sheet_rows(file_path, sheet_name=None):
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".csv":
+        return _iter_csv_rows(file_path)
+    elif extension in OPENPYXL_EXTENSIONS:
+        return _iter_excel_rows(file_path, sheet_name)
+
+    # legacy formats (e.g. .xls) cannot be streamed
+    xl = pd.ExcelFile(file_path)
+    frame = xl.parse(sheet_name if sheet_name else xl.sheet_names[0], index_col=None)
+    rows = ([_clean_value(v) for v in values] for values in frame.itertuples(index=False, name=None))
+    return itertools.chain([list(frame.columns)], rows)
+
+
+def iter_rows(file_path, sheet_name=None, columns=None):
+    """
+    Streams the rows of a sheet of an Excel file (.xlsx or .xlsm, read in read-only mode) or of a .csv file, as
+    dictionaries keyed by the column headers in the first row, without loading the whole file into memory. Blank rows
+    are skipped and blank cells are :py:data:`None`. The type of each column of a .csv file (int, float or str) is
+    inferred from all of its values, by reading the file twice.
+
+    :param file_path: The full file path of the Excel or .csv file to be read.
+    :type file_path: str
+    :param sheet_name: Name of a particular sheet in the file to read (optional, defaults to the first sheet in the
+    Excel file).
+    :type sheet_name: str
+    :param columns: Columns to be read (optional, defaults to every column).
+    :type columns: list of str
+    :raises ValueError: Raised if a column is not found in the header.
+    :return: Generator of dictionaries, each dictionary representing a row in the file.
+    :rtype: generator of dict
+    """
+    rows = _iter_sheet_rows(file_path, sheet_name)
+    header = next(rows, None)
+    if header is None:
+        return
+
+    header = _make_header(header)
+    indices = _get_column_indices(header, columns)
+    keys = [header[i] for i in indices]
+    for values in rows:
+        num_values = len(values)
+        yield dict(zip(keys, [values[i] if i < num_values else None for i in indices]))
+
+
+def iter_row_chunks(file_path, sheet_name=None, columns=None, chunk_size=10000):
+    """
+    Same as :py:func:`iter_rows`, but yields the rows in lists of up to :py:data:`chunk_size` rows, e.g. to feed bulk
+    requests or entity builders a chunk at a time while keeping memory flat.
+
+    :param file_path: The full file path of the Excel or .csv file to be read.
+    :type file_path: str
+    :param sheet_name: Name of a particular sheet in the file to read (optional).
+    :type sheet_name: str
+    :param columns: Columns to be read (optional, defaults to every column).
+    :type columns: list of str
+    :param chunk_size: Maximum number of rows per chunk.
+    :type chunk_size: int
+    :return: Generator of lists of dictionaries.
+    :rtype: generator of list
+    """
+    rows = iter_rows(file_path, sheet_name, columns)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _clean_value(value):
+    # missing values are written as blank cells
+    if value is None or value is pd.NA or value is pd.NaT or (isinstance(value, float) and value != value):
+        return None
+
+    return value
+
+
+def write_rows(rows, file_path, sheet_name="Sheet1", field_order=None):
+    """
+    Streams rows to an Excel file (.xlsx, through a write-only workbook) or to a .csv file, one row at a time, so that
+    any number of rows (e.g. produced by a generator) can be written with flat memory. Missing values are written as
+    blank cells.
+
+    :param rows: Iterable of dictionaries, each dictionary representing a row in the file.
+    :type rows: iterable of dict
+    :param file_path: The full file path (appended with .xlsx or .csv) of the file to be written. This will overwrite
+    the file if it already exists.
+    :type file_path: str
+    :param sheet_name: Name of the sheet to write to (optional, defaults to "Sheet1"). Ignored for .csv files.
+    :type sheet_name: str
+    :param field_order: List of keys ordered to match the intended column ordering (left to right). Any keys omitted
+    from the list will not be written as columns. (optional, defaults to the keys of every row in the order they first
+    appear, which needs all rows in memory at once: pass it to stream the rows with flat memory)
+    :type field_order: list of str
+    :return: Number of rows written.
+    :rtype: int
+    """
+    if field_order:
+        fields = list(field_order)
+    else:
+        # every key of any row is a column (like a pandas DataFrame), so the rows are read in full before writing
+        rows = list(rows)
+        fields = list(dict.fromkeys(key for row in rows for key in row))
+    num_rows = 0
+
+    if file_path.lower().endswith(".csv"):
+        with open(file_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(fields)
+            for row in rows:
+                writer.writerow([_clean_value(row.get(field)) for field in fields])
+                num_rows += 1
+
+        return num_rows
+
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    worksheet.append(fields)
+    for row in rows:
+        worksheet.append([_clean_value(row.get(field)) for field in fields])
+        num_rows += 1
+    workbook.save(file_path)
+
+    return num_rows
+
 
 def load_from_excel(file_path, sheet_name=None):
     """
@@ -15,6 +213,7 @@ def load_from_excel(file_path, sheet_name=None):
     :return: List of dictionaries, each dictionary representing a row in the Excel file.
     :rtype: list of dict
     """
+    # use iter_rows or iter_row_chunks to read large files without loading them into memory at once
     xl = pd.ExcelFile(file_path)
     sheet_name = sheet_name if sheet_name else xl.sheet_names[0]
 
@@ -41,12 +240,8 @@ def export_to_excel(data, file_path, sheet_name="Sheet1", field_order=None, sort
     :type sorting_fields: list of str
     :return: None
     """
-
-    writer = pd.ExcelWriter(file_path, engine='openpyxl')
-    df = pd.DataFrame(data)
-    if field_order:
-        df = df[field_order]
+    # sorting needs every row at once, otherwise the rows are streamed straight to the workbook
     if sorting_fields:
-        df = df.sort_values(sorting_fields)
-    df.to_excel(writer, sheet_name=sheet_name, index=False)
-    writer.save()
+        data = pd.DataFrame(data).sort_values(sorting_fields).to_dict('records')
+
+    write_rows(data, file_path, sheet_name=sheet_name, field_order=field_order)
@@ -1,13 +1,74 @@
-import requests
+import numpy
 
 from plantpredict.plant_predict_entity import PlantPredictEntity
-from plantpredict.error_handlers import handle_refused_connection, handle_error_response
+from plantpredict.error_handlers import handle_error_response
 from plantpredict.enumerations import EntityTypeEnum
 
 
+def _parse_kva_curves(kva_curves):
+    """
+    Returns the elevations (sorted) and the temperatures and kVA ratings (sorted by temperature) of each kVA curve.
+    Curves are given either as :code:`{"elevation": ..., "data_points": [{"temperature": ..., "kva": ...}, ...]}`, or
+    as a flat list of :code:`{"elevation": ..., "temperature": ..., "kva": ...}` points.
+    """
+    points_by_elevation = {}
+    try:
+        for curve in kva_curves:
+            for point in (curve["data_points"] if "data_points" in curve else [curve]):
+                points_by_elevation.setdefault(float(curve["elevation"]), []).append(
+                    (float(point["temperature"]), float(point["kva"]))
+                )
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Invalid kVA curves: each point needs an elevation, a temperature and a kVA rating.")
+    if not points_by_elevation:
+        raise ValueError("The inverter has no kVA curves.")
+
+    elevations = sorted(points_by_elevation)
+    curves = [numpy.array(sorted(points_by_elevation[elevation])).T for elevation in elevations]
+
+    return numpy.array(elevations), curves
+
+
+def interpolate_kva_curves(kva_curves, elevation, temperature):
+    """
+    Interpolates kVA ratings from an inverter's kVA curves: linearly in temperature along the curves of the two
+    elevations around each elevation, then linearly in elevation between them. Temperatures and elevations outside
+    the curves are clamped to the nearest curve point.
+
+    :param list kva_curves: The :py:attr:`kva_curves` of an :py:class:`Inverter`.
+    :param elevation: Elevation(s) - units :py:data:`[m]`.
+    :type elevation: float or numpy.ndarray
+    :param temperature: Temperature(s), broadcast against :py:data:`elevation` - units :py:data:`[deg-C]`.
+    :type temperature: float or numpy.ndarray
+    :return: kVA rating(s) - units :py:data:`[kVA]`.
+    :rtype: float or numpy.ndarray
+    """
+    elevations, curves = _parse_kva_curves(kva_curves)
+    elevation, temperature = numpy.broadcast_arrays(numpy.asarray(elevation, dtype=float),
+                                                    numpy.asarray(temperature, dtype=float))
+    shape = elevation.shape
+    elevation, temperature = elevation.ravel(), temperature.ravel()
+
+    # every curve evaluated at every temperature, one row per elevation
+    kvas = numpy.vstack([numpy.interp(temperature, curve_temperatures, curve_kvas)
+                         for curve_temperatures, curve_kvas in curves])
+    if len(elevations) == 1:
+        kva = kvas[0]
+    else:
+        elevation = numpy.clip(elevation, elevations[0], elevations[-1])
+        lower = numpy.clip(numpy.searchsorted(elevations, elevation, side="right") - 1, 0, len(elevations) - 2)
+        weight = (elevation - elevations[lower]) / (elevations[lower + 1] - elevations[lower])
+        columns = numpy.arange(len(elevation))
+        kva = (1.0 - weight) * kvas[lower, columns] + weight * kvas[lower + 1, columns]
+
+    return float(kva[0]) if not shape else kva.reshape(shape)
+
+
 class Inverter(PlantPredictEntity):
     """
     """
+    _disk_cache_url_suffix = "/Inverter/{}"
+
     def create(self):
         """POST /Inverter"""
         self.create_url_suffix = "/Inverter"
@@ -28,7 +89,6 @@ class Inverter(PlantPredictEntity):
         self.update_url_suffix = "/Inverter".format(self.id)
         return super(Inverter, self).update()
 
-    @handle_refused_connection
     @handle_error_response
     def change_status(self, new_status, note=""):
         """
@@ -37,7 +97,7 @@ class Inverter(PlantPredictEntity):
         :param note:
         :return:
         """
-        return requests.post(
+        return self.api.session.post(
             url=self.api.base_url + "/Inverter/Status",
             headers={"Authorization": "Bearer " + self.api.access_token},
             json=[{
@@ -49,7 +109,6 @@ class Inverter(PlantPredictEntity):
             }]
         )
 
-    @handle_refused_connection
     @handle_error_response
     def get_kva(self, elevation, temperature, use_cooling_temp):
         """
@@ -61,8 +120,32 @@ class Inverter(PlantPredictEntity):
                                       at 99.6 degrees).
         :return: # TODO after new API response is implemented
         """
-        return requests.get(
+        return self.api.session.get(
             url=self.api.base_url + "/Inverter/{}/kVa".format(self.id),
             headers={"Authorization": "Bearer " + self.api.access_token},
             params={"elevation": elevation, "temperature": temperature, "useCoolingTemp": use_cooling_temp}
         )
+
+    def interpolate_kva(self, elevation, temperature):
+        """
+        Same as :py:meth:`get_kva` with :py:data:`use_cooling_temp=True`, but evaluated locally from the inverter's
+        :py:attr:`kva_curves` (retrieved with :py:meth:`get` if the instance doesn't have them yet), and for arrays of
+        elevations and temperatures at once:
+
+        .. code-block:: python
+
+            inverter = api.inverter(id=808)
+            kva_ratings = inverter.interpolate_kva(elevation=1000.0, temperature=hourly_temperatures)
+
+        :param elevation: Elevation(s) at which to evaluate the inverter kVa rating - units :py:data:`[m]`.
+        :type elevation: float or numpy.ndarray
+        :param temperature: Temperature(s) at which to evaluate the inverter kVa rating, broadcast against
+                            :py:data:`elevation` - units :py:data:`[deg-C]`.
+        :type temperature: float or numpy.ndarray
+        :return: kVA rating(s) - units :py:data:`[kVA]`.
+        :rtype: float or numpy.ndarray
+        """
+        if getattr(self, "kva_curves", None) is None:
+            self.get()
+
+        return interpolate_kva_curves(self.kva_curves, elevation, temperature)
@@ -1,18 +1,142 @@
+import os
 import json
-import requests
+import numpy
 import pandas
-from operator import itemgetter
-from itertools import groupby
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
 
 from plantpredict.plant_predict_entity import PlantPredictEntity
 from plantpredict.utilities import convert_json, camel_to_snake, snake_to_camel
-from plantpredict.error_handlers import handle_refused_connection, handle_error_response
+from plantpredict.error_handlers import handle_error_response, decode_response, APIError
+from plantpredict.single_diode import SingleDiodeModel
+from plantpredict.helpers import iter_row_chunks
+
+# template column names, and the keys they are mapped to in the Key IV Points and Full IV Curves payloads
+KEY_IV_POINTS_COLUMNS = [
+    ("Temperature [deg-C]", "temperature"),
+    ("Irradiance [W/m2]", "irradiance"),
+    ("Isc [A]", "short_circuit_current"),
+    ("Imp [A]", "mpp_current"),
+    ("Voc [V]", "open_circuit_voltage"),
+    ("Vmp [V]", "mpp_voltage"),
+    ("Pmp [W]", "max_power"),
+]
+FULL_IV_CURVES_COLUMNS = [
+    ("Temperature [deg-C]", "temperature"),
+    ("Irradiance [W/m2]", "irradiance"),
+    ("I [A]", "current"),
+    ("V [V]", "voltage"),
+]
+
+# number of rows read at a time from .csv and .parquet templates
+TEMPLATE_CHUNK_SIZE = 100000
+
+# errors that make a single module of a bulk operation fail, without failing the others
+BULK_ERRORS = (APIError, requests.exceptions.RequestException, ValueError)
+
+
+class ModuleBulkResult(object):
+    """
+    Outcome of a bulk module operation such as :py:meth:`Module.generate_single_diode_parameters_advanced_bulk`.
+
+    :ivar list succeeded: Modules whose results were assigned to them, in the order they were given.
+    :ivar list failed: :code:`(module, error)` tuples of the modules that failed, in the order they were given.
+    """
+    @property
+    def is_successful(self):
+        return not self.failed
+
+    def __init__(self):
+        self.succeeded = []
+        self.failed = []
+
+    def __repr__(self):
+        return "ModuleBulkResult(succeeded={}, failed={})".format(len(self.succeeded), len(self.failed))
+
+
+def _iter_template_chunks(file_path, columns, sheet_name=None, chunk_size=TEMPLATE_CHUNK_SIZE):
+    """Yields data frames with the given columns of a .xlsx, .csv or .parquet template."""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".csv":
+        for chunk in pandas.read_csv(file_path, usecols=columns, chunksize=chunk_size, float_precision="round_trip"):
+            yield chunk
+
+    elif extension == ".parquet":
+        # streams the row groups if pyarrow is installed, otherwise lets pandas pick a parquet engine
+        if pyarrow is not None:
+            for batch in pyarrow.parquet.ParquetFile(file_path).iter_batches(batch_size=chunk_size, columns=columns):
+                yield batch.to_pandas()
+        else:
+            yield pandas.read_parquet(file_path, columns=columns)
+
+    else:
+        # streams the rows of the sheet from a read-only workbook
+        for rows in iter_row_chunks(file_path, sheet_name, columns, chunk_size):
+            yield pandas.DataFrame(rows, columns=columns)
+
+
+def _read_template_columns(file_path, columns, sheet_name=None, chunk_size=TEMPLATE_CHUNK_SIZE):
+    """Reads the given columns of a template into one array per column."""
+    arrays = {column: [] for column in columns}
+    for chunk in _iter_template_chunks(file_path, columns, sheet_name, chunk_size):
+        for column in columns:
+            arrays[column].append(chunk[column].to_numpy())
+
+    return [numpy.concatenate(arrays[column]) if arrays[column] else numpy.array([]) for column in columns]
+
+
+def _run_bulk_chunk(modules, url_suffix, method_name):
+    """Runs a bulk request for a chunk of modules, and falls back to one request per module if it fails."""
+    try:
+        results = modules[0]._post_bulk(url_suffix, modules)
+        if not isinstance(results, list) or len(results) != len(modules) or \
+                not all(isinstance(result, dict) for result in results):
+            raise ValueError("Unexpected response to {}.".format(url_suffix))
+    except BULK_ERRORS:
+        results = None
+
+    outcomes = []
+    for i, module in enumerate(modules):
+        if results is not None:
+            module.__dict__.update(results[i])
+            outcomes.append((module, None))
+            continue
+
+        try:
+            getattr(module, method_name)()
+            outcomes.append((module, None))
+        except BULK_ERRORS as e:
+            outcomes.append((module, e))
+
+    return outcomes
+
+
+def _run_bulk(modules, url_suffix, method_name, chunk_size, max_workers):
+    chunks = [modules[i:i + chunk_size] for i in range(0, len(modules), chunk_size)]
+
+    result = ModuleBulkResult()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for outcomes in executor.map(lambda chunk: _run_bulk_chunk(chunk, url_suffix, method_name), chunks):
+            for module, error in outcomes:
+                if error is None:
+                    result.succeeded.append(module)
+                else:
+                    result.failed.append((module, error))
+
+    return result
 
 
 class Module(PlantPredictEntity):
     """
     The :py:mod:`Module` entity models all of the characteristics of a photovoltaic solar module (panel).
     """
+    _disk_cache_url_suffix = "/Module/{}"
+
     def create(self):
         """
         **POST** */Module*
@@ -310,7 +434,6 @@ class Module(PlantPredictEntity):
         self.update_url_suffix = "/Module"
         return super(Module, self).update()
 
-    @handle_refused_connection
     @handle_error_response
     def generate_single_diode_parameters_default(self):
         """
@@ -376,17 +499,18 @@ class Module(PlantPredictEntity):
         :return: Dictionary mirroring local module object with newly generated parameters.
         :rtype: dict
         """
-        response = requests.post(
+        response = self.api.session.post(
             url=self.api.base_url + "/Module/Generator/GenerateSingleDiodeParametersDefault",
             headers={"Authorization": "Bearer " + self.api.access_token},
             json=convert_json(self.__dict__, snake_to_camel)
         )
 
-        self.__dict__.update(convert_json(json.loads(response.content), camel_to_snake))
+        # an error response is left to the error handler
+        if 200 <= response.status_code < 300:
+            self.__dict__.update(decode_response(response))
 
         return response
 
-    @handle_refused_connection
     @handle_error_response
     def generate_single_diode_parameters_advanced(self):
         """
@@ -455,17 +579,18 @@ class Module(PlantPredictEntity):
         :return: Dictionary mirroring local module object with newly generated parameters.
         :rtype: dict
         """
-        response = requests.post(
+        response = self.api.session.post(
             url=self.api.base_url + "/Module/Generator/GenerateSingleDiodeParametersAdvanced",
             headers={"Authorization": "Bearer " + self.api.access_token},
             json=convert_json(self.__dict__, snake_to_camel)
         )
 
-        self.__dict__.update(convert_json(json.loads(response.content), camel_to_snake))
+        # an error response is left to the error handler
+        if 200 <= response.status_code < 300:
+            self.__dict__.update(decode_response(response))
 
         return response
 
-    @handle_refused_connection
     @handle_error_response
     def calculate_effective_irradiance_response(self):
         """
@@ -571,13 +696,12 @@ class Module(PlantPredictEntity):
         :return: A list of dictionaries containing the calculated relative efficiencies (see Example Code above).
         :rtype: list of dict
         """
-        return requests.post(
+        return self.api.session.post(
             url=self.api.base_url + "/Module/Generator/CalculateEffectiveIrradianceResponse",
             headers={"Authorization": "Bearer " + self.api.access_token},
             json=convert_json(self.__dict__, snake_to_camel)
         )
 
-    @handle_refused_connection
     @handle_error_response
     def optimize_series_resistance(self):
         """
@@ -634,48 +758,68 @@ class Module(PlantPredictEntity):
         :return: Dictionary mirroring local module object with newly generated parameters.
         :rtype: dict
         """
-        response = requests.post(
+        response = self.api.session.post(
             url=self.api.base_url + "/Module/Generator/OptimizeSeriesResistance",
             headers={"Authorization": "Bearer " + self.api.access_token},
             json=convert_json(self.__dict__, snake_to_camel)
         )
 
-        self.__dict__.update(convert_json(json.loads(response.content), camel_to_snake))
+        # an error response is left to the error handler
+        if 200 <= response.status_code < 300:
+            self.__dict__.update(decode_response(response))
 
         return response
 
     @staticmethod
-    def _parse_key_iv_points_template(file_path, sheet_name=None):
+    def _parse_key_iv_points_template(file_path, sheet_name=None, chunk_size=TEMPLATE_CHUNK_SIZE):
         """
         Parses the PlantPredict standard template for Key IV Points input and returns a JSON-serializable
-        data structure.
+        data structure. Besides the .xlsx template, the same columns are accepted in a .csv or .parquet file, which
+        is read :py:data:`chunk_size` rows at a time.
 
-        :param file_path: Full path to .xlsx file containing Key IV points data.
+        :param file_path: Full path to .xlsx (or .csv or .parquet) file containing Key IV points data.
         :type file_path: str
         :param sheet_name: Sheet name containing data (only required if using file with multiple Excel sheets).
         :type sheet_name: str
+        :param int chunk_size: Number of rows read at a time from .csv and .parquet files.
         :return: List of dictionaries containing data in appropriate structure for process_key_iv_points() method.
         :rtype: list of dict
         """
-        xl = pandas.ExcelFile(file_path)
-        sheet_idx = 0 if not sheet_name else xl.sheet_names.index(sheet_name)
-        xls_data = xl.parse(xl.sheet_names[sheet_idx], index_col=None).to_dict('records')
-
-        key_iv_points_data = []
-        for d in xls_data:
-            key_iv_points_data.append({
-                "temperature": d["Temperature [deg-C]"],
-                "irradiance": d["Irradiance [W/m2]"],
-                "short_circuit_current": d["Isc [A]"],
-                "mpp_current": d["Imp [A]"],
-                "open_circuit_voltage": d["Voc [V]"],
-                "mpp_voltage": d["Vmp [V]"],
-                "max_power": d["Pmp [W]"],
-            })
+        columns = _read_template_columns(
+            file_path, [column for column, _ in KEY_IV_POINTS_COLUMNS], sheet_name, chunk_size
+        )
+        keys = [key for _, key in KEY_IV_POINTS_COLUMNS]
+
+        return [dict(zip(keys, row)) for row in zip(*[column.tolist() for column in columns])]
+
+    def _prepare_key_iv_points_data(self, file_path=None, key_iv_points_data=None):
+        """
+        Validates the Key IV Points input options of :py:meth:`process_key_iv_points` and returns the Key IV Points
+        data, parsing the .xlsx template if a file path was given.
+
+        :param str file_path: File path to the .xlsx template for Key IV Points.
+        :param list key_iv_points_data: List of dictionaries, each containing Key IV Points at a particular condition.
+        :return: List of dictionaries, each containing Key IV Points at a particular condition.
+        :rtype: list of dict
+        """
+        # if the input is the .xlsx template, parse it
+        if not file_path and not key_iv_points_data:
+            raise ValueError(
+                "Either a file path to the .xslx template for Key IV Points input or the properly formatted " 
+                "JSON-serializable data structure for Key IV Points input must be assigned as input. See the Python "
+                "SDK documentation (https://plantpredict-python.readthedocs.io/en/latest/) for more information."
+            )
+        elif file_path and key_iv_points_data:
+            raise ValueError(
+                "Only one input option may be specified."
+            )
+
+        # if the user specifies a file_path to the .xlsx template, parse it
+        elif file_path:
+            key_iv_points_data = self._parse_key_iv_points_template(file_path)
 
         return key_iv_points_data
 
-    @handle_refused_connection
     @handle_error_response
     def process_key_iv_points(self, file_path=None, key_iv_points_data=None):
         """
@@ -835,64 +979,80 @@ class Module(PlantPredictEntity):
         :return: Dictionary containing STC electrical parameters, temperature coefficients, and effective irradiance response, depending on the scope of the input data provided (see "Generated Parameters" above).
         :rtype: dict
         """
-        # if the input is the .xlsx template, parse it
-        if not file_path and not key_iv_points_data:
-            raise ValueError(
-                "Either a file path to the .xslx template for Key IV Points input or the properly formatted " 
-                "JSON-serializable data structure for Key IV Points input must be assigned as input. See the Python "
-                "SDK documentation (https://plantpredict-python.readthedocs.io/en/latest/) for more information."
-            )
-        elif file_path and key_iv_points_data:
-            raise ValueError(
-                "Only one input option may be specified."
-            )
-
-        # if the user specifies a file_path to the .xlsx template, parse it
-        elif file_path:
-            key_iv_points_data = self._parse_key_iv_points_template(file_path)
+        key_iv_points_data = self._prepare_key_iv_points_data(file_path, key_iv_points_data)
 
-        response = requests.post(
+        response = self.api.session.post(
             url=self.api.base_url + "/Module/Generator/ProcessKeyIVPoints",
             headers={"Authorization": "Bearer " + self.api.access_token},
             json=[convert_json(d, snake_to_camel) for d in key_iv_points_data]
         )
 
-        self.__dict__.update(convert_json(json.loads(response.content), camel_to_snake))
+        # an error response is left to the error handler
+        if 200 <= response.status_code < 300:
+            self.__dict__.update(decode_response(response))
 
         return response
 
     @staticmethod
-    def _parse_full_iv_curves_template(file_path, sheet_name=None):
+    def _parse_full_iv_curves_template(file_path, sheet_name=None, chunk_size=TEMPLATE_CHUNK_SIZE):
         """
         Locally parses the PlantPredict standard template for Full IV Curves input and returns a JSON-serializable
-        data structure.
+        data structure. Besides the .xlsx template, the same columns are accepted in a .csv or .parquet file, which
+        is read :py:data:`chunk_size` rows at a time.
 
-        :param file_path: Full path to .xslx file containing Full IV Curve data.
+        :param file_path: Full path to .xslx (or .csv or .parquet) file containing Full IV Curve data.
         :type file_path: str
         :param sheet_name: Sheet name containing data (only required if using file with multiple Excel sheets).
         :type sheet_name: str
+        :param int chunk_size: Number of rows read at a time from .csv and .parquet files.
         :return: List of dictionaries containing data in appropriate structure for process_full_iv_curves() method.
         :rtype: list of dict
         """
-        xl = pandas.ExcelFile(file_path)
-        sheet_idx = 0 if not sheet_name else xl.sheet_names.index(sheet_name)
-        xls_data = xl.parse(xl.sheet_names[sheet_idx], index_col=None).to_dict('records')
+        temperatures, irradiances, currents, voltages = _read_template_columns(
+            file_path, [column for column, _ in FULL_IV_CURVES_COLUMNS], sheet_name, chunk_size
+        )
+
+        # groups the points by condition (sorted by temperature, then irradiance), keeping their order in the file
+        order = numpy.lexsort((irradiances, temperatures))
+        temperatures, irradiances = temperatures[order].tolist(), irradiances[order].tolist()
+        currents, voltages = currents[order].tolist(), voltages[order].tolist()
+
+        is_new_condition = (numpy.diff(temperatures) != 0) | (numpy.diff(irradiances) != 0)
+        starts = [0] + (numpy.flatnonzero(is_new_condition) + 1).tolist()
+        ends = starts[1:] + [len(temperatures)]
+
+        return [{
+            "temperature": temperatures[start],
+            "irradiance": irradiances[start],
+            "data_points": [{"current": c, "voltage": v} for c, v in zip(currents[start:end], voltages[start:end])]
+        } for start, end in zip(starts, ends) if end > start]
+
+    def _prepare_iv_curve_data(self, file_path=None, iv_curve_data=None):
+        """
+        Validates the Full IV Curves input options of :py:meth:`process_iv_curves` and returns the IV curve data,
+        parsing the .xlsx template if a file path was given.
 
-        grouper = itemgetter("Temperature [deg-C]", "Irradiance [W/m2]")
-        full_iv_curves_data = []
-        for key, grp in groupby(sorted(xls_data, key=grouper), grouper):
-            temp_dict = dict(zip(["Temperature [deg-C]", "Irradiance [W/m2]"], key))
+        :param str file_path: File path to the .xlsx template for Full IV Curves.
+        :param list iv_curve_data: List of dictionaries, each containing an IV curve at a particular condition.
+        :return: List of dictionaries, each containing an IV curve at a particular condition.
+        :rtype: list of dict
+        """
+        # if the input is the .xlsx template, parse it
+        if not file_path and not iv_curve_data:
+            raise ValueError(
+                "Either a file path to the .xslx template for Full IV Curves input or the properly formatted " 
+                "JSON-serializable data structure for Key IV Points input must be assigned as input. See the Python "
+                "SDK documentation (https://plantpredict-python.readthedocs.io/en/latest/) for more information."
+            )
+        elif file_path and iv_curve_data:
+            raise ValueError("Only one input option may be specified.")
 
-            iv_points = [(item["I [A]"], item["V [V]"]) for item in grp]
-            full_iv_curves_data.append({
-                "temperature": temp_dict["Temperature [deg-C]"],
-                "irradiance": temp_dict["Irradiance [W/m2]"],
-                "data_points": [{"current": iv[0], "voltage": iv[1]} for iv in iv_points]
-            })
+        # if the user specifies a file_path to the .xlsx template, parse it
+        elif file_path:
+            iv_curve_data = self._parse_full_iv_curves_template(file_path)
 
-        return full_iv_curves_data
+        return iv_curve_data
 
-    @handle_refused_connection
     @handle_error_response
     def process_iv_curves(self, file_path=None, iv_curve_data=None):
         """
@@ -967,21 +1127,9 @@ class Module(PlantPredictEntity):
         :return: List of dictionaries, each containing extracted module electrical characteristics corresponding to the IV curve provided at a particular temperature/irradiance condition.
         :rtype: list of dict
         """
-        # if the input is the .xlsx template, parse it
-        if not file_path and not iv_curve_data:
-            raise ValueError(
-                "Either a file path to the .xslx template for Full IV Curves input or the properly formatted " 
-                "JSON-serializable data structure for Key IV Points input must be assigned as input. See the Python "
-                "SDK documentation (https://plantpredict-python.readthedocs.io/en/latest/) for more information."
-            )
-        elif file_path and iv_curve_data:
-            raise ValueError("Only one input option may be specified.")
-
-        # if the user specifies a file_path to the .xlsx template, parse it
-        elif file_path:
-            iv_curve_data = self._parse_full_iv_curves_template(file_path)
+        iv_curve_data = self._prepare_iv_curve_data(file_path, iv_curve_data)
 
-        response = requests.post(
+        response = self.api.session.post(
             url=self.api.base_url + "/Module/Generator/ProcessIVCurves",
             headers={"Authorization": "Bearer " + self.api.access_token},
             json=[convert_json(d, snake_to_camel) for d in iv_curve_data]
@@ -989,7 +1137,6 @@ class Module(PlantPredictEntity):
 
         return [convert_json(d, camel_to_snake) for d in json.loads(response.content)]
 
-    @handle_refused_connection
     @handle_error_response
     def generate_iv_curve(self, num_iv_points=100):
         """
@@ -1057,14 +1204,13 @@ class Module(PlantPredictEntity):
         """
         self.num_iv_points = num_iv_points
 
-        return requests.post(
+        return self.api.session.post(
             url=self.api.base_url + "/Module/Generator/GenerateIVCurve",
             headers={"Authorization": "Bearer " + self.api.access_token},
             json=convert_json(self.__dict__, snake_to_camel)
         )
 
     @handle_error_response
-    @handle_refused_connection
     def calculate_basic_data_at_conditions(self, temperature, irradiance):
         """
 
@@ -1076,30 +1222,73 @@ class Module(PlantPredictEntity):
             "data_points": self.generate_iv_curve()
         }])
 
-    # @handle_error_response
-    # @handle_refused_connection
-    # def generate_single_diode_parameters_advanced_bulk(self, modules):
-    #    """
-    #
-    #    :param modules:
-    #    :return:
-    #    """
-    #    return requests.post(
-    #        url=self.api.base_url + "/Module/Generator/GenerateSingleDiodeParametersAdvancedBulk",
-    #        headers={"Authorization": "Bearer " + self.api.access_token},
-    #        json=convert_json_list(modules, snake_to_camel)
-    #    )
-
-    #@handle_error_response
-    #@handle_refused_connection
-    #def optimize_series_resistance_bulk(self, modules):
-    #    """
-    #
-    #   :param modules:
-    #    :return:
-    #    """
-    #    return requests.post(
-    #        url=self.api.base_url + "/Module/Generator/OptimizeSeriesResistanceBulk",
-    #        headers={"Authorization": "Bearer " + self.api.access_token},
-    #        json=convert_json_list(modules, snake_to_camel)
-    #    )
+    def get_single_diode_model(self):
+        """
+        Returns a local 1-diode model of the module, built from its current attributes (see "Required Attributes" of
+        :py:meth:`generate_iv_curve`). Unlike :py:meth:`generate_iv_curve` and
+        :py:meth:`calculate_basic_data_at_conditions`, which need two requests per condition, the model computes IV
+        curves and maximum power points for arrays of temperatures and irradiances without any request:
+
+        .. code-block:: python
+
+            model = module.get_single_diode_model()
+            iv_curves = model.generate_iv_curves(temperature=25.0, irradiance=[200.0, 600.0, 1000.0])
+            basic_data = model.calculate_basic_data_at_conditions(temperature=[25.0, 50.0], irradiance=1000.0)
+
+        :return: 1-diode model of the module.
+        :rtype: plantpredict.single_diode.SingleDiodeModel
+        """
+        return SingleDiodeModel.from_module(self)
+
+    @handle_error_response
+    def _post_bulk(self, url_suffix, modules):
+        """Sends a bulk request for several modules with the api of this module, returning one result per module."""
+        return self.api.session.post(
+            url=self.api.base_url + url_suffix,
+            headers={"Authorization": "Bearer " + self.api.access_token},
+            json=[convert_json(module.__dict__, snake_to_camel) for module in modules]
+        )
+
+    @staticmethod
+    def generate_single_diode_parameters_advanced_bulk(modules, chunk_size=10, max_workers=4):
+        """
+        **POST** */Module/Generator/GenerateSingleDiodeParametersAdvancedBulk*
+
+        Same as :py:meth:`generate_single_diode_parameters_advanced`, for many modules at once (e.g. all power bins of
+        a datasheet). The modules are sent in chunks of :py:data:`chunk_size`, with up to :py:data:`max_workers` chunks
+        in flight, and the generated parameters are assigned to each module. A module whose parameters can't be
+        generated doesn't fail the others: if a chunk fails, its modules are retried one by one, and the modules that
+        still fail are reported in the result.
+
+        .. code-block:: python
+
+            result = Module.generate_single_diode_parameters_advanced_bulk(modules)
+            for module, error in result.failed:
+                print(module.name, error)
+
+        :param list modules: Modules with the attributes required by
+                             :py:meth:`generate_single_diode_parameters_advanced`.
+        :param int chunk_size: Maximum number of modules per request.
+        :param int max_workers: Maximum number of requests in flight.
+        :return: The modules that succeeded and those that failed (with their errors).
+        :rtype: ModuleBulkResult
+        """
+        return _run_bulk(modules, "/Module/Generator/GenerateSingleDiodeParametersAdvancedBulk",
+                         "generate_single_diode_parameters_advanced", chunk_size, max_workers)
+
+    @staticmethod
+    def optimize_series_resistance_bulk(modules, chunk_size=10, max_workers=4):
+        """
+        **POST** */Module/Generator/OptimizeSeriesResistanceBulk*
+
+        Same as :py:meth:`optimize_series_resistance`, for many modules at once, with the chunking, concurrency and
+        failure handling of :py:meth:`generate_single_diode_parameters_advanced_bulk`.
+
+        :param list modules: Modules with the attributes required by :py:meth:`optimize_series_resistance`.
+        :param int chunk_size: Maximum number of modules per request.
+        :param int max_workers: Maximum number of requests in flight.
+        :return: The modules that succeeded and those that failed (with their errors).
+        :rtype: ModuleBulkResult
+        """
+        return _run_bulk(modules, "/Module/Generator/OptimizeSeriesResistanceBulk", "optimize_series_resistance",
+                         chunk_size, max_workers)
@@ -1,16 +1,30 @@
-import json
-import requests
+from plantpredict.utilities import convert_json, snake_to_camel, decorate_all_methods
+from plantpredict.error_handlers import handle_error_response, decode_response, APIError
+from plantpredict.cache import DiskCache
 
-from plantpredict.utilities import convert_json, camel_to_snake, snake_to_camel, decorate_all_methods
-from plantpredict.error_handlers import handle_refused_connection, handle_error_response, APIError
+
+def _get_disk_cache(entity):
+    """Returns the disk cache of the entity's API instance if the entity is one of the cached kinds."""
+    disk_cache = getattr(entity.api, "disk_cache", None)
+    if entity._disk_cache_url_suffix is None or not isinstance(disk_cache, DiskCache):
+        return None
+    return disk_cache
+
+
+def _invalidate_disk_cache(entity, response):
+    disk_cache = _get_disk_cache(entity)
+    if disk_cache is not None and getattr(entity, "id", None) is not None and 200 <= response.status_code < 300:
+        disk_cache.invalidate(entity.api.base_url + entity._disk_cache_url_suffix.format(entity.id))
 
 
-@decorate_all_methods(handle_refused_connection)
 @decorate_all_methods(handle_error_response)
 class PlantPredictEntity(object):
+    # URL suffix (formatted with the id) of entities that are stored in the api's disk cache, if it has one
+    _disk_cache_url_suffix = None
+
     def create(self, *args):
         """Generic POST request."""
-        response = requests.post(
+        response = self.api.session.post(
             url=self.api.base_url + self.create_url_suffix,
             headers={"Authorization": "Bearer " + self.api.access_token},
             json=convert_json(self.__dict__, snake_to_camel)
@@ -18,7 +32,7 @@ class PlantPredictEntity(object):
 
         # power plant is the exception that doesn't have its own id. has a project and prediction id
         try:
-            self.id = json.loads(response.content)['id'] if 200 <= response.status_code < 300 else None
+            self.id = decode_response(response)['id'] if 200 <= response.status_code < 300 else None
         except ValueError:
             pass
 
@@ -26,35 +40,46 @@ class PlantPredictEntity(object):
 
     def delete(self):
         """Generic DELETE request."""
-
-        return requests.delete(
+        response = self.api.session.delete(
             url=self.api.base_url + self.delete_url_suffix,
             headers={"Authorization": "Bearer " + self.api.access_token}
         )
+        _invalidate_disk_cache(self, response)
+
+        return response
 
     def get(self):
         """Generic GET request."""
-        response = requests.get(
-            url=self.api.base_url + self.get_url_suffix,
-            headers={"Authorization": "Bearer " + self.api.access_token}
-        )
+        url = self.api.base_url + self.get_url_suffix
+        headers = {"Authorization": "Bearer " + self.api.access_token}
+
+        # library entities are served from (and revalidated against) the disk cache if the api has one
+        disk_cache = _get_disk_cache(self)
+        if disk_cache is not None:
+            response = disk_cache.get(self.api.session, url, headers, account=DiskCache.get_account(self.api))
+        else:
+            response = self.api.session.get(url=url, headers=headers)
         if response.status_code == 404:
             raise APIError(response.status_code, response.content)
-        else:
-            attr = convert_json(json.loads(response.content), camel_to_snake)
-        for key in attr:
-            setattr(self, key, attr[key])
+
+        # any other error (e.g. an expired access token) is left to the error handler
+        elif 200 <= response.status_code < 300:
+            attr = decode_response(response)
+            for key in attr:
+                setattr(self, key, attr[key])
 
         return response
 
     def update(self):
         """Generic PUT request."""
-
-        return requests.put(
+        response = self.api.session.put(
             url=self.api.base_url + self.update_url_suffix,
             headers={"Authorization": "Bearer " + self.api.access_token},
             json=convert_json(self.__dict__, snake_to_camel)
         )
+        _invalidate_disk_cache(self, response)
+
+        return response
 
     def __init__(self, api, **kwargs):
         self.api = api
@@ -1,10 +1,139 @@
 import copy
 import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 
 from plantpredict.plant_predict_entity import PlantPredictEntity
-from plantpredict.error_handlers import handle_refused_connection, handle_error_response
+from plantpredict.cache import EntityCache
+from plantpredict.helpers import iter_rows
+from plantpredict.error_handlers import handle_error_response
 from plantpredict.enumerations import ModuleOrientationEnum, TrackingTypeEnum, FacialityEnum
 
+# DC field parameters that default to the attribute of the same name of the module
+MODULE_DEFAULT_DC_FIELD_PARAMETERS = [
+    "module_quality", "module_mismatch_coefficient", "light_induced_degradation", "heat_balance_conductive_coef",
+    "heat_balance_convective_coef", "sandia_conductive_coef", "sandia_convective_coef", "cell_to_module_temp_diff"
+]
+
+# columns of a power plant layout (see PowerPlant.add_layout) read once per block, array and inverter, with the argument
+# of add_block, add_array and add_inverter they are passed as
+LAYOUT_BLOCK_COLUMNS = {
+    "use_energization_date": "use_energization_date",
+    "energization_date": "energization_date",
+}
+LAYOUT_ARRAY_COLUMNS = {
+    "array_repeater": "repeater",
+    "transformer_enabled": "transformer_enabled",
+    "match_total_inverter_kva": "match_total_inverter_kva",
+    "transformer_kva_rating": "transformer_kva_rating",
+    "ac_collection_loss": "ac_collection_loss",
+    "das_load": "das_load",
+    "cooling_load": "cooling_load",
+    "additional_losses": "additional_losses",
+    "transformer_high_side_voltage": "transformer_high_side_voltage",
+    "transformer_no_load_loss": "transformer_no_load_loss",
+    "transformer_full_load_loss": "transformer_full_load_loss",
+    "array_description": "description",
+}
+LAYOUT_INVERTER_COLUMNS = {
+    "setpoint_kw": "setpoint_kw",
+    "power_factor": "power_factor",
+    "inverter_repeater": "repeater",
+}
+
+# DC field columns of a power plant layout, with the same defaults as the arguments of add_dc_field
+LAYOUT_DC_FIELD_COLUMNS = {
+    "module_id": None,
+    "tracking_type": None,
+    "modules_high": None,
+    "modules_wired_in_series": None,
+    "post_to_post_spacing": None,
+    "number_of_rows": 1,
+    "modules_wide": None,
+    "field_dc_power": None,
+    "number_of_series_strings_wired_in_parallel": None,
+    "module_tilt": None,
+    "module_orientation": None,
+    "module_azimuth": None,
+    "tracking_backtracking_type": None,
+    "minimum_tracking_limit_angle_d": -60.0,
+    "maximum_tracking_limit_angle_d": 60.0,
+    "lateral_intermodule_gap": 0.02,
+    "vertical_intermodule_gap": 0.02,
+    "table_to_table_spacing": 0.0,
+    "tables_removed_for_pcs": 0,
+    "module_quality": None,
+    "module_mismatch_coefficient": None,
+    "light_induced_degradation": None,
+    "dc_wiring_loss_at_stc": 1.5,
+    "dc_health": 1.0,
+    "heat_balance_conductive_coef": None,
+    "heat_balance_convective_coef": None,
+    "sandia_conductive_coef": None,
+    "sandia_convective_coef": None,
+    "cell_to_module_temp_diff": None,
+    "tracker_load_loss": 0.0,
+    "post_height": None,
+    "structure_shading": 0.0,
+    "backside_mismatch": None,
+}
+LAYOUT_REQUIRED_COLUMNS = [
+    "block", "array", "inverter", "inverter_id", "module_id", "tracking_type", "modules_high",
+    "modules_wired_in_series", "post_to_post_spacing"
+]
+
+# layout columns holding integers, which are read as floats from columns with blank cells
+LAYOUT_INTEGER_COLUMNS = {
+    "inverter_id", "module_id", "tracking_type", "tracking_backtracking_type", "module_orientation", "modules_high",
+    "modules_wired_in_series", "modules_wide", "array_repeater", "inverter_repeater"
+}
+
+
+def _read_layout(layout, sheet_name=None):
+    """
+    Reads a power plant layout from a DataFrame, a list of dictionaries, or the path to a .csv or Excel file.
+
+    :return: The layout, with one row per DC field.
+    :rtype: pandas.DataFrame
+    """
+    if isinstance(layout, pd.DataFrame):
+        return layout.reset_index(drop=True)
+    if isinstance(layout, str):
+        if layout.lower().endswith(".csv"):
+            return pd.read_csv(layout)
+        return pd.DataFrame(list(iter_rows(layout, sheet_name)))
+
+    return pd.DataFrame(list(layout))
+
+
+def _get_layout_value(row, column, default=None):
+    """Returns the value of a column in a layout row, or a default if the column is missing or the cell is blank."""
+    value = row.get(column)
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return default
+    if column in LAYOUT_INTEGER_COLUMNS and isinstance(value, float) and value.is_integer():
+        return int(value)
+
+    return value
+
+
+def _get_inverter_name(index):
+    """
+    Returns the name of the inverter at a given position in its array, in the same sequence as spreadsheet columns:
+    :py:data:`"A"` to :py:data:`"Z"`, then :py:data:`"AA"`, :py:data:`"AB"`, etc.
+
+    :param int index: Position of the inverter in its array (0-indexed).
+    :return: Name of the inverter.
+    :rtype: str
+    """
+    name = ""
+    index += 1
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        name = chr(ord("A") + remainder) + name
+
+    return name
+
 
 class PowerPlant(PlantPredictEntity):
     """
@@ -60,6 +189,14 @@ class PowerPlant(PlantPredictEntity):
                                   :py:data:`False`, the :py:attr:`kva_rating` of each inverter in the power plant is set
                                   as the :py:attr:`apparent_power` of the inverter model specified by
                                   :py:data:`inverter_id`.
+    :param float cache_ttl: Number of seconds that modules, inverters and other entities retrieved by the builder
+                            methods are reused before being retrieved again. Defaults to :py:data:`None` (reused until
+                            :py:meth:`~plantpredict.powerplant.PowerPlant.invalidate_cache` is called).
+    :param bool local_kva: If :py:data:`True`, the :py:attr:`kva_rating` of inverters (with :py:data:`use_cooling_temp`)
+                           is evaluated locally from the inverter's :py:attr:`kva_curves` with
+                           :py:meth:`~plantpredict.inverter.Inverter.interpolate_kva`, rather than requested from the
+                           kVA endpoint for each inverter model and site. Defaults to :py:data:`False`, as the local
+                           evaluation has not been checked against the endpoint for every inverter.
     :param float lgia_limitation: Maximum power output limit for power plant according to its Large Generator
                                   Interconnection Agreement (LGIA). Must be between :py:data:`0` and :py:data:`2000` -
                                   units :py:data:`[MWac]`.
@@ -311,7 +448,7 @@ class PowerPlant(PlantPredictEntity):
         for block in self.blocks:
             for array in block['arrays']:
                 for inverter in array['inverters']:
-                    num_inverters.append(inverter['repeater'] * array['repeater'] * block['repeater'])
+                    num_inverters.append(inverter['repeater'] * array['repeater'] * block.get('repeater', 1))
 
         return sum(num_inverters)
 
@@ -382,16 +519,62 @@ class PowerPlant(PlantPredictEntity):
         except AttributeError:
             self.transmission_lines = [transmission_line]
 
+    def _index_block(self, block):
+        self._block_index[block["name"]] = block
+        if "id" in block:
+            self._block_id_index.setdefault(block["id"], block)
+        for array in block.get("arrays") or []:
+            self._index_array(block["name"], array)
+
+    def _index_array(self, block_name, array):
+        self._array_index[(block_name, array["name"])] = array
+        for inverter in array.get("inverters") or []:
+            self._index_inverter(block_name, array["name"], inverter)
+
+    def _index_inverter(self, block_name, array_name, inverter):
+        self._inverter_index[(block_name, array_name, inverter["name"])] = inverter
+
+    def reindex(self):
+        """
+        Rebuilds the index of blocks, arrays and inverters (by name, and blocks by id) used to look them up in constant
+        time. The index is maintained by the "power plant builder" methods and rebuilt automatically when
+        :py:attr:`blocks` is replaced (e.g. by :py:meth:`~plantpredict.powerplant.PowerPlant.get`) or does not contain a
+        name being looked up, so this only needs to be called after removing or renaming blocks, arrays or inverters
+        by hand.
+        """
+        self._indexed_blocks = self.blocks
+        self._block_index = {}
+        self._block_id_index = {}
+        self._array_index = {}
+        self._inverter_index = {}
+        for block in self.blocks or []:
+            self._index_block(block)
+
+    def _lookup(self, index_name, key):
+        if self._indexed_blocks is not self.blocks:
+            self.reindex()
+
+        # a miss may be an element appended to blocks by hand, so the index is rebuilt once before giving up
+        if key not in getattr(self, index_name):
+            self.reindex()
+
+        return getattr(self, index_name).get(key)
+
     def _validate_block_name(self, block_name):
         """
         Checks that a given block with name `block_name` exists the power plant structure.
 
         :param int block_name: Name of block. Can be found as key `name` in each dictionary item of list `self.blocks`.
         :raises ValueError: Raised if no blocks in `self.blocks` have the name `block_name`.
+        :return: The block.
+        :rtype: dict
         """
-        if block_name not in [b['name'] for b in self.blocks]:
+        block = self._lookup("_block_index", block_name)
+        if block is None:
             raise ValueError("{} is not a valid block name in the existing power plant structure.".format(block_name))
 
+        return block
+
     def _validate_array_name(self, block_name, array_name):
         """
         Checks that a given block with name `block_name` exists the power plant structure, and if so, that a given array
@@ -402,12 +585,17 @@ class PowerPlant(PlantPredictEntity):
                                `self.blocks[i]["arrays"]`, where `i` is some valid integer index.
         :raises ValueError: Raised if no blocks in `self.blocks` have the name `block_name`. Also raised if `block_name`
                             is valid but there is no array in the block with name `array_name`.
+        :return: The array.
+        :rtype: dict
         """
         self._validate_block_name(block_name)
 
-        if array_name not in [a['name'] for a in self.blocks[block_name - 1]['arrays']]:
+        array = self._lookup("_array_index", (block_name, array_name))
+        if array is None:
             raise ValueError("{} is not a valid array name in block {}.".format(array_name, block_name))
 
+        return array
+
     def _validate_inverter_name(self, block_name, array_name, inverter_name):
         """
         Checks that a given block with name `block_name` exists the power plant structure, and if so, that a given array
@@ -422,16 +610,58 @@ class PowerPlant(PlantPredictEntity):
                                   indices.
         :raises ValueError: Raised if no blocks in `self.blocks` have the name `block_name`. Also raised if `block_name`
                             is valid but there is no array in the block with name `array_name`.
+        :return: The inverter.
+        :rtype: dict
         """
-        self._validate_block_name(block_name)
         self._validate_array_name(block_name, array_name)
 
-        if inverter_name not in [i['name'] for i in self.blocks[block_name - 1]['arrays'][array_name - 1]['inverters']]:
+        inverter = self._lookup("_inverter_index", (block_name, array_name, inverter_name))
+        if inverter is None:
             raise ValueError(
                 "'{}' is not a valid inverter name in array {} of block {}.".format(inverter_name, array_name,
                                                                                     block_name))
 
-    @handle_refused_connection
+        return inverter
+
+    def get_block(self, block_name):
+        """
+        Returns the block with a given name, from an index of the power plant structure (see
+        :py:meth:`~plantpredict.powerplant.PowerPlant.reindex`).
+
+        :param int block_name: Name of the block.
+        :raises ValueError: Raised if there is no block named :py:data:`block_name`.
+        :return: The block dictionary (as stored in :py:attr:`blocks`).
+        :rtype: dict
+        """
+        return self._validate_block_name(block_name)
+
+    def get_array(self, block_name, array_name):
+        """
+        Returns the array with a given name in a given block, from an index of the power plant structure (see
+        :py:meth:`~plantpredict.powerplant.PowerPlant.reindex`).
+
+        :param int block_name: Name of the parent block.
+        :param int array_name: Name of the array.
+        :raises ValueError: Raised if there is no such block or array.
+        :return: The array dictionary (as stored in :py:attr:`blocks`).
+        :rtype: dict
+        """
+        return self._validate_array_name(block_name, array_name)
+
+    def get_inverter(self, block_name, array_name, inverter_name):
+        """
+        Returns the inverter with a given name in a given array, from an index of the power plant structure (see
+        :py:meth:`~plantpredict.powerplant.PowerPlant.reindex`).
+
+        :param int block_name: Name of the parent block.
+        :param int array_name: Name of the parent array.
+        :param str inverter_name: Name of the inverter.
+        :raises ValueError: Raised if there is no such block, array or inverter.
+        :return: The inverter dictionary (as stored in :py:attr:`blocks`).
+        :rtype: dict
+        """
+        return self._validate_inverter_name(block_name, array_name, inverter_name)
+
     @handle_error_response
     def add_block(self, use_energization_date=False, energization_date=""):
         """
@@ -465,9 +695,11 @@ class PowerPlant(PlantPredictEntity):
         except AttributeError:
             self.blocks = [block]
 
-        return self.blocks[-1]["name"]
+        if self._indexed_blocks is self.blocks:
+            self._index_block(block)
+
+        return block["name"]
 
-    @handle_refused_connection
     @handle_error_response
     def clone_block(self, block_id_to_clone):
         """
@@ -488,15 +720,40 @@ class PowerPlant(PlantPredictEntity):
         :return: Name of newly cloned block.
         :rtype: int
         """
-        block_to_clone = [b for b in self.blocks if b['id'] == block_id_to_clone][0]
+        block_name = self._append_block_copy(block_id_to_clone)
+        try:
+            self.update()
+        except Exception:
+            self._remove_last_block()
+            raise
+
+        return block_name
+
+    def _append_block_copy(self, block_id_to_clone):
+        """
+        Appends (and indexes) a copy of the block specified by its unique identifier, named sequentially.
+
+        :param int block_id_to_clone: Unique identifier of the block to copy.
+        :return: Name of the appended block.
+        :rtype: int
+        """
+        block_to_clone = self._lookup("_block_id_index", block_id_to_clone)
+        if block_to_clone is None:
+            raise ValueError("{} is not a valid block id in the existing power plant structure.".format(
+                block_id_to_clone))
+
         block_copy = copy.deepcopy(block_to_clone)
         block_copy["name"] = len(self.blocks) + 1
         self.blocks.append(block_copy)
-        self.update()
+        self._index_block(block_copy)
 
-        return self.blocks[-1]["name"]
+        return block_copy["name"]
+
+    def _remove_last_block(self):
+        # leaves the power plant as it was before a block was appended whose addition could not be persisted
+        self.blocks.pop()
+        self.reindex()
 
-    @handle_refused_connection
     @handle_error_response
     def add_array(self, block_name, transformer_enabled=True, match_total_inverter_kva=True,
                   transformer_kva_rating=None, repeater=1, ac_collection_loss=1, das_load=800, cooling_load=0.0,
@@ -557,10 +814,10 @@ class PowerPlant(PlantPredictEntity):
         :return: The name of the newly added array.
         :rtype: int
         """
-        self._validate_block_name(block_name)
+        block = self._validate_block_name(block_name)
 
         array = {
-            "name": len(self.blocks[block_name - 1]["arrays"]) + 1,
+            "name": len(block["arrays"]) + 1,
             "repeater": repeater,
             "ac_collection_loss": ac_collection_loss,
             "das_load": das_load,
@@ -577,11 +834,63 @@ class PowerPlant(PlantPredictEntity):
         if not match_total_inverter_kva:
             array.update({"transformer_kva_rating": transformer_kva_rating})
 
-        self.blocks[block_name - 1]["arrays"].append(array)
+        block["arrays"].append(array)
+        self._index_array(block_name, array)
+
+        return array["name"]
+
+    def invalidate_cache(self, *key_prefix):
+        """
+        Discards entities cached while building the power plant, so that they are retrieved from PlantPredict again the
+        next time they are needed. Modules, inverters, the project, the prediction and ASHRAE stations used by
+        :py:meth:`~plantpredict.powerplant.PowerPlant.add_inverter` and
+        :py:meth:`~plantpredict.powerplant.PowerPlant.add_dc_field` are cached for the lifetime of the instance (or
+        :py:attr:`cache_ttl` seconds, if specified).
+
+        .. code-block:: python
+
+            powerplant.invalidate_cache("module", 456)      # a single module
+            powerplant.invalidate_cache("inverter")         # all inverters
+            powerplant.invalidate_cache()                   # everything
+
+        :param key_prefix: Kind of entity (:py:data:`"module"`, :py:data:`"inverter"`, :py:data:`"inverter_kva"`,
+                           :py:data:`"project"`, :py:data:`"prediction"` or :py:data:`"ashrae"`) optionally followed by
+                           its unique identifier.
+        """
+        self._entity_cache.invalidate(*key_prefix)
+
+    def _get_project(self):
+        def fetch():
+            project = self.api.project(id=self.project_id)
+            project.get()
+            return project
+
+        return self._entity_cache.get(("project", self.project_id), fetch)
+
+    def _get_prediction(self):
+        def fetch():
+            prediction = self.api.prediction(id=self.prediction_id, project_id=self.project_id)
+            prediction.get()
+            return prediction
 
-        return self.blocks[block_name - 1]["arrays"][-1]["name"]
+        return self._entity_cache.get(("prediction", self.prediction_id), fetch)
+
+    def _get_ashrae_station(self, latitude, longitude, station_name):
+        def fetch():
+            ashrae = self.api.ashrae(latitude=latitude, longitude=longitude, station_name=station_name)
+            ashrae.get_station()
+            return ashrae
+
+        return self._entity_cache.get(("ashrae", station_name, latitude, longitude), fetch)
+
+    def _get_inverter(self, inverter_id):
+        def fetch():
+            inverter = self.api.inverter(id=inverter_id)
+            inverter.get()
+            return inverter
+
+        return self._entity_cache.get(("inverter", inverter_id), fetch)
 
-    @handle_refused_connection
     @handle_error_response
     def _get_inverter_apparent_power(self, inverter_id):
         """
@@ -591,12 +900,8 @@ class PowerPlant(PlantPredictEntity):
         :return: Apparent power of inverter model - units `[kVA]`.
         :rtype: float
         """
-        inverter = self.api.inverter(id=inverter_id)
-        inverter.get()
-
-        return inverter.apparent_power
+        return self._get_inverter(inverter_id).apparent_power
 
-    @handle_refused_connection
     @handle_error_response
     def _get_inverter_kva_rating(self, inverter_id):
         """
@@ -609,27 +914,47 @@ class PowerPlant(PlantPredictEntity):
         :rtype: float
         """
         # retrieve ASHRAE station based on latitude and longitude of project associated with power plant
-        project = self.api.project(id=self.project_id)
-        project.get()
-        prediction = self.api.prediction(id=self.prediction_id, project_id=self.project_id)
-        prediction.get()
-        ashrae = self.api.ashrae(
-            latitude=project.latitude,
-            longitude=project.longitude,
-            station_name=prediction.ashrae_station
-        )
-        ashrae.get_station()
+        project = self._get_project()
+        prediction = self._get_prediction()
+        ashrae = self._get_ashrae_station(project.latitude, project.longitude, prediction.ashrae_station)
+
+        # if enabled, evaluate the inverter's kVA curves locally (falling back to the endpoint if they can't be read)
+        if self._local_kva:
+            kva = self._interpolate_inverter_kva(self._get_inverter(inverter_id), project.elevation, ashrae.cool_996)
+            if kva is not None:
+                return kva
 
         # use the kVA endpoint to calculate the kVA with elevation and 99.6 cooling temp of nearest ASHRAE station
-        inverter = self.api.inverter(id=inverter_id)
-        response = inverter.get_kva(
-            elevation=project.elevation,
-            temperature=ashrae.cool_996,
-            use_cooling_temp=self.use_cooling_temp
-        )
+        def fetch():
+            inverter = self.api.inverter(id=inverter_id)
+            return inverter.get_kva(
+                elevation=project.elevation,
+                temperature=ashrae.cool_996,
+                use_cooling_temp=self.use_cooling_temp
+            )
+
+        response = self._entity_cache.get(self._get_inverter_kva_key(inverter_id, project, ashrae), fetch)
 
         return response['kva']
 
+    @staticmethod
+    def _interpolate_inverter_kva(inverter, elevation, temperature):
+        """
+        :return: The kVA rating evaluated from the kVA curves of the inverter, or :py:data:`None` if it has none that
+                 can be read.
+        :rtype: float, None
+        """
+        if isinstance(getattr(inverter, "kva_curves", None), list) and inverter.kva_curves:
+            try:
+                return inverter.interpolate_kva(elevation, temperature)
+            except ValueError:
+                pass
+
+        return None
+
+    def _get_inverter_kva_key(self, inverter_id, project, ashrae):
+        return "inverter_kva", inverter_id, project.elevation, ashrae.cool_996, self.use_cooling_temp
+
     @staticmethod
     def _validate_inverter_setpoint_inputs(setpoint_kw, power_factor, kva_rating):
         """
@@ -660,7 +985,6 @@ class PowerPlant(PlantPredictEntity):
 
         return setpoint_kw, power_factor
 
-    @handle_refused_connection
     @handle_error_response
     def add_inverter(self, block_name, array_name, inverter_id, setpoint_kw=None, power_factor=1.0, repeater=1):
         """
@@ -670,8 +994,9 @@ class PowerPlant(PlantPredictEntity):
         if there are 2 existing inverters with names :py:data:`"A"` and :py:data:`"B"` (accessible via key
         :py:data:`name` for a given inverter dictionary), the next array created by
         :py:meth:`~plantpredict.powerplant.PowerPlant.add_inverter` will automatically have :py:data:`name` equal to
-        :py:data:`"C"`. This method does not currently account for the situation in which an existing power plant has
-        inverters named non-sequentially.
+        :py:data:`"C"`, and inverters after :py:data:`"Z"` are named :py:data:`"AA"`, :py:data:`"AB"`, etc. This method
+        does not currently account for the situation in which an existing power plant has inverters named
+        non-sequentially.
 
         The inverter :py:data:'kva_rating` will be set based on the power plant-level attribute
         :py:attr:`use_cooling_temp`. If :py:attr:`use_cooling_temp` is :py:data:`True`, this value is automatically
@@ -713,23 +1038,25 @@ class PowerPlant(PlantPredictEntity):
         :rtype: str
         """
         # validate and prepare inverter parameters
-        self._validate_array_name(block_name, array_name)
+        array = self._validate_array_name(block_name, array_name)
 
         kva_rating = (self._get_inverter_kva_rating(inverter_id) if self.use_cooling_temp
                       else self._get_inverter_apparent_power(inverter_id))
         setpoint_kw, power_factor = self._validate_inverter_setpoint_inputs(setpoint_kw, power_factor, kva_rating)
 
-        self.blocks[block_name - 1]["arrays"][array_name - 1]["inverters"].append({
-            "name": chr(ord("A") + len(self.blocks[block_name - 1]["arrays"][array_name - 1]["inverters"])),
+        inverter = {
+            "name": _get_inverter_name(len(array["inverters"])),
             "repeater": repeater,
             "inverter_id": inverter_id,
             "setpoint_kw": setpoint_kw,
             "power_factor": power_factor,
             "dc_fields": [],
             "kva_rating": kva_rating
-        })
+        }
+        array["inverters"].append(inverter)
+        self._index_inverter(block_name, array_name, inverter)
 
-        return self.blocks[block_name - 1]["arrays"][array_name - 1]["inverters"][-1]["name"]
+        return inverter["name"]
 
     def _get_default_module_azimuth_from_latitude(self):
         """
@@ -742,12 +1069,26 @@ class PowerPlant(PlantPredictEntity):
                  `[degrees]`.
         :rtype: float
         """
-        p = self.api.project(id=self.project_id)
-        p.get()
+        p = self._get_project()
         azimuth = 180.0 if p.latitude >= 0.0 else 0.0
 
         return azimuth
 
+    def _get_module(self, module_id):
+        """
+        Retrieves the module specified by its unique identifier, for use in sizing and defaulting DC field parameters.
+
+        :param int module_id: Unique identifier of a Module in the PlantPredict Module database.
+        :return: Module with all of its attributes retrieved.
+        :rtype: plantpredict.module.Module
+        """
+        def fetch():
+            m = self.api.module(id=module_id)
+            m.get()
+            return m
+
+        return self._entity_cache.get(("module", module_id), fetch)
+
     @staticmethod
     def _calculate_collector_bandwidth(module_width, module_length, module_orientation, modules_high,
                                        vertical_intermodule_gap):
@@ -983,7 +1324,6 @@ class PowerPlant(PlantPredictEntity):
 
         return field_dc_power, number_of_series_strings_wired_in_parallel
 
-    @handle_refused_connection
     @handle_error_response
     def calculate_post_to_post_spacing_from_gcr(self, ground_coverage_ratio, module_id, modules_high,
                                                 module_orientation=None, vertical_intermodule_gap=0.02):
@@ -1007,8 +1347,7 @@ class PowerPlant(PlantPredictEntity):
         :return: Post to post spacing (row spacing) of DC field - units :py:data:`[m]`.
         :rtype: float
         """
-        m = self.api.module(id=module_id)
-        m.get()
+        m = self._get_module(module_id)
 
         collector_bandwidth = self._calculate_collector_bandwidth(
             module_width=m.width,
@@ -1093,7 +1432,44 @@ class PowerPlant(PlantPredictEntity):
 
         return max(post_height, 1.5)
 
-    @handle_refused_connection
+    def _make_dc_field(self, m, post_height=None, structure_shading=0.0, backside_mismatch=None, **dc_field):
+        """
+        Completes the dictionary of a DC field, as added by :py:meth:`~plantpredict.powerplant.PowerPlant.add_dc_field`,
+        from its parameters and calculated dimensions. Loss and thermal parameters left as :py:data:`None` are set to
+        those of the module, and the bifacial parameters are added if the module is bifacial.
+
+        :param plantpredict.module.Module m: Module used in the DC field.
+        :param dc_field: DC field name, parameters and calculated dimensions.
+        :return: The DC field.
+        :rtype: dict
+        """
+        # module count confirmed calculation in PlantPredict backend
+        dc_field.update({
+            "planned_module_rating": m.stc_max_power,
+            "module_count": 1000*dc_field["field_dc_power"]/m.stc_max_power
+        })
+        for key in MODULE_DEFAULT_DC_FIELD_PARAMETERS:
+            if dc_field.get(key) is None:
+                dc_field[key] = getattr(m, key)
+        if dc_field.get("module_azimuth") is None:
+            dc_field["module_azimuth"] = self._get_default_module_azimuth_from_latitude()
+
+        # add bifacial parameters if module is bifacial
+        if m.faciality == FacialityEnum.BIFACIAL:
+            dc_field.update({
+                "post_height": (
+                    post_height if post_height is not None
+                    else self._calculate_default_post_height(dc_field["tracking_type"], dc_field["collector_bandwidth"],
+                                                             dc_field["module_tilt"],
+                                                             dc_field["minimum_tracking_limit_angle_d"],
+                                                             dc_field["maximum_tracking_limit_angle_d"])
+                    ),
+                "structure_shading": structure_shading,
+                "backside_mismatch": backside_mismatch if backside_mismatch is not None else m.backside_mismatch
+            })
+
+        return dc_field
+
     @handle_error_response
     def add_dc_field(self, block_name, array_name, inverter_name, module_id, tracking_type, modules_high,
                      modules_wired_in_series, post_to_post_spacing, number_of_rows=1, modules_wide=None,
@@ -1305,12 +1681,12 @@ class PowerPlant(PlantPredictEntity):
             raise ValueError("Seasonal Tilt is not currently supported by the add_dc_field method.")
 
         # validate inputs
-        self._validate_inverter_name(block_name=block_name, array_name=array_name, inverter_name=inverter_name)
+        inverter = self._validate_inverter_name(block_name=block_name, array_name=array_name,
+                                                inverter_name=inverter_name)
         self._validate_mounting_structure_parameters(tracking_type, module_tilt, tracking_backtracking_type)
 
         # calculate parameters typically calculated in the UI
-        m = self.api.module(id=module_id)
-        m.get()
+        m = self._get_module(module_id)
         field_dc_power, number_of_series_strings_wired_in_parallel = self._validate_dc_field_sizing(
             field_dc_power=field_dc_power,
             number_of_series_strings_wired_in_parallel=number_of_series_strings_wired_in_parallel,
@@ -1341,84 +1717,308 @@ class PowerPlant(PlantPredictEntity):
             tables_removed_for_pcs=tables_removed_for_pcs,
             number_of_rows=number_of_rows
         )
-        self.blocks[block_name - 1]["arrays"][array_name - 1]["inverters"][ord(inverter_name) - 65]["dc_fields"].append(
-            {
-                "name": len(self.blocks[block_name - 1]["arrays"][array_name - 1]["inverters"][
-                                ord(inverter_name) - 65]["dc_fields"]) + 1,
-                "module_id": module_id,
-                "tracking_type": tracking_type,
-                "module_tilt": module_tilt,
-                "tracking_backtracking_type": tracking_backtracking_type,
-                "minimum_tracking_limit_angle_d": minimum_tracking_limit_angle_d,
-                "maximum_tracking_limit_angle_d": maximum_tracking_limit_angle_d,
-                "module_orientation": module_orientation,
-                "modules_high": modules_high,
-                "module_azimuth": (module_azimuth if module_azimuth is not None
-                                   else self._get_default_module_azimuth_from_latitude()),
-                "collector_bandwidth": collector_bandwidth,
-                "post_to_post_spacing": post_to_post_spacing,
-                # Electrical
-                "planned_module_rating": m.stc_max_power,
-                "modules_wired_in_series": modules_wired_in_series,
-                "field_dc_power": field_dc_power,
-                "number_of_series_strings_wired_in_parallel": number_of_series_strings_wired_in_parallel,
-                "module_count": 1000*field_dc_power/m.stc_max_power,    # confirmed calculation in PlantPredict backend
-                # Losses
-                "module_quality": module_quality if module_quality is not None else m.module_quality,
-                "module_mismatch_coefficient": (module_mismatch_coefficient if module_mismatch_coefficient is not None
-                                                else m.module_mismatch_coefficient),
-                "light_induced_degradation": (light_induced_degradation if light_induced_degradation is not None else
-                                              m.light_induced_degradation),
-                "dc_wiring_loss_at_stc": dc_wiring_loss_at_stc,
-                "dc_health": dc_health,
-                "heat_balance_conductive_coef": (heat_balance_conductive_coef if heat_balance_conductive_coef is not
-                                                 None else m.heat_balance_conductive_coef),
-                "heat_balance_convective_coef": (heat_balance_convective_coef if heat_balance_convective_coef is not
-                                                 None else m.heat_balance_convective_coef),
-                "sandia_conductive_coef": (sandia_conductive_coef if sandia_conductive_coef is not None
-                                           else m.sandia_conductive_coef),
-                "cell_to_module_temp_diff": (cell_to_module_temp_diff if cell_to_module_temp_diff is not None else
-                                             m.cell_to_module_temp_diff),
-                "sandia_convective_coef": (sandia_convective_coef if sandia_convective_coef is not None
-                                           else m.sandia_convective_coef),
-                "tracker_load_loss": tracker_load_loss,
-                # Advanced Fields
-                "lateral_intermodule_gap": lateral_intermodule_gap,
-                "vertical_intermodule_gap": vertical_intermodule_gap,
-                "modules_wide": modules_wide,
-                "table_to_table_spacing": table_to_table_spacing,
-                "number_of_rows": number_of_rows,
-                "table_length": table_length,
-                "tables_per_row": tables_per_row,
-                "tables_removed_for_pcs": tables_removed_for_pcs,
-                "field_length": self._calculate_dc_field_length(tables_per_row, module_orientation, m.length, m.width,
-                                                                lateral_intermodule_gap, modules_wide, tracking_type,
-                                                                number_of_rows, post_to_post_spacing,
-                                                                collector_bandwidth),
-                "field_width": self._calculate_dc_field_width(tracking_type, number_of_rows, post_to_post_spacing,
-                                                              collector_bandwidth, tables_per_row, module_orientation,
-                                                              m.length, m.width, lateral_intermodule_gap, modules_wide)
-            }
+        inverter["dc_fields"].append(self._make_dc_field(
+            m,
+            name=len(inverter["dc_fields"]) + 1,
+            module_id=module_id,
+            tracking_type=tracking_type,
+            module_tilt=module_tilt,
+            tracking_backtracking_type=tracking_backtracking_type,
+            minimum_tracking_limit_angle_d=minimum_tracking_limit_angle_d,
+            maximum_tracking_limit_angle_d=maximum_tracking_limit_angle_d,
+            module_orientation=module_orientation,
+            modules_high=modules_high,
+            module_azimuth=module_azimuth,
+            collector_bandwidth=collector_bandwidth,
+            post_to_post_spacing=post_to_post_spacing,
+            modules_wired_in_series=modules_wired_in_series,
+            field_dc_power=field_dc_power,
+            number_of_series_strings_wired_in_parallel=number_of_series_strings_wired_in_parallel,
+            module_quality=module_quality,
+            module_mismatch_coefficient=module_mismatch_coefficient,
+            light_induced_degradation=light_induced_degradation,
+            dc_wiring_loss_at_stc=dc_wiring_loss_at_stc,
+            dc_health=dc_health,
+            heat_balance_conductive_coef=heat_balance_conductive_coef,
+            heat_balance_convective_coef=heat_balance_convective_coef,
+            sandia_conductive_coef=sandia_conductive_coef,
+            cell_to_module_temp_diff=cell_to_module_temp_diff,
+            sandia_convective_coef=sandia_convective_coef,
+            tracker_load_loss=tracker_load_loss,
+            lateral_intermodule_gap=lateral_intermodule_gap,
+            vertical_intermodule_gap=vertical_intermodule_gap,
+            modules_wide=modules_wide,
+            table_to_table_spacing=table_to_table_spacing,
+            number_of_rows=number_of_rows,
+            table_length=table_length,
+            tables_per_row=tables_per_row,
+            tables_removed_for_pcs=tables_removed_for_pcs,
+            field_length=self._calculate_dc_field_length(tables_per_row, module_orientation, m.length, m.width,
+                                                         lateral_intermodule_gap, modules_wide, tracking_type,
+                                                         number_of_rows, post_to_post_spacing, collector_bandwidth),
+            field_width=self._calculate_dc_field_width(tracking_type, number_of_rows, post_to_post_spacing,
+                                                       collector_bandwidth, tables_per_row, module_orientation,
+                                                       m.length, m.width, lateral_intermodule_gap, modules_wide),
+            post_height=post_height,
+            structure_shading=structure_shading,
+            backside_mismatch=backside_mismatch
+        ))
+
+        return inverter["dc_fields"][-1]["name"]
+
+    @staticmethod
+    def _calculate_dc_field_geometry(module_width, module_length, module_orientation, modules_high, modules_wide,
+                                     vertical_intermodule_gap, lateral_intermodule_gap, field_dc_power,
+                                     planned_module_rating, tables_removed_for_pcs, number_of_rows,
+                                     post_to_post_spacing, tracking_type):
+        """
+        Calculates the collector bandwidth, table length, tables per row, and field length and width of many DC fields
+        at once. Takes an array per parameter (with one element per DC field) and uses the same equations as
+        :py:meth:`~plantpredict.powerplant.PowerPlant._calculate_collector_bandwidth`,
+        :py:meth:`~plantpredict.powerplant.PowerPlant._calculate_table_length`,
+        :py:meth:`~plantpredict.powerplant.PowerPlant._calculate_tables_per_row`,
+        :py:meth:`~plantpredict.powerplant.PowerPlant._calculate_dc_field_length` and
+        :py:meth:`~plantpredict.powerplant.PowerPlant._calculate_dc_field_width`.
+
+        :return: Dictionary with an array per calculated DC field parameter.
+        :rtype: dict
+        """
+        landscape = module_orientation == ModuleOrientationEnum.LANDSCAPE
+        tracker = tracking_type == TrackingTypeEnum.HORIZONTAL_TRACKER
+
+        collector_bandwidth = (modules_high * np.where(landscape, module_width, module_length) / 1000.0 +
+                               (modules_high - 1) * vertical_intermodule_gap)
+        module_dimension = np.where(landscape, module_length / 1000.0, module_width / 1000.0)
+        table_length = modules_wide*module_dimension + lateral_intermodule_gap*(modules_wide - 1)
+
+        total_tables = 1000*field_dc_power / planned_module_rating / (modules_high * modules_wide)
+        tables_per_row = (total_tables + tables_removed_for_pcs) / number_of_rows
+
+        size_by_collector_bandwidth = post_to_post_spacing*(number_of_rows - 1) + collector_bandwidth
+        size_by_tables_per_row = ((modules_wide * tables_per_row * (module_dimension + lateral_intermodule_gap)) -
+                                  lateral_intermodule_gap)
+
+        return {
+            "collector_bandwidth": collector_bandwidth,
+            "table_length": table_length,
+            "tables_per_row": tables_per_row,
+            "field_length": np.where(tracker, size_by_tables_per_row, size_by_collector_bandwidth),
+            "field_width": np.where(tracker, size_by_collector_bandwidth, size_by_tables_per_row)
+        }
+
+    def _prefetch_layout_entities(self, module_ids, inverter_ids, max_workers):
+        """
+        Retrieves the modules and inverter kVA ratings used in a layout concurrently, so that they are cached by the
+        time the power plant is built.
+
+        :return: Modules by unique identifier.
+        :rtype: dict
+        """
+        if self.use_cooling_temp:
+            project = self._get_project()
+            prediction = self._get_prediction()
+            self._get_ashrae_station(project.latitude, project.longitude, prediction.ashrae_station)
+
+        get_kva_rating = self._get_inverter_kva_rating if self.use_cooling_temp else self._get_inverter_apparent_power
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            kva_ratings = executor.map(get_kva_rating, inverter_ids)
+            modules = dict(zip(module_ids, executor.map(self._get_module, module_ids)))
+            list(kva_ratings)
+
+        return modules
+
+    @staticmethod
+    def _get_layout_arguments(row, columns):
+        arguments = {}
+        for column, argument in columns.items():
+            value = _get_layout_value(row, column)
+            if value is not None:
+                arguments[argument] = value
+
+        return arguments
+
+    def _prepare_layout_dc_fields(self, rows, modules):
+        """
+        Validates and completes the DC field parameters of each row of a layout, calculating the dimensions of all of
+        the DC fields at once.
+        """
+        dc_fields = []
+        for i, row in enumerate(rows):
+            dc_field = {column: _get_layout_value(row, column, default)
+                        for column, default in LAYOUT_DC_FIELD_COLUMNS.items()}
+            m = modules[dc_field["module_id"]]
+            try:
+                if dc_field["tracking_type"] == TrackingTypeEnum.SEASONAL_TILT:
+                    raise ValueError("Seasonal Tilt is not currently supported by the add_layout method.")
+                self._validate_mounting_structure_parameters(dc_field["tracking_type"], dc_field["module_tilt"],
+                                                             dc_field["tracking_backtracking_type"])
+                dc_field["field_dc_power"], dc_field["number_of_series_strings_wired_in_parallel"] = \
+                    self._validate_dc_field_sizing(
+                        field_dc_power=dc_field["field_dc_power"],
+                        number_of_series_strings_wired_in_parallel=dc_field[
+                            "number_of_series_strings_wired_in_parallel"],
+                        planned_module_rating=m.stc_max_power,
+                        modules_wired_in_series=dc_field["modules_wired_in_series"]
+                    )
+            except ValueError as e:
+                raise ValueError("Row {} of the layout: {}".format(i, e.args[0]))
+
+            if dc_field["module_orientation"] is None:
+                dc_field["module_orientation"] = m.default_orientation
+            if dc_field["modules_wide"] is None:
+                dc_field["modules_wide"] = dc_field["modules_wired_in_series"]
+            dc_fields.append(dc_field)
+
+        def column(key):
+            return np.array([dc_field[key] for dc_field in dc_fields], dtype=float)
+
+        def module_column(key):
+            return np.array([getattr(modules[dc_field["module_id"]], key) for dc_field in dc_fields], dtype=float)
+
+        geometry = self._calculate_dc_field_geometry(
+            module_width=module_column("width"),
+            module_length=module_column("length"),
+            module_orientation=column("module_orientation"),
+            modules_high=column("modules_high"),
+            modules_wide=column("modules_wide"),
+            vertical_intermodule_gap=column("vertical_intermodule_gap"),
+            lateral_intermodule_gap=column("lateral_intermodule_gap"),
+            field_dc_power=column("field_dc_power"),
+            planned_module_rating=module_column("stc_max_power"),
+            tables_removed_for_pcs=column("tables_removed_for_pcs"),
+            number_of_rows=column("number_of_rows"),
+            post_to_post_spacing=column("post_to_post_spacing"),
+            tracking_type=column("tracking_type")
         )
+        for key, values in geometry.items():
+            for dc_field, value in zip(dc_fields, values.tolist()):
+                dc_field[key] = value
+
+        return dc_fields
+
+    def add_layout(self, layout, sheet_name=None, max_workers=4):
+        """
+        A "power plant builder" helper method that adds the blocks, arrays, inverters and DC fields described by a table
+        with one row per DC field, as an alternative to calling
+        :py:meth:`~plantpredict.powerplant.PowerPlant.add_block`,
+        :py:meth:`~plantpredict.powerplant.PowerPlant.add_array`,
+        :py:meth:`~plantpredict.powerplant.PowerPlant.add_inverter` and
+        :py:meth:`~plantpredict.powerplant.PowerPlant.add_dc_field` for each of them. The modules and inverters used in
+        the layout are retrieved once each, concurrently, and the DC field dimensions are calculated for all rows at
+        once.
+
+        The layout columns are:
+
+        * :py:data:`block`, :py:data:`array` and :py:data:`inverter` (required): Labels of the block, array and
+          inverter of the DC field. Rows with the same labels share a block, array or inverter, which are added in order
+          of first appearance and named sequentially as by the other builder methods (so the labels can be any value).
+        * :py:data:`inverter_id` (required), :py:data:`setpoint_kw`, :py:data:`power_factor` and
+          :py:data:`inverter_repeater`: Arguments of :py:meth:`~plantpredict.powerplant.PowerPlant.add_inverter`.
+        * :py:data:`use_energization_date` and :py:data:`energization_date`: Arguments of
+          :py:meth:`~plantpredict.powerplant.PowerPlant.add_block`.
+        * :py:data:`array_repeater`, :py:data:`array_description` and the other arguments of
+          :py:meth:`~plantpredict.powerplant.PowerPlant.add_array` (such as :py:data:`transformer_enabled`).
+        * The arguments of :py:meth:`~plantpredict.powerplant.PowerPlant.add_dc_field` (other than the names of its
+          parents), of which :py:data:`module_id`, :py:data:`tracking_type`, :py:data:`modules_high`,
+          :py:data:`modules_wired_in_series` and :py:data:`post_to_post_spacing` are required.
+
+        Block, array and inverter columns are read from the first row of each block, array and inverter. Missing
+        columns and blank cells take the default values of the corresponding methods.
 
-        # add bifacial parameters if module is bifacial
-        if m.faciality == FacialityEnum.BIFACIAL:
-            self.blocks[block_name - 1]["arrays"][array_name - 1]["inverters"][ord(inverter_name) - 65][
-                "dc_fields"][-1].update({
-                    "post_height": (
-                        post_height if post_height is not None
-                        else self._calculate_default_post_height(tracking_type, collector_bandwidth, module_tilt,
-                                                                 minimum_tracking_limit_angle_d,
-                                                                 maximum_tracking_limit_angle_d)
-                        ),
-                    "structure_shading": structure_shading,
-                    "backside_mismatch": backside_mismatch if backside_mismatch is not None else m.backside_mismatch
-                })
-
-        return self.blocks[
-            block_name - 1]["arrays"][array_name - 1]["inverters"][ord(inverter_name) - 65]["dc_fields"][-1]["name"]
-
-    def __init__(self, api, project_id=None, prediction_id=None, use_cooling_temp=True, **kwargs):
+        Note that this addition is not persisted to PlantPredict unless
+        :py:meth:`~plantpredict.powerplant.PowerPlant.update` is subsequently called (or the power plant is created with
+        :py:meth:`~plantpredict.powerplant.PowerPlant.from_layout`).
+
+        :param layout: Layout as a DataFrame, a list of dictionaries, or the path to a .csv or Excel file.
+        :type layout: pandas.DataFrame, list of dict, str
+        :param str sheet_name: Sheet of the Excel file to read (optional, defaults to the first sheet).
+        :param int max_workers: Maximum number of modules and inverters retrieved concurrently.
+        :raises ValueError: Raised if a required column is missing, if an inverter label is used with different
+                            :py:data:`inverter_id` values, or if the DC field parameters of a row are not valid (as in
+                            :py:meth:`~plantpredict.powerplant.PowerPlant.add_dc_field`).
+        """
+        layout = _read_layout(layout, sheet_name)
+        missing_columns = [column for column in LAYOUT_REQUIRED_COLUMNS if column not in layout.columns]
+        if missing_columns:
+            raise ValueError("The layout is missing the required column(s): {}.".format(", ".join(missing_columns)))
+
+        rows = layout.to_dict("records")
+        inverter_ids = {}
+        for i, row in enumerate(rows):
+            inverter_key = (row["block"], row["array"], row["inverter"])
+            inverter_id = inverter_ids.setdefault(inverter_key, _get_layout_value(row, "inverter_id"))
+            if inverter_id != _get_layout_value(row, "inverter_id"):
+                raise ValueError("Row {} of the layout: inverter {} of array {} of block {} has more than one "
+                                 "inverter_id.".format(i, row["inverter"], row["array"], row["block"]))
+
+        module_ids = list(dict.fromkeys(_get_layout_value(row, "module_id") for row in rows))
+        modules = self._prefetch_layout_entities(module_ids, list(dict.fromkeys(inverter_ids.values())), max_workers)
+        dc_fields = self._prepare_layout_dc_fields(rows, modules)
+
+        # builds the tree in one pass, adding each block, array and inverter when it first appears
+        block_names, array_names, inverter_names = {}, {}, {}
+        for row, dc_field in zip(rows, dc_fields):
+            block_key = row["block"]
+            array_key = (block_key, row["array"])
+            inverter_key = array_key + (row["inverter"], )
+
+            if block_key not in block_names:
+                block_names[block_key] = self.add_block(**self._get_layout_arguments(row, LAYOUT_BLOCK_COLUMNS))
+            block_name = block_names[block_key]
+
+            if array_key not in array_names:
+                array_names[array_key] = self.add_array(
+                    block_name, **self._get_layout_arguments(row, LAYOUT_ARRAY_COLUMNS)
+                )
+            array_name = array_names[array_key]
+
+            if inverter_key not in inverter_names:
+                inverter_names[inverter_key] = self.add_inverter(
+                    block_name, array_name, inverter_ids[inverter_key],
+                    **self._get_layout_arguments(row, LAYOUT_INVERTER_COLUMNS)
+                )
+            inverter = self._validate_inverter_name(block_name, array_name, inverter_names[inverter_key])
+
+            inverter["dc_fields"].append(self._make_dc_field(
+                modules[dc_field["module_id"]], name=len(inverter["dc_fields"]) + 1, **dc_field
+            ))
+
+    @classmethod
+    def from_layout(cls, api, layout, project_id=None, prediction_id=None, use_cooling_temp=True, sheet_name=None,
+                    create=True, max_workers=4, **kwargs):
+        """
+        Builds a new power plant from a table with one row per DC field (see
+        :py:meth:`~plantpredict.powerplant.PowerPlant.add_layout` for its columns) and, by default, creates it in
+        PlantPredict with a single request.
+
+        .. code-block:: python
+
+            powerplant = PowerPlant.from_layout(api, "layout.csv", project_id=1, prediction_id=2)
+
+        :param plantpredict.api.Api api: API used to retrieve modules and inverters, and to create the power plant.
+        :param layout: Layout as a DataFrame, a list of dictionaries, or the path to a .csv or Excel file.
+        :type layout: pandas.DataFrame, list of dict, str
+        :param int project_id: Unique identifier of the project of the power plant.
+        :param int prediction_id: Unique identifier of the prediction of the power plant.
+        :param bool use_cooling_temp: See :py:meth:`~plantpredict.powerplant.PowerPlant.add_inverter`.
+        :param str sheet_name: Sheet of the Excel file to read (optional, defaults to the first sheet).
+        :param bool create: If :py:data:`True`, calls :py:meth:`~plantpredict.powerplant.PowerPlant.create` once the
+                            power plant is built.
+        :param int max_workers: Maximum number of modules and inverters retrieved concurrently.
+        :param kwargs: Other attributes of the power plant (e.g. :py:attr:`lgia_limitation`).
+        :return: The power plant.
+        :rtype: plantpredict.powerplant.PowerPlant
+        """
+        powerplant = cls(api, project_id=project_id, prediction_id=prediction_id, use_cooling_temp=use_cooling_temp,
+                         **kwargs)
+        powerplant.add_layout(layout, sheet_name=sheet_name, max_workers=max_workers)
+        if create:
+            powerplant.create()
+
+        return powerplant
+
+    def __init__(self, api, project_id=None, prediction_id=None, use_cooling_temp=True, cache_ttl=None,
+                 local_kva=False, **kwargs):
         """
         Constructor method.
         """
@@ -1426,6 +2026,19 @@ class PowerPlant(PlantPredictEntity):
         self.prediction_id = prediction_id
         self.use_cooling_temp = use_cooling_temp
 
+        # whether inverter kVA ratings are evaluated locally from their kVA curves (local only, never sent)
+        self._local_kva = local_kva
+
+        # entities retrieved while building the power plant (see invalidate_cache)
+        self._entity_cache = EntityCache(ttl=cache_ttl)
+
+        # blocks, arrays and inverters by name (and blocks by id), see reindex
+        self._indexed_blocks = None
+        self._block_index = {}
+        self._block_id_index = {}
+        self._array_index = {}
+        self._inverter_index = {}
+
         self.power_factor = 1.0
         self.blocks = []
         self.transformers = []
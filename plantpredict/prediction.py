@@ -1,9 +1,183 @@
-import requests
+import os
+import json
+import time
+import random
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 from plantpredict.plant_predict_entity import PlantPredictEntity
-from plantpredict.utilities import convert_json, snake_to_camel
-from plantpredict.error_handlers import handle_refused_connection, handle_error_response
-from plantpredict.enumerations import PredictionStatusEnum, EntityTypeEnum
+from plantpredict.utilities import convert_json, convert_key, camel_to_snake, snake_to_camel
+from plantpredict.error_handlers import handle_error_response, parse_retry_after, APIError, PredictionError, \
+    PredictionTimeoutError, stream_json_response
+from plantpredict.enumerations import PredictionStatusEnum, EntityTypeEnum, ProcessingStatusEnum
+
+
+def nodal_data_to_frame(nodal_data, index="timestamp"):
+    """
+    Converts nodal data, as decoded from the JSON sent by PlantPredict (with camel case keys), into a DataFrame with
+    one typed column per nodal result. Keys are converted to snake case once per column rather than once per time step.
+    Accepts a list with a dictionary per time step, a dictionary of columns, or a dictionary holding one such list
+    alongside other (metadata) entries, which are kept in :py:attr:`DataFrame.attrs` with snake case keys.
+
+    :param nodal_data: Decoded nodal data.
+    :type nodal_data: list, dict
+    :param str index: Column (snake case) converted to datetimes and used as index, if present. :py:data:`None` keeps a
+                      default integer index.
+    :return: The nodal data.
+    :rtype: pandas.DataFrame
+    """
+    metadata = {}
+    if isinstance(nodal_data, dict):
+        record_keys = [k for k, v in nodal_data.items() if isinstance(v, list) and v and isinstance(v[0], dict)]
+        if len(record_keys) == 1:
+            metadata = {k: v for k, v in nodal_data.items() if k != record_keys[0]}
+            nodal_data = nodal_data[record_keys[0]]
+        elif not all(isinstance(v, list) for v in nodal_data.values()):
+            raise ValueError("The nodal data is neither a list of time steps nor a dictionary of columns.")
+
+    frame = pd.DataFrame(nodal_data)
+    frame.columns = [convert_key(column, camel_to_snake) for column in frame.columns]
+    if index is not None and index in frame.columns:
+        frame[index] = pd.to_datetime(frame[index])
+        frame = frame.set_index(index)
+
+    frame.attrs.update(convert_json(metadata, camel_to_snake))
+
+    return frame
+
+
+# levels of the power plant hierarchy with nodal data, from the top down
+NODAL_DATA_LEVELS = ("system", "block", "array", "inverter", "dc_field")
+
+
+# levels of a block exported by each of its export options (see Prediction.run)
+BLOCK_EXPORT_OPTION_LEVELS = {
+    "export_block": "block",
+    "export_arrays": "array",
+    "export_inverters": "inverter",
+    "export_dc_fields": "dc_field"
+}
+
+
+def _get_exported_levels(export_options, block_name):
+    for block_export_options in export_options.get("block_export_options") or []:
+        if block_export_options.get("name") == block_name:
+            return {level for option, level in BLOCK_EXPORT_OPTION_LEVELS.items() if block_export_options.get(option)}
+
+    # blocks without export options have no nodal data
+    return set()
+
+
+def get_nodal_data_nodes(blocks, levels=NODAL_DATA_LEVELS, export_options=None):
+    """
+    Lists the nodes of a power plant hierarchy at the given levels, top down, in the form expected by
+    :py:meth:`~plantpredict.prediction.Prediction.get_all_nodal_data`.
+
+    :param list blocks: Blocks of the power plant (see :py:attr:`~plantpredict.powerplant.PowerPlant.blocks`).
+    :param levels: Levels of the hierarchy to list, among :py:data:`NODAL_DATA_LEVELS`.
+    :param dict export_options: Export options the prediction was run with (see
+                                :py:meth:`~plantpredict.prediction.Prediction.run`). If provided, only the nodes whose
+                                nodal data was exported are listed.
+    :raises ValueError: Raised if a level is not in :py:data:`NODAL_DATA_LEVELS`.
+    :return: List of :code:`(node, params)` tuples, where :code:`node` is a name such as
+             :py:data:`"block=1/array=2/inverter=A"` and :code:`params` is the input of
+             :py:meth:`~plantpredict.prediction.Prediction.get_nodal_data` for the node.
+    :rtype: list of tuple
+    """
+    invalid_levels = [level for level in levels if level not in NODAL_DATA_LEVELS]
+    if invalid_levels:
+        raise ValueError("Invalid nodal data level(s) {}, must be among {}.".format(
+            ", ".join(invalid_levels), ", ".join(NODAL_DATA_LEVELS)
+        ))
+
+    nodes = []
+    if "system" in levels and (export_options is None or export_options.get("export_system")):
+        nodes.append(("system", None))
+
+    for block in blocks or []:
+        block_levels = set(levels)
+        if export_options is not None:
+            block_levels &= _get_exported_levels(export_options, block["name"])
+
+        block_node = "block={}".format(block["name"])
+        block_params = {"block_number": block["name"]}
+        if "block" in block_levels:
+            nodes.append((block_node, block_params))
+
+        for array in block.get("arrays") or []:
+            array_node = "{}/array={}".format(block_node, array["name"])
+            array_params = dict(block_params, array_number=array["name"])
+            if "array" in block_levels:
+                nodes.append((array_node, array_params))
+
+            for inverter in array.get("inverters") or []:
+                inverter_node = "{}/inverter={}".format(array_node, inverter["name"])
+                inverter_params = dict(array_params, inverter_name=inverter["name"])
+                if "inverter" in block_levels:
+                    nodes.append((inverter_node, inverter_params))
+
+                if "dc_field" in block_levels:
+                    for dc_field in inverter.get("dc_fields") or []:
+                        nodes.append((
+                            "{}/dc_field={}".format(inverter_node, dc_field["name"]),
+                            dict(inverter_params, dc_field_number=dc_field["name"])
+                        ))
+
+    return nodes
+
+
+def _read_checkpoint(checkpoint):
+    if checkpoint is None or not os.path.exists(checkpoint):
+        return set()
+
+    with open(checkpoint) as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+class PollingPolicy(object):
+    """
+    Controls how :py:meth:`~plantpredict.prediction.Prediction.run` waits for a prediction to finish processing. The
+    processing status is polled right away, then again after :py:attr:`initial_interval` seconds, and the interval
+    grows by :py:attr:`backoff_factor` after every poll up to :py:attr:`max_interval`. Each interval is randomly
+    stretched or shrunk by up to :py:attr:`jitter` (as a fraction) so that many predictions started together do not
+    poll in lockstep.
+
+    .. code-block:: python
+
+        from plantpredict.prediction import PollingPolicy
+
+        prediction.run(polling_policy=PollingPolicy(initial_interval=5.0, max_interval=60.0, timeout=2*3600))
+
+    :param float initial_interval: Seconds to wait between the first and the second poll.
+    :param float backoff_factor: Factor applied to the interval after every poll.
+    :param float max_interval: Upper bound of the interval (before jitter) in seconds.
+    :param float jitter: Maximum relative random deviation of each interval, between 0 and 1.
+    :param float timeout: Maximum total time to wait in seconds, or :py:data:`None` to wait indefinitely.
+    :param bool raise_on_error: Waiting always stops as soon as the processing status becomes
+                                :py:attr:`~plantpredict.enumerations.ProcessingStatusEnum.ERROR`. If :py:data:`True`,
+                                :py:class:`~plantpredict.error_handlers.PredictionError` is then raised, otherwise
+                                the failed prediction is returned like a completed one.
+    """
+    def intervals(self):
+        """
+        Generates the (jittered) number of seconds to sleep between consecutive polls.
+
+        :return: An infinite generator of intervals in seconds.
+        :rtype: generator
+        """
+        interval = self.initial_interval
+        while True:
+            yield max(interval * (1 + random.uniform(-self.jitter, self.jitter)), 0.0)
+            interval = min(interval * self.backoff_factor, self.max_interval)
+
+    def __init__(self, initial_interval=1.0, backoff_factor=1.5, max_interval=30.0, jitter=0.1, timeout=None,
+                 raise_on_error=True):
+        self.initial_interval = initial_interval
+        self.backoff_factor = backoff_factor
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.timeout = timeout
+        self.raise_on_error = raise_on_error
 
 
 class Prediction(PlantPredictEntity):
@@ -169,82 +343,332 @@ class Prediction(PlantPredictEntity):
 
         return super(Prediction, self).update()
 
-    @handle_refused_connection
-    def _wait_for_prediction(self):
-        is_complete = False
-        while not is_complete:
-            self.get()
-            if self.processing_status == 3:
-                is_complete = True
+    def _get_processing_status(self):
+        """
+        Retrieves only the processing status of the Prediction. Unlike :py:meth:`get`, the response is not converted and
+        assigned to the local instance, which keeps polling cheap for large predictions.
+
+        :return: Processing status (see :py:class:`~plantpredict.enumerations.ProcessingStatusEnum`), or :py:data:`None`
+                 if it could not be determined because the access token had to be refreshed.
+        :rtype: int
+        """
+        access_token = self.api.access_token
+        response = self.api.session.get(
+            url=self.api.base_url + "/Project/{}/Prediction/{}".format(self.project_id, self.id),
+            headers={"Authorization": "Bearer " + access_token}
+        )
+        if response.status_code == 401:
+            self.api.refresh_access_token(stale_token=access_token)
+            return None
+        elif not 200 <= response.status_code < 300:
+            raise APIError(
+                response.status_code, response.content,
+                retry_after=parse_retry_after(getattr(response, "headers", {}).get("Retry-After"))
+            )
+
+        return json.loads(response.content).get("processingStatus")
+
+    def _is_prediction_complete(self, processing_status, polling_policy):
+        if processing_status == ProcessingStatusEnum.SUCCESS:
+            return True
+        elif processing_status == ProcessingStatusEnum.ERROR:
+            if polling_policy.raise_on_error:
+                raise PredictionError(self.id, processing_status)
+            return True
+
+        return False
+
+    def _wait_for_prediction(self, polling_policy=None):
+        polling_policy = polling_policy if polling_policy is not None else PollingPolicy()
+        start = time.monotonic()
+
+        for interval in polling_policy.intervals():
+            processing_status = self._get_processing_status()
+            if self._is_prediction_complete(processing_status, polling_policy):
+                break
+
+            if polling_policy.timeout is not None and time.monotonic() - start + interval > polling_policy.timeout:
+                raise PredictionTimeoutError(self.id, processing_status, polling_policy.timeout)
+            time.sleep(interval)
+
+        # assigns the attributes of the completed prediction to the local instance
+        self.get()
 
-    @handle_refused_connection
     @handle_error_response
-    def run(self, export_options=None):
+    def _submit_run(self, export_options=None):
+        return self.api.session.post(
+            url=self.api.base_url + "/Project/{}/Prediction/{}/Run".format(self.project_id, self.id),
+            headers={"Authorization": "Bearer " + self.api.access_token},
+            json=convert_json(export_options, snake_to_camel) if export_options else None
+        )
+
+    def run(self, export_options=None, polling_policy=None):
         """
         POST /Project/{ProjectId}/Prediction/{PredictionId}/Run
 
-        Runs the Prediction and waits for simulation to complete. The input variable "export_options" should take the
+        Runs the Prediction and waits for simulation to complete. The processing status is polled according to
+        :py:data:`polling_policy`. To run many predictions concurrently, use
+        :py:meth:`~plantpredict.api.Api.run_predictions` instead.
 
         :param export_options: Contains options for exporting
+        :param plantpredict.prediction.PollingPolicy polling_policy: Intervals, timeout and error handling of the wait
+                                                                      for completion. Defaults to
+                                                                      :py:class:`PollingPolicy` with default arguments.
+        :raises plantpredict.error_handlers.PredictionError: If the prediction run fails.
+        :raises plantpredict.error_handlers.PredictionTimeoutError: If the run does not complete within the timeout of
+                                                                    the polling policy.
         :return:
         """
-        response = requests.post(
-            url=self.api.base_url + "/Project/{}/Prediction/{}/Run".format(self.project_id, self.id),
-            headers={"Authorization": "Bearer " + self.api.access_token},
-            json=convert_json(export_options, snake_to_camel) if export_options else None
-        )
-        # TODO why didn't this return an error? it only returned when I stopped the script
+        # raises an APIError without waiting if the run request itself fails
+        response = self._submit_run(export_options)
 
         # observes task queue to wait for prediction run to complete
-        self._wait_for_prediction()
+        self._wait_for_prediction(polling_policy)
 
         return response
 
-    @handle_refused_connection
     @handle_error_response
     def get_results_summary(self):
         """GET /Project/{ProjectId}/Prediction/{Id}/ResultSummary"""
 
-        return requests.get(
+        return self.api.session.get(
             url=self.api.base_url + "/Project/{}/Prediction/{}/ResultSummary".format(self.project_id, self.id),
             headers={"Authorization": "Bearer " + self.api.access_token}
         )
 
-    @handle_refused_connection
     @handle_error_response
-    def get_results_details(self):
-        """GET /Project/{ProjectId}/Prediction/{Id}/ResultDetails"""
+    def get_results_details(self, stream=False):
+        """
+        GET /Project/{ProjectId}/Prediction/{Id}/ResultDetails
+
+        :param bool stream: If :py:data:`True`, returns a generator of the elements of the array held by the results
+                            details, decoded as they are received (see
+                            :py:meth:`~plantpredict.prediction.Prediction.iter_results_details`).
+        """
+        if stream:
+            return self.iter_results_details()
 
-        return requests.get(
+        return self.api.session.get(
             url=self.api.base_url + "/Project/{}/Prediction/{}/ResultDetails".format(self.project_id, self.id),
             headers={"Authorization": "Bearer " + self.api.access_token}
         )
 
-    @handle_refused_connection
-    @handle_error_response
-    def get_nodal_data(self, params=None):
-        """GET /Project/{ProjectId}/Prediction/{Id}/NodalJson"""
+    def iter_results_details(self, key=None, chunk_size=65536):
+        """
+        **GET** */Project/* :py:attr:`project_id` */Prediction/* :py:attr:`id` */ResultDetails*
 
-        return requests.get(
+        Streams the results details and yields the elements of the array they hold (e.g. one per time step) one at a
+        time as they are received, instead of decoding the whole response at once as
+        :py:meth:`~plantpredict.prediction.Prediction.get_results_details` does. The request is sent once iteration
+        starts.
+
+        :param str key: Name (in snake case) of the member holding the array, or :py:data:`None` for the first one.
+        :param int chunk_size: Number of bytes read from the response at a time.
+        :return: Generator of dictionaries with snake case keys.
+        """
+        def send():
+            return self.api.session.get(
+                url=self.api.base_url + "/Project/{}/Prediction/{}/ResultDetails".format(self.project_id, self.id),
+                headers={"Authorization": "Bearer " + self.api.access_token},
+                stream=True
+            )
+
+        return stream_json_response(self, send, key=key, chunk_size=chunk_size)
+
+    def _get_nodal_response(self, params=None, stream=False):
+        return self.api.session.get(
             url=self.api.base_url + "/Project/{}/Prediction/{}/NodalJson".format(self.project_id, self.id),
             headers={"Authorization": "Bearer " + self.api.access_token},
-            params=convert_json(params, snake_to_camel) if params else {}
+            params=convert_json(params, snake_to_camel) if params else {},
+            stream=stream
         )
 
-    @handle_refused_connection
     @handle_error_response
-    def clone(self, new_prediction_name):
+    def get_nodal_data(self, params=None, stream=False):
         """
+        GET /Project/{ProjectId}/Prediction/{Id}/NodalJson
 
-        :param new_prediction_name:
-        :return:
+        :param bool stream: If :py:data:`True`, returns a generator of the time steps, decoded as they are received (see
+                            :py:meth:`~plantpredict.prediction.Prediction.iter_nodal_data`).
         """
-        new_prediction = self.api.prediction()
-        self.get()
-        original_prediction_id = self.id
+        if stream:
+            return self.iter_nodal_data(params)
 
-        new_prediction.__dict__ = self.__dict__
-        # initialize necessary fields
+        return self._get_nodal_response(params)
+
+    @handle_error_response
+    def get_nodal_frame(self, params=None, index="timestamp"):
+        """
+        **GET** */Project/* :py:attr:`project_id` */Prediction/* :py:attr:`id` */NodalJson*
+
+        Same as :py:meth:`~plantpredict.prediction.Prediction.get_nodal_data`, but returns the nodal data as a DataFrame
+        with a typed column per nodal result (see :py:func:`~plantpredict.prediction.nodal_data_to_frame`), which is
+        much faster and smaller than a list of dictionaries for long time series.
+
+        .. code-block:: python
+
+            nodal_data = prediction.get_nodal_frame(params={"block_number": 1, "array_number": 1})
+            nodal_data["dc_power"].resample("D").sum()
+
+        :param dict params: Node of the power plant to retrieve the nodal data of, as in
+                            :py:meth:`~plantpredict.prediction.Prediction.get_nodal_data`.
+        :param str index: Column (snake case) converted to datetimes and used as index, if present.
+        :return: The nodal data.
+        :rtype: pandas.DataFrame
+        """
+        response = self._get_nodal_response(params)
+
+        # an error response is left to the error handler
+        if not 200 <= response.status_code < 300:
+            return response
+
+        return nodal_data_to_frame(json.loads(response.content) if response.content else [], index=index)
+
+    def iter_nodal_data(self, params=None, chunk_size=65536):
+        """
+        **GET** */Project/* :py:attr:`project_id` */Prediction/* :py:attr:`id` */NodalJson*
+
+        Streams the nodal data and yields one dictionary (with snake case keys) per time step as it is received, so that
+        the nodal data of a long time series is never held in memory at once. The request is sent once iteration
+        starts.
+
+        .. code-block:: python
+
+            for time_step in prediction.iter_nodal_data(params={"block_number": 1}):
+                total += time_step["dc_power"]
+
+        :param dict params: Node of the power plant to retrieve the nodal data of, as in
+                            :py:meth:`~plantpredict.prediction.Prediction.get_nodal_data`.
+        :param int chunk_size: Number of bytes read from the response at a time.
+        :return: Generator of dictionaries.
+        """
+        return stream_json_response(
+            self, lambda: self._get_nodal_response(params, stream=True), chunk_size=chunk_size
+        )
+
+    def iter_nodal_frames(self, params=None, num_rows=8760, index="timestamp", chunk_size=65536):
+        """
+        **GET** */Project/* :py:attr:`project_id` */Prediction/* :py:attr:`id` */NodalJson*
+
+        Streams the nodal data and yields it as DataFrames of up to :py:data:`num_rows` consecutive time steps (see
+        :py:meth:`~plantpredict.prediction.Prediction.get_nodal_frame`), so that only one chunk of the time series is
+        held in memory at a time:
+
+        .. code-block:: python
+
+            for nodal_data in prediction.iter_nodal_frames(params={"block_number": 1}):
+                nodal_data.to_csv("block_1.csv", mode="a")
+
+        :param dict params: Node of the power plant to retrieve the nodal data of, as in
+                            :py:meth:`~plantpredict.prediction.Prediction.get_nodal_data`.
+        :param int num_rows: Maximum number of time steps per DataFrame.
+        :param str index: Column (snake case) converted to datetimes and used as index, if present.
+        :param int chunk_size: Number of bytes read from the response at a time.
+        :return: Generator of DataFrames.
+        """
+        # keys are converted once per column of each DataFrame rather than once per time step
+        records = stream_json_response(
+            self, lambda: self._get_nodal_response(params, stream=True), chunk_size=chunk_size, convert_keys=False
+        )
+
+        rows = []
+        for record in records:
+            rows.append(record)
+            if len(rows) == num_rows:
+                yield nodal_data_to_frame(rows, index=index)
+                rows = []
+
+        if rows:
+            yield nodal_data_to_frame(rows, index=index)
+
+    def get_all_nodal_data(self, levels=NODAL_DATA_LEVELS, sink=None, checkpoint=None, max_workers=4, as_frame=True,
+                           powerplant=None, export_options=None):
+        """
+        Retrieves the nodal data of every node of the power plant at the given levels of its hierarchy (e.g. every
+        array and DC field), with up to :py:data:`max_workers` requests in flight at a time. Each node is passed to
+        :py:data:`sink` as soon as it arrives, so that the nodal data of a large plant never has to be held in memory
+        at once:
+
+        .. code-block:: python
+
+            def sink(node, nodal_data):
+                nodal_data.to_csv(os.path.join("nodal_data", node.replace("/", "_") + ".csv"))
+
+            prediction.run(export_options=export_options)
+            prediction.get_all_nodal_data(levels=["array", "dc_field"], sink=sink, checkpoint="nodal_data/done.txt",
+                                          export_options=export_options)
+
+        With a :py:data:`checkpoint` file, the nodes handed to the sink are recorded as they complete and skipped by
+        later calls, so that an interrupted download resumes where it left off. If a node fails (after the retries of
+        the :py:class:`~plantpredict.error_handlers.RetryPolicy`), the requests still queued are cancelled, those in
+        flight are awaited (but not passed to the sink), and the error is raised.
+
+        Only nodes exported when the prediction was run (see :py:meth:`~plantpredict.prediction.Prediction.run`) have
+        nodal data, and requesting any other node fails, so pass the :py:data:`export_options` of the run to retrieve
+        only those.
+
+        :param levels: Levels of the power plant hierarchy to retrieve, among :py:data:`NODAL_DATA_LEVELS`
+                       (:py:data:`"system"`, :py:data:`"block"`, :py:data:`"array"`, :py:data:`"inverter"` and
+                       :py:data:`"dc_field"`). Defaults to all of them.
+        :param sink: Function called with the name of each node (see
+                     :py:func:`~plantpredict.prediction.get_nodal_data_nodes`) and its nodal data, in the calling
+                     thread. If :py:data:`None`, the nodal data is returned instead.
+        :param str checkpoint: Path of a text file listing the completed nodes, created if it does not exist.
+        :param int max_workers: Maximum number of nodes retrieved concurrently.
+        :param bool as_frame: If :py:data:`True`, the nodal data of each node is retrieved with
+                              :py:meth:`~plantpredict.prediction.Prediction.get_nodal_frame`, otherwise with
+                              :py:meth:`~plantpredict.prediction.Prediction.get_nodal_data`.
+        :param plantpredict.powerplant.PowerPlant powerplant: Power plant of the prediction, retrieved if not provided.
+        :param dict export_options: Export options the prediction was run with. If :py:data:`None`, every node of the
+                                    power plant at the given levels is retrieved.
+        :return: Nodal data by node if :py:data:`sink` is :py:data:`None`, otherwise :py:data:`None`.
+        :rtype: dict
+        """
+        if powerplant is None:
+            powerplant = self.api.powerplant(project_id=self.project_id, prediction_id=self.id)
+            powerplant.get()
+
+        completed = _read_checkpoint(checkpoint)
+        nodes = [(node, params) for node, params in get_nodal_data_nodes(powerplant.blocks, levels, export_options)
+                 if node not in completed]
+
+        results = {} if sink is None else None
+        if sink is None:
+            sink = results.__setitem__
+
+        get = self.get_nodal_frame if as_frame else self.get_nodal_data
+        checkpoint_file = open(checkpoint, "a") if checkpoint is not None else None
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = {}
+        try:
+            for node, params in nodes:
+                pending[executor.submit(get, params)] = node
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = pending.pop(future)
+                    sink(node, future.result())
+                    if checkpoint_file is not None:
+                        checkpoint_file.write(node + "\n")
+                        checkpoint_file.flush()
+        finally:
+            # after a failure, the nodes not started yet are not requested (cancel_futures needs Python 3.9)
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+            if checkpoint_file is not None:
+                checkpoint_file.close()
+
+        return results
+
+    @staticmethod
+    def _initialize_cloned_prediction(new_prediction):
+        """
+        Removes the database-assigned fields copied over from the original prediction so that the clone can be created
+        as a new entity.
+
+        :param plantpredict.prediction.Prediction new_prediction: Prediction holding a copy of the original attributes.
+        """
         new_prediction.__dict__.pop('id', None)
         new_prediction.__dict__.pop('created_date', None)
         new_prediction.__dict__.pop('last_modified', None)
@@ -254,19 +678,15 @@ class Prediction(PlantPredictEntity):
         new_prediction.__dict__.pop('powerplant_id', None)
         new_prediction.__dict__.pop('powerplant', None)
 
-        new_prediction.name = new_prediction_name
-        new_prediction.create()
-        new_prediction_id = new_prediction.id
+    @staticmethod
+    def _initialize_cloned_powerplant(new_powerplant):
+        """
+        Removes the database-assigned ids copied over from the original power plant (and every block, array, inverter
+        and DC field within it) so that the clone can be created as a new entity.
 
-        # clone powerplant and attach to new prediction
-        new_powerplant = self.api.powerplant()
-        powerplant = self.api.powerplant(project_id=self.project_id, prediction_id=original_prediction_id)
-        powerplant.get()
-        new_powerplant.__dict__ = powerplant.__dict__
-        new_powerplant.prediction_id = new_prediction_id
+        :param plantpredict.powerplant.PowerPlant new_powerplant: Power plant holding a copy of the original attributes.
+        """
         new_powerplant.__dict__.pop('id', None)
-
-        # initialize necessary fields
         for block in new_powerplant.blocks:
             block.pop('id', None)
             for array in block['arrays']:
@@ -276,6 +696,32 @@ class Prediction(PlantPredictEntity):
                     for dc_field in inverter['dc_fields']:
                         dc_field.pop('id', None)
 
+    @handle_error_response
+    def clone(self, new_prediction_name):
+        """
+
+        :param new_prediction_name:
+        :return:
+        """
+        new_prediction = self.api.prediction()
+        self.get()
+        original_prediction_id = self.id
+
+        new_prediction.__dict__ = self.__dict__
+        self._initialize_cloned_prediction(new_prediction)
+
+        new_prediction.name = new_prediction_name
+        new_prediction.create()
+        new_prediction_id = new_prediction.id
+
+        # clone powerplant and attach to new prediction
+        new_powerplant = self.api.powerplant()
+        powerplant = self.api.powerplant(project_id=self.project_id, prediction_id=original_prediction_id)
+        powerplant.get()
+        new_powerplant.__dict__ = powerplant.__dict__
+        new_powerplant.prediction_id = new_prediction_id
+        self._initialize_cloned_powerplant(new_powerplant)
+
         new_powerplant.create()
 
         self.id = original_prediction_id
@@ -283,7 +729,6 @@ class Prediction(PlantPredictEntity):
 
         return new_prediction_id
 
-    @handle_refused_connection
     @handle_error_response
     def change_status(self, new_status, note=""):
         """
@@ -295,7 +740,7 @@ class Prediction(PlantPredictEntity):
         :param str note: Description of reason for change.
         :return:
         """
-        return requests.post(
+        return self.api.session.post(
             url=self.api.base_url + "/Project/{}/Prediction/Status".format(self.project_id),
             headers={"Authorization": "Bearer " + self.api.access_token},
             json=[{
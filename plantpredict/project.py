@@ -1,8 +1,7 @@
-import requests
 import json
 
 from plantpredict.plant_predict_entity import PlantPredictEntity
-from plantpredict.error_handlers import handle_refused_connection, handle_error_response
+from plantpredict.error_handlers import handle_error_response
 from plantpredict.utilities import convert_json, camel_to_snake
 
 
@@ -91,7 +90,6 @@ class Project(PlantPredictEntity):
 
         return super(Project, self).update()
 
-    @handle_refused_connection
     @handle_error_response
     def get_all_predictions(self):
         """HTTP Request: GET /Project/{ProjectId}/Prediction
@@ -102,7 +100,7 @@ class Project(PlantPredictEntity):
         :rtype: list of dict
         """
 
-        return requests.get(
+        return self.api.session.get(
             url=self.api.base_url + "/Project/{}/Prediction".format(self.id),
             headers={"Authorization": "Bearer " + self.api.access_token}
         )
@@ -120,7 +118,7 @@ class Project(PlantPredictEntity):
         :type search_radius: float
         :return: TODO
         """
-        response = requests.get(
+        response = self.api.session.get(
             url=self.api.base_url + "/Project/Search",
             headers={"Authorization": "Bearer " + self.api.access_token},
             params={'latitude': latitude, 'longitude': longitude, 'searchRadius': search_radius}
@@ -130,17 +128,18 @@ class Project(PlantPredictEntity):
 
         return [convert_json(p, camel_to_snake) for p in project_list]
 
-    @handle_refused_connection
     @handle_error_response
     def assign_location_attributes(self):
         """
+        Retrieves the location info, elevation and time zone of the project's latitude and longitude with
+        :py:meth:`~plantpredict.geo.Geo.get_location_attributes` (concurrently, and from the
+        :py:class:`~plantpredict.cache.GeoCache` of the :py:class:`~plantpredict.api.Api` if it has one), and assigns
+        them to the project.
 
         :return:
         """
         geo = self.api.geo(latitude=self.latitude, longitude=self.longitude)
-        geo.get_location_info()
-        geo.get_elevation()
-        geo.get_time_zone()
+        geo.get_location_attributes()
 
         self.locality = geo.locality
         self.state_province_code = geo.state_province_code
@@ -0,0 +1,135 @@
+import re
+import time
+import threading
+
+# endpoint families that can be throttled separately, matched (in order) against the path of each request URL
+ENDPOINT_FAMILIES = [
+    ("prediction_run", r"/Prediction/[^/]+/Run$"),
+    ("weather_download", r"/Weather/Download(/|$)"),
+    ("module_generator", r"/Module/Generator/"),
+    ("geo", r"/Geo/"),
+]
+
+
+class RateLimit(object):
+    """
+    Token-bucket rate limit combined with a cap on the number of requests in flight. Thread-safe, so a single instance
+    throttles every thread sending requests through the same :py:class:`~plantpredict.api.Api`.
+
+    The bucket holds up to :py:attr:`burst` tokens and refills at :py:attr:`rate` tokens per second; each request takes
+    one token and waits for the next one if the bucket is empty.
+
+    :param float rate: Sustained number of requests per second (positive), or :py:data:`None` for no rate limit.
+    :param int burst: Number of requests that may be sent at once after a quiet period. Defaults to one second's worth
+                      of :py:attr:`rate` (but at least 1).
+    :param int max_in_flight: Maximum number of requests awaiting their response at the same time, or
+                              :py:data:`None` for no limit.
+    :raises ValueError: Raised if :py:data:`rate` is not positive.
+    """
+    def _take_token(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+    def acquire(self):
+        """
+        Blocks until the request may be sent. Every call must be followed by :py:meth:`release` once the response has
+        been received; using the instance as a context manager does both.
+        """
+        start = time.monotonic()
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        if self.rate is not None:
+            self._take_token()
+
+        with self._lock:
+            self.num_requests += 1
+            self.wait_time += time.monotonic() - start
+
+    def release(self):
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def __init__(self, rate=None, burst=None, max_in_flight=None):
+        if rate is not None and not rate > 0:
+            raise ValueError("rate must be positive (or None for no rate limit).")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate or 1, 1)
+        self.max_in_flight = max_in_flight
+
+        # counters, e.g. to check how much time is spent waiting for the limit
+        self.num_requests = 0
+        self.wait_time = 0.0
+
+        self._lock = threading.Lock()
+        self._semaphore = threading.BoundedSemaphore(max_in_flight) if max_in_flight is not None else None
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+
+class RateLimiter(object):
+    """
+    Selects the :py:class:`RateLimit` of the endpoint family each request belongs to. Configured through the
+    :py:data:`rate_limits` argument of :py:class:`~plantpredict.api.Api`:
+
+    .. code-block:: python
+
+        from plantpredict.rate_limit import RateLimit
+
+        api = plantpredict.Api(..., rate_limits={
+            "prediction_run": RateLimit(rate=0.5, max_in_flight=4),     # POST .../Prediction/{id}/Run
+            "weather_download": RateLimit(rate=1.0),                    # /Weather/Download/*
+            "module_generator": RateLimit(max_in_flight=8),             # /Module/Generator/*
+            "geo": RateLimit(rate=5.0),                                 # /Geo/*
+            "default": RateLimit(rate=20.0, max_in_flight=16)           # every other request
+        })
+
+    The family names are those in :py:data:`ENDPOINT_FAMILIES`. Requests of a family without a configured limit fall
+    back to :py:data:`"default"`, and are not throttled if there is no default either.
+
+    :param dict rate_limits: :py:class:`RateLimit` by endpoint family name.
+    :param list endpoint_families: List of :code:`(name, pattern)` tuples, where :code:`pattern` is a regular
+                                   expression searched in the URL path. Defaults to :py:data:`ENDPOINT_FAMILIES`.
+    """
+    def get_family(self, url):
+        """
+        :param str url: Request URL.
+        :return: Name of the endpoint family of the URL, or :py:data:`"default"`.
+        :rtype: str
+        """
+        path = url.split("?", 1)[0]
+        for name, pattern in self._patterns:
+            if pattern.search(path):
+                return name
+
+        return "default"
+
+    def get(self, url):
+        """
+        :param str url: Request URL.
+        :return: The rate limit that applies to the URL, or :py:data:`None`.
+        :rtype: RateLimit
+        """
+        return self.rate_limits.get(self.get_family(url), self.rate_limits.get("default"))
+
+    def __init__(self, rate_limits, endpoint_families=None):
+        self.rate_limits = rate_limits
+        self._patterns = [
+            (name, re.compile(pattern))
+            for name, pattern in (endpoint_families if endpoint_families is not None else ENDPOINT_FAMILIES)
+        ]
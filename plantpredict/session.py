@@ -0,0 +1,213 @@
+import gzip
+import json
+import zlib
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from plantpredict.rate_limit import RateLimiter
+from plantpredict.error_handlers import APIError, parse_retry_after, is_connection_refused
+
+
+class _ConnectionCountingMixin(object):
+    """
+    Counts the sockets a connection pool actually opens, including reconnects of pooled connections that the server
+    dropped (which urllib3's own :py:attr:`num_connections` does not see).
+    """
+    num_connects = 0
+
+    def _validate_conn(self, conn):
+        if conn.sock is None:
+            self.num_connects += 1
+        super(_ConnectionCountingMixin, self)._validate_conn(conn)
+
+
+class _HTTPConnectionPool(_ConnectionCountingMixin, HTTPConnectionPool):
+    pass
+
+
+class _HTTPSConnectionPool(_ConnectionCountingMixin, HTTPSConnectionPool):
+    pass
+
+
+class _PooledAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super(_PooledAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _HTTPConnectionPool, "https": _HTTPSConnectionPool}
+
+
+class Session(requests.Session):
+    """
+    Pooled, keep-alive HTTP session owned by :py:class:`~plantpredict.api.Api` and shared by every entity created from
+    it. Connections to each host are kept open and reused across requests, so building a power plant with hundreds of
+    :py:meth:`~plantpredict.powerplant.PowerPlant.add_inverter` and
+    :py:meth:`~plantpredict.powerplant.PowerPlant.add_dc_field` calls only pays the TCP/TLS handshake once per pooled
+    connection rather than once per request.
+
+    If rate limits are configured, every request waits for the :py:class:`~plantpredict.rate_limit.RateLimit` of its
+    endpoint family before it is sent, which keeps all threads sharing the session under the configured quota.
+
+    If request compression is enabled, JSON bodies of at least :py:attr:`compression_threshold` bytes (e.g. weather
+    details, IV curves, power plant trees) are sent gzip- or deflate-encoded. Compressed responses are always accepted
+    and decoded transparently.
+
+    If a :py:class:`~plantpredict.error_handlers.RetryPolicy` is set, each request is retried on its own after a
+    transient failure as the policy allows, so that a method sending several requests only repeats the one that failed.
+    """
+    def _encode_json_body(self, kwargs):
+        # serializes the JSON body here (instead of in requests) so that it can be measured and compressed
+        body = json.dumps(kwargs.pop("json"), allow_nan=False).encode("utf-8")
+        headers = dict(kwargs.get("headers") or {})
+        headers["Content-Type"] = "application/json"
+        num_body_bytes = len(body)
+
+        if self.request_compression is not None and num_body_bytes >= self.compression_threshold:
+            body = gzip.compress(body) if self.request_compression == "gzip" else zlib.compress(body)
+            headers["Content-Encoding"] = self.request_compression
+
+        kwargs["data"] = body
+        kwargs["headers"] = headers
+        self._count(request_bytes=num_body_bytes, request_wire_bytes=len(body))
+
+        return kwargs
+
+    def _count(self, **counts):
+        with self._stats_lock:
+            for key, value in counts.items():
+                self._wire_stats[key] += value
+
+    def request(self, method, url, *args, **kwargs):
+        if kwargs.get("json") is not None and kwargs.get("data") is None:
+            kwargs = self._encode_json_body(kwargs)
+
+        if self.retry_policy is None:
+            return self._send(method, url, *args, **kwargs)
+
+        retry_policy = self.retry_policy
+
+        def attempt():
+            try:
+                response = self._send(method, url, *args, **kwargs)
+            except requests.exceptions.ConnectionError as e:
+                if not retry_policy.is_retryable(method, connection_refused=is_connection_refused(e)):
+                    raise
+                return None, e
+
+            if not retry_policy.is_retryable(method, response.status_code):
+                return response, None
+            return response, APIError(
+                response.status_code, response.content,
+                retry_after=parse_retry_after((getattr(response, "headers", None) or {}).get("Retry-After"))
+            )
+
+        # retries the request as configured by the retry policy, handing the last failed response to the caller
+        return retry_policy.call(method + " " + url, attempt)
+
+    def _send(self, method, url, *args, **kwargs):
+        rate_limit = self.rate_limiter.get(url) if self.rate_limiter is not None else None
+        if rate_limit is None:
+            response = super(Session, self).request(method, url, *args, **kwargs)
+        else:
+            with rate_limit:
+                response = super(Session, self).request(method, url, *args, **kwargs)
+
+        # streamed responses are left unread
+        if not kwargs.get("stream", False):
+            num_content_bytes = len(response.content or b"")
+            try:
+                num_wire_bytes = response.raw.tell()
+            except AttributeError:
+                num_wire_bytes = num_content_bytes
+            self._count(requests=1, response_bytes=num_content_bytes, response_wire_bytes=num_wire_bytes)
+
+        return response
+
+    def wire_stats(self):
+        """
+        Summarizes the size of request and response bodies sent through the session, before and after compression.
+
+        .. code-block:: python
+
+            {
+                "requests": 250,                    # requests sent
+                "request_bytes": 52000000,          # JSON request bodies, uncompressed
+                "request_wire_bytes": 6100000,      # JSON request bodies as sent
+                "response_bytes": 31000000,         # response bodies, decoded
+                "response_wire_bytes": 4200000      # response bodies as received
+            }
+
+        :return: A dictionary of byte counters as shown above.
+        :rtype: dict
+        """
+        with self._stats_lock:
+            return dict(self._wire_stats)
+
+    def connection_stats(self):
+        """
+        Summarizes connection reuse across the host pools currently held by the session.
+
+        .. code-block:: python
+
+            {
+                "requests": 250,        # requests sent
+                "connections": 2,       # new TCP/TLS connections opened
+                "reused": 248           # requests served by an already open connection
+            }
+
+        :return: A dictionary of connection counters as shown above.
+        :rtype: dict
+        """
+        num_requests = 0
+        num_connections = 0
+        for adapter in set(self.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    num_requests += pool.num_requests
+                    num_connections += getattr(pool, "num_connects", pool.num_connections)
+
+        return {
+            "requests": num_requests,
+            "connections": num_connections,
+            "reused": max(num_requests - num_connections, 0)
+        }
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False, keep_alive=True, rate_limits=None,
+                 request_compression=None, compression_threshold=16384, retry_policy=None):
+        """
+        :param int pool_connections: Number of per-host connection pools to keep cached.
+        :param int pool_maxsize: Maximum number of connections kept open to a single host.
+        :param bool pool_block: If :py:data:`True`, requests wait for a free connection once :py:attr:`pool_maxsize`
+                                connections to a host are in use instead of opening (and discarding) extra ones.
+        :param bool keep_alive: If :py:data:`False`, every connection is closed after its response is read.
+        :param dict rate_limits: :py:class:`~plantpredict.rate_limit.RateLimit` by endpoint family name (see
+                                 :py:class:`~plantpredict.rate_limit.RateLimiter`).
+        :param str request_compression: :py:data:`"gzip"` or :py:data:`"deflate"` to compress large JSON request
+                                        bodies, or :py:data:`None` to send them uncompressed.
+        :param int compression_threshold: Minimum size in bytes of a JSON request body to be compressed.
+        :param plantpredict.error_handlers.RetryPolicy retry_policy: Retries of refused connections and transient
+                                                                     server errors, or :py:data:`None` for no retries.
+        """
+        super(Session, self).__init__()
+
+        if request_compression not in (None, "gzip", "deflate"):
+            raise ValueError("request_compression must be None, 'gzip' or 'deflate'.")
+        self.request_compression = request_compression
+        self.compression_threshold = compression_threshold
+        self.retry_policy = retry_policy
+        self._stats_lock = threading.Lock()
+        self._wire_stats = dict.fromkeys(
+            ["requests", "request_bytes", "request_wire_bytes", "response_bytes", "response_wire_bytes"], 0
+        )
+
+        self.rate_limiter = RateLimiter(rate_limits) if rate_limits else None
+
+        adapter = _PooledAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+        if not keep_alive:
+            self.headers["Connection"] = "close"
@@ -0,0 +1,281 @@
+import numpy
+
+from plantpredict.enumerations import PVModelTypeEnum
+
+# Boltzmann constant [J/K] and elementary charge [C]
+BOLTZMANN = 1.380649e-23
+ELEMENTARY_CHARGE = 1.602176634e-19
+
+# standard test conditions at which the module parameters are specified
+STC_IRRADIANCE = 1000.0
+STC_TEMPERATURE = 25.0
+
+# exponents above this are clipped to keep numpy.exp finite while iterating
+_MAX_EXPONENT = 700.0
+
+
+class SingleDiodeModel(object):
+    """
+    Local (offline) evaluation of the 1-diode model of a PV module, with the same parameters as the
+    :py:class:`~plantpredict.module.Module` entity. Computes IV curves and the key points of the IV curve for arrays of
+    cell temperatures and irradiances in one vectorized call, instead of a
+    :py:meth:`~plantpredict.module.Module.generate_iv_curve` and
+    :py:meth:`~plantpredict.module.Module.process_iv_curves` round trip per condition.
+
+    .. code-block:: python
+
+        model = module.get_single_diode_model()
+
+        temperatures, irradiances = numpy.meshgrid([15.0, 25.0, 50.0], [200.0, 400.0, 600.0, 800.0, 1000.0])
+        basic_data = model.calculate_basic_data_at_conditions(temperatures, irradiances)
+        relative_efficiency = basic_data["max_power"] / basic_data["max_power"][-1, 1] * 1000.0 / irradiances
+
+    At a cell temperature :math:`T` and irradiance :math:`G`, the current :math:`I` at voltage :math:`V` solves
+
+    .. math::
+
+        I = I_{ph} - I_0 \\left(e^{\\frac{V + I R_s}{n N_s k T / q}} - 1\\right) - \\frac{V + I R_s}{R_{sh}}
+            - I_{ph} \\frac{d}{N_s V_{bi} - (V + I R_s)}
+
+    with :math:`I_{ph} = \\frac{G}{1000} (I_{ph,STC} + \\mu_{I_{sc}} (T - 25))`,
+    :math:`I_0 = I_{0,STC} (T / T_{STC})^3 e^{\\frac{q E_g}{n k} (1 / T_{STC} - 1 / T)}`,
+    :math:`n = n_{STC} (1 + \\mu_\\gamma (T - 25))` and
+    :math:`R_{sh} = R_{sh,STC} + (R_{sh,0} - R_{sh,STC}) e^{-R_{sh,exp} G / 1000}`. The last (recombination) term only
+    applies to the :py:attr:`~plantpredict.enumerations.PVModelTypeEnum.ONE_DIODE_RECOMBINATION` models.
+
+    :param int number_of_cells_in_series: Number of cells in one string of cells - unitless.
+    :param float light_generated_current: Light-generated current at STC - units :py:data:`[A]`.
+    :param float saturation_current_at_stc: Diode saturation current at STC - units :py:data:`[A]`.
+    :param float diode_ideality_factor_at_stc: Diode ideality factor at STC - unitless.
+    :param float series_resistance_at_stc: Series resistance - units :py:data:`[Ohms]`.
+    :param float shunt_resistance_at_stc: Shunt resistance at STC - units :py:data:`[Ohms]`.
+    :param float dark_shunt_resistance: Shunt resistance at zero irradiance - units :py:data:`[Ohms]`.
+    :param float exponential_dependency_on_shunt_resistance: Exponent of the irradiance dependence of the shunt
+                                                             resistance - unitless.
+    :param float bandgap_voltage: Bandgap voltage - units :py:data:`[V]`.
+    :param float stc_short_circuit_current: Short circuit current at STC - units :py:data:`[A]`.
+    :param float stc_short_circuit_current_temp_coef: Temperature coefficient of the short circuit current - units
+                                                      :py:data:`[%/deg-C]`.
+    :param float linear_temp_dependence_on_gamma: Temperature coefficient of the diode ideality factor - units
+                                                  :py:data:`[%/deg-C]`.
+    :param int pv_model: 1-diode model type. Use :py:mod:`plantpredict.enumerations.PVModelTypeEnum`.
+    :param float built_in_voltage: Built-in voltage of a cell (recombination models only) - units :py:data:`[V]`.
+    :param float recombination_parameter: Recombination parameter :math:`d = d_i^2 / \\mu \\tau` (recombination models
+                                          only) - units :py:data:`[V]`.
+    """
+    @classmethod
+    def from_module(cls, module):
+        """
+        :param module: Module with the 1-diode model parameters, e.g. after :py:meth:`Module.get` or
+                       :py:meth:`Module.generate_single_diode_parameters_advanced`.
+        :type module: plantpredict.module.Module or dict
+        :rtype: SingleDiodeModel
+        """
+        attributes = module if isinstance(module, dict) else module.__dict__
+
+        return cls(
+            number_of_cells_in_series=attributes["number_of_cells_in_series"],
+            light_generated_current=attributes["light_generated_current"],
+            saturation_current_at_stc=attributes["saturation_current_at_stc"],
+            diode_ideality_factor_at_stc=attributes["diode_ideality_factor_at_stc"],
+            series_resistance_at_stc=attributes["series_resistance_at_stc"],
+            shunt_resistance_at_stc=attributes["shunt_resistance_at_stc"],
+            dark_shunt_resistance=attributes.get("dark_shunt_resistance"),
+            exponential_dependency_on_shunt_resistance=attributes.get("exponential_dependency_on_shunt_resistance"),
+            bandgap_voltage=attributes["bandgap_voltage"],
+            stc_short_circuit_current=attributes.get("stc_short_circuit_current"),
+            stc_short_circuit_current_temp_coef=attributes.get("stc_short_circuit_current_temp_coef") or 0.0,
+            linear_temp_dependence_on_gamma=attributes.get("linear_temp_dependence_on_gamma") or 0.0,
+            pv_model=attributes.get("pv_model", PVModelTypeEnum.ONE_DIODE),
+            built_in_voltage=attributes.get("built_in_voltage"),
+            recombination_parameter=attributes.get("recombination_parameter")
+        )
+
+    def get_parameters_at_conditions(self, temperature, irradiance):
+        """
+        Translates the STC parameters to the given conditions.
+
+        :param temperature: Cell temperature(s) - units :py:data:`[deg-C]`.
+        :type temperature: float or numpy.ndarray
+        :param irradiance: Irradiance(s), broadcast against :py:data:`temperature` - units :py:data:`[W/m^2]`.
+        :type irradiance: float or numpy.ndarray
+        :return: Arrays :py:data:`light_generated_current`, :py:data:`saturation_current`,
+                 :py:data:`diode_ideality_factor`, :py:data:`thermal_voltage` (of the string of cells, including the
+                 ideality factor), :py:data:`shunt_resistance` and :py:data:`series_resistance`.
+        :rtype: dict
+        """
+        temperature, irradiance = numpy.broadcast_arrays(numpy.asarray(temperature, dtype=float),
+                                                         numpy.asarray(irradiance, dtype=float))
+        delta_t = temperature - STC_TEMPERATURE
+        cell_temperature = temperature + 273.15
+        stc_cell_temperature = STC_TEMPERATURE + 273.15
+        relative_irradiance = irradiance / STC_IRRADIANCE
+
+        isc_temp_coef = self.stc_short_circuit_current_temp_coef / 100.0 * self.stc_short_circuit_current
+        light_generated_current = relative_irradiance * (self.light_generated_current + isc_temp_coef * delta_t)
+
+        ideality = self.diode_ideality_factor_at_stc * (1.0 + self.linear_temp_dependence_on_gamma / 100.0 * delta_t)
+        saturation_current = self.saturation_current_at_stc * (cell_temperature / stc_cell_temperature) ** 3 * \
+            numpy.exp(ELEMENTARY_CHARGE * self.bandgap_voltage / (ideality * BOLTZMANN) *
+                      (1.0 / stc_cell_temperature - 1.0 / cell_temperature))
+        thermal_voltage = ideality * self.number_of_cells_in_series * BOLTZMANN * cell_temperature / ELEMENTARY_CHARGE
+
+        shunt_resistance = numpy.full(temperature.shape, float(self.shunt_resistance_at_stc))
+        if self.dark_shunt_resistance is not None and self.exponential_dependency_on_shunt_resistance is not None:
+            shunt_resistance = shunt_resistance + (self.dark_shunt_resistance - self.shunt_resistance_at_stc) * \
+                numpy.exp(-self.exponential_dependency_on_shunt_resistance * relative_irradiance)
+
+        return {
+            "light_generated_current": light_generated_current,
+            "saturation_current": saturation_current,
+            "diode_ideality_factor": ideality,
+            "thermal_voltage": thermal_voltage,
+            "shunt_resistance": shunt_resistance,
+            "series_resistance": numpy.full(temperature.shape, float(self.series_resistance_at_stc))
+        }
+
+    def _residual(self, parameters, voltage, current):
+        """Returns the residual of the 1-diode equation and its derivative with respect to the diode voltage."""
+        diode_voltage = voltage + current * parameters["series_resistance"]
+        exponential = numpy.exp(numpy.minimum(diode_voltage / parameters["thermal_voltage"], _MAX_EXPONENT))
+
+        residual = parameters["light_generated_current"] - parameters["saturation_current"] * (exponential - 1.0) - \
+            diode_voltage / parameters["shunt_resistance"] - current
+        derivative = -parameters["saturation_current"] * exponential / parameters["thermal_voltage"] - \
+            1.0 / parameters["shunt_resistance"]
+
+        if self._has_recombination:
+            # keeps the diode voltage below the built-in voltage, where the recombination current diverges
+            margin = numpy.maximum(self._total_built_in_voltage - diode_voltage, 1e-9)
+            residual = residual - parameters["light_generated_current"] * self._total_recombination / margin
+            derivative = derivative - parameters["light_generated_current"] * self._total_recombination / margin ** 2
+
+        return residual, derivative
+
+    def _solve_current(self, parameters, voltage, iterations=100, tolerance=1e-12):
+        # the residual is concave and decreasing in the current, so Newton's method converges monotonically from the
+        # light-generated current (where the residual is negative for any non-negative voltage)
+        current = numpy.array(numpy.broadcast_to(parameters["light_generated_current"], voltage.shape))
+        for _ in range(iterations):
+            residual, derivative = self._residual(parameters, voltage, current)
+            step = residual / (derivative * parameters["series_resistance"] - 1.0)
+            current = current - step
+            if numpy.all(numpy.abs(step) <= tolerance * numpy.maximum(numpy.abs(current), 1.0)):
+                break
+
+        return current
+
+    def _solve_open_circuit_voltage(self, parameters, iterations=100, tolerance=1e-12):
+        # starts above the open circuit voltage (the value without shunt and recombination losses)
+        voltage = parameters["thermal_voltage"] * numpy.log1p(
+            numpy.maximum(parameters["light_generated_current"], 0.0) / parameters["saturation_current"]
+        )
+        if self._has_recombination:
+            voltage = numpy.minimum(voltage, self._total_built_in_voltage * (1.0 - 1e-9))
+
+        zero_current = numpy.zeros(voltage.shape)
+        for _ in range(iterations):
+            residual, derivative = self._residual(parameters, voltage, zero_current)
+            step = residual / derivative
+            voltage = voltage - step
+            if numpy.all(numpy.abs(step) <= tolerance * numpy.maximum(numpy.abs(voltage), 1.0)):
+                break
+
+        return numpy.maximum(voltage, 0.0)
+
+    def generate_iv_curves(self, temperature, irradiance, num_iv_points=100):
+        """
+        Generates IV curves from short circuit to open circuit, with evenly spaced voltages.
+
+        :param temperature: Cell temperature(s) - units :py:data:`[deg-C]`.
+        :type temperature: float or numpy.ndarray
+        :param irradiance: Irradiance(s), broadcast against :py:data:`temperature` - units :py:data:`[W/m^2]`.
+        :type irradiance: float or numpy.ndarray
+        :param int num_iv_points: Number of IV points of each curve.
+        :return: Arrays :py:data:`voltage` and :py:data:`current` with the shape of the broadcast conditions plus a last
+                 axis of length :py:data:`num_iv_points` - units :py:data:`[V]` and :py:data:`[A]`.
+        :rtype: dict
+        """
+        parameters = self.get_parameters_at_conditions(temperature, irradiance)
+        open_circuit_voltage = self._solve_open_circuit_voltage(parameters)
+
+        voltage = open_circuit_voltage[..., numpy.newaxis] * numpy.linspace(0.0, 1.0, num_iv_points)
+        current = self._solve_current({k: v[..., numpy.newaxis] for k, v in parameters.items()}, voltage)
+        current[..., -1] = 0.0
+
+        return {"voltage": voltage, "current": current}
+
+    def calculate_basic_data_at_conditions(self, temperature, irradiance, iterations=60):
+        """
+        Calculates the key points of the IV curve.
+
+        :param temperature: Cell temperature(s) - units :py:data:`[deg-C]`.
+        :type temperature: float or numpy.ndarray
+        :param irradiance: Irradiance(s), broadcast against :py:data:`temperature` - units :py:data:`[W/m^2]`.
+        :type irradiance: float or numpy.ndarray
+        :param int iterations: Number of golden-section iterations of the maximum power point search.
+        :return: :py:data:`short_circuit_current`, :py:data:`open_circuit_voltage`, :py:data:`mpp_current`,
+                 :py:data:`mpp_voltage` and :py:data:`max_power`, as floats for scalar conditions and otherwise as
+                 arrays with the shape of the broadcast conditions - units :py:data:`[A]`, :py:data:`[V]` and
+                 :py:data:`[W]`.
+        :rtype: dict
+        """
+        parameters = self.get_parameters_at_conditions(temperature, irradiance)
+        open_circuit_voltage = self._solve_open_circuit_voltage(parameters)
+        short_circuit_current = self._solve_current(parameters, numpy.zeros(open_circuit_voltage.shape))
+
+        # golden-section search of the maximum power between short circuit and open circuit
+        ratio = (numpy.sqrt(5.0) - 1.0) / 2.0
+        lower, upper = numpy.zeros(open_circuit_voltage.shape), open_circuit_voltage.copy()
+        for _ in range(iterations):
+            left = upper - ratio * (upper - lower)
+            right = lower + ratio * (upper - lower)
+            left_power = left * self._solve_current(parameters, left)
+            right_power = right * self._solve_current(parameters, right)
+            is_left = left_power > right_power
+            upper = numpy.where(is_left, right, upper)
+            lower = numpy.where(is_left, lower, left)
+
+        mpp_voltage = (lower + upper) / 2.0
+        mpp_current = self._solve_current(parameters, mpp_voltage)
+
+        basic_data = {
+            "short_circuit_current": short_circuit_current,
+            "open_circuit_voltage": open_circuit_voltage,
+            "mpp_current": mpp_current,
+            "mpp_voltage": mpp_voltage,
+            "max_power": mpp_current * mpp_voltage
+        }
+        if not open_circuit_voltage.shape:
+            return {key: float(value) for key, value in basic_data.items()}
+
+        return basic_data
+
+    def __init__(self, number_of_cells_in_series, light_generated_current, saturation_current_at_stc,
+                 diode_ideality_factor_at_stc, series_resistance_at_stc, shunt_resistance_at_stc,
+                 dark_shunt_resistance=None, exponential_dependency_on_shunt_resistance=None, bandgap_voltage=1.12,
+                 stc_short_circuit_current=None, stc_short_circuit_current_temp_coef=0.0,
+                 linear_temp_dependence_on_gamma=0.0, pv_model=PVModelTypeEnum.ONE_DIODE, built_in_voltage=None,
+                 recombination_parameter=None):
+        self.number_of_cells_in_series = number_of_cells_in_series
+        self.light_generated_current = light_generated_current
+        self.saturation_current_at_stc = saturation_current_at_stc
+        self.diode_ideality_factor_at_stc = diode_ideality_factor_at_stc
+        self.series_resistance_at_stc = series_resistance_at_stc
+        self.shunt_resistance_at_stc = shunt_resistance_at_stc
+        self.dark_shunt_resistance = dark_shunt_resistance
+        self.exponential_dependency_on_shunt_resistance = exponential_dependency_on_shunt_resistance
+        self.bandgap_voltage = bandgap_voltage
+        self.stc_short_circuit_current = (stc_short_circuit_current if stc_short_circuit_current is not None
+                                          else light_generated_current)
+        self.stc_short_circuit_current_temp_coef = stc_short_circuit_current_temp_coef
+        self.linear_temp_dependence_on_gamma = linear_temp_dependence_on_gamma
+        self.pv_model = pv_model
+        self.built_in_voltage = built_in_voltage
+        self.recombination_parameter = recombination_parameter
+
+        # the recombination term of the string of cells, if the model has one
+        self._has_recombination = (pv_model != PVModelTypeEnum.ONE_DIODE and bool(built_in_voltage) and
+                                   bool(recombination_parameter))
+        self._total_built_in_voltage = number_of_cells_in_series * (built_in_voltage or 0.0)
+        self._total_recombination = recombination_parameter or 0.0
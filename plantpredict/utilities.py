@@ -1,4 +1,7 @@
 import re
+import json
+import codecs
+from functools import lru_cache
 
 
 def decorate_all_methods(decorator):
@@ -10,14 +13,16 @@ def decorate_all_methods(decorator):
     return decorate
 
 
+CAMEL_PATTERN = re.compile(r'([A-Z])')
+UNDERSCORE_PATTERN = re.compile(r'_([a-z])')
+
+
 def camel_to_snake(key):
-    camel_pat = re.compile(r'([A-Z])')
-    return camel_pat.sub(lambda x: '_' + x.group(1).lower(), key)
+    return CAMEL_PATTERN.sub(lambda x: '_' + x.group(1).lower(), key)
 
 
 def snake_to_camel(key):
-    under_pat = re.compile(r'_([a-z])')
-    return under_pat.sub(lambda x: x.group(1).upper(), key)
+    return UNDERSCORE_PATTERN.sub(lambda x: x.group(1).upper(), key)
 
 
 MANUAL_KEY_FIXES = {
@@ -82,78 +87,245 @@ MANUAL_KEY_FIXES = {
 }
 
 
+@lru_cache(maxsize=8192)
+def convert_key(key, convert_function):
+    """
+    Converts a single key from one convention to another, including the manual fixes in :py:data:`MANUAL_KEY_FIXES`.
+    Conversions are cached, so each distinct key is only translated once per process.
+
+    :param str key: Key to be converted.
+    :param convert_function: :py:func:`camel_to_snake` or :py:func:`snake_to_camel`.
+    :return: The converted key.
+    :rtype: str
+    """
+    new_key = convert_function(key)
+
+    # manual fixes
+    for fix, replacement in MANUAL_KEY_FIXES[convert_function.__name__].items():
+        if fix in new_key:
+            if not (fix == "d_c" and new_key == "light_generated_current"):       # edge case
+                new_key = new_key.replace(fix, replacement)
+
+    # this removes the underscore given to a snake case when the first character in the camel case is capital
+    return new_key[1:] if new_key[0] == "_" else new_key
+
+
+def _empty_like(value):
+    # containers are rebuilt with converted keys; every other value is kept as is
+    if isinstance(value, dict):
+        return {}
+    elif isinstance(value, list):
+        return []
+    return value
+
+
 def convert_json(d, convert_function):
     """
-    Convert a nested dictionary from one convention to another. Prepares payload for http request.
+    Convert a nested dictionary (or list) from one convention to another. Prepares payload for http request.
+
+    The structure is walked iteratively, so arbitrarily deep payloads do not hit the recursion limit, and each
+    container is rebuilt exactly once. Lists may contain dictionaries, scalars or further lists; scalar elements are
+    kept. Keys named "api" and keys prefixed with an underscore are omitted at every level.
+
     Args:
-        d (dict): dictionary (nested or not) to be converted.
+        d (dict or list): dictionary or list (nested or not) to be converted.
         convert_function (func): function that takes the string in one convention and returns it in the other one.
     Returns:
-        Dictionary with the new keys.
+        Dictionary (or list) with the new keys.
 
     """
-    # "api" object is not serializable, so remove it from http request
-    dict_copy = d.copy()
-    dict_copy.pop("api", None)
-
-    new = {}
-    for k, v in dict_copy.items():
-        new_v = v
-        if isinstance(v, dict):
-            new_v = convert_json(v, convert_function)
-        elif isinstance(v, list):
-            new_v = list()
-            for x in v:
-                if isinstance(x, dict):
-                    new_v.append(convert_json(x, convert_function))
-
-        new_key = convert_function(k)
-
-        # manual fixes
-        for key, val in MANUAL_KEY_FIXES[convert_function.__name__].items():
-            if key in new_key:
-                if not (key == "d_c" and new_key == "light_generated_current"):       # edge case
-                    new_key = new_key.replace(key, val)
-
-        # this removes the underscore given to a snake case when the first character in the camel case is capital
-        new_key = new_key[1:] if new_key[0] == "_" else new_key
-
-        new[new_key] = new_v
+    new = _empty_like(d)
+    stack = [(d, new)] if new is not d else []
+
+    while stack:
+        source, target = stack.pop()
+
+        if isinstance(source, dict):
+            for k, v in source.items():
+                # "api" object is not serializable, so remove it from http request, and attributes prefixed with an
+                # underscore hold local client state and are never sent to the server
+                if k == "api" or k.startswith("_"):
+                    continue
+
+                new_v = _empty_like(v)
+                target[convert_key(k, convert_function)] = new_v
+                if new_v is not v:
+                    stack.append((v, new_v))
+
+        else:
+            for v in source:
+                new_v = _empty_like(v)
+                target.append(new_v)
+                if new_v is not v:
+                    stack.append((v, new_v))
 
     return new
 
 
 def convert_json_list(l, convert_function):
-    new_list = []
-    for d in l:
-        # "api" object is not serializable, so remove it from http request
-        dict_copy = d.copy()
-        dict_copy.pop("api", None)
-
-        new = {}
-        for k, v in dict_copy.items():
-            new_v = v
-            if isinstance(v, dict):
-                new_v = convert_json(v, convert_function)
-            elif isinstance(v, list):
-                new_v = list()
-                for x in v:
-                    if isinstance(x, dict):
-                        new_v.append(convert_json(x, convert_function))
-
-            new_key = convert_function(k)
-
-            # manual fixes
-            for key, val in MANUAL_KEY_FIXES[convert_function.__name__].items():
-                if key in new_key:
-                    if not (key == "d_c" and new_key == "light_generated_current"):       # edge case
-                        new_key = new_key.replace(key, val)
-
-            # this removes the underscore given to a snake case when the first character in the camel case is capital
-            new_key = new_key[1:] if new_key[0] == "_" else new_key
-
-            new[new_key] = new_v
-
-        new_list.append(new)
-
-    return new_list
+    """
+    Same as :py:func:`convert_json`, which also accepts lists. Kept for backwards compatibility.
+    """
+    return convert_json(l, convert_function)
+
+
+def _make_object_pairs_hook(convert_function):
+    # converts the keys of each object as it is decoded, skipping the same keys as convert_json
+    def object_pairs_hook(pairs):
+        return {
+            convert_key(k, convert_function): v for k, v in pairs if k != "api" and not k.startswith("_")
+        }
+    return object_pairs_hook
+
+
+def parse_json(content, convert_function=None):
+    """
+    Decodes a JSON document, converting the keys of every object while it is decoded rather than rebuilding the
+    decoded document with :py:func:`convert_json` afterwards, so that a response is only walked once and only one
+    copy of it is held in memory.
+
+    :param content: JSON document.
+    :type content: str or bytes
+    :param convert_function: :py:func:`camel_to_snake` or :py:func:`snake_to_camel`, or :py:data:`None` to keep the
+                             keys as they are.
+    :return: The decoded document.
+    :rtype: dict or list
+    """
+    if convert_function is None:
+        return json.loads(content)
+
+    return json.loads(content, object_pairs_hook=_make_object_pairs_hook(convert_function))
+
+
+class _JSONStream(object):
+    """
+    Incrementally decoded JSON document, read from an iterable of text or bytes chunks (e.g.
+    :py:meth:`requests.Response.iter_content`). Only the unconsumed tail of the document is buffered.
+    """
+    WHITESPACE = " \t\n\r"
+
+    def _read(self):
+        # appends the next non-empty chunk to the buffer, dropping what has been consumed already
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                self._buffer = self._buffer[self._position:] + text
+                self._position = 0
+                return True
+
+        return False
+
+    def peek(self):
+        """Skips whitespace and returns the next character, or an empty string at the end of the document."""
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in self.WHITESPACE:
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._read():
+                return ""
+
+    def expect(self, characters):
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError("Expected {} in the JSON document, found {}.".format(
+                " or ".join(repr(c) for c in characters), repr(character) if character else "its end"
+            ))
+        self._position += 1
+
+        return character
+
+    def decode_value(self):
+        """Decodes the next value, reading further chunks until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except ValueError:
+                # reads at least as much again as is buffered, so that a long value is not decoded once per chunk
+                size = len(self._buffer) - self._position
+                if not self._read():
+                    raise
+                while len(self._buffer) - self._position < 2 * size and self._read():
+                    pass
+                continue
+
+            # a number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and self._read():
+                continue
+
+            self._position = end
+            return value
+
+    def iter_array(self):
+        """Yields the elements of the array starting at the next character, one at a time."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._position += 1
+            return
+
+        while True:
+            yield self.decode_value()
+            if self.expect(",]") == "]":
+                return
+
+    def __init__(self, chunks, convert_function=None):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._position = 0
+        self._decoder = json.JSONDecoder(
+            object_pairs_hook=_make_object_pairs_hook(convert_function) if convert_function is not None else None
+        )
+
+
+def iter_json_items(chunks, key=None, convert_function=None):
+    """
+    Incrementally decodes a JSON document that is (or contains) a long array, e.g. the time series of a nodal data
+    response, and yields the elements of that array one at a time without holding the whole document in memory:
+
+    .. code-block:: python
+
+        response = session.get(url, stream=True)
+        for record in iter_json_items(response.iter_content(65536), convert_function=camel_to_snake):
+            ...
+
+    If the document is an object, the elements of its member :py:data:`key` are yielded, or those of its first
+    member that is an array if :py:data:`key` is :py:data:`None`. Every other member is decoded and discarded.
+
+    :param chunks: Iterable of :py:class:`str` or UTF-8 encoded :py:class:`bytes` chunks of the document.
+    :param str key: Name of the member of a top level object to yield the elements of, as it is after conversion with
+                    :py:data:`convert_function`.
+    :param convert_function: :py:func:`camel_to_snake` or :py:func:`snake_to_camel` to convert the keys of the yielded
+                             elements, or :py:data:`None` to keep them as they are.
+    :return: Generator of the elements of the array.
+    :raises ValueError: If the document is not valid JSON, or does not contain the array.
+    """
+    stream = _JSONStream(chunks, convert_function)
+    if stream.peek() == "[":
+        yield from stream.iter_array()
+        return
+
+    found = False
+    stream.expect("{")
+    character = stream.peek()
+    while character != "}":
+        name = stream.decode_value()
+        if not isinstance(name, str):
+            raise ValueError("Expected a member name in the JSON document, found {}.".format(repr(name)))
+        if convert_function is not None:
+            name = convert_key(name, convert_function)
+        stream.expect(":")
+
+        if not found and stream.peek() == "[" and (key is None or name == key):
+            found = True
+            yield from stream.iter_array()
+        else:
+            stream.decode_value()
+
+        character = stream.expect(",}")
+
+    if not found:
+        raise ValueError("The JSON document does not contain {}.".format(
+            "an array" if key is None else "the array {}".format(repr(key))
+        ))
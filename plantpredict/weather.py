@@ -1,7 +1,6 @@
 import json
-import requests
 from plantpredict.plant_predict_entity import PlantPredictEntity
-from plantpredict.error_handlers import handle_refused_connection, handle_error_response
+from plantpredict.error_handlers import handle_error_response, decode_response
 from plantpredict.utilities import convert_json, camel_to_snake, snake_to_camel
 
 
@@ -11,6 +10,8 @@ class Weather(PlantPredictEntity):
     "GET /Weather/{Id}" in `the general PlantPredict API documentation
     <http://app.plantpredict.com/swagger/ui/index#!/Weather/Weather_Get_0>`_.
     """
+    _disk_cache_url_suffix = "/Weather/{}"
+
     def create(self):
         """
         POST /Weather
@@ -111,7 +112,6 @@ class Weather(PlantPredictEntity):
         self.update_url_suffix = "/Weather"
         return super(Weather, self).update()
 
-    @handle_refused_connection
     @handle_error_response
     def get_details(self):
         """
@@ -122,12 +122,11 @@ class Weather(PlantPredictEntity):
         :returns: A list of dictionaries where each dictionary contains one timestamp of detailed weather data.
         :rtype: list of dicts
         """
-        return requests.get(
+        return self.api.session.get(
             url=self.api.base_url + "/Weather/{}/Detail".format(self.id),
             headers={"Authorization": "Bearer " + self.api.access_token}
         )
 
-    @handle_refused_connection
     @handle_error_response
     def search(self, latitude, longitude, search_radius=1):
         """
@@ -145,7 +144,7 @@ class Weather(PlantPredictEntity):
         :rtype: list of dicts
         """
 
-        response = requests.get(
+        response = self.api.session.get(
             url=self.api.base_url + "/Weather/Search",
             headers={"Authorization": "Bearer " + self.api.access_token},
             params=convert_json({
@@ -159,7 +158,6 @@ class Weather(PlantPredictEntity):
 
         return [convert_json(w, camel_to_snake) for w in weather_list]
 
-    @handle_refused_connection
     @handle_error_response
     def download(self, latitude, longitude, provider=0):
         """
@@ -174,12 +172,12 @@ class Weather(PlantPredictEntity):
         :return: #TODO
         :rtype: dict
         """
-        response = requests.post(
+        response = self.api.session.post(
             url=self.api.base_url + "/Weather/Download/{}".format(provider),
             headers={"Authorization": "Bearer " + self.api.access_token},
             params={'latitude': latitude, 'longitude': longitude}
         )
 
-        self.id = json.loads(response.content)['id'] if 200 <= response.status_code < 300 else None
+        self.id = decode_response(response)['id'] if 200 <= response.status_code < 300 else None
 
         return response
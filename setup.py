@@ -22,5 +22,9 @@ setup(
         'mock',
         'xlrd',
         'openpyxl'
-    ]
+    ],
+    extras_require={
+        'async': ['aiohttp'],
+        'export': ['pyarrow']
+    }
 )
@@ -262,7 +262,7 @@ def mocked_requests_get(*args, **kwargs):
 
     elif kwargs['url'] == "https://api.plantpredict.com/Project/710/Prediction/555":
         return MockResponse(
-            json_data={"id": 555, "project_id": 710, "name": "Prediction Name"},
+            json_data={"id": 555, "project_id": 710, "name": "Prediction Name", "processingStatus": 3},
             status_code=200
         )
 
@@ -376,4 +376,10 @@ def mocked_requests_update(*args, **kwargs):
             status_code=200
         )
 
+    elif kwargs['url'] == "https://api.plantpredict.com/Project/7/Prediction/77/PowerPlant":
+        return MockResponse(
+            json_data={},
+            status_code=204
+        )
+
     return MockResponse(None, 404)
@@ -1,6 +1,7 @@
 import unittest
 import mock
 
+from plantpredict.session import Session
 from plantpredict.prediction import Prediction
 from plantpredict.module import Module
 from plantpredict.project import Project
@@ -23,6 +24,7 @@ class PlantPredictUnitTestCase(unittest.TestCase):
         self.mocked_api = mocked_api()
         self.mocked_api.base_url = "https://api.plantpredict.com"
         self.mocked_api.access_token = 'dummy_token'
+        self.mocked_api.session = Session()
 
         self.mocked_api.prediction.return_value = Prediction(self.mocked_api)
         self.mocked_api.module.return_value = Module(api=self.mocked_api, id=module_id)
@@ -1,13 +1,17 @@
+import time
 import unittest
+import threading
 import mock
 
 import plantpredict
-from plantpredict import project, prediction, powerplant, geo, inverter, module, weather, ashrae
+from plantpredict import project, prediction, powerplant, geo, inverter, module, weather, ashrae, batch
+from plantpredict.session import Session
+from plantpredict.rate_limit import RateLimit
 from tests import mocked_requests
 
 
 class TestApi(unittest.TestCase):
-    @mock.patch('plantpredict.api.requests.post', new=mocked_requests.mocked_requests_post)
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
     def setUp(self):
         self.api = plantpredict.Api(
             username="dummy username",
@@ -16,13 +20,78 @@ class TestApi(unittest.TestCase):
             client_secret="dummy client secret"
         )
 
-    @mock.patch('plantpredict.api.requests.post', new=mocked_requests.mocked_requests_post)
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
     def test_refresh_access_token(self):
         self.api.refresh_access_token()
 
         self.assertEqual(self.api.access_token, "dummy access token 2")
         self.assertEqual(self.api.refresh_token, "dummy refresh token 2")
 
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
+    def test_refresh_access_token_already_refreshed(self):
+        response = self.api.refresh_access_token(stale_token="expired access token")
+
+        self.assertIsNone(response)
+        self.assertEqual(self.api.access_token, "dummy access token")
+
+    def test_refresh_access_token_single_flight(self):
+        num_refreshes = []
+
+        def post(*args, **kwargs):
+            num_refreshes.append(kwargs["params"]["grant_type"])
+            time.sleep(0.05)
+            return mocked_requests.mocked_requests_post(*args, **kwargs)
+
+        stale_token = self.api.access_token
+        with mock.patch('requests.Session.post', new=post):
+            threads = [
+                threading.Thread(target=self.api.refresh_access_token, kwargs={"stale_token": stale_token})
+                for _ in range(10)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(num_refreshes, ["refresh_token"])
+        self.assertEqual(self.api.access_token, "dummy access token 2")
+
+    def test_refresh_access_token_expired_refresh_token(self):
+        def post(*args, **kwargs):
+            if kwargs["params"]["grant_type"] == "refresh_token":
+                return mocked_requests.MockResponse(400, json_data={"error": "invalid_grant"})
+            return mocked_requests.mocked_requests_post(*args, **kwargs)
+
+        self.api.access_token = "expired access token"
+        with mock.patch('requests.Session.post', new=post):
+            self.api.refresh_access_token()
+
+        self.assertEqual(self.api.access_token, "dummy access token")
+
+    def test_access_token_expiry(self):
+        def post(*args, **kwargs):
+            return mocked_requests.MockResponse(200, json_data={
+                "access_token": "dummy access token 3", "refresh_token": "dummy refresh token 3", "expires_in": 3600
+            })
+
+        with mock.patch('requests.Session.post', new=post):
+            self.api.refresh_access_token()
+
+        self.assertAlmostEqual(self.api.access_token_expires_at, time.time() + 3600, delta=5)
+
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
+    def test_access_token_refreshed_before_expiry(self):
+        self.api.access_token_expires_at = time.time() + 30
+
+        self.assertEqual(self.api.access_token, "dummy access token 2")
+        self.assertIsNone(self.api.access_token_expires_at)
+
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
+    def test_access_token_not_refreshed_before_margin(self):
+        self.api.access_token_expires_at = time.time() + 600
+
+        self.assertEqual(self.api.access_token, "dummy access token")
+
     def test_init(self):
         self.assertEqual(self.api.base_url, "https://api.plantpredict.com")
         self.assertEqual(self.api.username, "dummy username")
@@ -31,6 +100,38 @@ class TestApi(unittest.TestCase):
         self.assertEqual(self.api.client_secret, "dummy client secret")
         self.assertEqual(self.api.access_token, "dummy access token")
         self.assertEqual(self.api.refresh_token, "dummy refresh token")
+        self.assertIsInstance(self.api.session, Session)
+
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
+    def test_init_pool_configuration(self):
+        api = plantpredict.Api(
+            username="dummy username",
+            password="dummy password",
+            client_id="dummy client id",
+            client_secret="dummy client secret",
+            pool_maxsize=25,
+            pool_block=True,
+            keep_alive=False
+        )
+        adapter = api.session.get_adapter(api.base_url)
+
+        self.assertEqual(adapter._pool_maxsize, 25)
+        self.assertTrue(adapter._pool_block)
+        self.assertEqual(api.session.headers["Connection"], "close")
+
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
+    def test_init_rate_limits(self):
+        prediction_run = RateLimit(rate=1.0, max_in_flight=2)
+        api = plantpredict.Api(
+            username="dummy username",
+            password="dummy password",
+            client_id="dummy client id",
+            client_secret="dummy client secret",
+            rate_limits={"prediction_run": prediction_run}
+        )
+
+        self.assertIs(api.session.rate_limiter.get(api.base_url + "/Project/7/Prediction/77/Run"), prediction_run)
+        self.assertIsNone(self.api.session.rate_limiter)
 
     def test_project(self):
         self.assertIsInstance(self.api.project(), project.Project)
@@ -56,6 +157,14 @@ class TestApi(unittest.TestCase):
     def test_ashrae(self):
         self.assertIsInstance(self.api.ashrae(), ashrae.ASHRAE)
 
+    def test_run_predictions(self):
+        predictions = [self.api.prediction(id=555, project_id=710), self.api.prediction(id=556, project_id=710)]
+        prediction_batch = self.api.run_predictions(predictions, max_in_flight=1)
+
+        self.assertIsInstance(prediction_batch, batch.PredictionBatch)
+        self.assertEqual([job.prediction for job in prediction_batch.jobs], predictions)
+        self.assertEqual(prediction_batch.max_in_flight, 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,13 +1,17 @@
+import os
 import mock
 import json
+import shutil
+import tempfile
 import unittest
+import numpy
 
-from plantpredict.ashrae import ASHRAE
+from plantpredict.ashrae import ASHRAE, ASHRAEStationIndex
 from tests import plantpredict_unit_test_case, mocked_requests
 
 
 class TestPrediction(plantpredict_unit_test_case.PlantPredictUnitTestCase):
-    @mock.patch('plantpredict.ashrae.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_get_station(self):
         self._make_mocked_api()
         ashrae = ASHRAE(api=self.mocked_api, latitude=35.0, longitude=-109.0)
@@ -25,7 +29,7 @@ class TestPrediction(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         })
         self.assertEqual(ashrae.cool_996, 20.0)
 
-    @mock.patch('plantpredict.ashrae.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_get_closest_station(self):
         self._make_mocked_api()
         ashrae = ASHRAE(api=self.mocked_api, latitude=33.0, longitude=-110.0)
@@ -43,3 +47,94 @@ class TestPrediction(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         })
         self.assertEqual(ashrae.cool_996, 20.0)
 
+
+class TestASHRAEStationIndex(plantpredict_unit_test_case.PlantPredictUnitTestCase):
+    def setUp(self):
+        random = numpy.random.RandomState(42)
+        self.latitudes = numpy.degrees(numpy.arcsin(random.uniform(-1.0, 1.0, 500)))
+        self.longitudes = random.uniform(-180.0, 180.0, 500)
+        self.stations = [{
+            "stationName": "STATION {}".format(i),
+            "wmo": 10000 + i,
+            "cool996": 20.0 + i % 10,
+            "min50Year": -20.0,
+            "max50Year": 40.0,
+            "distance": 1.0,
+            "latitude": latitude,
+            "longitude": longitude
+        } for i, (latitude, longitude) in enumerate(zip(self.latitudes, self.longitudes))]
+        self.ashrae_index = ASHRAEStationIndex(self.stations)
+
+    def _brute_force_distances(self, latitude, longitude):
+        latitudes, longitudes = numpy.radians(self.latitudes), numpy.radians(self.longitudes)
+        latitude, longitude = numpy.radians(latitude), numpy.radians(longitude)
+        a = numpy.sin((latitudes - latitude) / 2) ** 2 + \
+            numpy.cos(latitude) * numpy.cos(latitudes) * numpy.sin((longitudes - longitude) / 2) ** 2
+        return 2 * 6371.0 * numpy.arcsin(numpy.sqrt(a))
+
+    def test_init(self):
+        self.assertEqual(len(self.ashrae_index), 500)
+        self.assertEqual(self.ashrae_index.stations[3]["station_name"], "STATION 3")
+        self.assertEqual(self.ashrae_index.stations[3]["cool_996"], 23.0)
+        self.assertNotIn("distance", self.ashrae_index.stations[3])
+
+        with self.assertRaises(ValueError):
+            ASHRAEStationIndex([])
+
+    def test_get_closest_station(self):
+        random = numpy.random.RandomState(7)
+        for latitude, longitude in zip(random.uniform(-90.0, 90.0, 200), random.uniform(-180.0, 180.0, 200)):
+            distances = self._brute_force_distances(latitude, longitude)
+            station = self.ashrae_index.get_closest_station(latitude, longitude)
+
+            self.assertEqual(station["station_name"], "STATION {}".format(numpy.argmin(distances)))
+            self.assertAlmostEqual(station["distance"], distances.min(), places=6)
+
+    def test_get_closest_stations(self):
+        latitudes, longitudes = [33.0, -12.5, 89.9], [-110.0, 170.0, 0.0]
+        stations = self.ashrae_index.get_closest_stations(latitudes, longitudes)
+
+        self.assertEqual(stations, [
+            self.ashrae_index.get_closest_station(latitude, longitude)
+            for latitude, longitude in zip(latitudes, longitudes)
+        ])
+
+    def test_get_station(self):
+        station = self.ashrae_index.get_station(33.0, -110.0, station_name="STATION 17")
+        self.assertEqual(station["wmo"], 10017)
+        self.assertAlmostEqual(station["distance"], self._brute_force_distances(33.0, -110.0)[17], places=6)
+
+        # unknown names fall back to the closest station
+        self.assertEqual(
+            self.ashrae_index.get_station(33.0, -110.0, station_name="UNKNOWN"),
+            self.ashrae_index.get_closest_station(33.0, -110.0)
+        )
+
+    def test_from_file(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "stations.json")
+            self.ashrae_index.save(path)
+            self.assertEqual(ASHRAEStationIndex.from_file(path).stations, self.ashrae_index.stations)
+
+            path = os.path.join(directory, "stations.csv")
+            with open(path, "w") as f:
+                f.write("station_name,latitude,longitude,cool_996\nTEST STATION,35.0,-109.0,20.0\n")
+            self.assertEqual(ASHRAEStationIndex.from_file(path).get_closest_station(33.0, -110.0)["cool_996"], 20.0)
+        finally:
+            shutil.rmtree(directory)
+
+    @mock.patch('requests.Session.get')
+    def test_ashrae_uses_index(self, mocked_get):
+        self._make_mocked_api()
+        self.mocked_api.ashrae_index = self.ashrae_index
+
+        ashrae = ASHRAE(api=self.mocked_api, latitude=33.0, longitude=-110.0)
+        station = ashrae.get_closest_station()
+        self.assertEqual(ashrae.station_name, station["station_name"])
+        self.assertEqual(ashrae.cool_996, station["cool_996"])
+
+        ashrae = ASHRAE(api=self.mocked_api, latitude=33.0, longitude=-110.0)
+        ashrae.get_station(station_name="STATION 17")
+        self.assertEqual(ashrae.wmo, 10017)
+        self.assertFalse(mocked_get.called)
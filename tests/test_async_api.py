@@ -0,0 +1,361 @@
+import json
+import time
+import asyncio
+import unittest
+import mock
+
+from plantpredict import async_api
+from plantpredict.async_api import AsyncApi, AsyncProject, AsyncPrediction, AsyncPowerPlant, AsyncGeo, \
+    AsyncInverter, AsyncModule, AsyncWeather, AsyncASHRAE
+from plantpredict.powerplant import PowerPlant
+from plantpredict.prediction import PollingPolicy
+from plantpredict.error_handlers import APIError, PredictionError, RetryPolicy
+from plantpredict.enumerations import TrackingTypeEnum, ProcessingStatusEnum
+from tests import plantpredict_unit_test_case, mocked_requests
+
+
+async def mocked_send(self, method, url, **kwargs):
+    mocked_request = {
+        "GET": mocked_requests.mocked_requests_get,
+        "POST": mocked_requests.mocked_requests_post,
+        "PUT": mocked_requests.mocked_requests_update,
+        "DELETE": mocked_requests.mocked_requests_delete
+    }[method]
+    response = mocked_request(url=url, **kwargs)
+
+    # a few mocked endpoints return the decoded content instead of a response
+    if isinstance(response, mocked_requests.MockResponse):
+        return response.status_code, response.content, {}
+    return 200, json.dumps(response), {}
+
+
+@unittest.skipIf(async_api.aiohttp is None, "aiohttp is not installed")
+class TestAsyncApi(plantpredict_unit_test_case.PlantPredictUnitTestCase, unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.send_patcher = mock.patch('plantpredict.async_api.AsyncApi._send', new=mocked_send)
+        self.send_patcher.start()
+
+        self.api = AsyncApi(
+            username="dummy username",
+            password="dummy password",
+            client_id="dummy client id",
+            client_secret="dummy client secret"
+        )
+        await self.api.open()
+
+    async def asyncTearDown(self):
+        await self.api.close()
+        self.send_patcher.stop()
+
+    async def test_open(self):
+        self.assertEqual(self.api.access_token, "dummy access token")
+        self.assertEqual(self.api.refresh_token, "dummy refresh token")
+        self.assertIsNotNone(self.api.session)
+
+    async def test_close(self):
+        await self.api.close()
+        self.assertIsNone(self.api.session)
+
+    async def test_refresh_access_token(self):
+        await self.api.refresh_access_token()
+        self.assertEqual(self.api.access_token, "dummy access token 2")
+        self.assertEqual(self.api.refresh_token, "dummy refresh token 2")
+
+    async def test_request_not_found(self):
+        with self.assertRaises(APIError) as e:
+            await self.api.request("GET", "/get-info/80207")
+
+        self.assertEqual(e.exception.status, 404)
+
+    async def test_request_refreshes_expired_token(self):
+        responses = [(401, b"", {}), (200, b'{"stationName": "TEST STATION"}', {})]
+
+        async def send(method, url, headers=None, params=None, json=None):
+            if "okta" in url:
+                return 200, b'{"access_token": "new token", "refresh_token": "new refresh token"}', {}
+            self.assertEqual(headers["Authorization"], "Bearer " + self.api.access_token)
+            return responses.pop(0)
+
+        with mock.patch.object(self.api, '_send', new=send):
+            response = await self.api.request("GET", "/ASHRAE")
+
+        self.assertEqual(response, {"station_name": "TEST STATION"})
+        self.assertEqual(self.api.access_token, "new token")
+
+    async def test_request_refreshes_once_for_concurrent_requests(self):
+        refreshes = []
+
+        async def send(method, url, headers=None, params=None, json=None):
+            if "okta" in url:
+                refreshes.append(params["grant_type"])
+                await asyncio.sleep(0.01)
+                return 200, b'{"access_token": "new token", "refresh_token": "new refresh token"}', {}
+            if headers["Authorization"] != "Bearer new token":
+                return 401, b"", {}
+            return 200, b'{"stationName": "TEST STATION"}', {}
+
+        with mock.patch.object(self.api, '_send', new=send):
+            responses = await asyncio.gather(*[self.api.request("GET", "/ASHRAE") for _ in range(10)])
+
+        self.assertEqual(responses, 10*[{"station_name": "TEST STATION"}])
+        self.assertEqual(refreshes, ["refresh_token"])
+
+    async def test_request_refreshes_before_expiry(self):
+        self.api.access_token_expires_at = time.time() + 10
+        await self.api.request("GET", "/ASHRAE", params={"latitude": 33.0, "longitude": -110.0})
+
+        self.assertEqual(self.api.access_token, "dummy access token 2")
+
+    async def test_request_retries_transient_error(self):
+        responses = [(503, b"", {"Retry-After": "3"}), (502, b"", {}), (200, b'{"stationName": "TEST STATION"}', {})]
+
+        async def send(method, url, headers=None, params=None, json=None):
+            return responses.pop(0)
+
+        self.api.retry_policy = RetryPolicy(jitter=0.0)
+        with mock.patch.object(self.api, '_send', new=send), mock.patch('asyncio.sleep') as mocked_sleep:
+            response = await self.api.request("GET", "/ASHRAE")
+
+        self.assertEqual(response, {"station_name": "TEST STATION"})
+        self.assertEqual([c[0][0] for c in mocked_sleep.call_args_list], [3.0, 2.0])
+
+    async def test_request_gives_up(self):
+        async def send(method, url, headers=None, params=None, json=None):
+            return 504, b"Gateway Timeout", {}
+
+        self.api.retry_policy = RetryPolicy(max_attempts=2)
+        with mock.patch.object(self.api, '_send', new=send), mock.patch('asyncio.sleep'):
+            with self.assertRaises(APIError) as e:
+                await self.api.request("GET", "/ASHRAE")
+
+        self.assertEqual(e.exception.status, 504)
+
+    async def test_request_non_idempotent_not_retried(self):
+        sent = []
+
+        async def send(method, url, headers=None, params=None, json=None):
+            sent.append(method)
+            return 503, b"Service Unavailable", {}
+
+        with mock.patch.object(self.api, '_send', new=send), mock.patch('asyncio.sleep'):
+            with self.assertRaises(APIError):
+                await self.api.request("POST", "/Project/710/Prediction/555/Run")
+
+        self.assertEqual(sent, ["POST"])
+
+    async def test_request_no_content(self):
+        response = await self.api.request("POST", "/Project/710/Prediction/555/Run")
+        self.assertEqual(response, {"is_successful": True})
+
+    async def test_factories(self):
+        self.assertIsInstance(self.api.project(), AsyncProject)
+        self.assertIsInstance(self.api.prediction(), AsyncPrediction)
+        self.assertIsInstance(self.api.powerplant(), AsyncPowerPlant)
+        self.assertIsInstance(self.api.geo(), AsyncGeo)
+        self.assertIsInstance(self.api.inverter(), AsyncInverter)
+        self.assertIsInstance(self.api.module(), AsyncModule)
+        self.assertIsInstance(self.api.weather(), AsyncWeather)
+        self.assertIsInstance(self.api.ashrae(), AsyncASHRAE)
+
+    async def test_entity_create(self):
+        prediction = self.api.prediction(project_id=710, name="Prediction Name 2")
+        await prediction.create(use_closest_ashrae_station=False)
+
+        self.assertEqual(prediction.create_url_suffix, "/Project/710/Prediction")
+        self.assertEqual(prediction.id, 556)
+        self.assertEqual(prediction.error_model_acc, 2.9)
+
+    async def test_entity_get(self):
+        prediction = self.api.prediction(id=555, project_id=710)
+        await prediction.get()
+
+        self.assertEqual(prediction.get_url_suffix, "/Project/710/Prediction/555")
+        self.assertEqual(prediction.name, "Prediction Name")
+
+    async def test_prediction_get_processing_status(self):
+        prediction = self.api.prediction(id=555, project_id=710)
+        self.assertEqual(await prediction._get_processing_status(), ProcessingStatusEnum.SUCCESS)
+
+    async def test_prediction_run(self):
+        prediction = self.api.prediction(id=555, project_id=710)
+        with mock.patch('asyncio.sleep') as mocked_sleep:
+            response = await prediction.run(polling_policy=PollingPolicy(jitter=0.0))
+
+        self.assertEqual(response, {"is_successful": True})
+        self.assertFalse(mocked_sleep.called)
+        self.assertEqual(prediction.name, "Prediction Name")
+
+    async def test_prediction_wait_for_prediction_error(self):
+        prediction = self.api.prediction(id=555, project_id=710)
+        statuses = [ProcessingStatusEnum.QUEUED, ProcessingStatusEnum.ERROR]
+
+        async def get_processing_status():
+            return statuses.pop(0)
+
+        with mock.patch.object(prediction, '_get_processing_status', new=get_processing_status), \
+                mock.patch('asyncio.sleep') as mocked_sleep:
+            with self.assertRaises(PredictionError):
+                await prediction._wait_for_prediction(PollingPolicy(initial_interval=2.0, jitter=0.0))
+
+        mocked_sleep.assert_called_once_with(2.0)
+
+    async def test_concurrent_requests(self):
+        predictions = [self.api.prediction(id=555, project_id=710) for _ in range(10)]
+        summaries = await asyncio.gather(*[p.get_results_summary() for p in predictions])
+
+        self.assertEqual(
+            summaries, 10*[{"prediction_name": "Test Prediction", "block_result_summaries": [{"name": 1}]}]
+        )
+
+    async def test_prediction_assign_plant_design_temperature(self):
+        prediction = self.api.prediction(project_id=7)
+        await prediction._assign_plant_design_temperature_with_closest_ashrae_station()
+
+        self.assertEqual(prediction.ashrae_station, "TEST STATION")
+        self.assertEqual(prediction.cool_996, 20.0)
+
+    async def test_project_assign_location_attributes(self):
+        project = self.api.project(latitude=39.67, longitude=-105.21)
+        await project.assign_location_attributes()
+
+        self.assertEqual(project.locality, "Morrison")
+        self.assertEqual(project.elevation, 1965.96)
+        self.assertEqual(project.standard_offset_from_utc, -7.0)
+
+    async def test_weather_search(self):
+        results = await self.api.weather().search(latitude=39.67, longitude=-105.21)
+        self.assertEqual(results, [{"id": 998, "name": "Weather File 2"}])
+
+    async def test_inverter_get_kva(self):
+        response = await self.api.inverter(id=808).get_kva(elevation=1000, temperature=20.0, use_cooling_temp=True)
+        self.assertEqual(response, {"kva": 700.0})
+
+    async def test_module_generate_single_diode_parameters_default(self):
+        module = self.api.module()
+        await module.generate_single_diode_parameters_default()
+        self.assertEqual(module.diode_ideality_factor_at_stc, 1.78)
+
+    async def test_powerplant_add_dc_field_matches_sync(self):
+        powerplant = self.api.powerplant(project_id=7, prediction_id=77, use_cooling_temp=False)
+        powerplant.add_block()
+        powerplant.add_array(block_name=1)
+        powerplant.blocks[0]["arrays"][0]["inverters"].append({"name": "A", "dc_fields": []})
+        dc_field_inputs = dict(
+            block_name=1,
+            array_name=1,
+            inverter_name="A",
+            module_id=456,
+            tracking_type=TrackingTypeEnum.FIXED_TILT,
+            number_of_series_strings_wired_in_parallel=400,
+            modules_high=4,
+            modules_wired_in_series=10,
+            post_to_post_spacing=1.0,
+            module_tilt=30,
+        )
+        await powerplant.add_dc_field(**dc_field_inputs)
+
+        self._make_mocked_api(module_id=456)
+        sync_powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77)
+        sync_powerplant.blocks = [{"name": 1, "arrays": [{"name": 1, "inverters": [{"name": "A", "dc_fields": []}]}]}]
+        with mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get):
+            sync_powerplant.add_dc_field(**dc_field_inputs)
+
+        self.assertEqual(
+            powerplant.blocks[0]["arrays"][0]["inverters"][0]["dc_fields"],
+            sync_powerplant.blocks[0]["arrays"][0]["inverters"][0]["dc_fields"]
+        )
+
+    async def test_powerplant_local_state_not_sent(self):
+        powerplant = self.api.powerplant(project_id=7, prediction_id=77)
+        await powerplant._resolve_project()
+
+        sent = {}
+
+        async def request(method, url_suffix, params=None, json=None):
+            sent.update(json)
+            return {"is_successful": True}
+
+        with mock.patch.object(self.api, 'request', new=request):
+            await powerplant.create()
+
+        self.assertNotIn("_project", sent)
+        self.assertNotIn("Project", sent)
+        self.assertEqual(sent["projectId"], 7)
+
+    async def test_powerplant_clone_block(self):
+        powerplant = self.api.powerplant(project_id=7, prediction_id=77)
+        powerplant.blocks = [{"id": 1, "name": 1, "arrays": []}]
+
+        cloned_block_name = await powerplant.clone_block(block_id_to_clone=1)
+        self.assertEqual(cloned_block_name, 2)
+        self.assertEqual(powerplant.get_block(2), {"id": 1, "name": 2, "arrays": []})
+
+        with self.assertRaises(ValueError):
+            await powerplant.clone_block(block_id_to_clone=2)
+        self.assertEqual(len(powerplant.blocks), 2)
+
+    async def test_powerplant_clone_block_failed_update(self):
+        powerplant = self.api.powerplant(project_id=7, prediction_id=77)
+        powerplant.blocks = [{"id": 1, "name": 1, "arrays": []}]
+
+        async def request(method, url_suffix, params=None, json=None):
+            raise APIError(503, "Service Unavailable")
+
+        with mock.patch.object(self.api, 'request', new=request):
+            with self.assertRaises(APIError):
+                await powerplant.clone_block(block_id_to_clone=1)
+
+        self.assertEqual(powerplant.blocks, [{"id": 1, "name": 1, "arrays": []}])
+        with self.assertRaises(ValueError):
+            powerplant.get_block(2)
+
+    async def test_powerplant_add_inverter_shares_sync_cache(self):
+        powerplant = self.api.powerplant(project_id=7, prediction_id=77, local_kva=True)
+        powerplant.add_block()
+        powerplant.add_array(block_name=1)
+        requested = []
+        responses = {
+            "/Project/7": {"latitude": 33.0, "longitude": -110.0, "elevation": 1000.0},
+            "/Project/7/Prediction/77": {"ashrae_station": "TEST STATION"},
+            "/ASHRAE/GetStation": {"station_name": "TEST STATION", "cool_996": 20.0},
+            "/Inverter/808": {"apparent_power": 800.0, "kva_curves": [{"elevation": 0.0, "data_points": [
+                {"temperature": 10.0, "kva": 750.0}, {"temperature": 30.0, "kva": 650.0}
+            ]}]}
+        }
+
+        async def request(method, url_suffix, params=None, json=None):
+            requested.append(url_suffix)
+            return responses[url_suffix]
+
+        with mock.patch.object(self.api, 'request', new=request):
+            await powerplant.add_inverter(block_name=1, array_name=1, inverter_id=808)
+            await powerplant.add_inverter(block_name=1, array_name=1, inverter_id=808)
+
+            # the kVA rating is evaluated from the cached kVA curves, without the kVA endpoint
+            self.assertEqual(powerplant.blocks[0]["arrays"][0]["inverters"][1]["kva_rating"], 700.0)
+            self.assertEqual(sorted(requested), sorted(responses))
+
+            powerplant.invalidate_cache("inverter")
+            await powerplant.add_inverter(block_name=1, array_name=1, inverter_id=808)
+            self.assertEqual(requested.count("/Inverter/808"), 2)
+
+    async def test_prediction_get_nodal_frame(self):
+        prediction = self.api.prediction(id=555, project_id=710)
+
+        async def request(method, url_suffix, params=None, json=None, convert_keys=True):
+            self.assertFalse(convert_keys)
+            self.assertEqual(params, {"blockNumber": 1})
+            return [
+                {"timeStamp": "2019-01-01T00:00:00", "dcPower": 1.5},
+                {"timeStamp": "2019-01-01T01:00:00", "dcPower": 2.5}
+            ]
+
+        with mock.patch.object(self.api, 'request', new=request):
+            nodal_data = await prediction.get_nodal_frame(params={"block_number": 1})
+
+        self.assertEqual(list(nodal_data.columns), ["dc_power"])
+        self.assertEqual(nodal_data["dc_power"].tolist(), [1.5, 2.5])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+import mock
+import unittest
+import requests
+
+from plantpredict.batch import PredictionBatch
+from plantpredict.prediction import Prediction, PollingPolicy
+from plantpredict.error_handlers import APIError, PredictionError, PredictionTimeoutError, RetryPolicy
+from plantpredict.enumerations import ProcessingStatusEnum
+from tests import plantpredict_unit_test_case
+
+
+class TestPredictionBatch(plantpredict_unit_test_case.PlantPredictUnitTestCase):
+    def _make_predictions(self, statuses):
+        """Makes a mocked prediction per list of processing statuses returned by its consecutive polls."""
+        self._make_mocked_api()
+        self.in_flight = set()
+        self.max_in_flight = 0
+        self.submitted = []
+
+        predictions = []
+        for i, prediction_statuses in enumerate(statuses, 1):
+            prediction = Prediction(api=self.mocked_api, id=i, project_id=7)
+            prediction._submit_run = mock.Mock(side_effect=self._submit_run(prediction))
+            prediction._get_processing_status = mock.Mock(side_effect=self._get_processing_status(
+                prediction, list(prediction_statuses))
+            )
+            prediction.get_results_summary = mock.Mock(return_value={"prediction_id": i})
+            predictions.append(prediction)
+
+        return predictions
+
+    def _submit_run(self, prediction):
+        def submit_run(export_options=None):
+            self.submitted.append(prediction.id)
+            self.in_flight.add(prediction.id)
+            self.max_in_flight = max(self.max_in_flight, len(self.in_flight))
+            return {"is_successful": True}
+        return submit_run
+
+    def _get_processing_status(self, prediction, statuses):
+        def get_processing_status():
+            status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+            if status in (ProcessingStatusEnum.SUCCESS, ProcessingStatusEnum.ERROR):
+                self.in_flight.discard(prediction.id)
+            return status
+        return get_processing_status
+
+    @mock.patch('time.sleep')
+    def test_run(self, mocked_sleep):
+        running, success = ProcessingStatusEnum.RUNNING, ProcessingStatusEnum.SUCCESS
+        predictions = self._make_predictions([
+            [running, running, running, success],
+            [success],
+            [running, success],
+            [running, success],
+            [success]
+        ])
+        batch = PredictionBatch(self.mocked_api, predictions, max_in_flight=2, polling_policy=PollingPolicy(jitter=0.0))
+
+        jobs = batch.run()
+        self.assertEqual([job.prediction.id for job in jobs], [2, 3, 1, 4, 5])
+        self.assertTrue(all(job.is_successful for job in jobs))
+        self.assertEqual([job.results_summary for job in jobs], [{"prediction_id": i} for i in [2, 3, 1, 4, 5]])
+        self.assertEqual(self.max_in_flight, 2)
+        self.assertTrue(all(job.attempts == 1 for job in jobs))
+        self.assertTrue(all(job.elapsed >= 0.0 for job in jobs))
+
+    @mock.patch('time.sleep')
+    def test_run_yields_as_completed(self, mocked_sleep):
+        predictions = self._make_predictions([
+            [ProcessingStatusEnum.RUNNING, ProcessingStatusEnum.SUCCESS],
+            [ProcessingStatusEnum.SUCCESS]
+        ])
+        batch = iter(PredictionBatch(self.mocked_api, predictions))
+
+        self.assertEqual(next(batch).prediction.id, 2)
+        self.assertFalse(mocked_sleep.called)
+        self.assertEqual(next(batch).prediction.id, 1)
+        with self.assertRaises(StopIteration):
+            next(batch)
+
+    @mock.patch('time.sleep')
+    def test_run_without_results_summary(self, mocked_sleep):
+        predictions = self._make_predictions([[ProcessingStatusEnum.SUCCESS]])
+        jobs = PredictionBatch(self.mocked_api, predictions, get_results_summary=False).run()
+
+        self.assertIsNone(jobs[0].results_summary)
+        self.assertFalse(predictions[0].get_results_summary.called)
+
+    @mock.patch('time.sleep')
+    def test_run_retries_transient_failure(self, mocked_sleep):
+        predictions = self._make_predictions([[ProcessingStatusEnum.SUCCESS]])
+        submit_run = predictions[0]._submit_run.side_effect
+        predictions[0]._submit_run.side_effect = [APIError(503, "Service Unavailable"), submit_run]
+
+        jobs = PredictionBatch(self.mocked_api, predictions, polling_policy=PollingPolicy(initial_interval=0.0)).run()
+        self.assertTrue(jobs[0].is_successful)
+        self.assertEqual(jobs[0].attempts, 2)
+
+    @mock.patch('time.sleep')
+    def test_run_gives_up_after_max_retries(self, mocked_sleep):
+        predictions = self._make_predictions([[ProcessingStatusEnum.SUCCESS]])
+        predictions[0]._submit_run.side_effect = APIError(429, "Too Many Requests")
+
+        jobs = PredictionBatch(
+            self.mocked_api, predictions, max_retries=2, polling_policy=PollingPolicy(initial_interval=0.0)
+        ).run()
+        self.assertFalse(jobs[0].is_successful)
+        self.assertEqual(jobs[0].error.status, 429)
+        self.assertEqual(jobs[0].attempts, 3)
+
+    @mock.patch('time.sleep')
+    def test_run_does_not_retry_client_error(self, mocked_sleep):
+        predictions = self._make_predictions([[ProcessingStatusEnum.SUCCESS]])
+        predictions[0]._submit_run.side_effect = APIError(400, "Bad Request")
+
+        jobs = PredictionBatch(self.mocked_api, predictions).run()
+        self.assertEqual(jobs[0].error.status, 400)
+        self.assertEqual(jobs[0].attempts, 1)
+
+    @mock.patch('time.sleep')
+    def test_run_does_not_resubmit_server_error(self, mocked_sleep):
+        predictions = self._make_predictions([[ProcessingStatusEnum.SUCCESS]])
+        predictions[0]._submit_run.side_effect = APIError(500, "Internal Server Error")
+
+        jobs = PredictionBatch(self.mocked_api, predictions).run()
+        self.assertEqual(jobs[0].error.status, 500)
+        self.assertEqual(jobs[0].attempts, 1)
+
+    @mock.patch('time.sleep')
+    def test_run_does_not_resubmit_after_session_retries(self, mocked_sleep):
+        predictions = self._make_predictions([[ProcessingStatusEnum.SUCCESS]])
+        predictions[0]._submit_run.side_effect = APIError(429, "Too Many Requests")
+        self.mocked_api.session.retry_policy = RetryPolicy()
+
+        jobs = PredictionBatch(self.mocked_api, predictions).run()
+        self.assertEqual(jobs[0].error.status, 429)
+        self.assertEqual(jobs[0].attempts, 1)
+
+    @mock.patch('time.sleep')
+    def test_run_connection_error_fails_job(self, mocked_sleep):
+        predictions = self._make_predictions([[ProcessingStatusEnum.SUCCESS], [ProcessingStatusEnum.SUCCESS]])
+        predictions[0]._submit_run.side_effect = requests.exceptions.ConnectionError()
+        predictions[1]._get_processing_status.side_effect = requests.exceptions.ReadTimeout()
+
+        jobs = PredictionBatch(self.mocked_api, predictions).run()
+        self.assertIsInstance(jobs[0].error, requests.exceptions.ConnectionError)
+        self.assertIsInstance(jobs[1].error, requests.exceptions.ReadTimeout)
+        self.assertEqual(len(jobs), 2)
+
+    @mock.patch('time.sleep')
+    def test_run_unexpected_error_fails_job(self, mocked_sleep):
+        predictions = self._make_predictions([[ProcessingStatusEnum.SUCCESS]] * 3)
+        predictions[0]._submit_run.side_effect = ValueError("Expecting value: line 1 column 1 (char 0)")
+        predictions[1].get_results_summary.side_effect = KeyError("id")
+
+        jobs = PredictionBatch(self.mocked_api, predictions).run()
+        self.assertEqual(len(jobs), 3)
+        self.assertEqual({type(job.error) for job in jobs}, {ValueError, KeyError, type(None)})
+        self.assertTrue(jobs[-1].is_successful)
+
+    @mock.patch('time.sleep')
+    def test_run_prediction_error(self, mocked_sleep):
+        predictions = self._make_predictions([
+            [ProcessingStatusEnum.RUNNING, ProcessingStatusEnum.ERROR],
+            [ProcessingStatusEnum.RUNNING, ProcessingStatusEnum.SUCCESS]
+        ])
+
+        jobs = PredictionBatch(self.mocked_api, predictions).run()
+        self.assertIsInstance(jobs[0].error, PredictionError)
+        self.assertIsNone(jobs[0].results_summary)
+        self.assertTrue(jobs[1].is_successful)
+
+    @mock.patch('time.sleep')
+    def test_run_prediction_error_without_raise_on_error(self, mocked_sleep):
+        predictions = self._make_predictions([[ProcessingStatusEnum.RUNNING, ProcessingStatusEnum.ERROR]])
+
+        jobs = PredictionBatch(self.mocked_api, predictions, polling_policy=PollingPolicy(raise_on_error=False)).run()
+        self.assertIsInstance(jobs[0].error, PredictionError)
+        self.assertEqual(predictions[0]._get_processing_status.call_count, 2)
+
+    @mock.patch('time.sleep')
+    @mock.patch('time.monotonic')
+    def test_run_timeout(self, mocked_monotonic, mocked_sleep):
+        predictions = self._make_predictions([[ProcessingStatusEnum.RUNNING]])
+        mocked_monotonic.side_effect = [0.0, 0.0, 5.0, 11.0, 20.0]
+
+        jobs = PredictionBatch(self.mocked_api, predictions, polling_policy=PollingPolicy(timeout=10.0)).run()
+        self.assertIsInstance(jobs[0].error, PredictionTimeoutError)
+        self.assertEqual(jobs[0].error.processing_status, ProcessingStatusEnum.RUNNING)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,304 @@
+import os
+import time
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+import mock
+
+from plantpredict.cache import EntityCache, DiskCache, GeoCache
+from plantpredict.inverter import Inverter
+from tests import plantpredict_unit_test_case
+
+
+class TestEntityCache(unittest.TestCase):
+    def test_get(self):
+        cache = EntityCache()
+        fetch = mock.Mock(return_value={"id": 456})
+
+        self.assertEqual(cache.get(("module", 456), fetch), {"id": 456})
+        self.assertEqual(cache.get(("module", 456), fetch), {"id": 456})
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(len(cache), 1)
+
+    def test_get_fetch_error_not_cached(self):
+        cache = EntityCache()
+        fetch = mock.Mock(side_effect=[ValueError, {"id": 456}])
+
+        with self.assertRaises(ValueError):
+            cache.get(("module", 456), fetch)
+        self.assertEqual(cache.get(("module", 456), fetch), {"id": 456})
+
+    @mock.patch('time.monotonic')
+    def test_get_ttl(self, mocked_monotonic):
+        cache = EntityCache(ttl=10.0)
+        fetch = mock.Mock(side_effect=[1, 2])
+
+        mocked_monotonic.return_value = 0.0
+        self.assertEqual(cache.get(("inverter", 808), fetch), 1)
+        mocked_monotonic.return_value = 9.0
+        self.assertEqual(cache.get(("inverter", 808), fetch), 1)
+        mocked_monotonic.return_value = 10.5
+        self.assertEqual(cache.get(("inverter", 808), fetch), 2)
+
+    def test_invalidate(self):
+        cache = EntityCache()
+        for key in [("module", 1), ("module", 2), ("inverter", 1), ("inverter_kva", 1, 1000.0, 20.0, True)]:
+            cache.get(key, lambda: key)
+
+        cache.invalidate("module", 1)
+        self.assertEqual(
+            sorted(cache._entries), [("inverter", 1), ("inverter_kva", 1, 1000.0, 20.0, True), ("module", 2)]
+        )
+        cache.invalidate("inverter")
+        self.assertEqual(sorted(cache._entries), [("inverter_kva", 1, 1000.0, 20.0, True), ("module", 2)])
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+
+
+def _make_response(status_code, content=b"", headers=None):
+    return mock.Mock(status_code=status_code, content=content, headers=headers or {}, url="")
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "cache", "entities.sqlite")
+        self.url = "https://api.plantpredict.com/Module/456"
+        self.session = mock.Mock()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_get_stores_response(self):
+        disk_cache = DiskCache(self.path)
+        self.session.get.return_value = _make_response(200, b'{"id": 456}')
+
+        response = disk_cache.get(self.session, self.url, {"Authorization": "Bearer token"})
+        self.assertEqual(response.content, b'{"id": 456}')
+        self.assertEqual(len(disk_cache), 1)
+        self.assertEqual(disk_cache.misses, 1)
+        disk_cache.close()
+
+        # a new instance (e.g. in another process) reads the same file
+        self.assertEqual(len(DiskCache(self.path)), 1)
+
+    def test_get_error_not_stored(self):
+        disk_cache = DiskCache(self.path)
+        self.session.get.return_value = _make_response(404, b"Not Found")
+
+        self.assertEqual(disk_cache.get(self.session, self.url, {}).status_code, 404)
+        self.assertEqual(len(disk_cache), 0)
+
+    def test_get_revalidates_with_etag(self):
+        disk_cache = DiskCache(self.path, max_age=None)
+        self.session.get.side_effect = [
+            _make_response(200, b'{"id": 456}', {"ETag": '"v1"', "Last-Modified": "Tue, 01 Sep 2020 00:00:00 GMT"}),
+            _make_response(304)
+        ]
+
+        disk_cache.get(self.session, self.url, {"Authorization": "Bearer token"})
+        response = disk_cache.get(self.session, self.url, {"Authorization": "Bearer token"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), {"id": 456})
+        self.assertEqual(self.session.get.call_args[1]["headers"], {
+            "Authorization": "Bearer token",
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Tue, 01 Sep 2020 00:00:00 GMT"
+        })
+        self.assertEqual(disk_cache.revalidations, 1)
+
+    def test_get_replaces_modified_entity(self):
+        disk_cache = DiskCache(self.path, max_age=None)
+        self.session.get.side_effect = [
+            _make_response(200, b'{"id": 456, "name": "old"}', {"ETag": '"v1"'}),
+            _make_response(200, b'{"id": 456, "name": "new"}', {"ETag": '"v2"'}),
+            _make_response(304)
+        ]
+
+        disk_cache.get(self.session, self.url, {})
+        disk_cache.get(self.session, self.url, {})
+        response = disk_cache.get(self.session, self.url, {})
+
+        self.assertEqual(json.loads(response.content)["name"], "new")
+        self.assertEqual(self.session.get.call_args[1]["headers"], {"If-None-Match": '"v2"'})
+
+    def test_get_max_age(self):
+        disk_cache = DiskCache(self.path)
+        self.session.get.return_value = _make_response(200, b'{"id": 456}')
+
+        disk_cache.get(self.session, self.url, {})
+        response = disk_cache.get(self.session, self.url, {})
+
+        self.assertEqual(response.content, b'{"id": 456}')
+        self.assertEqual(self.session.get.call_count, 1)
+        self.assertEqual(disk_cache.hits, 1)
+
+        # without a maximum age, an entity is requested again if the server doesn't send validators
+        disk_cache.max_age = None
+        disk_cache.get(self.session, self.url, {})
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_get_keyed_by_account(self):
+        disk_cache = DiskCache(self.path)
+        self.session.get.side_effect = [_make_response(200, b'{"name": "private 1"}'),
+                                        _make_response(200, b'{"name": "private 2"}')]
+
+        disk_cache.get(self.session, self.url, {}, account="account 1")
+        response = disk_cache.get(self.session, self.url, {}, account="account 2")
+
+        self.assertEqual(response.content, b'{"name": "private 2"}')
+        self.assertEqual(disk_cache.get(self.session, self.url, {}, account="account 1").content,
+                         b'{"name": "private 1"}')
+        self.assertEqual(len(disk_cache), 2)
+
+        disk_cache.invalidate(self.url)
+        self.assertEqual(len(disk_cache), 0)
+
+    def test_get_account(self):
+        account = DiskCache.get_account(mock.Mock(client_id="client", username="user"))
+
+        self.assertEqual(account, DiskCache.get_account(mock.Mock(client_id="client", username="user")))
+        self.assertNotEqual(account, DiskCache.get_account(mock.Mock(client_id="client", username="other user")))
+        self.assertNotIn("user", account)
+
+    def test_eviction(self):
+        disk_cache = DiskCache(self.path, max_size=100)
+        self.session.get.side_effect = lambda url, headers: _make_response(200, os.urandom(40))
+
+        for i in range(4):
+            disk_cache.get(self.session, "https://api.plantpredict.com/Module/{}".format(i), {})
+
+        self.assertLessEqual(disk_cache.size(), 100)
+        self.assertGreater(disk_cache.evictions, 0)
+        self.assertEqual(len(disk_cache) + disk_cache.evictions, 4)
+
+    def test_invalidate(self):
+        disk_cache = DiskCache(self.path)
+        self.session.get.return_value = _make_response(200, b'{"id": 456}')
+        disk_cache.get(self.session, self.url, {})
+        disk_cache.get(self.session, "https://api.plantpredict.com/Module/789", {})
+
+        disk_cache.invalidate(self.url)
+        self.assertEqual(len(disk_cache), 1)
+        disk_cache.invalidate()
+        self.assertEqual(len(disk_cache), 0)
+
+
+class TestEntityDiskCache(plantpredict_unit_test_case.PlantPredictUnitTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self._make_mocked_api()
+        self.mocked_api.disk_cache = DiskCache(os.path.join(self.directory, "entities.sqlite"), max_age=3600.0)
+
+    def tearDown(self):
+        self.mocked_api.disk_cache.close()
+        shutil.rmtree(self.directory)
+
+    @mock.patch('requests.Session.get')
+    def test_get(self, mocked_get):
+        mocked_get.return_value = _make_response(200, b'{"id": 808, "name": "Inverter 808"}')
+
+        inverter = Inverter(api=self.mocked_api, id=808)
+        inverter.get()
+        other_inverter = Inverter(api=self.mocked_api, id=808)
+        other_inverter.get()
+
+        self.assertEqual(mocked_get.call_count, 1)
+        self.assertEqual(other_inverter.name, "Inverter 808")
+
+    @mock.patch('requests.Session.get')
+    def test_get_not_shared_between_accounts(self, mocked_get):
+        mocked_get.return_value = _make_response(200, b'{"id": 808, "name": "Inverter 808"}')
+        self.mocked_api.username = "user"
+
+        Inverter(api=self.mocked_api, id=808).get()
+        self.mocked_api.username = "other user"
+        Inverter(api=self.mocked_api, id=808).get()
+
+        self.assertEqual(mocked_get.call_count, 2)
+
+    @mock.patch('requests.Session.put')
+    @mock.patch('requests.Session.get')
+    def test_update_invalidates(self, mocked_get, mocked_put):
+        mocked_get.return_value = _make_response(200, b'{"id": 808, "name": "Inverter 808"}')
+        mocked_put.return_value = _make_response(200)
+
+        inverter = Inverter(api=self.mocked_api, id=808)
+        inverter.get()
+        inverter.update()
+        inverter.get()
+
+        self.assertEqual(mocked_get.call_count, 2)
+
+
+class TestGeoCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "geo_cache.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_get_cell(self):
+        geo_cache = GeoCache(resolution=0.01)
+
+        self.assertEqual(geo_cache.get_cell(39.671, -105.209), (3967, -10521))
+        self.assertEqual(geo_cache.get_cell(39.671, -105.209), geo_cache.get_cell(39.669, -105.211))
+        self.assertNotEqual(geo_cache.get_cell(39.671, -105.209), geo_cache.get_cell(39.68, -105.209))
+
+    def test_get(self):
+        geo_cache = GeoCache(resolution=0.01)
+        fetch = mock.Mock(side_effect=[{"elevation": 1965.96}, {"elevation": 1553.61}])
+
+        self.assertEqual(geo_cache.get(39.671, -105.209, fetch), {"elevation": 1965.96})
+        self.assertEqual(geo_cache.get(39.669, -105.211, fetch), {"elevation": 1965.96})
+        self.assertEqual(geo_cache.get(35.1, -106.7, fetch), {"elevation": 1553.61})
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(len(geo_cache), 2)
+
+    def test_get_single_lookup_per_cell(self):
+        geo_cache = GeoCache(resolution=0.01)
+        fetch = mock.Mock(side_effect=lambda: time.sleep(0.02) or {"elevation": 1965.96})
+
+        threads = [threading.Thread(target=geo_cache.get, args=(39.67, -105.21, fetch)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(geo_cache.hits, 4)
+
+    def test_persistence(self):
+        geo_cache = GeoCache(resolution=0.01, path=self.path)
+        geo_cache.get(39.67, -105.21, lambda: {"elevation": 1965.96})
+        self.assertFalse(os.path.exists(self.path))
+        geo_cache.close()
+
+        fetch = mock.Mock()
+        self.assertEqual(GeoCache(resolution=0.01, path=self.path).get(39.67, -105.21, fetch), {"elevation": 1965.96})
+        self.assertFalse(fetch.called)
+
+        # a different resolution is a different grid
+        self.assertEqual(len(GeoCache(resolution=0.1, path=self.path)), 0)
+
+    def test_save_every(self):
+        geo_cache = GeoCache(resolution=0.01, path=self.path, save_every=2)
+        with mock.patch.object(geo_cache, "_save", wraps=geo_cache._save) as mocked_save:
+            for i in range(5):
+                geo_cache.get(30.0 + i, -105.0, lambda: {"elevation": 1000.0})
+            self.assertEqual(mocked_save.call_count, 2)
+
+            geo_cache.close()
+            geo_cache.close()
+            self.assertEqual(mocked_save.call_count, 3)
+
+        self.assertEqual(len(GeoCache(resolution=0.01, path=self.path)), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,9 +2,252 @@ import unittest
 import mock
 import requests
 
-from plantpredict.error_handlers import handle_refused_connection
+from plantpredict.error_handlers import handle_refused_connection, handle_error_response, parse_retry_after, \
+    stream_json_response, decode_response, APIError, RetryPolicy
+from tests import mocked_requests
 
 
 class TestErrorHandlers(unittest.TestCase):
-    pass
-    # TODO
+    def _make_entity(self, responses):
+        api = mock.MagicMock()
+        api.access_token = "dummy access token"
+        for response in responses:
+            response.url = "https://api.plantpredict.com/ASHRAE"
+
+        class Entity(object):
+            def __init__(self):
+                self.api = api
+                self.num_requests = 0
+
+            @handle_error_response
+            def get(self):
+                self.num_requests += 1
+                return responses.pop(0)
+
+        return Entity()
+
+    def test_handle_error_response(self):
+        entity = self._make_entity([mocked_requests.MockResponse(200, json_data={"stationName": "TEST STATION"})])
+
+        self.assertEqual(entity.get(), {"station_name": "TEST STATION"})
+        self.assertFalse(entity.api.refresh_access_token.called)
+
+    def test_handle_error_response_no_content(self):
+        entity = self._make_entity([mocked_requests.MockResponse(204)])
+        self.assertEqual(entity.get(), {"is_successful": True})
+
+    def test_handle_error_response_decodes_once(self):
+        response = mocked_requests.MockResponse(200, json_data={"stationName": "TEST STATION"})
+        entity = self._make_entity([response])
+        entity_attributes = decode_response(response)
+
+        with mock.patch('plantpredict.error_handlers.parse_json') as mocked_parse_json:
+            self.assertIs(entity.get(), entity_attributes)
+        self.assertFalse(mocked_parse_json.called)
+        self.assertEqual(entity_attributes, {"station_name": "TEST STATION"})
+
+    def test_handle_error_response_error(self):
+        entity = self._make_entity([mocked_requests.MockResponse(500, content=b"Server Error")])
+
+        with self.assertRaises(APIError) as e:
+            entity.get()
+        self.assertEqual(e.exception.status, 500)
+
+    def test_handle_error_response_replays_after_refresh(self):
+        entity = self._make_entity([
+            mocked_requests.MockResponse(401, content=b""),
+            mocked_requests.MockResponse(200, json_data={"stationName": "TEST STATION"})
+        ])
+
+        self.assertEqual(entity.get(), {"station_name": "TEST STATION"})
+        entity.api.refresh_access_token.assert_called_once_with(stale_token="dummy access token")
+        self.assertEqual(entity.num_requests, 2)
+
+    def test_handle_error_response_replays_once(self):
+        entity = self._make_entity([
+            mocked_requests.MockResponse(401, content=b""),
+            mocked_requests.MockResponse(401, content=b"")
+        ])
+
+        with self.assertRaises(APIError) as e:
+            entity.get()
+        self.assertEqual(e.exception.status, 401)
+        self.assertEqual(entity.num_requests, 2)
+
+
+    def _make_retried_entity(self, results, retry_policy=None):
+        api = mock.MagicMock()
+        api.access_token = "dummy access token"
+        api.retry_policy = retry_policy if retry_policy is not None else RetryPolicy(jitter=0.0)
+
+        class Entity(object):
+            def __init__(self):
+                self.api = api
+                self.num_requests = 0
+
+            @handle_refused_connection
+            def get(self):
+                self.num_requests += 1
+                result = results.pop(0)
+                if isinstance(result, Exception):
+                    raise result
+                return result
+
+        return Entity()
+
+    def test_retry_policy_get_delay(self):
+        retry_policy = RetryPolicy(initial_backoff=1.0, backoff_factor=2.0, max_backoff=5.0, jitter=0.0)
+
+        self.assertEqual([retry_policy.get_delay(attempt) for attempt in range(1, 6)], [1.0, 2.0, 4.0, 5.0, 5.0])
+        self.assertEqual(retry_policy.get_delay(1, retry_after=30.0), 30.0)
+
+    def test_retry_policy_get_delay_jitter(self):
+        retry_policy = RetryPolicy(initial_backoff=10.0, jitter=0.5)
+        for _ in range(100):
+            self.assertTrue(5.0 <= retry_policy.get_delay(1) <= 10.0)
+
+    def test_retry_policy_allows_retry(self):
+        retry_policy = RetryPolicy(max_attempts=3, budget=60.0)
+
+        self.assertTrue(retry_policy.allows_retry(2, 10.0))
+        self.assertFalse(retry_policy.allows_retry(3, 10.0))
+        self.assertFalse(retry_policy.allows_retry(1, 61.0))
+        self.assertTrue(RetryPolicy(max_attempts=None, budget=None).allows_retry(100, 1000.0))
+
+    def test_retry_policy_is_retryable(self):
+        retry_policy = RetryPolicy()
+
+        self.assertTrue(retry_policy.is_retryable("get", 503))
+        self.assertTrue(retry_policy.is_retryable("PUT", 502))
+        self.assertFalse(retry_policy.is_retryable("GET", 500))
+        self.assertFalse(retry_policy.is_retryable("POST", 503))
+        self.assertTrue(retry_policy.is_retryable("POST", 429))
+        self.assertTrue(retry_policy.is_retryable("POST", connection_refused=True))
+        self.assertFalse(retry_policy.is_retryable("POST"))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("120"), 120.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertLess(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+    @mock.patch('time.sleep')
+    def test_retry_policy_call(self, mocked_sleep):
+        failed, succeeded = mock.MagicMock(), mock.MagicMock()
+        attempts = iter([(failed, APIError(503, "Service Unavailable")), (succeeded, None)])
+
+        self.assertIs(RetryPolicy().call("GET /Module/1", lambda: next(attempts)), succeeded)
+        self.assertTrue(failed.close.called)
+        self.assertFalse(succeeded.close.called)
+
+        # giving up returns the last failed result, or raises its error if there is none
+        last = mock.MagicMock()
+        self.assertIs(RetryPolicy(max_attempts=1).call("GET /Module/1", lambda: (last, APIError(503, ""))), last)
+        with self.assertRaises(APIError):
+            RetryPolicy(max_attempts=1).call("GET /Module/1", lambda: (None, APIError(503, "")))
+        self.assertEqual(mocked_sleep.call_count, 1)
+
+    @mock.patch('time.sleep')
+    def test_handle_refused_connection_retries(self, mocked_sleep):
+        events = []
+        entity = self._make_retried_entity(
+            [requests.exceptions.ConnectionError(), APIError(503, "Service Unavailable"), {"is_successful": True}],
+            RetryPolicy(jitter=0.0, on_event=events.append)
+        )
+
+        self.assertEqual(entity.get(), {"is_successful": True})
+        self.assertEqual(entity.num_requests, 3)
+        self.assertEqual([c[0][0] for c in mocked_sleep.call_args_list], [1.0, 2.0])
+        self.assertEqual([e["outcome"] for e in events], ["retry", "retry", "recovered"])
+        self.assertEqual(events[0]["function"], "get")
+
+    @mock.patch('time.sleep')
+    def test_handle_refused_connection_retry_after(self, mocked_sleep):
+        entity = self._make_retried_entity([APIError(429, "Too Many Requests", retry_after=12.0), {}])
+
+        entity.get()
+        mocked_sleep.assert_called_once_with(12.0)
+
+    @mock.patch('time.sleep')
+    def test_handle_refused_connection_max_attempts(self, mocked_sleep):
+        events = []
+        entity = self._make_retried_entity(
+            [APIError(502, "Bad Gateway") for _ in range(5)], RetryPolicy(max_attempts=3, on_event=events.append)
+        )
+
+        with self.assertRaises(APIError):
+            entity.get()
+        self.assertEqual(entity.num_requests, 3)
+        self.assertEqual([e["outcome"] for e in events], ["retry", "retry", "give_up"])
+
+    @mock.patch('time.sleep')
+    def test_handle_refused_connection_budget(self, mocked_sleep):
+        entity = self._make_retried_entity(
+            [requests.exceptions.ConnectionError() for _ in range(5)],
+            RetryPolicy(max_attempts=None, initial_backoff=10.0, jitter=0.0, budget=25.0)
+        )
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            entity.get()
+        self.assertEqual([c[0][0] for c in mocked_sleep.call_args_list], [10.0, 20.0])
+
+    @mock.patch('time.sleep')
+    def test_handle_refused_connection_client_error_not_retried(self, mocked_sleep):
+        entity = self._make_retried_entity([APIError(400, "Bad Request"), {}])
+
+        with self.assertRaises(APIError):
+            entity.get()
+        self.assertEqual(entity.num_requests, 1)
+        self.assertFalse(mocked_sleep.called)
+
+    @mock.patch('time.sleep')
+    def test_handle_refused_connection_default_policy(self, mocked_sleep):
+        entity = self._make_retried_entity([requests.exceptions.ConnectionError(), {}])
+        entity.api.retry_policy = mock.MagicMock()
+
+        self.assertEqual(entity.get(), {})
+        self.assertEqual(mocked_sleep.call_count, 1)
+
+    def test_handle_error_response_retry_after(self):
+        response = mocked_requests.MockResponse(503, content=b"Service Unavailable")
+        response.headers = {"Retry-After": "5"}
+        entity = self._make_entity([response])
+
+        with self.assertRaises(APIError) as e:
+            entity.get()
+        self.assertEqual(e.exception.retry_after, 5.0)
+
+    def _make_streamed_response(self, status_code, chunks):
+        return mock.Mock(status_code=status_code, content=b"".join(chunks), headers={},
+                         iter_content=mock.Mock(return_value=iter(chunks)))
+
+    def test_stream_json_response(self):
+        response = self._make_streamed_response(200, [b'[{"stationN', b'ame": "TEST STATION"}, {"stationName": 1}]'])
+        entity = mock.Mock(api=mock.MagicMock(access_token="dummy access token"))
+        send = mock.Mock(return_value=response)
+
+        items = stream_json_response(entity, send, chunk_size=16)
+        self.assertFalse(send.called)
+        self.assertEqual(list(items), [{"station_name": "TEST STATION"}, {"station_name": 1}])
+        response.iter_content.assert_called_once_with(16)
+        self.assertTrue(response.close.called)
+
+    def test_stream_json_response_replays_after_refresh(self):
+        responses = [self._make_streamed_response(401, [b""]), self._make_streamed_response(200, [b'[1, 2]'])]
+        entity = mock.Mock(api=mock.MagicMock(access_token="dummy access token"))
+
+        self.assertEqual(list(stream_json_response(entity, lambda: responses.pop(0))), [1, 2])
+        entity.api.refresh_access_token.assert_called_once_with(stale_token="dummy access token")
+
+    def test_stream_json_response_error(self):
+        response = self._make_streamed_response(500, [b"Server Error"])
+        entity = mock.Mock(api=mock.MagicMock(access_token="dummy access token"))
+
+        with self.assertRaises(APIError) as e:
+            list(stream_json_response(entity, lambda: response))
+        self.assertEqual(e.exception.status, 500)
+        self.assertTrue(response.close.called)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+import os
+import json
+import shutil
+import tempfile
+import importlib.util
+import unittest
+import mock
+import pandas
+
+from plantpredict import export
+from plantpredict.export import ResultsExporter
+from plantpredict.batch import PredictionJob
+
+
+class TestResultsExporter(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.prediction = mock.Mock(project_id=7, id=77)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def _make_nodal_frame(self, hours, **columns):
+        timestamps = pandas.to_datetime(["2019-01-01T{:02d}:00:00".format(hour) for hour in hours])
+        return pandas.DataFrame(columns, index=pandas.Index(timestamps, name="timestamp"))
+
+    def test_invalid_file_format(self):
+        with self.assertRaises(ValueError):
+            ResultsExporter(self.path, file_format="xlsx")
+
+    @unittest.skipIf(export.pyarrow is not None, "pyarrow is installed")
+    def test_feather_requires_pyarrow(self):
+        with self.assertRaises(ImportError):
+            ResultsExporter(self.path, file_format="feather")
+
+    def test_get_partition(self):
+        exporter = ResultsExporter(self.path, file_format="csv")
+
+        self.assertEqual(
+            exporter.get_partition("nodal_data", 7, 77, node="block=1/array=2"),
+            os.path.join(self.path, "nodal_data", "project_id=7", "prediction_id=77", "node=block%3D1%2Farray%3D2")
+        )
+        self.assertEqual(
+            exporter.get_partition("results_summary", 7, 77),
+            os.path.join(self.path, "results_summary", "project_id=7", "prediction_id=77")
+        )
+
+    def test_write_nodal_data(self):
+        exporter = ResultsExporter(self.path, file_format="csv")
+        exporter.write_nodal_data(self.prediction, "block=1", self._make_nodal_frame([0, 1], dc_power=[1, 2]))
+        file_paths = exporter.write_nodal_data(
+            self.prediction, "block=1", self._make_nodal_frame([2], dc_power=[2.5], ac_power=[2.0])
+        )
+
+        self.assertEqual(os.path.basename(file_paths[0])[:11], "part-00001-")
+        self.assertEqual(exporter.get_schema("nodal_data"), {
+            "timestamp": str(self._make_nodal_frame([0]).index.dtype),
+            "dc_power": "float64",
+            "ac_power": "float64"
+        })
+
+        nodal_data = exporter.read("nodal_data")
+        self.assertEqual(list(nodal_data.columns), ["timestamp", "dc_power", "ac_power", "project_id", "prediction_id",
+                                                    "node"])
+        self.assertEqual(nodal_data["dc_power"].tolist(), [1.0, 2.0, 2.5])
+        self.assertTrue(nodal_data["ac_power"][:2].isna().all())
+        self.assertEqual(nodal_data["timestamp"][2].hour, 2)
+        self.assertEqual(nodal_data["node"].unique().tolist(), ["block=1"])
+        self.assertEqual(nodal_data["prediction_id"].unique().tolist(), [77])
+
+    def test_schema_is_kept_across_predictions(self):
+        ResultsExporter(self.path, file_format="csv").write_nodal_data(
+            self.prediction, "system", self._make_nodal_frame([0], dc_power=[1.5], module_temperature=[10.0])
+        )
+
+        # a later run reads the schema written by the first one
+        exporter = ResultsExporter(self.path, file_format="csv")
+        exporter.write_nodal_data(mock.Mock(project_id=7, id=78), "system", [
+            {"timestamp": "2019-01-01T00:00:00", "module_temperature": 11, "dc_power": 2}
+        ])
+
+        nodal_data = exporter.read("nodal_data", prediction_id=78)
+        self.assertEqual(list(nodal_data.columns)[:3], ["timestamp", "dc_power", "module_temperature"])
+        self.assertEqual(nodal_data["module_temperature"].dtype, "float64")
+        self.assertEqual(len(exporter.read("nodal_data")), 2)
+
+        with self.assertRaises(ValueError):
+            exporter.write_nodal_data(self.prediction, "system", [{"timestamp": "not a time stamp"}])
+
+    def test_write_results_summary(self):
+        exporter = ResultsExporter(self.path, file_format="csv")
+        exporter.write_results_summary(self.prediction, {
+            "prediction_name": "Test Prediction",
+            "total_energy": 10.5,
+            "losses": {"soiling": 0.02},
+            "tags": ["a", "b"],
+            "block_result_summaries": [{"name": 1, "energy": 5}, {"name": 2, "energy": 5.5}]
+        })
+
+        results_summary = exporter.read("results_summary")
+        self.assertEqual(list(results_summary.columns), [
+            "prediction_name", "total_energy", "tags", "losses_soiling", "project_id", "prediction_id"
+        ])
+        self.assertEqual(json.loads(results_summary["tags"][0]), ["a", "b"])
+
+        block_result_summaries = exporter.read("results_summary.block_result_summaries")
+        self.assertEqual(block_result_summaries["energy"].tolist(), [5.0, 5.5])
+
+    def test_read_filters(self):
+        exporter = ResultsExporter(self.path, file_format="csv")
+        for prediction_id in [77, 78]:
+            for node in ["block=1", "block=2"]:
+                exporter.write("nodal_data", [{"dc_power": prediction_id}], 7, prediction_id, node=node)
+
+        self.assertEqual(len(exporter.read("nodal_data")), 4)
+        self.assertEqual(len(exporter.read("nodal_data", project_id=7, node="block=2")), 2)
+        self.assertEqual(exporter.read("nodal_data", prediction_id=78, node="block=1")["dc_power"].tolist(), [78.0])
+        self.assertTrue(exporter.read("nodal_data", project_id=8).empty)
+
+    def test_export_prediction(self):
+        def get_all_nodal_data(levels, sink, checkpoint, max_workers):
+            with open(checkpoint) as f:
+                completed = f.read().split()
+            for node in ["block=1", "block=2"]:
+                if node not in completed:
+                    sink(node, self._make_nodal_frame([0], dc_power=[1.0]))
+                    with open(checkpoint, "a") as f:
+                        f.write(node + "\n")
+
+        self.prediction.get_results_summary.return_value = {"prediction_name": "Test Prediction"}
+        self.prediction.get_results_details.return_value = {"daily_results": [{"energy": 1.0}, {"energy": 2.0}]}
+        self.prediction.get_all_nodal_data.side_effect = get_all_nodal_data
+        exporter = ResultsExporter(self.path, file_format="csv")
+
+        exporter.export_prediction(self.prediction, nodal_levels=["block"])
+        exporter.export_prediction(self.prediction, nodal_levels=["block"])
+
+        self.assertEqual(self.prediction.get_results_summary.call_count, 1)
+        self.assertEqual(self.prediction.get_results_details.call_count, 1)
+        self.assertEqual(self.prediction.get_all_nodal_data.call_args[1]["levels"], ["block"])
+        self.assertEqual(len(exporter.read("results_summary")), 1)
+        self.assertEqual(exporter.read("results_details.daily_results")["energy"].tolist(), [1.0, 2.0])
+        self.assertEqual(sorted(exporter.read("nodal_data")["node"]), ["block=1", "block=2"])
+
+    def test_export_batch(self):
+        jobs = []
+        for prediction_id, error in [(77, None), (78, ValueError())]:
+            job = PredictionJob(mock.Mock(project_id=7, id=prediction_id))
+            job.completed_at = 1.0
+            job.error = error
+            job.results_summary = {"prediction_name": "Test Prediction {}".format(prediction_id)}
+            jobs.append(job)
+
+        exporter = ResultsExporter(self.path, file_format="csv")
+        self.assertEqual(exporter.export_batch(iter(jobs), results_details=False), jobs)
+
+        results_summary = exporter.read("results_summary")
+        self.assertEqual(results_summary["prediction_name"].tolist(), ["Test Prediction 77"])
+        self.assertFalse(jobs[0].prediction.get_results_summary.called)
+        self.assertFalse(jobs[0].prediction.get_results_details.called)
+
+    @unittest.skipIf(export.pyarrow is None and importlib.util.find_spec("fastparquet") is None,
+                     "no parquet engine installed")
+    def test_write_parquet(self):
+        exporter = ResultsExporter(self.path)
+        file_paths = exporter.write_nodal_data(
+            self.prediction, "system", self._make_nodal_frame([0, 1], dc_power=[1, 2])
+        )
+
+        self.assertTrue(file_paths[0].endswith(".parquet"))
+        nodal_data = exporter.read("nodal_data")
+        self.assertEqual(nodal_data["dc_power"].tolist(), [1.0, 2.0])
+        self.assertEqual(nodal_data["timestamp"][1].hour, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,19 @@
+import os
+import shutil
+import tempfile
 import unittest
 import mock
 import json
 
 import plantpredict
 from plantpredict.geo import Geo
+from plantpredict.cache import GeoCache
+from plantpredict.error_handlers import APIError
 from tests import plantpredict_unit_test_case, mocked_requests
 
 
 class TestGeo(plantpredict_unit_test_case.PlantPredictUnitTestCase):
-    @mock.patch('plantpredict.geo.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_get_location_info(self):
         self._make_mocked_api()
         geo = Geo(api=self.mocked_api, latitude=39.67, longitude=-105.21)
@@ -29,7 +34,7 @@ class TestGeo(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         self.assertEqual(geo.state_province, "Colorado")
         self.assertEqual(geo.state_province_code, "CO")
 
-    @mock.patch('plantpredict.geo.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_get_elevation(self):
         self._make_mocked_api()
         geo = Geo(api=self.mocked_api, latitude=39.67, longitude=-105.21)
@@ -38,7 +43,7 @@ class TestGeo(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         self.assertEqual(json.loads(response.content), {"elevation": 1965.96})
         self.assertEqual(geo.elevation, 1965.96)
 
-    @mock.patch('plantpredict.geo.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_get_time_zone(self):
         self._make_mocked_api()
         geo = Geo(api=self.mocked_api, latitude=39.67, longitude=-105.21)
@@ -46,7 +51,52 @@ class TestGeo(plantpredict_unit_test_case.PlantPredictUnitTestCase):
 
         self.assertEqual(json.loads(response.content), {"time_zone": -7.0})
 
-    @mock.patch('plantpredict.api.requests.post', autospec=True)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
+    def test_get_location_attributes(self):
+        self._make_mocked_api()
+        geo = Geo(api=self.mocked_api, latitude=39.67, longitude=-105.21)
+        attributes = geo.get_location_attributes()
+
+        self.assertEqual(attributes, {
+            "country": "United States",
+            "country_code": "US",
+            "locality": "Morrison",
+            "region": "North America",
+            "state_province": "Colorado",
+            "state_province_code": "CO",
+            "elevation": 1965.96,
+            "time_zone": -7.0
+        })
+        self.assertEqual(geo.elevation, 1965.96)
+        self.assertEqual(geo.time_zone, -7.0)
+
+    @mock.patch('requests.Session.get')
+    def test_get_location_info_error(self, mocked_get):
+        mocked_get.return_value = mocked_requests.MockResponse(500, content="<html>Internal Server Error</html>")
+        self._make_mocked_api()
+        geo = Geo(api=self.mocked_api, latitude=39.67, longitude=-105.21)
+
+        with self.assertRaises(APIError) as e:
+            geo.get_location_info()
+        self.assertEqual(e.exception.status, 500)
+        self.assertFalse(hasattr(geo, "country"))
+
+    @mock.patch('requests.Session.get')
+    def test_get_location_attributes_cached(self, mocked_get):
+        mocked_get.side_effect = mocked_requests.mocked_requests_get
+        self._make_mocked_api()
+        self.mocked_api.geo_cache = GeoCache(resolution=0.01)
+
+        Geo(api=self.mocked_api, latitude=39.67, longitude=-105.21).get_location_attributes()
+        geo = Geo(api=self.mocked_api, latitude=39.671, longitude=-105.209)
+        geo.get_location_attributes()
+
+        self.assertEqual(mocked_get.call_count, 3)
+        self.assertEqual(geo.locality, "Morrison")
+        self.assertEqual(geo.latitude, 39.671)
+        self.assertEqual((self.mocked_api.geo_cache.hits, self.mocked_api.geo_cache.misses), (1, 1))
+
+    @mock.patch('requests.Session.post', autospec=True)
     def test_init(self, mock_api_post):
         mock_api_post.return_value.ok = True
         mock_api_post.return_value.content = '''{"access_token":"dummy_access_token",
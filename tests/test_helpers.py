@@ -1,8 +1,10 @@
 import unittest
 import os
+import shutil
+import tempfile
 import pandas as pd
 
-from plantpredict.helpers import load_from_excel, export_to_excel
+from plantpredict.helpers import load_from_excel, export_to_excel, iter_rows, iter_row_chunks, write_rows
 
 
 class TestHelpers(unittest.TestCase):
@@ -61,6 +63,82 @@ class TestHelpers(unittest.TestCase):
         loaded_data = load_from_excel("test_data/testing_helpers_truth.xlsx", "Sheet1")
         self.assertEqual(loaded_data, self.data)
 
+    def test_iter_rows(self):
+        self.assertEqual(list(iter_rows("test_data/testing_helpers_truth.xlsx")), self.data)
+        self.assertEqual(list(iter_rows("test_data/testing_helpers_truth.xlsx", "Sheet1", columns=["City", "Index"])), [
+            {"City": row["City"], "Index": row["Index"]} for row in self.data
+        ])
+
+        with self.assertRaises(ValueError):
+            list(iter_rows("test_data/testing_helpers_truth.xlsx", columns=["Index", "Country"]))
+
+    def test_iter_row_chunks(self):
+        chunks = list(iter_row_chunks("test_data/testing_helpers_truth.xlsx", chunk_size=3))
+        self.assertEqual(chunks, [self.data[:3], self.data[3:]])
+
+
+class TestStreamingHelpers(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_iter_rows_csv(self):
+        file_path = os.path.join(self.directory, "layout.csv")
+        with open(file_path, "w") as f:
+            f.write("block,power,name,count\n1,1.5,A,1\n\n2,,B,x\n3,2,C,3\n")
+
+        # every value of a column has the same type
+        self.assertEqual(list(iter_rows(file_path)), [
+            {"block": 1, "power": 1.5, "name": "A", "count": "1"},
+            {"block": 2, "power": None, "name": "B", "count": "x"},
+            {"block": 3, "power": 2.0, "name": "C", "count": "3"}
+        ])
+
+    def test_iter_rows_csv_infers_type_from_every_row(self):
+        file_path = os.path.join(self.directory, "layout.csv")
+        with open(file_path, "w", encoding="utf-8-sig") as f:
+            f.write("block,power,voltage\n")
+            f.writelines("{},1,1500\n".format(i) for i in range(2000))
+            f.write("2000,2.5,high\n")
+
+        rows = list(iter_rows(file_path))
+        self.assertEqual(rows[0], {"block": 0, "power": 1.0, "voltage": "1500"})
+        self.assertEqual(rows[-1], {"block": 2000, "power": 2.5, "voltage": "high"})
+        self.assertEqual({type(row["power"]) for row in rows}, {float})
+
+    def _make_rows(self):
+        return ({"index": i, "power": 0.5 * i if i % 2 else float("nan"), "name": "DC Field {}".format(i)}
+                for i in range(5))
+
+    def test_write_rows(self):
+        for extension in [".xlsx", ".csv"]:
+            file_path = os.path.join(self.directory, "rows" + extension)
+
+            self.assertEqual(write_rows(self._make_rows(), file_path, field_order=["name", "power"]), 5)
+            self.assertEqual(list(iter_rows(file_path))[:2], [
+                {"name": "DC Field 0", "power": None}, {"name": "DC Field 1", "power": 0.5}
+            ])
+
+    def test_write_rows_union_of_keys(self):
+        file_path = os.path.join(self.directory, "rows.csv")
+        write_rows(iter([{"a": 1}, {"b": 2.5, "a": 2}]), file_path)
+
+        self.assertEqual(list(iter_rows(file_path)), [{"a": 1, "b": None}, {"a": 2, "b": 2.5}])
+
+    def test_write_rows_sheet_name(self):
+        file_path = os.path.join(self.directory, "rows.xlsx")
+        write_rows([{"a": 1}], file_path, sheet_name="Results")
+
+        self.assertEqual(pd.ExcelFile(file_path).sheet_names, ["Results"])
+        self.assertEqual(list(iter_rows(file_path, "Results")), [{"a": 1}])
+
+    def test_write_rows_empty(self):
+        file_path = os.path.join(self.directory, "rows.csv")
+        self.assertEqual(write_rows([], file_path, field_order=["a", "b"]), 0)
+        self.assertEqual(list(iter_rows(file_path)), [])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,8 +1,11 @@
+import os
 import mock
 import unittest
 import json
+import numpy
 
-from plantpredict.inverter import Inverter
+from plantpredict.inverter import Inverter, interpolate_kva_curves
+from plantpredict.utilities import parse_json, camel_to_snake
 from tests import plantpredict_unit_test_case, mocked_requests
 
 
@@ -43,7 +46,7 @@ class TestInverter(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         self.assertEqual(inverter.update_url_suffix, "/Inverter")
         self.assertTrue(mocked_update.called)
 
-    @mock.patch('plantpredict.inverter.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_get_kva(self):
         self._make_mocked_api()
         inverter = Inverter(api=self.mocked_api, id=808)
@@ -51,6 +54,75 @@ class TestInverter(plantpredict_unit_test_case.PlantPredictUnitTestCase):
 
         self.assertEqual(json.loads(response.content)['kva'], 700.0)
 
+    @mock.patch('plantpredict.inverter.Inverter.get')
+    def test_interpolate_kva(self, mocked_get):
+        self._make_mocked_api()
+        inverter = Inverter(api=self.mocked_api, id=808)
+        mocked_get.side_effect = lambda: setattr(inverter, "kva_curves", KVA_CURVES)
+
+        self.assertEqual(inverter.interpolate_kva(elevation=1000.0, temperature=37.5), 600.0)
+        numpy.testing.assert_allclose(inverter.interpolate_kva(0.0, [25.0, 50.0]), [700.0, 600.0])
+        self.assertEqual(mocked_get.call_count, 1)
+
+
+# inverter as returned by GET /Inverter/{id}, with the responses of GET /Inverter/{id}/kVa (useCoolingTemp=true) at
+# some elevations and temperatures, recorded from PlantPredict: {"inverter": {...}, "kva": [{"elevation": ...,
+# "temperature": ..., "kva": ...}, ...]}
+KVA_PARITY_PATH = os.path.join(os.path.dirname(__file__), "test_data", "inverter_kva_parity.json")
+
+
+class TestKvaParity(unittest.TestCase):
+    @unittest.skipUnless(os.path.exists(KVA_PARITY_PATH), "no recorded kVA endpoint responses")
+    def test_interpolate_matches_endpoint(self):
+        with open(KVA_PARITY_PATH) as f:
+            recorded = json.load(f)
+        kva_curves = parse_json(json.dumps(recorded["inverter"]), camel_to_snake)["kva_curves"]
+
+        for point in recorded["kva"]:
+            self.assertAlmostEqual(
+                interpolate_kva_curves(kva_curves, point["elevation"], point["temperature"]), point["kva"],
+                delta=0.005 * point["kva"]
+            )
+
+
+KVA_CURVES = [
+    {"elevation": 2000.0, "data_points": [{"temperature": 25.0, "kva": 600.0}, {"temperature": 50.0, "kva": 500.0}]},
+    {"elevation": 0.0, "data_points": [{"temperature": 50.0, "kva": 600.0}, {"temperature": 25.0, "kva": 700.0}]},
+]
+
+
+class TestInterpolateKvaCurves(unittest.TestCase):
+    def test_interpolate(self):
+        self.assertEqual(interpolate_kva_curves(KVA_CURVES, 0.0, 25.0), 700.0)
+        self.assertEqual(interpolate_kva_curves(KVA_CURVES, 0.0, 37.5), 650.0)
+        self.assertEqual(interpolate_kva_curves(KVA_CURVES, 1000.0, 25.0), 650.0)
+        self.assertEqual(interpolate_kva_curves(KVA_CURVES, 1000.0, 37.5), 600.0)
+
+    def test_interpolate_clamped(self):
+        self.assertEqual(interpolate_kva_curves(KVA_CURVES, -100.0, 10.0), 700.0)
+        self.assertEqual(interpolate_kva_curves(KVA_CURVES, 3000.0, 60.0), 500.0)
+
+    def test_interpolate_arrays(self):
+        temperatures = numpy.array([[25.0, 37.5], [50.0, 60.0]])
+        kvas = interpolate_kva_curves(KVA_CURVES, 1000.0, temperatures)
+        numpy.testing.assert_allclose(kvas, [[650.0, 600.0], [550.0, 550.0]])
+
+        kvas = interpolate_kva_curves(KVA_CURVES, [0.0, 500.0, 2000.0], 25.0)
+        numpy.testing.assert_allclose(kvas, [700.0, 675.0, 600.0])
+
+    def test_interpolate_flat_points(self):
+        kva_curves = [
+            {"elevation": 0.0, "temperature": 25.0, "kva": 700.0},
+            {"elevation": 0.0, "temperature": 50.0, "kva": 600.0}
+        ]
+        self.assertEqual(interpolate_kva_curves(kva_curves, 1000.0, 37.5), 650.0)
+
+    def test_interpolate_invalid_curves(self):
+        with self.assertRaises(ValueError):
+            interpolate_kva_curves([], 0.0, 25.0)
+        with self.assertRaises(ValueError):
+            interpolate_kva_curves([{"elevation": 0.0, "data_points": [{"kva": 700.0}]}], 0.0, 25.0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,10 +1,24 @@
+import os
 import mock
+import shutil
+import tempfile
 import unittest
 import json
+import pandas
 
 from plantpredict.module import Module
 from tests import plantpredict_unit_test_case, mocked_requests
 
+try:
+    import pyarrow
+    HAS_PARQUET_ENGINE = True
+except ImportError:
+    try:
+        import fastparquet
+        HAS_PARQUET_ENGINE = True
+    except ImportError:
+        HAS_PARQUET_ENGINE = False
+
 
 class TestModule(plantpredict_unit_test_case.PlantPredictUnitTestCase):
     @mock.patch('plantpredict.plant_predict_entity.PlantPredictEntity.create')
@@ -89,6 +103,63 @@ class TestModule(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         self.assertEqual(key_iv_points[5]["short_circuit_current"], 1.74346881517)
         self.assertEqual(key_iv_points[5]["mpp_voltage"], 74.21342493)
 
+    def _write_template_copy(self, xlsx_path, extension):
+        """Writes the first sheet of an .xlsx template to a temporary .csv or .parquet file and returns its path."""
+        data = pandas.read_excel(xlsx_path)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        file_path = os.path.join(directory, "template" + extension)
+        if extension == ".csv":
+            data.to_csv(file_path, index=False)
+        else:
+            data.to_parquet(file_path, index=False)
+
+        return file_path
+
+    def test_parse_full_iv_curves_template_csv(self):
+        xlsx_path = "test_data/test_parse_full_iv_curves_template.xlsx"
+        csv_path = self._write_template_copy(xlsx_path, ".csv")
+
+        expected = Module._parse_full_iv_curves_template(xlsx_path)
+        self.assertEqual(Module._parse_full_iv_curves_template(csv_path), expected)
+        self.assertEqual(Module._parse_full_iv_curves_template(csv_path, chunk_size=7), expected)
+
+    def test_parse_key_iv_points_template_csv(self):
+        xlsx_path = "test_data/test_parse_key_iv_points_template.xlsx"
+        csv_path = self._write_template_copy(xlsx_path, ".csv")
+
+        expected = Module._parse_key_iv_points_template(xlsx_path)
+        self.assertEqual(Module._parse_key_iv_points_template(csv_path), expected)
+        self.assertEqual(Module._parse_key_iv_points_template(csv_path, chunk_size=4), expected)
+
+    def test_parse_full_iv_curves_template_keeps_file_order_within_curve(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        csv_path = os.path.join(directory, "template.csv")
+        pandas.DataFrame({
+            "Temperature [deg-C]": [50, 25, 50, 25],
+            "Irradiance [W/m2]": [1000, 1000, 1000, 200],
+            "I [A]": [9.0, 8.0, 7.0, 1.0],
+            "V [V]": [0.0, 0.0, 10.0, 0.0]
+        }).to_csv(csv_path, index=False)
+
+        self.assertEqual(Module._parse_full_iv_curves_template(csv_path), [
+            {"temperature": 25, "irradiance": 200, "data_points": [{"current": 1.0, "voltage": 0.0}]},
+            {"temperature": 25, "irradiance": 1000, "data_points": [{"current": 8.0, "voltage": 0.0}]},
+            {"temperature": 50, "irradiance": 1000, "data_points": [
+                {"current": 9.0, "voltage": 0.0}, {"current": 7.0, "voltage": 10.0}
+            ]}
+        ])
+
+    @unittest.skipIf(not HAS_PARQUET_ENGINE, "requires pyarrow or fastparquet")
+    def test_parse_full_iv_curves_template_parquet(self):
+        xlsx_path = "test_data/test_parse_full_iv_curves_template.xlsx"
+        parquet_path = self._write_template_copy(xlsx_path, ".parquet")
+
+        self.assertEqual(
+            Module._parse_full_iv_curves_template(parquet_path), Module._parse_full_iv_curves_template(xlsx_path)
+        )
+
     def test_parse_key_iv_points_template_with_sheet_name(self):
         self._make_mocked_api()
         module = Module(api=self.mocked_api)
@@ -103,7 +174,7 @@ class TestModule(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         self.assertEqual(key_iv_points[5]["short_circuit_current"], 1.74346881517)
         self.assertEqual(key_iv_points[5]["mpp_voltage"], 74.21342493)
 
-    @mock.patch('plantpredict.module.requests.post', new=mocked_requests.mocked_requests_post)
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
     def test_generate_iv_curve(self):
         self._make_mocked_api()
         module = Module(api=self.mocked_api)
@@ -137,7 +208,7 @@ class TestModule(plantpredict_unit_test_case.PlantPredictUnitTestCase):
             )
         self.assertEqual(e.exception.args[0], "Only one input option may be specified.")
 
-    @mock.patch('plantpredict.module.requests.post', mocked_requests.mocked_requests_post)
+    @mock.patch('requests.Session.post', mocked_requests.mocked_requests_post)
     def test_process_iv_curves_with_file(self):
         self._make_mocked_api()
         module = Module(api=self.mocked_api)
@@ -164,7 +235,7 @@ class TestModule(plantpredict_unit_test_case.PlantPredictUnitTestCase):
             }
         ])
 
-    @mock.patch('plantpredict.module.requests.post', mocked_requests.mocked_requests_post)
+    @mock.patch('requests.Session.post', mocked_requests.mocked_requests_post)
     def test_process_iv_curves_with_file(self):
         self._make_mocked_api()
         module = Module(api=self.mocked_api)
@@ -225,7 +296,7 @@ class TestModule(plantpredict_unit_test_case.PlantPredictUnitTestCase):
             )
         self.assertEqual(e.exception.args[0], "Only one input option may be specified.")
 
-    @mock.patch('plantpredict.module.requests.post', new=mocked_requests.mocked_requests_post)
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
     def test_process_key_iv_points_with_file(self):
         self._make_mocked_api()
         module = Module(api=self.mocked_api)
@@ -256,7 +327,7 @@ class TestModule(plantpredict_unit_test_case.PlantPredictUnitTestCase):
                 {"temperature": 25, "irradiance": 200, "relative_efficiency": 0.9582},
         ])
 
-    @mock.patch('plantpredict.module.requests.post', new=mocked_requests.mocked_requests_post)
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
     def test_process_key_iv_points_with_data(self):
         self._make_mocked_api()
         module = Module(api=self.mocked_api)
@@ -306,7 +377,7 @@ class TestModule(plantpredict_unit_test_case.PlantPredictUnitTestCase):
                 {"temperature": 25, "irradiance": 200, "relative_efficiency": 0.9582},
         ])
 
-    @mock.patch('plantpredict.module.requests.post', new=mocked_requests.mocked_requests_post)
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
     def test_calculate_basic_data_at_conditions(self):
         self._make_mocked_api()
         module = Module(self.mocked_api)
@@ -333,7 +404,7 @@ class TestModule(plantpredict_unit_test_case.PlantPredictUnitTestCase):
             }
         ])
 
-    @mock.patch('plantpredict.module.requests.post', new=mocked_requests.mocked_requests_post)
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
     def test_calculate_effective_irradiance_response(self):
         self._make_mocked_api()
         module = Module(self.mocked_api)
@@ -347,7 +418,7 @@ class TestModule(plantpredict_unit_test_case.PlantPredictUnitTestCase):
             {'temperature': 25, 'irradiance': 200, 'relative_efficiency': 0.97}
         ])
 
-    @mock.patch('plantpredict.module.requests.post', new=mocked_requests.mocked_requests_post)
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
     def test_generate_single_diode_parameters_advanced(self):
         self._make_mocked_api()
         module = Module(self.mocked_api)
@@ -363,7 +434,7 @@ class TestModule(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         })
         self.assertEqual(module.diode_ideality_factor_at_stc, 1.56)
 
-    @mock.patch('plantpredict.module.requests.post', new=mocked_requests.mocked_requests_post)
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
     def test_generate_single_diode_parameters_default(self):
         self._make_mocked_api()
         module = Module(self.mocked_api)
@@ -379,7 +450,7 @@ class TestModule(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         })
         self.assertEqual(module.diode_ideality_factor_at_stc, 1.78)
 
-    @mock.patch('plantpredict.module.requests.post', new=mocked_requests.mocked_requests_post)
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
     def test_optimize_series_resistance(self):
         self._make_mocked_api()
         module = Module(self.mocked_api)
@@ -396,5 +467,58 @@ class TestModule(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         self.assertEqual(module.diode_ideality_factor_at_stc, 1.22)
 
 
+    def _mocked_bulk_post(self, failing_names=()):
+        """Mocks the bulk endpoints (failing entirely if any module is in failing_names) and the single endpoints."""
+        self.bulk_requests = []
+
+        def post(url, headers, **kwargs):
+            body = kwargs["json"]
+            if url.endswith("Bulk"):
+                self.bulk_requests.append([m["name"] for m in body])
+                if any(m["name"] in failing_names for m in body):
+                    return mock.Mock(status_code=400, content=b"Bad Request", url=url, headers={})
+                content = [{"name": m["name"], "seriesResistanceAtStc": float(m["name"][-1])} for m in body]
+            elif body["name"] in failing_names:
+                return mock.Mock(status_code=400, content=b"Bad Request", url=url, headers={})
+            else:
+                content = {"name": body["name"], "seriesResistanceAtStc": float(body["name"][-1])}
+
+            return mock.Mock(status_code=200, content=json.dumps(content).encode(), url=url, headers={})
+
+        return post
+
+    @mock.patch('requests.Session.post')
+    def test_generate_single_diode_parameters_advanced_bulk(self, mocked_post):
+        self._make_mocked_api()
+        mocked_post.side_effect = self._mocked_bulk_post()
+        modules = [Module(self.mocked_api, name="Bin {}".format(i)) for i in range(5)]
+
+        result = Module.generate_single_diode_parameters_advanced_bulk(modules, chunk_size=2)
+        self.assertTrue(result.is_successful)
+        self.assertEqual(result.succeeded, modules)
+        self.assertEqual([m.series_resistance_at_stc for m in modules], [0.0, 1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(sorted(self.bulk_requests), [["Bin 0", "Bin 1"], ["Bin 2", "Bin 3"], ["Bin 4"]])
+        self.assertTrue(all(call[1]["url"].endswith("/GenerateSingleDiodeParametersAdvancedBulk")
+                            for call in mocked_post.call_args_list))
+
+    @mock.patch('requests.Session.post')
+    def test_optimize_series_resistance_bulk_partial_failure(self, mocked_post):
+        self._make_mocked_api()
+        mocked_post.side_effect = self._mocked_bulk_post(failing_names=("Bin 3", ))
+        modules = [Module(self.mocked_api, name="Bin {}".format(i)) for i in range(5)]
+
+        result = Module.optimize_series_resistance_bulk(modules, chunk_size=2, max_workers=2)
+        self.assertFalse(result.is_successful)
+        self.assertEqual(result.succeeded, modules[:3] + modules[4:])
+        self.assertEqual(len(result.failed), 1)
+        self.assertIs(result.failed[0][0], modules[3])
+        self.assertEqual(result.failed[0][1].status, 400)
+        self.assertEqual(modules[2].series_resistance_at_stc, 2.0)
+        self.assertFalse(hasattr(modules[3], "series_resistance_at_stc"))
+
+        # only the failed chunk was retried one module at a time
+        single_urls = [call[1]["url"] for call in mocked_post.call_args_list if not call[1]["url"].endswith("Bulk")]
+        self.assertEqual(single_urls, ["https://api.plantpredict.com/Module/Generator/OptimizeSeriesResistance"] * 2)
+
 if __name__ == '__main__':
     unittest.main()
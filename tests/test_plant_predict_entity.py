@@ -9,7 +9,7 @@ from plantpredict.error_handlers import APIError
 
 class TestPlantPredictEntity(plantpredict_unit_test_case.PlantPredictUnitTestCase):
 
-    @mock.patch('plantpredict.plant_predict_entity.requests.post', mocked_requests.mocked_requests_post)
+    @mock.patch('requests.Session.post', mocked_requests.mocked_requests_post)
     def test_create(self):
         self._make_mocked_api()
         ppe = PlantPredictEntity(self.mocked_api)
@@ -19,7 +19,7 @@ class TestPlantPredictEntity(plantpredict_unit_test_case.PlantPredictUnitTestCas
         self.assertEqual(json.loads(response.content), {"id": 35})
         self.assertEqual(ppe.id, 35)
 
-    @mock.patch('plantpredict.plant_predict_entity.requests.delete', mocked_requests.mocked_requests_delete)
+    @mock.patch('requests.Session.delete', mocked_requests.mocked_requests_delete)
     def test_delete(self):
         self._make_mocked_api()
         ppe = PlantPredictEntity(self.mocked_api)
@@ -28,7 +28,7 @@ class TestPlantPredictEntity(plantpredict_unit_test_case.PlantPredictUnitTestCas
         response = ppe.delete()
         self.assertEqual(json.loads(response.content), {"success": True})
 
-    @mock.patch('plantpredict.plant_predict_entity.requests.get', mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', mocked_requests.mocked_requests_get)
     def test_get_success(self):
         self._make_mocked_api()
         ppe = PlantPredictEntity(self.mocked_api)
@@ -38,7 +38,7 @@ class TestPlantPredictEntity(plantpredict_unit_test_case.PlantPredictUnitTestCas
         self.assertEqual(json.loads(response.content), {"color": "blue"})
         self.assertEqual(ppe.color, "blue")
 
-    @mock.patch('plantpredict.plant_predict_entity.requests.get', mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', mocked_requests.mocked_requests_get)
     def test_get_no_entity_found(self):
         self._make_mocked_api()
         ppe = PlantPredictEntity(self.mocked_api)
@@ -50,7 +50,7 @@ class TestPlantPredictEntity(plantpredict_unit_test_case.PlantPredictUnitTestCas
         self.assertEqual(e.exception.args[0], 404)
         self.assertEqual(e.exception.args[1], "Info not found.")
 
-    @mock.patch('plantpredict.plant_predict_entity.requests.put', mocked_requests.mocked_requests_update)
+    @mock.patch('requests.Session.put', mocked_requests.mocked_requests_update)
     def test_update(self):
         self._make_mocked_api()
         ppe = PlantPredictEntity(self.mocked_api)
@@ -1,10 +1,18 @@
+import os
 import mock
+import shutil
+import tempfile
 import unittest
+import pandas
+import requests
 
 from tests import plantpredict_unit_test_case, mocked_requests
 from tests.mocked_methods import mock_get_inverter_apparent_power, mock_get_inverter_kva_rating, \
     mock_calculate_default_post_height, mock_calculate_collector_bandwidth
 from plantpredict.powerplant import PowerPlant
+from plantpredict.inverter import Inverter
+from plantpredict.error_handlers import APIError, RetryPolicy
+from plantpredict.utilities import convert_json, snake_to_camel
 from plantpredict.enumerations import TrackingTypeEnum, ModuleOrientationEnum, BacktrackingTypeEnum
 
 
@@ -175,6 +183,7 @@ class TestPowerPlant(plantpredict_unit_test_case.PlantPredictUnitTestCase):
             {"length": 3.0, "resistance": 0.1, "number_of_conductors_per_phase": 1, "ordinal": 1}
         ])
 
+    @mock.patch('requests.Session.put', new=mocked_requests.mocked_requests_update)
     def test_clone_block(self):
         self._make_mocked_api()
         self.powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77)
@@ -365,6 +374,79 @@ class TestPowerPlant(plantpredict_unit_test_case.PlantPredictUnitTestCase):
             )
 
     @mock.patch('plantpredict.powerplant.PowerPlant._get_inverter_apparent_power', mock_get_inverter_apparent_power)
+    @mock.patch('plantpredict.ashrae.ASHRAE.get_station')
+    @mock.patch('plantpredict.prediction.Prediction.get')
+    @mock.patch('plantpredict.project.Project.get')
+    def test_get_inverter_kva_rating_is_cached(self, mocked_project_get, mocked_prediction_get, mocked_get_station):
+        self._make_mocked_api()
+        project = self.mocked_api.project.return_value
+        project.latitude, project.longitude, project.elevation = 33.0, -110.0, 1000.0
+        self.mocked_api.prediction.return_value.ashrae_station = "TEST STATION"
+        self.mocked_api.ashrae.return_value.cool_996 = 20.0
+        mocked_get_kva = self.mocked_api.inverter.return_value.get_kva
+        mocked_get_kva.return_value = {"kva": 700.0}
+        self.powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77)
+
+        for _ in range(3):
+            self.assertEqual(self.powerplant._get_inverter_kva_rating(808), 700.0)
+        self.assertEqual(mocked_project_get.call_count, 1)
+        self.assertEqual(mocked_prediction_get.call_count, 1)
+        self.assertEqual(mocked_get_station.call_count, 1)
+        mocked_get_kva.assert_called_once_with(elevation=1000.0, temperature=20.0, use_cooling_temp=True)
+
+        self.powerplant.invalidate_cache("inverter_kva")
+        self.powerplant._get_inverter_kva_rating(808)
+        self.assertEqual(mocked_get_kva.call_count, 2)
+        self.assertEqual(mocked_project_get.call_count, 1)
+
+    @mock.patch('plantpredict.ashrae.ASHRAE.get_station')
+    @mock.patch('plantpredict.prediction.Prediction.get')
+    @mock.patch('plantpredict.project.Project.get')
+    def test_get_inverter_kva_rating_from_kva_curves(self, mocked_project_get, mocked_prediction_get,
+                                                     mocked_get_station):
+        self._make_mocked_api()
+        project = self.mocked_api.project.return_value
+        project.latitude, project.longitude, project.elevation = 33.0, -110.0, 1000.0
+        self.mocked_api.prediction.return_value.ashrae_station = "TEST STATION"
+        self.mocked_api.ashrae.return_value.cool_996 = 20.0
+        self.mocked_api.inverter.return_value = Inverter(api=self.mocked_api, id=808, kva_curves=[
+            {"elevation": 0.0, "data_points": [{"temperature": 10.0, "kva": 750.0}, {"temperature": 30.0, "kva": 650.0}]}
+        ])
+        self.powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77, local_kva=True)
+
+        with mock.patch('plantpredict.inverter.Inverter.get'), mock.patch('plantpredict.inverter.Inverter.get_kva') \
+                as mocked_get_kva:
+            self.assertEqual(self.powerplant._get_inverter_kva_rating(808), 700.0)
+        self.assertFalse(mocked_get_kva.called)
+
+        # the kVA endpoint is used unless local evaluation is enabled
+        self.powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77)
+        with mock.patch('plantpredict.inverter.Inverter.get'), mock.patch('plantpredict.inverter.Inverter.get_kva') \
+                as mocked_get_kva:
+            mocked_get_kva.return_value = {"kva": 710.0}
+            self.assertEqual(self.powerplant._get_inverter_kva_rating(808), 710.0)
+        self.assertTrue(mocked_get_kva.called)
+
+    @mock.patch('plantpredict.module.Module.get')
+    def test_get_module_is_cached(self, mocked_module_get):
+        self._make_mocked_api(module_id=456)
+        self.powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77)
+
+        self.assertIs(self.powerplant._get_module(456), self.powerplant._get_module(456))
+        self.assertEqual(mocked_module_get.call_count, 1)
+
+        self.powerplant.invalidate_cache()
+        self.powerplant._get_module(456)
+        self.assertEqual(mocked_module_get.call_count, 2)
+
+    def test_entity_cache_not_sent(self):
+        self._make_mocked_api()
+        self.powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77, cache_ttl=60.0)
+
+        self.assertEqual(self.powerplant._entity_cache.ttl, 60.0)
+        self.assertNotIn("entityCache", convert_json(self.powerplant.__dict__, snake_to_camel))
+        self.assertNotIn("cacheTtl", convert_json(self.powerplant.__dict__, snake_to_camel))
+
     @mock.patch('plantpredict.powerplant.PowerPlant._get_inverter_kva_rating', mock_get_inverter_kva_rating)
     def test_add_inverter_default_inputs_use_cooling_temp(self):
         self._make_mocked_api()
@@ -396,6 +478,86 @@ class TestPowerPlant(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         with self.assertRaises(ValueError):
             self.powerplant.add_inverter(block_name=1, array_name=3, inverter_id=123)
 
+    @mock.patch('plantpredict.powerplant.PowerPlant._get_inverter_apparent_power', mock_get_inverter_apparent_power)
+    def test_add_inverter_names_beyond_z(self):
+        self._make_mocked_api()
+        self.powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77, use_cooling_temp=False)
+        self.powerplant.add_block()
+        self.powerplant.add_array(block_name=1)
+
+        names = [self.powerplant.add_inverter(block_name=1, array_name=1, inverter_id=123) for _ in range(705)]
+        self.assertEqual(names[:3], ["A", "B", "C"])
+        self.assertEqual(names[25:28], ["Z", "AA", "AB"])
+        self.assertEqual(names[701:], ["ZZ", "AAA", "AAB", "AAC"])
+        self.assertIs(self.powerplant.get_inverter(1, 1, "AB"), self.powerplant.blocks[0]["arrays"][0]["inverters"][27])
+
+    def test_get_block_array_inverter(self):
+        self._make_mocked_api()
+        self.powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77)
+        self._init_powerplant_structure()
+
+        block = self.powerplant.blocks[0]
+        self.assertIs(self.powerplant.get_block(1), block)
+        self.assertIs(self.powerplant.get_array(1, 1), block["arrays"][0])
+        self.assertIs(self.powerplant.get_inverter(1, 1, "A"), block["arrays"][0]["inverters"][0])
+        with self.assertRaises(ValueError):
+            self.powerplant.get_inverter(1, 1, "B")
+
+    def test_index_follows_blocks(self):
+        self._make_mocked_api()
+        self.powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77)
+        self._init_powerplant_structure()
+        self.assertEqual(self.powerplant.add_array(block_name=1), 2)
+
+        # blocks replaced (e.g. by get) or appended to by hand
+        self._init_powerplant_structure()
+        self.assertEqual(self.powerplant.add_array(block_name=1), 2)
+        self.powerplant.blocks.append({"id": 2, "name": 2, "arrays": []})
+        self.assertIs(self.powerplant.get_block(2), self.powerplant.blocks[1])
+        self.assertEqual(self.powerplant.add_array(block_name=2), 1)
+
+        # elements removed by hand are only dropped from the index by reindex
+        self.powerplant.blocks.pop()
+        self.powerplant.reindex()
+        with self.assertRaises(ValueError):
+            self.powerplant.get_block(2)
+
+    def test_clone_block_invalid_id(self):
+        self._make_mocked_api()
+        self.powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77)
+        self._init_powerplant_structure()
+
+        with self.assertRaises(ValueError) as e:
+            self.powerplant.clone_block(block_id_to_clone=2)
+        self.assertEqual(e.exception.args[0], "2 is not a valid block id in the existing power plant structure.")
+
+    @mock.patch('time.sleep')
+    def test_clone_block_failed_update(self, mocked_sleep):
+        self._make_mocked_api()
+        self.mocked_api.session.retry_policy = RetryPolicy(max_attempts=3, initial_backoff=0.0, jitter=0.0)
+        self.powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77)
+        self._init_powerplant_structure()
+
+        response = requests.Response()
+        response.status_code = 503
+        response._content = b"Service Unavailable"
+        with mock.patch('requests.Session.request', return_value=response) as mocked_request:
+            with self.assertRaises(APIError):
+                self.powerplant.clone_block(block_id_to_clone=1)
+
+        # only the single request is retried, and the power plant is left as it was
+        self.assertEqual(mocked_request.call_count, 3)
+        self.assertEqual(len(self.powerplant.blocks), 1)
+        self.assertEqual(self.powerplant.get_block(1)["name"], 1)
+
+    def test_index_not_sent(self):
+        self._make_mocked_api()
+        self.powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77)
+        self._init_powerplant_structure()
+        self.powerplant.get_block(1)
+
+        self.assertFalse([k for k in convert_json(self.powerplant.__dict__, snake_to_camel) if "Index" in k])
+
     @mock.patch('plantpredict.powerplant.PowerPlant._get_inverter_apparent_power', mock_get_inverter_apparent_power)
     def test_add_inverter_non_default_inputs_no_use_cooling_temp(self):
         self._make_mocked_api()
@@ -418,7 +580,7 @@ class TestPowerPlant(plantpredict_unit_test_case.PlantPredictUnitTestCase):
             "dc_fields": []
         })
 
-    @mock.patch('plantpredict.project.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_get_default_module_azimuth_from_latitude_above_equator(self):
         self._make_mocked_api()
         self.powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77)
@@ -597,7 +759,7 @@ class TestPowerPlant(plantpredict_unit_test_case.PlantPredictUnitTestCase):
 
     @mock.patch('plantpredict.powerplant.PowerPlant._calculate_collector_bandwidth',
                 new=mock_calculate_collector_bandwidth)
-    @mock.patch('plantpredict.plant_predict_entity.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_calculate_post_to_post_spacing_from_gcr(self):
         self._make_mocked_api()
         powerplant = PowerPlant(self.mocked_api)
@@ -722,8 +884,7 @@ class TestPowerPlant(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         self.assertEqual(post_height, 2.299038105676658)
 
     @mock.patch('plantpredict.powerplant.PowerPlant._calculate_default_post_height', mock_calculate_default_post_height)
-    @mock.patch('plantpredict.plant_predict_entity.requests.get', new=mocked_requests.mocked_requests_get)
-    @mock.patch('plantpredict.project.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_add_dc_field_with_bifacial_default_inputs(self):
         self._make_mocked_api(module_id=456)
         self.powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77)
@@ -786,8 +947,7 @@ class TestPowerPlant(plantpredict_unit_test_case.PlantPredictUnitTestCase):
             'backside_mismatch': 3.0
         })
 
-    @mock.patch('plantpredict.plant_predict_entity.requests.get', new=mocked_requests.mocked_requests_get)
-    @mock.patch('plantpredict.project.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_add_dc_field_with_bifacial_non_default_inputs(self):
         self._make_mocked_api(module_id=456)
         self.powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77)
@@ -872,8 +1032,7 @@ class TestPowerPlant(plantpredict_unit_test_case.PlantPredictUnitTestCase):
                 module_tilt=30
             )
 
-    @mock.patch('plantpredict.plant_predict_entity.requests.get', new=mocked_requests.mocked_requests_get)
-    @mock.patch('plantpredict.project.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_add_dc_field_fixed_tilt(self):
         """Test minimum inputs for successfully adding fixed tilt DC field."""
         self._make_mocked_api()
@@ -936,8 +1095,7 @@ class TestPowerPlant(plantpredict_unit_test_case.PlantPredictUnitTestCase):
             'field_width': 2019.98
         })
 
-    @mock.patch('plantpredict.plant_predict_entity.requests.get', new=mocked_requests.mocked_requests_get)
-    @mock.patch('plantpredict.project.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_add_dc_field_tracking(self):
         """Test minimum inputs for successfully adding tracker DC field."""
         self._make_mocked_api()
@@ -1000,8 +1158,7 @@ class TestPowerPlant(plantpredict_unit_test_case.PlantPredictUnitTestCase):
             'field_width': 4.859999999999999
         })
 
-    @mock.patch('plantpredict.plant_predict_entity.requests.get', new=mocked_requests.mocked_requests_get)
-    @mock.patch('plantpredict.project.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     @mock.patch('plantpredict.powerplant.PowerPlant._validate_dc_field_sizing')
     @mock.patch('plantpredict.powerplant.PowerPlant._validate_mounting_structure_parameters')
     @mock.patch('plantpredict.powerplant.PowerPlant._validate_inverter_name')
@@ -1032,8 +1189,7 @@ class TestPowerPlant(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         self.assertTrue(mock_validate_mounting_structure_parameters.called)
         self.assertTrue(mock_validate_dc_field_sizing.called)
 
-    @mock.patch('plantpredict.plant_predict_entity.requests.get', new=mocked_requests.mocked_requests_get)
-    @mock.patch('plantpredict.project.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     @mock.patch('plantpredict.powerplant.PowerPlant._calculate_tables_per_row')
     @mock.patch('plantpredict.powerplant.PowerPlant._calculate_table_length')
     @mock.patch('plantpredict.powerplant.PowerPlant._get_default_module_azimuth_from_latitude')
@@ -1060,8 +1216,7 @@ class TestPowerPlant(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         self.assertTrue(mock_calculate_table_length.called)
         self.assertTrue(mock_calculate_tables_per_row.called)
 
-    @mock.patch('plantpredict.plant_predict_entity.requests.get', new=mocked_requests.mocked_requests_get)
-    @mock.patch('plantpredict.project.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     @mock.patch('plantpredict.powerplant.PowerPlant._calculate_dc_field_width')
     @mock.patch('plantpredict.powerplant.PowerPlant._calculate_dc_field_length')
     def test_add_dc_field_dimension_calculator_helpers_called(self, mock_calculate_dc_field_length,
@@ -1088,8 +1243,7 @@ class TestPowerPlant(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         self.assertTrue(mock_calculate_dc_field_length.called)
         self.assertTrue(mock_calculate_dc_field_width.called)
 
-    @mock.patch('plantpredict.plant_predict_entity.requests.get', new=mocked_requests.mocked_requests_get)
-    @mock.patch('plantpredict.project.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_add_dc_field_fails_on_fixed_tilt_no_module_tilt(self):
         self._make_mocked_api()
         self.powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77)
@@ -1108,8 +1262,7 @@ class TestPowerPlant(plantpredict_unit_test_case.PlantPredictUnitTestCase):
                 post_to_post_spacing=1.5
             )
 
-    @mock.patch('plantpredict.plant_predict_entity.requests.get', new=mocked_requests.mocked_requests_get)
-    @mock.patch('plantpredict.project.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_add_dc_field_fails_on_tracker_no_backtracking_type(self):
         self._make_mocked_api()
         self.powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77)
@@ -1142,5 +1295,96 @@ class TestPowerPlant(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         self.assertEqual(self.powerplant.some_kwarg, 'kwarg')
 
 
+    def _make_layout(self):
+        return pandas.DataFrame([
+            {"block": "north", "array": 1, "inverter": "x", "inverter_id": 123, "module_id": 456,
+             "tracking_type": TrackingTypeEnum.FIXED_TILT, "modules_high": 4, "modules_wired_in_series": 10,
+             "post_to_post_spacing": 5.0, "module_tilt": 25, "field_dc_power": 800.0, "number_of_rows": 10,
+             "array_repeater": 2},
+            {"block": "north", "array": 1, "inverter": "x", "inverter_id": 123, "module_id": 456,
+             "tracking_type": TrackingTypeEnum.HORIZONTAL_TRACKER, "modules_high": 1, "modules_wired_in_series": 20,
+             "post_to_post_spacing": 6.0, "tracking_backtracking_type": BacktrackingTypeEnum.BACKTRACKING,
+             "number_of_series_strings_wired_in_parallel": 150, "module_orientation": ModuleOrientationEnum.PORTRAIT,
+             "number_of_rows": 12},
+            {"block": "south", "array": 1, "inverter": "x", "inverter_id": 123, "module_id": 456,
+             "tracking_type": TrackingTypeEnum.FIXED_TILT, "modules_high": 2, "modules_wired_in_series": 10,
+             "post_to_post_spacing": 4.0, "module_tilt": 20, "field_dc_power": 500.0, "inverter_repeater": 3},
+        ])
+
+    def _build_layout_imperatively(self):
+        powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77, use_cooling_temp=False)
+        powerplant.add_block()
+        powerplant.add_array(block_name=1, repeater=2)
+        powerplant.add_inverter(block_name=1, array_name=1, inverter_id=123)
+        powerplant.add_dc_field(block_name=1, array_name=1, inverter_name="A", module_id=456,
+                                tracking_type=TrackingTypeEnum.FIXED_TILT, modules_high=4, modules_wired_in_series=10,
+                                post_to_post_spacing=5.0, module_tilt=25, field_dc_power=800.0, number_of_rows=10)
+        powerplant.add_dc_field(block_name=1, array_name=1, inverter_name="A", module_id=456,
+                                tracking_type=TrackingTypeEnum.HORIZONTAL_TRACKER, modules_high=1,
+                                modules_wired_in_series=20, post_to_post_spacing=6.0,
+                                tracking_backtracking_type=BacktrackingTypeEnum.BACKTRACKING,
+                                number_of_series_strings_wired_in_parallel=150,
+                                module_orientation=ModuleOrientationEnum.PORTRAIT, number_of_rows=12)
+        powerplant.add_block()
+        powerplant.add_array(block_name=2)
+        powerplant.add_inverter(block_name=2, array_name=1, inverter_id=123, repeater=3)
+        powerplant.add_dc_field(block_name=2, array_name=1, inverter_name="A", module_id=456,
+                                tracking_type=TrackingTypeEnum.FIXED_TILT, modules_high=2, modules_wired_in_series=10,
+                                post_to_post_spacing=4.0, module_tilt=20, field_dc_power=500.0)
+
+        return powerplant
+
+    @mock.patch('plantpredict.powerplant.PowerPlant._get_inverter_apparent_power', mock_get_inverter_apparent_power)
+    @mock.patch('plantpredict.plant_predict_entity.PlantPredictEntity.create')
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
+    def test_from_layout(self, mocked_create):
+        self._make_mocked_api(module_id=456)
+        expected = self._build_layout_imperatively()
+
+        powerplant = PowerPlant.from_layout(self.mocked_api, self._make_layout(), project_id=7, prediction_id=77,
+                                            use_cooling_temp=False)
+        self.assertEqual(powerplant.blocks, expected.blocks)
+        self.assertEqual(mocked_create.call_count, 1)
+        self.assertEqual(powerplant.power_factor, 1.0)
+
+    @mock.patch('plantpredict.powerplant.PowerPlant._get_inverter_apparent_power', mock_get_inverter_apparent_power)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
+    def test_from_layout_csv(self):
+        self._make_mocked_api(module_id=456)
+        expected = self._build_layout_imperatively()
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        file_path = os.path.join(directory, "layout.csv")
+        self._make_layout().to_csv(file_path, index=False)
+
+        powerplant = PowerPlant.from_layout(self.mocked_api, file_path, project_id=7, prediction_id=77,
+                                            use_cooling_temp=False, create=False)
+        self.assertEqual(powerplant.blocks, expected.blocks)
+
+    def test_add_layout_missing_columns(self):
+        self._make_mocked_api()
+        powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77)
+
+        with self.assertRaises(ValueError) as e:
+            powerplant.add_layout([{"block": 1, "array": 1, "inverter": "A", "inverter_id": 123}])
+        self.assertEqual(e.exception.args[0], "The layout is missing the required column(s): module_id, tracking_type, "
+                                              "modules_high, modules_wired_in_series, post_to_post_spacing.")
+
+    @mock.patch('plantpredict.powerplant.PowerPlant._get_inverter_apparent_power', mock_get_inverter_apparent_power)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
+    def test_add_layout_invalid_row(self):
+        self._make_mocked_api(module_id=456)
+        powerplant = PowerPlant(api=self.mocked_api, project_id=7, prediction_id=77, use_cooling_temp=False)
+        layout = self._make_layout()
+        layout.loc[2, "module_tilt"] = None
+
+        with self.assertRaises(ValueError) as e:
+            powerplant.add_layout(layout)
+        self.assertEqual(e.exception.args[0], "Row 2 of the layout: The input module_tilt is required for a fixed tilt "
+                                              "DC field.")
+        self.assertEqual(powerplant.blocks, [])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,8 +1,15 @@
+import os
 import mock
 import json
+import pandas
+import shutil
+import tempfile
+import threading
 import unittest
 
-from plantpredict.prediction import Prediction
+from plantpredict.prediction import Prediction, PollingPolicy, nodal_data_to_frame, get_nodal_data_nodes
+from plantpredict.error_handlers import APIError, PredictionError, PredictionTimeoutError
+from plantpredict.enumerations import ProcessingStatusEnum
 from tests import plantpredict_unit_test_case, mocked_requests
 
 
@@ -16,8 +23,7 @@ class TestPrediction(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         self.assertEqual(prediction.create_url_suffix, "/Project/7/Prediction")
         self.assertTrue(mocked_create.called)
 
-    @mock.patch('plantpredict.ashrae.requests.get', new=mocked_requests.mocked_requests_get)
-    @mock.patch('plantpredict.project.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_assign_plant_design_temperature_with_closest_ashrae_station(self):
         self._make_mocked_api()
         prediction = Prediction(api=self.mocked_api, project_id=7)
@@ -56,7 +62,7 @@ class TestPrediction(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         self.assertTrue(mocked_update.called)
 
     @mock.patch('plantpredict.prediction.Prediction._wait_for_prediction')
-    @mock.patch('plantpredict.prediction.requests.post', new=mocked_requests.mocked_requests_post)
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
     def test_run(self, mocked_wait_for_prediction):
         self._make_mocked_api()
         prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
@@ -65,7 +71,109 @@ class TestPrediction(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         self.assertTrue(mocked_wait_for_prediction.called)
         self.assertEqual(is_success["is_successful"], True)
 
-    @mock.patch('plantpredict.prediction.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('plantpredict.prediction.Prediction._wait_for_prediction')
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
+    def test_run_with_polling_policy(self, mocked_wait_for_prediction):
+        self._make_mocked_api()
+        prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
+        polling_policy = PollingPolicy(timeout=60.0)
+
+        prediction.run(polling_policy=polling_policy)
+        mocked_wait_for_prediction.assert_called_once_with(polling_policy)
+
+    @mock.patch('plantpredict.prediction.Prediction._wait_for_prediction')
+    @mock.patch('requests.Session.post', return_value=mocked_requests.MockResponse(500, content=b"Server Error"))
+    def test_run_failed_request_does_not_wait(self, mocked_post, mocked_wait_for_prediction):
+        self._make_mocked_api()
+        prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
+
+        with self.assertRaises(APIError):
+            prediction.run()
+        self.assertFalse(mocked_wait_for_prediction.called)
+
+    def test_polling_policy_intervals(self):
+        polling_policy = PollingPolicy(initial_interval=1.0, backoff_factor=2.0, max_interval=5.0, jitter=0.0)
+        intervals = polling_policy.intervals()
+
+        self.assertEqual([next(intervals) for _ in range(5)], [1.0, 2.0, 4.0, 5.0, 5.0])
+
+    def test_polling_policy_intervals_jitter(self):
+        polling_policy = PollingPolicy(initial_interval=10.0, backoff_factor=1.0, jitter=0.2)
+        intervals = polling_policy.intervals()
+
+        for _ in range(100):
+            self.assertTrue(8.0 <= next(intervals) <= 12.0)
+
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
+    def test_get_processing_status(self):
+        self._make_mocked_api()
+        prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
+
+        self.assertEqual(prediction._get_processing_status(), ProcessingStatusEnum.SUCCESS)
+        self.assertIsNone(prediction.name)
+
+    @mock.patch('time.sleep')
+    @mock.patch('plantpredict.prediction.Prediction.get')
+    @mock.patch('plantpredict.prediction.Prediction._get_processing_status')
+    def test_wait_for_prediction(self, mocked_get_processing_status, mocked_get, mocked_sleep):
+        self._make_mocked_api()
+        prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
+        mocked_get_processing_status.side_effect = [
+            ProcessingStatusEnum.QUEUED, ProcessingStatusEnum.RUNNING, None, ProcessingStatusEnum.SUCCESS
+        ]
+
+        prediction._wait_for_prediction(PollingPolicy(initial_interval=1.0, backoff_factor=2.0, jitter=0.0))
+        self.assertEqual(mocked_get_processing_status.call_count, 4)
+        self.assertEqual([c[0][0] for c in mocked_sleep.call_args_list], [1.0, 2.0, 4.0])
+        self.assertEqual(mocked_get.call_count, 1)
+
+    @mock.patch('time.sleep')
+    @mock.patch('plantpredict.prediction.Prediction.get')
+    @mock.patch('plantpredict.prediction.Prediction._get_processing_status')
+    def test_wait_for_prediction_error(self, mocked_get_processing_status, mocked_get, mocked_sleep):
+        self._make_mocked_api()
+        prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
+        mocked_get_processing_status.side_effect = [ProcessingStatusEnum.RUNNING, ProcessingStatusEnum.ERROR]
+
+        with self.assertRaises(PredictionError) as e:
+            prediction._wait_for_prediction()
+        self.assertEqual(e.exception.processing_status, ProcessingStatusEnum.ERROR)
+        self.assertFalse(mocked_get.called)
+
+    @mock.patch('time.sleep')
+    @mock.patch('plantpredict.prediction.Prediction.get')
+    @mock.patch('plantpredict.prediction.Prediction._get_processing_status')
+    def test_wait_for_prediction_error_without_raise_on_error(self, mocked_get_processing_status, mocked_get,
+                                                              mocked_sleep):
+        self._make_mocked_api()
+        prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
+        mocked_get_processing_status.side_effect = [
+            ProcessingStatusEnum.RUNNING, ProcessingStatusEnum.ERROR, ProcessingStatusEnum.ERROR
+        ]
+
+        prediction._wait_for_prediction(PollingPolicy(jitter=0.0, raise_on_error=False))
+        self.assertEqual(mocked_get_processing_status.call_count, 2)
+        self.assertEqual(mocked_sleep.call_count, 1)
+        self.assertEqual(mocked_get.call_count, 1)
+
+    @mock.patch('time.sleep')
+    @mock.patch('time.monotonic')
+    @mock.patch('plantpredict.prediction.Prediction.get')
+    @mock.patch('plantpredict.prediction.Prediction._get_processing_status')
+    def test_wait_for_prediction_timeout(self, mocked_get_processing_status, mocked_get, mocked_monotonic,
+                                         mocked_sleep):
+        self._make_mocked_api()
+        prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
+        mocked_get_processing_status.return_value = ProcessingStatusEnum.RUNNING
+        mocked_monotonic.side_effect = [0.0, 1.0, 3.0, 7.0]
+
+        with self.assertRaises(PredictionTimeoutError):
+            prediction._wait_for_prediction(
+                PollingPolicy(initial_interval=1.0, backoff_factor=2.0, jitter=0.0, timeout=10.0)
+            )
+        self.assertEqual(mocked_sleep.call_count, 2)
+
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_get_results_summary(self):
         self._make_mocked_api()
         prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
@@ -75,7 +183,7 @@ class TestPrediction(plantpredict_unit_test_case.PlantPredictUnitTestCase):
             "prediction_name": "Test Prediction", "block_result_summaries": [{"name": 1}]
         })
 
-    @mock.patch('plantpredict.prediction.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_get_results_details(self):
         self._make_mocked_api()
         prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
@@ -83,7 +191,7 @@ class TestPrediction(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         response = prediction.get_results_details()
         self.assertEqual(json.loads(response.content), {"prediction_name": "Test Prediction Details"})
 
-    @mock.patch('plantpredict.prediction.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_get_nodal_data(self):
         self._make_mocked_api()
         prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
@@ -96,8 +204,272 @@ class TestPrediction(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         })
         self.assertEqual(nodal_data_dc_field, {"nodal_data_dc_field": {}})
 
-    @mock.patch('plantpredict.prediction.requests.post', new=mocked_requests.mocked_requests_post)
-    @mock.patch('plantpredict.prediction.requests.get', new=mocked_requests.mocked_requests_get)
+    def _mock_nodal_response(self, content, status_code=200):
+        return mock.Mock(status_code=status_code, content=json.dumps(content).encode(), headers={}, url="")
+
+    def test_get_nodal_frame(self):
+        self._make_mocked_api()
+        prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
+        response = self._mock_nodal_response([
+            {"timeStamp": "2019-01-01T00:00:00", "dcPower": 1.5, "globalHorizontalIrradiance": 0,
+             "moduleTemperature": 10.0},
+            {"timeStamp": "2019-01-01T01:00:00", "dcPower": 2.5, "globalHorizontalIrradiance": 10,
+             "moduleTemperature": 11.0}
+        ])
+
+        with mock.patch('requests.Session.get', return_value=response) as mocked_get:
+            nodal_data = prediction.get_nodal_frame(params={"block_number": 1, "array_number": 1})
+
+        self.assertEqual(mocked_get.call_args[1]["params"], {"blockNumber": 1, "arrayNumber": 1})
+        self.assertEqual(list(nodal_data.columns), ["dc_power", "global_horizontal_irradiance", "module_temperature"])
+        self.assertIsInstance(nodal_data.index, pandas.DatetimeIndex)
+        self.assertEqual(nodal_data.index[1].hour, 1)
+        self.assertEqual(nodal_data["dc_power"].dtype, "float64")
+        self.assertEqual(nodal_data["global_horizontal_irradiance"].dtype, "int64")
+        self.assertEqual(nodal_data["dc_power"].tolist(), [1.5, 2.5])
+
+    def test_get_nodal_frame_error(self):
+        self._make_mocked_api()
+        prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
+
+        with mock.patch('requests.Session.get', return_value=self._mock_nodal_response("Not Found", 404)):
+            with self.assertRaises(APIError) as e:
+                prediction.get_nodal_frame()
+        self.assertEqual(e.exception.status, 404)
+
+    def _mock_streamed_nodal_response(self, content, chunk_size=16):
+        content = json.dumps(content).encode()
+        return mock.Mock(status_code=200, content=content, headers={}, url="", iter_content=mock.Mock(
+            return_value=iter([content[i:i + chunk_size] for i in range(0, len(content), chunk_size)])
+        ))
+
+    def test_iter_nodal_data(self):
+        self._make_mocked_api()
+        prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
+        response = self._mock_streamed_nodal_response({"nodalData": [
+            {"timeStamp": "2019-01-01T00:00:00", "dcPower": 1.5}, {"timeStamp": "2019-01-01T01:00:00", "dcPower": 2.5}
+        ]})
+
+        with mock.patch('requests.Session.get', return_value=response) as mocked_get:
+            nodal_data = prediction.get_nodal_data(params={"block_number": 1}, stream=True)
+            self.assertFalse(mocked_get.called)
+            self.assertEqual(list(nodal_data), [
+                {"timestamp": "2019-01-01T00:00:00", "dc_power": 1.5},
+                {"timestamp": "2019-01-01T01:00:00", "dc_power": 2.5}
+            ])
+
+        self.assertTrue(mocked_get.call_args[1]["stream"])
+        self.assertEqual(mocked_get.call_args[1]["params"], {"blockNumber": 1})
+
+    def test_iter_nodal_frames(self):
+        self._make_mocked_api()
+        prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
+        response = self._mock_streamed_nodal_response([
+            {"timeStamp": "2019-01-01T0{}:00:00".format(i), "dcPower": float(i)} for i in range(5)
+        ])
+
+        with mock.patch('requests.Session.get', return_value=response):
+            frames = list(prediction.iter_nodal_frames(num_rows=2))
+
+        self.assertEqual([len(frame) for frame in frames], [2, 2, 1])
+        self.assertEqual(list(frames[1].columns), ["dc_power"])
+        self.assertEqual(frames[1]["dc_power"].tolist(), [2.0, 3.0])
+        self.assertEqual(frames[2].index[0].hour, 4)
+
+    def test_iter_results_details(self):
+        self._make_mocked_api()
+        prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
+        response = self._mock_streamed_nodal_response({
+            "predictionName": "Test Prediction Details",
+            "hourlyResults": [{"dcPower": 1}],
+            "dailyResults": [{"dcPower": 24}]
+        })
+
+        with mock.patch('requests.Session.get', return_value=response):
+            self.assertEqual(list(prediction.iter_results_details(key="daily_results")), [{"dc_power": 24}])
+
+    def test_nodal_data_to_frame_with_metadata(self):
+        nodal_data = nodal_data_to_frame({
+            "nodeName": "DC Field 1",
+            "nodalData": [{"timeStamp": "2019-01-01T00:00:00", "dcPower": 1.5}]
+        })
+
+        self.assertEqual(nodal_data.attrs, {"node_name": "DC Field 1"})
+        self.assertEqual(nodal_data["dc_power"].tolist(), [1.5])
+
+    def _make_nodal_powerplant(self):
+        return mock.Mock(blocks=[
+            {"name": 1, "arrays": [
+                {"name": 1, "inverters": [{"name": "A", "dc_fields": [{"name": 1}, {"name": 2}]}]},
+                {"name": 2, "inverters": [{"name": "A", "dc_fields": [{"name": 1}]}]}
+            ]}
+        ])
+
+    def test_get_nodal_data_nodes(self):
+        nodes = get_nodal_data_nodes(self._make_nodal_powerplant().blocks, levels=["system", "array", "dc_field"])
+
+        self.assertEqual([node for node, _ in nodes], [
+            "system",
+            "block=1/array=1",
+            "block=1/array=1/inverter=A/dc_field=1",
+            "block=1/array=1/inverter=A/dc_field=2",
+            "block=1/array=2",
+            "block=1/array=2/inverter=A/dc_field=1"
+        ])
+        self.assertIsNone(nodes[0][1])
+        self.assertEqual(nodes[3][1], {
+            "block_number": 1, "array_number": 1, "inverter_name": "A", "dc_field_number": 2
+        })
+
+        with self.assertRaises(ValueError):
+            get_nodal_data_nodes([], levels=["plant"])
+
+    def test_get_all_nodal_data(self):
+        self._make_mocked_api()
+        prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
+        in_flight = []
+        max_in_flight = []
+        lock = threading.Lock()
+
+        def get_nodal_frame(params):
+            with lock:
+                in_flight.append(1)
+                max_in_flight.append(len(in_flight))
+            threading.Event().wait(0.01)
+            with lock:
+                in_flight.pop()
+            return params
+
+        with mock.patch.object(prediction, "get_nodal_frame", side_effect=get_nodal_frame):
+            nodal_data = prediction.get_all_nodal_data(
+                levels=["block", "inverter"], max_workers=2, powerplant=self._make_nodal_powerplant()
+            )
+
+        self.assertEqual(nodal_data, {
+            "block=1": {"block_number": 1},
+            "block=1/array=1/inverter=A": {"block_number": 1, "array_number": 1, "inverter_name": "A"},
+            "block=1/array=2/inverter=A": {"block_number": 1, "array_number": 2, "inverter_name": "A"}
+        })
+        self.assertLessEqual(max(max_in_flight), 2)
+
+    def test_get_all_nodal_data_resumes_from_checkpoint(self):
+        self._make_mocked_api()
+        prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        checkpoint = os.path.join(directory, "done.txt")
+        sunk = []
+
+        def get_nodal_data(params):
+            if params["dc_field_number"] == 2:
+                raise APIError(500, "Internal Server Error")
+            return params
+
+        with mock.patch.object(prediction, "get_nodal_data", side_effect=get_nodal_data):
+            with self.assertRaises(APIError):
+                prediction.get_all_nodal_data(levels=["dc_field"], sink=lambda node, data: sunk.append(node),
+                                              checkpoint=checkpoint, max_workers=1, as_frame=False,
+                                              powerplant=self._make_nodal_powerplant())
+        self.assertIn("block=1/array=1/inverter=A/dc_field=1", sunk)
+        self.assertNotIn("block=1/array=1/inverter=A/dc_field=2", sunk)
+        num_sunk = len(sunk)
+
+        with mock.patch.object(prediction, "get_nodal_data", return_value={}) as mocked_get_nodal_data:
+            result = prediction.get_all_nodal_data(levels=["dc_field"], sink=lambda node, data: sunk.append(node),
+                                                   checkpoint=checkpoint, as_frame=False,
+                                                   powerplant=self._make_nodal_powerplant())
+        self.assertIsNone(result)
+        self.assertEqual(mocked_get_nodal_data.call_count, 3 - num_sunk)
+        self.assertEqual(sorted(sunk), [
+            "block=1/array=1/inverter=A/dc_field=1",
+            "block=1/array=1/inverter=A/dc_field=2",
+            "block=1/array=2/inverter=A/dc_field=1"
+        ])
+        with open(checkpoint) as f:
+            self.assertEqual(len(f.read().split()), 3)
+
+    def test_get_all_nodal_data_cancels_pending_nodes(self):
+        self._make_mocked_api()
+        prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
+        requested = []
+
+        def get_nodal_data(params):
+            requested.append(params)
+            if len(requested) > 1:
+                # keeps the only worker busy while the failure is handled
+                threading.Event().wait(0.1)
+            return params
+
+        def sink(node, data):
+            raise IOError("disk full")
+
+        with mock.patch.object(prediction, "get_nodal_data", side_effect=get_nodal_data):
+            with self.assertRaises(IOError):
+                prediction.get_all_nodal_data(levels=["dc_field"], sink=sink, max_workers=1, as_frame=False,
+                                              powerplant=self._make_nodal_powerplant())
+        self.assertLess(len(requested), 3)
+
+    def test_get_all_nodal_data_exported_nodes(self):
+        self._make_mocked_api()
+        prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
+        powerplant = self._make_nodal_powerplant()
+        powerplant.blocks.append({"name": 2, "arrays": [
+            {"name": 1, "inverters": [{"name": "A", "dc_fields": [{"name": 1}]}]}
+        ]})
+        export_options = {
+            "export_system": True,
+            "block_export_options": [{
+                "name": 1,
+                "export_block": False,
+                "export_arrays": True,
+                "export_inverters": False,
+                "export_dc_fields": True
+            }]
+        }
+        exported_nodes = [
+            "block=1/array=1",
+            "block=1/array=1/inverter=A/dc_field=1",
+            "block=1/array=1/inverter=A/dc_field=2",
+            "block=1/array=2",
+            "block=1/array=2/inverter=A/dc_field=1"
+        ]
+
+        def get_nodal_data(params):
+            # only the nodes exported by the run have nodal data
+            if params["block_number"] != 1:
+                raise APIError(404, "Not Found")
+            return params
+
+        with mock.patch.object(prediction, "get_nodal_data", side_effect=get_nodal_data):
+            nodal_data = prediction.get_all_nodal_data(levels=["array", "dc_field"], as_frame=False,
+                                                       powerplant=powerplant, export_options=export_options)
+
+        self.assertEqual(sorted(nodal_data), exported_nodes)
+        self.assertEqual(
+            [node for node, _ in get_nodal_data_nodes(powerplant.blocks, export_options=export_options)],
+            ["system"] + exported_nodes
+        )
+
+    def test_get_all_nodal_data_gets_powerplant(self):
+        self._make_mocked_api()
+        self.mocked_api.powerplant.return_value = self._make_nodal_powerplant()
+        prediction = Prediction(api=self.mocked_api, project_id=710, id=555)
+
+        with mock.patch.object(prediction, "get_nodal_frame", return_value="nodal data"):
+            nodal_data = prediction.get_all_nodal_data(levels=["system"])
+
+        self.mocked_api.powerplant.assert_called_once_with(project_id=710, prediction_id=555)
+        self.assertEqual(nodal_data, {"system": "nodal data"})
+
+    def test_nodal_data_to_frame_columns(self):
+        nodal_data = nodal_data_to_frame({"timeStamp": ["2019-01-01T00:00:00"], "dcPower": [1.5]}, index=None)
+
+        self.assertEqual(list(nodal_data.columns), ["timestamp", "dc_power"])
+        with self.assertRaises(ValueError):
+            nodal_data_to_frame({"timeStamp": "2019-01-01T00:00:00"})
+
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_clone(self):
         self._make_mocked_api()
 
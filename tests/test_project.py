@@ -43,7 +43,7 @@ class TestProject(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         self.assertEqual(project.update_url_suffix, "/Project")
         self.assertTrue(mocked_update.called)
 
-    @mock.patch('plantpredict.project.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_get_all_predictions(self):
         self._make_mocked_api()
         project = Project(api=self.mocked_api, id=710)
@@ -55,7 +55,7 @@ class TestProject(plantpredict_unit_test_case.PlantPredictUnitTestCase):
             {"project_id": 3, "name": "Project 3"}
         ])
 
-    @mock.patch('plantpredict.project.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_search(self):
         self._make_mocked_api()
         project = Project(api=self.mocked_api)
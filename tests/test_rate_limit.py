@@ -0,0 +1,131 @@
+import time
+import threading
+import unittest
+import mock
+
+from plantpredict.rate_limit import RateLimit, RateLimiter
+from plantpredict.session import Session
+
+
+class TestRateLimit(unittest.TestCase):
+    def test_init_defaults(self):
+        rate_limit = RateLimit(rate=5.0)
+
+        self.assertEqual(rate_limit.burst, 5.0)
+        self.assertIsNone(rate_limit.max_in_flight)
+        self.assertEqual(RateLimit(rate=0.5).burst, 1)
+
+    def test_init_invalid_rate(self):
+        for rate in [0, -1.0]:
+            with self.assertRaises(ValueError):
+                RateLimit(rate=rate)
+        self.assertIsNone(RateLimit(max_in_flight=2).rate)
+
+    def test_rate(self):
+        rate_limit = RateLimit(rate=50.0, burst=1)
+
+        start = time.monotonic()
+        for _ in range(6):
+            with rate_limit:
+                pass
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+        self.assertEqual(rate_limit.num_requests, 6)
+        self.assertGreater(rate_limit.wait_time, 0.0)
+
+    def test_burst(self):
+        rate_limit = RateLimit(rate=1.0, burst=5)
+
+        start = time.monotonic()
+        for _ in range(5):
+            with rate_limit:
+                pass
+
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_max_in_flight(self):
+        rate_limit = RateLimit(max_in_flight=2)
+        in_flight = []
+        max_in_flight = []
+        lock = threading.Lock()
+
+        def send():
+            with rate_limit:
+                with lock:
+                    in_flight.append(1)
+                    max_in_flight.append(len(in_flight))
+                time.sleep(0.02)
+                with lock:
+                    in_flight.pop()
+
+        threads = [threading.Thread(target=send) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(max(max_in_flight), 2)
+        self.assertEqual(rate_limit.num_requests, 8)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.prediction_run = RateLimit(max_in_flight=1)
+        self.geo = RateLimit(rate=10.0)
+        self.default = RateLimit(rate=100.0)
+
+    def test_get_family(self):
+        rate_limiter = RateLimiter({})
+        base_url = "https://api.plantpredict.com"
+
+        self.assertEqual(rate_limiter.get_family(base_url + "/Project/7/Prediction/77/Run"), "prediction_run")
+        self.assertEqual(rate_limiter.get_family(base_url + "/Project/7/Prediction/77"), "default")
+        self.assertEqual(rate_limiter.get_family(base_url + "/Weather/Download/0?latitude=1"), "weather_download")
+        self.assertEqual(rate_limiter.get_family(base_url + "/Module/Generator/ProcessIVCurves"), "module_generator")
+        self.assertEqual(rate_limiter.get_family(base_url + "/Geo/33.0/-110.0/Location"), "geo")
+
+    def test_get(self):
+        rate_limiter = RateLimiter({"prediction_run": self.prediction_run, "geo": self.geo, "default": self.default})
+
+        self.assertIs(rate_limiter.get("https://api.plantpredict.com/Project/7/Prediction/77/Run"), self.prediction_run)
+        self.assertIs(rate_limiter.get("https://api.plantpredict.com/Geo/33.0/-110.0/Elevation"), self.geo)
+        self.assertIs(rate_limiter.get("https://api.plantpredict.com/Module/Generator/GenerateIVCurve"), self.default)
+
+    def test_get_without_default(self):
+        rate_limiter = RateLimiter({"geo": self.geo})
+        self.assertIsNone(rate_limiter.get("https://api.plantpredict.com/Project/7"))
+
+    def test_custom_endpoint_families(self):
+        rate_limiter = RateLimiter({"inverter": self.geo}, endpoint_families=[("inverter", r"/Inverter/")])
+        self.assertIs(rate_limiter.get("https://api.plantpredict.com/Inverter/808/kVa"), self.geo)
+
+
+class TestSessionRateLimit(unittest.TestCase):
+    @mock.patch('requests.Session.request')
+    def test_request_is_throttled(self, mocked_request):
+        prediction_run = RateLimit(max_in_flight=1)
+        session = Session(rate_limits={"prediction_run": prediction_run})
+
+        session.post("https://api.plantpredict.com/Project/7/Prediction/77/Run")
+        session.get("https://api.plantpredict.com/Project/7/Prediction/77")
+
+        self.assertEqual(mocked_request.call_count, 2)
+        self.assertEqual(prediction_run.num_requests, 1)
+
+    @mock.patch('requests.Session.request', side_effect=ValueError)
+    def test_request_releases_on_error(self, mocked_request):
+        prediction_run = RateLimit(max_in_flight=1)
+        session = Session(rate_limits={"default": prediction_run})
+
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                session.get("https://api.plantpredict.com/Project/7")
+
+        self.assertEqual(prediction_run.num_requests, 2)
+
+    def test_no_rate_limits(self):
+        self.assertIsNone(Session().rate_limiter)
+
+
+if __name__ == '__main__':
+    unittest.main()
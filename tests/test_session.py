@@ -0,0 +1,214 @@
+import gzip
+import json
+import zlib
+import mock
+import unittest
+import threading
+import requests
+from six.moves import BaseHTTPServer
+
+from plantpredict.session import Session
+from plantpredict.error_handlers import RetryPolicy
+
+
+class _KeepAliveHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    received = []
+
+    def _respond(self, body, content_encoding=None):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if content_encoding:
+            self.send_header("Content-Encoding", content_encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/large":
+            # large response, compressed if the client accepts it
+            body = json.dumps({"values": 1000 * [1.0]}).encode("utf-8")
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                self._respond(gzip.compress(body), "gzip")
+            else:
+                self._respond(body)
+        else:
+            self._respond(b'{"ok": true}')
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        content_encoding = self.headers.get("Content-Encoding")
+        if content_encoding == "gzip":
+            body = gzip.decompress(body)
+        elif content_encoding == "deflate":
+            body = zlib.decompress(body)
+
+        self.received.append((content_encoding, self.headers.get("Content-Type"), json.loads(body.decode("utf-8"))))
+        self._respond(b'{"ok": true}')
+
+    def log_message(self, *args):
+        pass
+
+
+class TestSession(unittest.TestCase):
+    def setUp(self):
+        self.server = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+        self.url = "http://127.0.0.1:{}/".format(self.server.server_port)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_init_pool_configuration(self):
+        session = Session(pool_connections=3, pool_maxsize=7, pool_block=True)
+        adapter = session.get_adapter("https://api.plantpredict.com")
+
+        self.assertIs(adapter, session.get_adapter("http://api.plantpredict.com"))
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 7)
+        self.assertTrue(adapter._pool_block)
+        self.assertEqual(session.headers["Connection"], "keep-alive")
+
+    def test_init_without_keep_alive(self):
+        session = Session(keep_alive=False)
+        self.assertEqual(session.headers["Connection"], "close")
+
+    def test_connection_stats_no_requests(self):
+        self.assertEqual(Session().connection_stats(), {"requests": 0, "connections": 0, "reused": 0})
+
+    def test_connection_stats_reuses_connection(self):
+        session = Session()
+        for _ in range(3):
+            self.assertEqual(session.get(self.url).status_code, 200)
+
+        self.assertEqual(session.connection_stats(), {"requests": 3, "connections": 1, "reused": 2})
+        session.close()
+
+    def test_connection_stats_without_keep_alive(self):
+        session = Session(keep_alive=False)
+        for _ in range(3):
+            self.assertEqual(session.get(self.url).status_code, 200)
+
+        self.assertEqual(session.connection_stats(), {"requests": 3, "connections": 3, "reused": 0})
+        session.close()
+
+
+    def test_init_invalid_request_compression(self):
+        with self.assertRaises(ValueError):
+            Session(request_compression="br")
+
+    def test_request_compression(self):
+        payload = {"weatherDetails": [{"index": i, "globalHorizontalIrradiance": 0.0} for i in range(8760)]}
+        for request_compression in ("gzip", "deflate"):
+            _KeepAliveHandler.received = []
+            session = Session(request_compression=request_compression, compression_threshold=1024)
+            session.post(self.url, json=payload)
+
+            self.assertEqual(_KeepAliveHandler.received, [(request_compression, "application/json", payload)])
+            stats = session.wire_stats()
+            self.assertEqual(stats["request_bytes"], len(json.dumps(payload)))
+            self.assertLess(stats["request_wire_bytes"], stats["request_bytes"] / 10)
+            session.close()
+
+    def test_request_compression_below_threshold(self):
+        _KeepAliveHandler.received = []
+        session = Session(request_compression="gzip", compression_threshold=1024)
+        session.post(self.url, json={"name": "Test"}, headers={"Authorization": "Bearer token"})
+
+        self.assertEqual(_KeepAliveHandler.received, [(None, "application/json", {"name": "Test"})])
+        self.assertEqual(session.wire_stats()["request_wire_bytes"], session.wire_stats()["request_bytes"])
+        session.close()
+
+    def test_no_request_compression(self):
+        _KeepAliveHandler.received = []
+        session = Session()
+        session.post(self.url, json={"values": 1000 * [1.0]})
+
+        self.assertEqual(_KeepAliveHandler.received[0][0], None)
+        session.close()
+
+    def test_wire_stats_compressed_response(self):
+        session = Session()
+        response = session.get(self.url + "large")
+
+        self.assertEqual(response.json(), {"values": 1000 * [1.0]})
+        stats = session.wire_stats()
+        self.assertEqual(stats["requests"], 1)
+        self.assertEqual(stats["response_bytes"], len(response.content))
+        self.assertLess(stats["response_wire_bytes"], stats["response_bytes"])
+        session.close()
+
+    def test_wire_stats_no_requests(self):
+        self.assertEqual(Session().wire_stats(), {
+            "requests": 0,
+            "request_bytes": 0,
+            "request_wire_bytes": 0,
+            "response_bytes": 0,
+            "response_wire_bytes": 0
+        })
+
+
+class TestSessionRetries(unittest.TestCase):
+    def _make_response(self, status_code, headers=None):
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers.update(headers or {})
+        response._content = b'{"ok": true}' if status_code == 200 else b""
+        return response
+
+    @mock.patch('time.sleep')
+    def test_request_retries_transient_error(self, mocked_sleep):
+        session = Session(retry_policy=RetryPolicy(jitter=0.0))
+        responses = [self._make_response(503, {"Retry-After": "3"}), self._make_response(200)]
+        with mock.patch('requests.Session.request', side_effect=responses) as mocked_request:
+            response = session.request("GET", "https://api.plantpredict.com/Project/7")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mocked_request.call_count, 2)
+        self.assertEqual(mocked_sleep.call_args[0][0], 3.0)
+
+    @mock.patch('time.sleep')
+    def test_request_gives_up(self, mocked_sleep):
+        session = Session(retry_policy=RetryPolicy(max_attempts=3, initial_backoff=0.0, jitter=0.0))
+        with mock.patch('requests.Session.request', return_value=self._make_response(504)) as mocked_request:
+            response = session.request("PUT", "https://api.plantpredict.com/Project/7")
+
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual(mocked_request.call_count, 3)
+
+    @mock.patch('time.sleep')
+    def test_request_non_idempotent_not_retried(self, mocked_sleep):
+        session = Session(retry_policy=RetryPolicy())
+        with mock.patch('requests.Session.request', return_value=self._make_response(503)) as mocked_request:
+            response = session.request("POST", "https://api.plantpredict.com/Project")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(mocked_request.call_count, 1)
+
+        with mock.patch('requests.Session.request', side_effect=requests.exceptions.ReadTimeout()) as mocked_request:
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                session.request("POST", "https://api.plantpredict.com/Project")
+        self.assertEqual(mocked_request.call_count, 1)
+
+    @mock.patch('time.sleep')
+    def test_request_non_idempotent_rate_limited(self, mocked_sleep):
+        session = Session(retry_policy=RetryPolicy(jitter=0.0))
+        responses = [self._make_response(429), self._make_response(200)]
+        with mock.patch('requests.Session.request', side_effect=responses) as mocked_request:
+            response = session.request("POST", "https://api.plantpredict.com/Project")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mocked_request.call_count, 2)
+
+    def test_request_without_retry_policy(self):
+        with mock.patch('requests.Session.request', return_value=self._make_response(503)) as mocked_request:
+            Session().request("GET", "https://api.plantpredict.com/Project/7")
+
+        self.assertEqual(mocked_request.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
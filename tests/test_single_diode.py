@@ -0,0 +1,119 @@
+import unittest
+import numpy
+
+from plantpredict.module import Module
+from plantpredict.single_diode import SingleDiodeModel
+from plantpredict.enumerations import PVModelTypeEnum
+from tests import plantpredict_unit_test_case
+
+MODULE_ATTRIBUTES = {
+    "pv_model": PVModelTypeEnum.ONE_DIODE_RECOMBINATION,
+    "number_of_cells_in_series": 264,
+    "stc_short_circuit_current": 2.54,
+    "stc_open_circuit_voltage": 219.2,
+    "stc_mpp_current": 2.355,
+    "stc_mpp_voltage": 182.55,
+    "stc_short_circuit_current_temp_coef": 0.04,
+    "light_generated_current": 2.54,
+    "saturation_current_at_stc": 2.415081e-12,
+    "diode_ideality_factor_at_stc": 1.17,
+    "linear_temp_dependence_on_gamma": -0.08,
+    "exponential_dependency_on_shunt_resistance": 5.5,
+    "series_resistance_at_stc": 5.277,
+    "dark_shunt_resistance": 6400,
+    "shunt_resistance_at_stc": 6400,
+    "bandgap_voltage": 1.5,
+    "built_in_voltage": 0.9,
+    "recombination_parameter": 0.9
+}
+
+
+def _solve_current_by_bisection(model, temperature, irradiance, voltage):
+    """Slow scalar reference solution of the 1-diode equation."""
+    parameters = {k: float(v) for k, v in model.get_parameters_at_conditions(temperature, irradiance).items()}
+    lower, upper = -1.0, parameters["light_generated_current"] + 1.0
+    for _ in range(200):
+        current = (lower + upper) / 2.0
+        residual, _ = model._residual(parameters, voltage, current)
+        if residual > 0:
+            lower = current
+        else:
+            upper = current
+
+    return (lower + upper) / 2.0
+
+
+class TestSingleDiodeModel(unittest.TestCase):
+    def setUp(self):
+        self.model = SingleDiodeModel.from_module(MODULE_ATTRIBUTES)
+
+    def test_basic_data_at_stc(self):
+        basic_data = self.model.calculate_basic_data_at_conditions(25.0, 1000.0)
+
+        self.assertAlmostEqual(basic_data["open_circuit_voltage"], 219.2, delta=0.5)
+        self.assertAlmostEqual(basic_data["mpp_current"], 2.355, delta=0.01)
+        self.assertAlmostEqual(basic_data["mpp_voltage"], 182.55, delta=1.5)
+        self.assertAlmostEqual(basic_data["short_circuit_current"], 2.54, delta=0.02)
+        self.assertAlmostEqual(basic_data["max_power"], basic_data["mpp_current"] * basic_data["mpp_voltage"])
+
+    def test_basic_data_arrays(self):
+        temperatures, irradiances = numpy.meshgrid([15.0, 25.0, 50.0], [0.0, 200.0, 600.0, 1000.0])
+        basic_data = self.model.calculate_basic_data_at_conditions(temperatures, irradiances)
+
+        self.assertEqual(basic_data["max_power"].shape, (4, 3))
+        numpy.testing.assert_array_equal(basic_data["max_power"][0], 0.0)
+        self.assertTrue(numpy.all(numpy.diff(basic_data["max_power"], axis=0) > 0))
+        self.assertTrue(numpy.all(numpy.diff(basic_data["max_power"][1:], axis=1) < 0))
+
+        for i, j in [(1, 0), (3, 2)]:
+            single = self.model.calculate_basic_data_at_conditions(temperatures[i, j], irradiances[i, j])
+            for key in single:
+                self.assertAlmostEqual(basic_data[key][i, j], single[key], places=4)
+
+    def test_max_power_point(self):
+        iv_curve = self.model.generate_iv_curves(40.0, 800.0, num_iv_points=2000)
+        basic_data = self.model.calculate_basic_data_at_conditions(40.0, 800.0)
+
+        self.assertAlmostEqual(basic_data["max_power"], (iv_curve["voltage"] * iv_curve["current"]).max(), delta=0.01)
+        self.assertLessEqual((iv_curve["voltage"] * iv_curve["current"]).max(), basic_data["max_power"] + 1e-9)
+
+    def test_generate_iv_curves(self):
+        iv_curves = self.model.generate_iv_curves([25.0, 50.0], 1000.0, num_iv_points=50)
+
+        self.assertEqual(iv_curves["voltage"].shape, (2, 50))
+        self.assertEqual(iv_curves["current"].shape, (2, 50))
+        numpy.testing.assert_array_equal(iv_curves["voltage"][:, 0], 0.0)
+        numpy.testing.assert_array_equal(iv_curves["current"][:, -1], 0.0)
+        self.assertTrue(numpy.all(numpy.diff(iv_curves["current"], axis=1) <= 0))
+
+        for k in [0, 10, 30, 45]:
+            expected = _solve_current_by_bisection(self.model, 50.0, 1000.0, iv_curves["voltage"][1, k])
+            self.assertAlmostEqual(iv_curves["current"][1, k], expected, places=9)
+
+    def test_one_diode_without_recombination(self):
+        attributes = dict(MODULE_ATTRIBUTES, pv_model=PVModelTypeEnum.ONE_DIODE)
+        model = SingleDiodeModel.from_module(attributes)
+
+        self.assertFalse(model._has_recombination)
+        self.assertGreater(model.calculate_basic_data_at_conditions(25.0, 1000.0)["max_power"],
+                           self.model.calculate_basic_data_at_conditions(25.0, 1000.0)["max_power"])
+        voltage = model.generate_iv_curves(25.0, 1000.0, 20)["voltage"][12]
+        self.assertAlmostEqual(
+            float(model._solve_current(model.get_parameters_at_conditions(25.0, 1000.0), numpy.array(voltage))),
+            _solve_current_by_bisection(model, 25.0, 1000.0, voltage), places=9
+        )
+
+
+class TestModuleSingleDiodeModel(plantpredict_unit_test_case.PlantPredictUnitTestCase):
+    def test_get_single_diode_model(self):
+        self._make_mocked_api()
+        module = Module(api=self.mocked_api, **MODULE_ATTRIBUTES)
+
+        model = module.get_single_diode_model()
+        self.assertIsInstance(model, SingleDiodeModel)
+        self.assertEqual(model.series_resistance_at_stc, 5.277)
+        self.assertTrue(model._has_recombination)
+
+
+if __name__ == '__main__':
+    unittest.main()
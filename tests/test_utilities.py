@@ -55,6 +55,26 @@ class TestUtilities(unittest.TestCase):
         camel_key = utilities.snake_to_camel(snake_key)
         self.assertEqual(camel_key, "test")
 
+    def test_convert_key_camel_to_snake(self):
+        self.assertEqual(utilities.convert_key("lightGeneratedCurrent", utilities.camel_to_snake),
+                         "light_generated_current")
+        self.assertEqual(utilities.convert_key("dcFieldKVARating", utilities.camel_to_snake), "dc_field_kva_rating")
+        self.assertEqual(utilities.convert_key("STCMPP", utilities.camel_to_snake), "stc_mpp")
+        self.assertEqual(utilities.convert_key("Cool996", utilities.camel_to_snake), "cool_996")
+
+    def test_convert_key_snake_to_camel(self):
+        self.assertEqual(utilities.convert_key("powerplant", utilities.snake_to_camel), "powerPlant")
+        self.assertEqual(utilities.convert_key("number_of_conductors_per_phase", utilities.snake_to_camel),
+                         "numberOfConductersPerPhase")
+
+    def test_convert_key_is_cached(self):
+        utilities.convert_key.cache_clear()
+        for _ in range(3):
+            utilities.convert_key("thisIsOnlyATest", utilities.camel_to_snake)
+
+        self.assertEqual(utilities.convert_key.cache_info().misses, 1)
+        self.assertEqual(utilities.convert_key.cache_info().hits, 2)
+
     def test_convert_json_camel_to_snake(self):
         with open('test_data/test_convert_json_camel.json', 'rb') as json_file:
             snake_dict = utilities.convert_json(json.load(json_file), utilities.camel_to_snake)
@@ -62,6 +82,35 @@ class TestUtilities(unittest.TestCase):
         with open('test_data/test_convert_json_snake.json', 'rb') as json_file:
             self.assertEqual(snake_dict, json.load(json_file))
 
+    def test_convert_json_keeps_scalar_list_elements(self):
+        camel_dict = {"dcFields": [{"moduleId": 1}, 2, "three", None], "nodalData": [[1.0, 2.0], [{"dcPower": 3.0}]]}
+        snake_dict = utilities.convert_json(camel_dict, utilities.camel_to_snake)
+        self.assertEqual(snake_dict, {
+            "dc_fields": [{"module_id": 1}, 2, "three", None],
+            "nodal_data": [[1.0, 2.0], [{"dc_power": 3.0}]]
+        })
+
+    def test_convert_json_removes_api_and_private_keys(self):
+        snake_dict = {
+            "name": "Test", "api": object(), "_cache": {}, "blocks": [{"api": object(), "_index": 1, "id": 2}]
+        }
+        camel_dict = utilities.convert_json(snake_dict, utilities.snake_to_camel)
+        self.assertEqual(camel_dict, {"name": "Test", "blocks": [{"id": 2}]})
+        self.assertIn("api", snake_dict)
+
+    def test_convert_json_deeply_nested(self):
+        camel_dict = {"leafValue": 1}
+        for _ in range(5000):
+            camel_dict = {"childNode": [camel_dict]}
+        snake_dict = utilities.convert_json(camel_dict, utilities.camel_to_snake)
+
+        for _ in range(5000):
+            snake_dict = snake_dict["child_node"][0]
+        self.assertEqual(snake_dict, {"leaf_value": 1})
+
+    def test_convert_json_scalar(self):
+        self.assertEqual(utilities.convert_json(5, utilities.camel_to_snake), 5)
+
     def test_convert_json_list_camel_to_snake(self):
         camel_list = [{"firstItem": 1}, {"secondItem": 2}, {"thirdItem": 3}]
         snake_list = utilities.convert_json_list(camel_list, utilities.camel_to_snake)
@@ -72,6 +121,60 @@ class TestUtilities(unittest.TestCase):
         camel_list = utilities.convert_json_list(snake_list, utilities.snake_to_camel)
         self.assertEqual(camel_list, [{"firstItem": 1}, {"secondItem": 2}, {"thirdItem": 3}])
 
+    def test_parse_json(self):
+        content = b'{"dcFields": [{"moduleId": 1, "_local": 2}, 3], "api": {}}'
+        self.assertEqual(utilities.parse_json(content, utilities.camel_to_snake), {"dc_fields": [{"module_id": 1}, 3]})
+        self.assertEqual(utilities.parse_json(content)["dcFields"][0], {"moduleId": 1, "_local": 2})
+
+    def _chunk(self, document, chunk_size):
+        content = json.dumps(document).encode("utf-8")
+        return [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)]
+
+    def test_iter_json_items(self):
+        time_steps = [
+            {"timeStamp": "2019-01-01T0{}:00:00".format(i), "dcPower": 1234.5 + i, "node": "é"} for i in range(5)
+        ]
+
+        # chunks split numbers, strings and multi-byte characters
+        for chunk_size in [1, 2, 5, 64, 100000]:
+            items = utilities.iter_json_items(
+                self._chunk(time_steps, chunk_size), convert_function=utilities.camel_to_snake
+            )
+            self.assertEqual(list(items), utilities.convert_json(time_steps, utilities.camel_to_snake))
+
+        self.assertEqual(list(utilities.iter_json_items(["[12", "3, 4", ".5]"])), [123, 4.5])
+        self.assertEqual(list(utilities.iter_json_items([" [ ] "])), [])
+
+    def test_iter_json_items_in_object(self):
+        document = {
+            "nodeName": "DC Field 1", "summary": {"values": [1, 2]}, "nodalData": [{"dcPower": 1}, {"dcPower": 2}]
+        }
+        chunks = self._chunk(document, 7)
+
+        self.assertEqual(list(utilities.iter_json_items(chunks)), [{"dcPower": 1}, {"dcPower": 2}])
+        self.assertEqual(list(utilities.iter_json_items(chunks, key="nodalData")), [{"dcPower": 1}, {"dcPower": 2}])
+        self.assertEqual(
+            list(utilities.iter_json_items(chunks, key="nodal_data", convert_function=utilities.camel_to_snake)),
+            [{"dc_power": 1}, {"dc_power": 2}]
+        )
+
+    def test_iter_json_items_is_incremental(self):
+        chunks = iter(self._chunk([{"dcPower": i} for i in range(1000)], 10))
+        items = utilities.iter_json_items(chunks)
+
+        self.assertEqual(next(items), {"dcPower": 0})
+        self.assertGreater(len(list(chunks)), 1000)
+
+    def test_iter_json_items_invalid(self):
+        with self.assertRaises(ValueError):
+            list(utilities.iter_json_items(['[{"dcPower": 1}, {"dcPow']))
+        with self.assertRaises(ValueError):
+            list(utilities.iter_json_items(['{"nodeName": "DC Field 1"}']))
+        with self.assertRaises(ValueError):
+            list(utilities.iter_json_items(['{"nodalData": [1]}'], key="other"))
+        with self.assertRaises(ValueError):
+            list(utilities.iter_json_items(['"nodalData"']))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
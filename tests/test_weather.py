@@ -44,7 +44,7 @@ class TestWeather(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         self.assertEqual(weather.update_url_suffix, "/Weather")
         self.assertTrue(mocked_update.called)
 
-    @mock.patch('plantpredict.weather.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_get_details(self):
         self._make_mocked_api()
         weather = Weather(api=self.mocked_api, id=999)
@@ -52,7 +52,7 @@ class TestWeather(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         response = weather.get_details()
         self.assertEqual(json.loads(response.content), {"id": 999, "name": "Weather File"})
 
-    @mock.patch('plantpredict.weather.requests.get', new=mocked_requests.mocked_requests_get)
+    @mock.patch('requests.Session.get', new=mocked_requests.mocked_requests_get)
     def test_search(self):
         self._make_mocked_api()
         weather = Weather(api=self.mocked_api)
@@ -60,7 +60,7 @@ class TestWeather(plantpredict_unit_test_case.PlantPredictUnitTestCase):
         search_results = weather.search(latitude=39.67, longitude=-105.21)
         self.assertEqual(search_results, [{"id": 998, "name": "Weather File 2"}])
 
-    @mock.patch('plantpredict.weather.requests.post', new=mocked_requests.mocked_requests_post)
+    @mock.patch('requests.Session.post', new=mocked_requests.mocked_requests_post)
     def test_download(self):
         self._make_mocked_api()
         weather = Weather(api=self.mocked_api)